@@ -0,0 +1,294 @@
+# analysis_bundle.py
+# 분석 결과를 한 파일(ZIP)로 묶어 LLM 호출 없이 결과 탭 3개를 바로 다시 여는 분석 번들
+# 원본 다이제스트(문서 ID), 페이지 텍스트, 페이지 썸네일, 구조화 JSON, 스키마 경로 인덱스, 결과 탭용 부가 상태, 단계별 소요 시간을 담고,
+# 원본 PDF는 크기 상한 안에서 함께 넣어 PDF 뷰어도 그대로 동작하게 합니다.
+import io
+import json
+import os
+import tempfile
+import time
+import zipfile
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from app_config import AppConfig
+from page_render import open_pdf, render_page_jpeg
+from render_cache import RenderCache
+from similar_patents import document_label
+
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_SUFFIX = ".zip"
+MANIFEST_MEMBER = "manifest.json"
+PAGE_TEXTS_MEMBER = "page_texts.json"
+STRUCTURED_DATA_MEMBER = "structured_data.json"
+PATH_INDEX_MEMBER = "path_index.json"
+SESSION_FIELDS_MEMBER = "session_fields.json"
+SOURCE_PDF_MEMBER = "source.pdf"
+IMAGE_MEMBER_PREFIX = "images/"
+# 분석 기록 페이지가 메인 앱에 열 번들 경로를 넘기는 세션 상태 키 (메인 앱의 SessionStateKeys.PENDING_BUNDLE_PATH)
+PENDING_BUNDLE_SESSION_KEY = "pending_bundle_path"
+
+
+def _image_member(page_num: int, dpi: int) -> str:
+    return f"{IMAGE_MEMBER_PREFIX}p{page_num:05d}_d{dpi}.jpg"
+
+def _parse_image_member(name: str) -> Optional[Tuple[int, int]]:
+    """'images/p00012_d30.jpg' -> (12, 30). 형식이 다르면 None."""
+    stem = name[len(IMAGE_MEMBER_PREFIX):-len(".jpg")]
+    page_text, _, dpi_text = stem.partition("_d")
+    if not (name.startswith(IMAGE_MEMBER_PREFIX) and page_text.startswith("p") and page_text[1:].isdigit() and dpi_text.isdigit()):
+        return None
+    return int(page_text[1:]), int(dpi_text)
+
+def build_path_index(structured_data: Dict[str, Any], paths: Iterable[str]) -> Dict[str, Any]:
+    """스키마 경로(점 구분) -> 추출 값 매핑. 값이 없는(None) 경로는 넣지 않습니다 (Tab 3 항목 조회와 번들 목록의 채움 비율에 사용)."""
+    index = {}
+    for path in paths:
+        value: Any = structured_data
+        for key in path.split("."):
+            if isinstance(value, list) and key.isdigit():
+                value = value[int(key)] if int(key) < len(value) else None
+            elif isinstance(value, dict):
+                value = value.get(key)
+            else:
+                value = None
+            if value is None:
+                break
+        if value is not None:
+            index[path] = value
+    return index
+
+def render_bundle_images(
+    pdf_source: Union[bytes, str],
+    document_id: str,
+    page_count: int,
+    cache: Optional[RenderCache] = None
+) -> Dict[Tuple[int, int], bytes]:
+    """
+    번들에 넣을 페이지 이미지를 만듭니다: 앞 BUNDLE_THUMBNAIL_MAX_PAGES페이지의 썸네일(미리보기 DPI)과
+    앞 BUNDLE_FULL_RES_PAGES페이지의 뷰어 해상도 이미지. 렌더링 캐시에 있으면 그대로 쓰고, 새로 그린 이미지는 캐시에도 넣습니다.
+    """
+    wanted = [(page_num, AppConfig.PDF_VIEWER_PREVIEW_DPI) for page_num in range(min(page_count, AppConfig.BUNDLE_THUMBNAIL_MAX_PAGES))]
+    wanted += [(page_num, AppConfig.DEFAULT_DPI_PDF_PREVIEW) for page_num in range(min(page_count, AppConfig.BUNDLE_FULL_RES_PAGES))]
+    images = {}
+    doc = None
+    try:
+        for page_num, dpi in wanted:
+            data = cache.get(document_id, page_num, dpi) if cache else None
+            if data is None:
+                doc = doc or open_pdf(pdf_source)
+                data = render_page_jpeg(doc, page_num, dpi)
+                if data is not None and cache:
+                    cache.put(document_id, page_num, dpi, data)
+            if data is not None:
+                images[(page_num, dpi)] = data
+    finally:
+        if doc is not None:
+            doc.close()
+    return images
+
+class AnalysisBundleStore:
+    """
+    분석 번들을 `<base_dir>/<document_id>.zip`으로 보관합니다 (같은 문서를 다시 분석하면 덮어씀). 쓰기는 임시 파일 -> os.replace로 원자적입니다.
+    JSON 멤버는 압축하고, 이미 압축된 JPEG와 원본 PDF는 압축하지 않고(ZIP_STORED) 넣어 다시 열 때 읽기만 하면 되게 합니다.
+    """
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def path(self, document_id: str) -> str:
+        return os.path.join(self.base_dir, f"{document_id}{BUNDLE_SUFFIX}")
+
+    def write(
+        self,
+        document_id: str,
+        source_file_name: str,
+        page_texts: List[str],
+        structured_data: Dict[str, Any],
+        path_index: Dict[str, Any],
+        session_fields: Optional[Dict[str, Any]] = None,
+        images: Optional[Dict[Tuple[int, int], bytes]] = None,
+        source_pdf: Optional[Union[bytes, str]] = None,
+        timings: Optional[Dict[str, float]] = None,
+        extra_manifest: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        번들을 기록하고 매니페스트를 반환합니다. source_pdf는 PDF 바이트 또는 (대용량 모드) 파일 경로이며,
+        BUNDLE_EMBED_SOURCE_MAX_MB보다 크면 넣지 않습니다 (그 경우 뷰어는 번들의 썸네일로만 표시).
+        """
+        started = time.perf_counter()
+        images = images or {}
+        source_size = None
+        if source_pdf is not None:
+            source_size = os.path.getsize(source_pdf) if isinstance(source_pdf, str) else len(source_pdf)
+        embed_source = source_size is not None and source_size <= AppConfig.BUNDLE_EMBED_SOURCE_MAX_MB * 1024 * 1024
+        manifest = {
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "document_id": document_id,
+            "source": {"sha256": document_id, "file_name": source_file_name, "size_bytes": source_size, "embedded": embed_source},
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "page_count": len(page_texts),
+            "label": document_label({"source_file_name": source_file_name, "structured_data": structured_data}),
+            "filled_paths": len(path_index),
+            "images": {"pages": sorted({page_num for page_num, _ in images}), "dpis": sorted({dpi for _, dpi in images})},
+            "timings": dict(timings or {}),
+            **(extra_manifest or {}),
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f, zipfile.ZipFile(f, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+                bundle.writestr(PAGE_TEXTS_MEMBER, json.dumps(page_texts, ensure_ascii=False))
+                bundle.writestr(STRUCTURED_DATA_MEMBER, json.dumps(structured_data, ensure_ascii=False))
+                bundle.writestr(PATH_INDEX_MEMBER, json.dumps(path_index, ensure_ascii=False))
+                bundle.writestr(SESSION_FIELDS_MEMBER, json.dumps(session_fields or {}, ensure_ascii=False, default=str))
+                for (page_num, dpi), data in sorted(images.items()):
+                    bundle.writestr(_image_member(page_num, dpi), data, compress_type=zipfile.ZIP_STORED)
+                if embed_source:
+                    if isinstance(source_pdf, str):
+                        bundle.write(source_pdf, SOURCE_PDF_MEMBER, compress_type=zipfile.ZIP_STORED)
+                    else:
+                        bundle.writestr(SOURCE_PDF_MEMBER, source_pdf, compress_type=zipfile.ZIP_STORED)
+                # 매니페스트는 마지막에 기록 (번들 쓰기 시간 포함)
+                manifest["timings"]["bundle_write_seconds"] = time.perf_counter() - started
+                bundle.writestr(MANIFEST_MEMBER, json.dumps(manifest, ensure_ascii=False))
+            os.replace(tmp_path, self.path(document_id))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return manifest
+
+    def read(self, path: str, include_source: bool = True) -> Dict[str, Any]:
+        """
+        번들 전체를 읽습니다. 반환: {'manifest', 'page_texts', 'structured_data', 'path_index', 'session_fields',
+        'images': {(페이지, DPI): JPEG 바이트}, 'source_pdf': 바이트 또는 None}. 형식이 맞지 않으면 ValueError.
+        """
+        with zipfile.ZipFile(path) as bundle:
+            manifest = json.loads(bundle.read(MANIFEST_MEMBER))
+            if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported bundle format version: {manifest.get('format_version')}")
+            images = {}
+            for name in bundle.namelist():
+                key = _parse_image_member(name) if name.startswith(IMAGE_MEMBER_PREFIX) else None
+                if key:
+                    images[key] = bundle.read(name)
+            has_source = include_source and SOURCE_PDF_MEMBER in bundle.namelist()
+            return {
+                "manifest": manifest,
+                "page_texts": json.loads(bundle.read(PAGE_TEXTS_MEMBER)),
+                "structured_data": json.loads(bundle.read(STRUCTURED_DATA_MEMBER)),
+                "path_index": json.loads(bundle.read(PATH_INDEX_MEMBER)),
+                "session_fields": json.loads(bundle.read(SESSION_FIELDS_MEMBER)),
+                "images": images,
+                "source_pdf": bundle.read(SOURCE_PDF_MEMBER) if has_source else None,
+            }
+
+    @staticmethod
+    def read_manifest(path: str) -> Optional[Dict[str, Any]]:
+        """매니페스트만 읽습니다 (목록 표시용). 읽을 수 없는 파일이면 None."""
+        try:
+            with zipfile.ZipFile(path) as bundle:
+                manifest = json.loads(bundle.read(MANIFEST_MEMBER))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+        manifest["path"] = path
+        manifest["file_size_bytes"] = os.path.getsize(path)
+        return manifest
+
+    def list_manifests(self) -> List[Dict[str, Any]]:
+        """저장된 번들의 매니페스트 목록 (최근 생성 순)."""
+        manifests = [
+            self.read_manifest(os.path.join(self.base_dir, name))
+            for name in os.listdir(self.base_dir) if name.endswith(BUNDLE_SUFFIX)
+        ]
+        return sorted((m for m in manifests if m), key=lambda m: m.get("created_at", ""), reverse=True)
+
+    def fingerprint(self) -> str:
+        """번들 디렉토리 지문 (파일명, 크기, 수정 시각). 목록 캐시의 무효화 키로 사용합니다."""
+        with os.scandir(self.base_dir) as entries:
+            return ";".join(sorted(
+                f"{entry.name}:{entry.stat().st_size}:{entry.stat().st_mtime_ns}" for entry in entries if entry.name.endswith(BUNDLE_SUFFIX)
+            ))
+
+    def import_bytes(self, data: bytes) -> str:
+        """다른 곳에서 받은 번들 파일을 검증한 뒤 저장소에 넣고 경로를 반환합니다. 형식이 맞지 않으면 ValueError."""
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as bundle:
+                manifest = json.loads(bundle.read(MANIFEST_MEMBER))
+        except (KeyError, zipfile.BadZipFile) as e:
+            raise ValueError(f"Not an analysis bundle: {e}") from e
+        if not isinstance(manifest, dict):
+            raise ValueError("Unsupported or invalid analysis bundle manifest.")
+        document_id = str(manifest.get("document_id") or "")
+        if manifest.get("format_version") != BUNDLE_FORMAT_VERSION or not document_id.isalnum():
+            raise ValueError("Unsupported or invalid analysis bundle manifest.")
+        fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path(document_id))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return self.path(document_id)
+
+def seed_render_cache(cache: RenderCache, document_id: str, images: Dict[Tuple[int, int], bytes]) -> int:
+    """번들의 페이지 이미지를 렌더링 캐시에 넣어 뷰어가 다시 렌더링하지 않게 합니다. 이미 있는 항목은 건너뛰며, 넣은 수를 반환합니다."""
+    seeded = 0
+    for (page_num, dpi), data in images.items():
+        if not cache.contains(document_id, page_num, dpi):
+            cache.put(document_id, page_num, dpi, data)
+            seeded += 1
+    return seeded
+
+def benchmark_analysis_bundle(n_pages: int = 40, seed: int = 0) -> Dict[str, float]:
+    """
+    합성 특허 PDF 하나로 번들 기록(이미지 렌더링 포함)과 다시 열기(번들 읽기 + 빈 렌더링 캐시 채우기) 시간을 측정하고,
+    다시 연 뒤 뷰어 첫 페이지를 캐시에서 읽는 시간과 PDF에서 새로 렌더링하는 시간을 비교합니다.
+    """
+    import fitz  # PyMuPDF
+    from page_render import render_pdf_page_jpeg
+    from schema_descriptions import SCHEMA_FIELD_DESCRIPTIONS
+    from upload_pipeline import make_benchmark_pdf_bytes
+
+    pdf_bytes = make_benchmark_pdf_bytes(n_pages, seed=seed)
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        page_texts = [page.get_text("text") for page in doc]
+    structured_data = {
+        "patent_info": {"publication_number": "EP 0 000 000 A1", "title": "Synthetic positive electrode active material", "applicants": ["Example Corp."]},
+        "representative_performance_data_from_examples_or_figures": [
+            {"metric_name": "Discharge capacity", "value": f"{110 + index % 40}", "unit": "mAh/g"} for index in range(200)
+        ],
+        "document_summary_for_user": "합성 요약 " * 40,
+    }
+    document_id = f"bench{seed:011d}"
+    results: Dict[str, float] = {"pages": float(n_pages)}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = AnalysisBundleStore(os.path.join(tmp_dir, "bundles"))
+        started = time.perf_counter()
+        images = render_bundle_images(pdf_bytes, document_id, len(page_texts), RenderCache(os.path.join(tmp_dir, "cache_write")))
+        results["render_images_seconds"] = time.perf_counter() - started
+        path_index = build_path_index(structured_data, SCHEMA_FIELD_DESCRIPTIONS.keys())
+        manifest = store.write(document_id, "bench.pdf", page_texts, structured_data, path_index, images=images, source_pdf=pdf_bytes)
+        results["write_seconds"] = manifest["timings"]["bundle_write_seconds"]
+        results["bundle_mb"] = os.path.getsize(store.path(document_id)) / 1024 / 1024
+        results["images"] = float(len(images))
+
+        reopen_cache = RenderCache(os.path.join(tmp_dir, "cache_reopen"))
+        started = time.perf_counter()
+        bundle = store.read(store.path(document_id))
+        results["read_ms"] = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        seed_render_cache(reopen_cache, document_id, bundle["images"])
+        results["seed_ms"] = (time.perf_counter() - started) * 1000
+        results["reopen_ms"] = results["read_ms"] + results["seed_ms"]
+
+        started = time.perf_counter()
+        reopen_cache.get(document_id, 0, AppConfig.DEFAULT_DPI_PDF_PREVIEW)
+        results["first_page_cached_ms"] = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        render_pdf_page_jpeg(bundle["source_pdf"], 0, AppConfig.DEFAULT_DPI_PDF_PREVIEW)
+        results["first_page_render_ms"] = (time.perf_counter() - started) * 1000
+    return results
@@ -0,0 +1,206 @@
+# app_config.py
+# 앱(streamlit_test2.py)과 배치 CLI(batch_cli.py)가 함께 사용하는 전역 설정 및 상수
+
+class AppConfig:
+    # 사용할 Gemini 모델 이름
+    GEMINI_MODEL_NAME = "gemini-2.5-flash-preview-05-20" # 혹은 "gemini-1.5-pro-latest" 등 사용 가능한 최신 모델
+    # 모델의 창의성/일관성 조절 (0.0은 가장 일관성 있는 답변)
+    TEMPERATURE = 0.0
+    # LLM API 요청 타임아웃 시간 (초 단위, 예: 20분)
+    API_REQUEST_TIMEOUT_STRUCTURED_DATA = 1200
+    # PDF 페이지 이미지 뷰어용 DPI (해상도)
+    DEFAULT_DPI_PDF_PREVIEW = 150
+    # 분석 결과 저장소 디렉토리 (문서별 페이지 텍스트 + 추출 결과 + 스키마 섹션 버전)
+    RESULT_STORE_DIR = "analysis_store"
+    # 모델별 토큰 단가 (USD / 1M 토큰, (입력, 출력)). 비용 추정용이며 실제 청구 금액과 다를 수 있음
+    MODEL_PRICING_PER_1M_TOKENS = {
+        "gemini-2.5-flash-preview-05-20": (0.15, 0.60),
+        "gemini-2.5-pro-preview-05-06": (1.25, 10.00),
+        "gemini-1.5-pro-latest": (1.25, 5.00),
+    }
+
+    # --- 모델 캐스케이드 (섹션별 모델 라우팅) ---
+    # 캐스케이드 사용 여부 기본값 (사이드바에서 변경 가능)
+    USE_MODEL_CASCADE = False
+    # 등급별 모델 이름: 저가 모델을 먼저 쓰고, 검증 실패/저신뢰 섹션만 고성능 모델로 승급
+    CASCADE_MODEL_NAMES = {
+        "cheap": GEMINI_MODEL_NAME,
+        "strong": "gemini-2.5-pro-preview-05-06",
+    }
+    # 섹션 그룹별 라우팅 표: 그룹 이름 -> (스키마 섹션 목록, 시도할 모델 등급 순서)
+    # 한 그룹은 한 번의 LLM 호출로 추출됩니다.
+    SECTION_MODEL_ROUTES = {
+        "bibliographic_and_summary": (
+            ["patent_info", "application_details", "key_claimed_advantages_or_problems_solved_by_invention",
+             "document_summary_for_user", "language_of_document", "source_file_name"],
+            ["cheap"],
+        ),
+        "material_and_morphology": (
+            ["material_description", "morphology_structure", "physical_chemical_properties_specific"],
+            ["cheap", "strong"],
+        ),
+        "preparation_and_performance": (
+            ["preparation_method_summary", "representative_performance_data_from_examples_or_figures"],
+            ["cheap", "strong"],
+        ),
+    }
+    # 동시에 실행할 섹션 그룹 호출 수
+    CASCADE_MAX_WORKERS = 3
+    # 섹션 내 값이 비어 있는 리프 필드 비율이 이 값을 넘으면 저신뢰로 보고 승급
+    CASCADE_MAX_EMPTY_FIELD_RATIO = 0.7
+
+    # --- 쿼터 (공유 API 키의 요청/토큰 한도) ---
+    # 동시에 진행 중인 LLM 호출 수 상한 (전체 / 세션별)
+    QUOTA_MAX_INFLIGHT_CALLS_GLOBAL = 8
+    QUOTA_MAX_INFLIGHT_CALLS_PER_SESSION = 3
+    # 최근 60초 동안 사용(예약 포함)할 수 있는 토큰 수 상한 (전체 / 세션별)
+    QUOTA_MAX_TOKENS_PER_MINUTE_GLOBAL = 2_000_000
+    QUOTA_MAX_TOKENS_PER_MINUTE_PER_SESSION = 600_000
+    # 한도 초과 시 대기열에서 기다릴 최대 시간 (초). 초과하면 호출을 포기하고 오류를 반환
+    QUOTA_QUEUE_TIMEOUT_SECONDS = 600
+    # 대시보드에 보관할 최근 오류 이벤트(429, 타임아웃) 수
+    QUOTA_RECENT_EVENTS_LIMIT = 50
+
+    # --- 결과 탭 렌더링 ---
+    # 영역별(전체 스크립트/각 탭 프래그먼트) 재실행 지연 기록 보관 개수
+    RENDER_TIMING_HISTORY = 20
+    # PDF 뷰어: 페이지 이미지 JPEG 품질, 먼저 보여줄 저해상도 미리보기(썸네일 겸용) DPI
+    PDF_VIEWER_JPEG_QUALITY = 85
+    PDF_VIEWER_PREVIEW_DPI = 30
+    # 페이지 이동용 썸네일 줄에 표시할 페이지 수, 현재 페이지를 그린 뒤 고해상도로 미리 렌더링해 둘 다음 페이지 수
+    PDF_VIEWER_THUMBNAIL_COUNT = 8
+    PDF_VIEWER_PREFETCH_PAGES = 1
+    # 페이지 이미지 디스크 캐시 (세션/재시작 간 공유): 디렉토리, 용량 상한 (MB), 상한 초과 시 줄일 목표 비율
+    RENDER_CACHE_DIR = "render_cache"
+    RENDER_CACHE_MAX_MB = 512
+    RENDER_CACHE_EVICT_TARGET_RATIO = 0.9
+
+    # --- PDF 텍스트 추출 ---
+    # 표를 PyMuPDF 표 탐지로 찾아 TSV 블록으로 프롬프트에 넣을지 여부 (False면 기존 sort=True 평문)
+    USE_TABLE_EXTRACTION = True
+    # 프롬프트에 넣기 전 반복 머리말/꼬리말 제거, 레이아웃 공백 정리, 짧은 페이지 표식 사용 여부 (앱과 백필 공용)
+    USE_TEXT_COMPACTION = True
+
+    # --- 표 형식 내보내기 (Parquet/CSV) ---
+    # 표별로 버퍼에 모았다가 파일에 기록하는 행 수 (Parquet row group 크기). 메모리 사용량 상한을 정함
+    EXPORT_CHUNK_ROWS = 5000
+
+    # --- 재개 가능한 배치 실행 (batch_cli.py run) ---
+    # 문서별 최대 시도 횟수 (실행을 다시 시작해도 저널의 실패 횟수가 이어짐)
+    BATCH_MAX_ATTEMPTS = 4
+    # 실패 후 재시도 대기 시간: 기본값 * 2^(실패 횟수-1), 상한 (초)
+    BATCH_RETRY_BACKOFF_SECONDS = 30
+    BATCH_RETRY_BACKOFF_MAX_SECONDS = 600
+    # 처리 속도(ETA) 계산에 사용할 최근 완료 건수
+    BATCH_THROUGHPUT_WINDOW = 50
+
+    # --- 대용량 PDF 모드 ---
+    # 이 크기(MB) 이상의 업로드는 기본으로 대용량 모드(디스크 spool + 페이지 범위 + 지연 추출)로 처리
+    LARGE_PDF_THRESHOLD_MB = 50
+    # 업로드를 내려 받을 디렉토리와 청크 크기, 오래된 파일 정리 기준 (시간)
+    LARGE_PDF_SPOOL_DIR = "large_pdf_spool"
+    LARGE_PDF_SPOOL_CHUNK_BYTES = 8 * 1024 * 1024
+    LARGE_PDF_SPOOL_MAX_AGE_HOURS = 24
+    # 추출 중 프로세스 RSS 상한 (MB). 넘으면 MuPDF 캐시를 비우고, 그래도 넘으면 추출 중단
+    LARGE_PDF_MEMORY_CEILING_MB = 1500
+    # 자동 페이지 선택 시 본문 페이지로 인정할 최소 텍스트 길이 (도면/텍스트 없는 스캔 페이지 제외)
+    LARGE_PDF_MIN_TEXT_CHARS = 200
+
+    # --- 감시 폴더 수집 서비스 (batch_cli.py ingest) ---
+    # 동시에 분석할 파일 수 (작업 스레드 수), 폴더 스캔 간격 (초)
+    INGEST_WORKERS = 4
+    INGEST_POLL_SECONDS = 30
+    # 수정된 지 이 시간(초)이 지나지 않은 파일은 아직 복사 중으로 보고 다음 스캔으로 미룸
+    INGEST_SETTLE_SECONDS = 10
+    # 처리 지연/처리 시간 분위수 계산에 사용할 최근 완료 건수
+    INGEST_METRICS_WINDOW = 200
+
+    # --- 여러 파일 업로드 (파싱/LLM 호출 파이프라인) ---
+    # 동시에 실행할 LLM 호출 수 (세션 쿼터와 함께 적용됨)
+    MULTI_UPLOAD_LLM_CONCURRENCY = 3
+    # LLM 작업 풀이 가득 찬 상태에서 미리 파싱해 둘 문서 수 (파싱 결과가 메모리에 쌓이는 상한)
+    MULTI_UPLOAD_PARSE_AHEAD = 1
+    # 진행 표 갱신 간격 (초)
+    MULTI_UPLOAD_UPDATE_SECONDS = 0.5
+
+    # --- 프로파일링 (cProfile + tracemalloc) ---
+    # 디버그 출력 기본 디렉토리 (프로파일 보고서는 <DEBUG_OUTPUT_BASE_DIR>/<PDF 이름>/profiles/에 저장)
+    DEBUG_OUTPUT_BASE_DIR = "debug_output"
+    # 이 환경 변수가 1/true/yes이면 사이드바의 프로파일링 토글이 기본으로 켜짐
+    PROFILING_ENV_VAR = "PATENT_APP_PROFILE"
+    # 요약/보고서에 표시할 상위 함수·할당 위치 수, tracemalloc이 기록할 호출 스택 깊이
+    PROFILE_TOP_N = 15
+    PROFILE_TRACEMALLOC_FRAMES = 10
+
+    # --- 실패 결과의 큰 문자열 (LLM 원본 응답, 파싱 시도한 JSON, traceback) ---
+    # 세션 상태 대신 저장할 디스크 디렉토리 (내용 SHA-256 주소, gzip 압축)와 옮길 필드
+    ERROR_ARTIFACT_DIR = "error_artifacts"
+    ERROR_ARTIFACT_FIELDS = ("raw_response", "extracted_json_to_parse", "traceback")
+    # 결과 딕셔너리에 남길 미리보기 길이, 전체 불러오기 시 화면에 표시할 최대 길이 (나머지는 다운로드), gzip 압축 수준
+    ERROR_ARTIFACT_PREVIEW_CHARS = 500
+    ERROR_ARTIFACT_DISPLAY_CHARS = 20000
+    ERROR_ARTIFACT_COMPRESS_LEVEL = 6
+
+    # --- 빠른 분석 (요약 + 청구항) ---
+    # 빠른 분석 LLM 호출 제한 시간 (초). 전체 추출(API_REQUEST_TIMEOUT_STRUCTURED_DATA)보다 훨씬 짧게 둠
+    QUICK_ANALYSIS_TIMEOUT = 60
+    # 요약(57)/Abstract 제목을 찾을 앞 페이지 수, 요약/청구항 구간 최대 길이 (문자)
+    QUICK_ABSTRACT_SEARCH_PAGES = 3
+    QUICK_ABSTRACT_MAX_CHARS = 4000
+    QUICK_CLAIMS_MAX_CHARS = 16000
+    # 빠른 분석 화면의 '전체 분석' 지연 비교에 사용할 최근 전체 분석 기록 수 (프로세스 전체)
+    FULL_ANALYSIS_LATENCY_HISTORY = 20
+
+    # --- Map-reduce 추출 (모델 컨텍스트보다 큰 문서) ---
+    # 프롬프트 텍스트의 추정 토큰이 이 값을 넘으면 한 번에 보내지 않고 페이지 창으로 나누어 추출
+    MAP_REDUCE_TRIGGER_TOKENS = 400_000
+    # 창 하나의 페이지 텍스트 추정 토큰 상한, 이웃 창과 겹치는 페이지 수 (페이지에 걸친 문단/표 보존)
+    MAP_REDUCE_WINDOW_TOKENS = 120_000
+    MAP_REDUCE_OVERLAP_PAGES = 1
+    # 동시에 추출할 창 수 (세션 쿼터와 함께 적용됨)
+    MAP_REDUCE_MAX_WORKERS = 4
+
+    # --- 스키마 프롬프트 접두부 캐시 (제공자 측 context caching) ---
+    # 사용 여부와 백엔드 ("gemini": 실제 Gemini 캐시, "simulated": 로컬 시뮬레이터로 캐시 토큰만 계산)
+    USE_PROMPT_CACHE = True
+    PROMPT_CACHE_BACKEND = "gemini"
+    # 캐시 TTL (초). 남은 TTL이 REFRESH_MARGIN보다 짧을 때 사용되면 TTL을 다시 연장 (사용 중에는 유지, 쓰지 않으면 만료)
+    PROMPT_CACHE_TTL_SECONDS = 3600
+    PROMPT_CACHE_REFRESH_MARGIN_SECONDS = 1800
+    # 이보다 짧은 접두부(추정 토큰)는 캐시하지 않음 (제공자 최소 캐시 크기), 동시에 유지할 캐시 수 (모델/접두부 버전별)
+    PROMPT_CACHE_MIN_TOKENS = 1024
+    PROMPT_CACHE_MAX_HANDLES = 4
+    # 캐시 생성에 실패하면 이 시간(초) 동안 캐시 없이 호출
+    PROMPT_CACHE_RETRY_SECONDS = 300
+    # 캐시 적중 입력 토큰의 단가 비율 (일반 입력 단가 대비), 캐시 저장 비용 (USD / 1M 토큰 / 시간)
+    CACHED_INPUT_PRICE_RATIO = 0.25
+    PROMPT_CACHE_STORAGE_USD_PER_1M_TOKEN_HOUR = 1.0
+    # 대시보드에 보관할 최근 캐시 요청/이벤트 수
+    PROMPT_CACHE_EVENT_HISTORY = 50
+
+    # --- 유사 특허 검색 (TF-IDF) ---
+    # 결과 화면 옆 유사 특허 패널 표시 여부와 표시할 문서 수
+    USE_SIMILAR_PATENTS = True
+    SIMILAR_PATENTS_TOP_K = 5
+    # 문서당 본문 용어 수 상한 (빈도 상위), 주요 추출 필드/조성 원소 용어에 더하는 가중치
+    SIMILAR_MAX_TERMS_PER_DOCUMENT = 256
+    SIMILAR_FIELD_WEIGHT = 3.0
+    # 검색에 사용할 쿼리 용어 수 (tf-idf 상위). 문서가 MIN_DOCUMENTS건 이상이면 이 비율보다 많은 문서에 나오는 용어는 검색에서 제외
+    SIMILAR_QUERY_MAX_TERMS = 64
+    SIMILAR_MAX_DF_RATIO = 0.5
+    SIMILAR_MAX_DF_MIN_DOCUMENTS = 1000
+    # 새 문서를 주 행렬에 병합하기 전까지 쌓아 두는 대기 행 수
+    SIMILAR_PENDING_MERGE_ROWS = 512
+    # 인덱스 파일 (RESULT_STORE_DIR 안), 이 수 이상의 문서가 바뀌었을 때만 파일을 다시 기록
+    SIMILAR_INDEX_FILENAME = "similarity_index.npz"
+    SIMILAR_INDEX_SAVE_MIN_CHANGES = 50
+
+    # --- 분석 번들 (지난 분석 결과 다시 열기) ---
+    # 분석이 끝날 때 번들을 기록할지 여부와 번들 디렉토리 (문서 ID별 ZIP 한 파일)
+    USE_ANALYSIS_BUNDLES = True
+    ANALYSIS_BUNDLE_DIR = "analysis_bundles"
+    # 원본 PDF를 번들에 함께 넣는 최대 크기 (MB). 더 크면 뷰어는 번들의 썸네일로만 표시
+    BUNDLE_EMBED_SOURCE_MAX_MB = 200
+    # 썸네일(미리보기 DPI)을 넣을 앞쪽 페이지 수, 뷰어 해상도 이미지를 넣을 앞쪽 페이지 수 (다시 열 때 첫 화면을 렌더링 없이 표시)
+    BUNDLE_THUMBNAIL_MAX_PAGES = 300
+    BUNDLE_FULL_RES_PAGES = 1
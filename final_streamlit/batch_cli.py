@@ -0,0 +1,609 @@
+# batch_cli.py
+# 저장된 분석 결과를 대상으로 하는 배치 작업용 명령줄 도구
+# 사용 예: python batch_cli.py backfill --dry-run
+import argparse
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Optional
+
+import fitz  # PyMuPDF
+import numpy as np
+from dotenv import load_dotenv
+
+from app_config import AppConfig
+from result_store import ResultStore
+from schema_versioning import BackfillReport, run_backfill
+from element_index import ElementIndex, benchmark_element_queries
+from batch_runner import RunJournal, RunProgress, collect_pdf_paths, run_batch, summarize_run
+from export import EXPORT_FORMATS, export_records
+from ingest_daemon import INGEST_JOURNAL_FILENAME, INGEST_METRICS_FILENAME, IngestDaemon, read_ingest_metrics
+from quota import QuotaLimitedModel, get_quota_manager
+from page_render import benchmark_page_render, warm_render_cache
+from render_cache import RenderCache
+from upload_pipeline import benchmark_pipelined_analysis
+from error_artifacts import benchmark_error_spill
+from quick_analysis import benchmark_quick_analysis
+from map_reduce import benchmark_map_reduce
+from prompt_cache import benchmark_prompt_cache
+from analysis_bundle import AnalysisBundleStore, benchmark_analysis_bundle
+from similar_patents import SimilarityIndex, benchmark_similarity_index, display_term, document_terms, load_index
+from large_pdf import MemoryCeilingError, benchmark_large_pdf, extract_large_pdf, parse_page_ranges
+from text_compaction import benchmark_compaction, compact_page_texts
+from unit_normalization import benchmark_normalization, build_normalized_table
+
+
+def _print_backfill_progress(report: BackfillReport, document_id: str) -> None:
+    print(
+        f"[{report.processed}/{report.stale_documents}] {document_id[:12]} "
+        f"성공 {report.succeeded} / 실패 {report.failed} | "
+        f"토큰 in {report.input_tokens:,} out {report.output_tokens:,} | "
+        f"비용 ${report.cost_usd:.4f} | 경과 {report.elapsed_seconds:.1f}s"
+    )
+
+def cmd_backfill(args: argparse.Namespace) -> int:
+    """스키마 섹션 변경분만 재추출하여 저장된 결과에 병합합니다."""
+    store = ResultStore(args.store_dir)
+    model = None
+    if not args.dry_run:
+        google_api_key = os.getenv("GOOGLE_API_KEY")
+        if not google_api_key:
+            print("오류: GOOGLE_API_KEY 환경변수가 설정되지 않았습니다.", file=sys.stderr)
+            return 1
+        from llm_utils import create_chat_model
+        model = create_chat_model(args.model, google_api_key)
+
+    report = run_backfill(store, model, args.model, progress_callback=_print_backfill_progress,
+                          limit=args.limit, dry_run=args.dry_run)
+    print(
+        f"전체 문서 {report.total_documents}건 중 재추출 대상 {report.stale_documents}건, "
+        f"처리 {report.processed}건 (성공 {report.succeeded}, 실패 {report.failed}), "
+        f"재추출 섹션 {report.sections_reextracted}개, 추정 비용 ${report.cost_usd:.4f}"
+    )
+    for err in report.errors:
+        print(f"  실패: {err['document_id'][:12]} - {err['error']}", file=sys.stderr)
+    return 1 if report.failed else 0
+
+def cmd_normalize(args: argparse.Namespace) -> int:
+    """저장된 결과의 수치 필드를 기준 단위로 정규화하여 NumPy 열(.npz)로 저장합니다."""
+    if args.benchmark:
+        stats = benchmark_normalization(args.benchmark)
+        print(
+            f"{int(stats['records']):,}건 (고유 문자열 {int(stats['distinct_strings']):,}개): "
+            f"cold {stats['cold_seconds']:.2f}s ({stats['records_per_second_cold']:,.0f}건/s), "
+            f"warm {stats['warm_seconds']:.2f}s, 파싱 성공 비율 {stats['parsed_ratio']:.1%}"
+        )
+        return 0
+
+    store = ResultStore(args.store_dir)
+    started = time.perf_counter()
+    columns = build_normalized_table(store.iter_records())
+    elapsed = time.perf_counter() - started
+    output_path = args.output or os.path.join(args.store_dir, "normalized_properties.npz")
+    np.savez_compressed(output_path, **columns)
+    row_count = len(columns["value_text"])
+    parsed_count = int((~np.isnan(columns["min"]) | ~np.isnan(columns["max"])).sum())
+    print(f"값 {row_count:,}건 정규화 (수치 파싱 {parsed_count:,}건), {elapsed:.2f}s -> {output_path}")
+    return 0
+
+def cmd_elements(args: argparse.Namespace) -> int:
+    """화학식 원소 비트셋 인덱스를 만들거나 읽어 조성 검색을 실행합니다."""
+    if args.benchmark:
+        stats = benchmark_element_queries(args.benchmark)
+        print(f"문서 {int(stats.pop('documents')):,}건, 인덱스 생성 {stats.pop('build_seconds'):.2f}s")
+        for name, value in stats.items():
+            if name.endswith("_ms"):
+                print(f"  {name[:-3]}: {value:.3f} ms ({int(stats[name[:-3] + '_matches']):,}건)")
+        return 0
+
+    index_path = args.index or os.path.join(args.store_dir, "element_index.npz")
+    if args.rebuild or not os.path.exists(index_path):
+        started = time.perf_counter()
+        index = ElementIndex.from_records(ResultStore(args.store_dir).iter_records())
+        index.save(index_path)
+        print(f"원소 인덱스 생성: 문서 {len(index):,}건, {time.perf_counter() - started:.2f}s -> {index_path}")
+    else:
+        index = ElementIndex.load(index_path)
+    if not (args.include or args.exclude):
+        return 0
+
+    started = time.perf_counter()
+    try:
+        matches = index.query(args.include, args.exclude, include_explicit_only=args.explicit_only)
+    except ValueError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
+    print(f"일치 {len(matches):,}건 / 전체 {len(index):,}건 ({(time.perf_counter() - started) * 1000:.2f} ms)")
+    for document_id in matches[:args.show]:
+        print(f"  {document_id}")
+    return 0
+
+def cmd_similar(args: argparse.Namespace) -> int:
+    """유사 특허 TF-IDF 인덱스를 저장소와 동기화(또는 새로 생성)하고, 저장된 문서나 텍스트와 비슷한 문서를 찾습니다."""
+    if args.benchmark:
+        stats = benchmark_similarity_index(args.benchmark, k=args.top_k)
+        print(f"문서 {int(stats['documents']):,}건 (용어 {int(stats['vocabulary_size']):,}개, 항목 {int(stats['nonzeros']):,}개, 행렬 {stats['matrix_mb']:.0f} MB)")
+        print(f"  인덱스 생성 {stats['build_seconds']:.2f}s ({stats['documents'] / stats['build_seconds']:,.0f} 문서/s), 합성 데이터 준비 {stats['generate_seconds']:.2f}s")
+        print(f"  상위 {args.top_k}개 검색: 평균 {stats['query_mean_ms']:.2f} ms, p95 {stats['query_p95_ms']:.2f} ms, 최대 {stats['query_max_ms']:.2f} ms")
+        print(f"  증분 추가 {stats['insert_ms']:.2f} ms/문서, 대기 행 포함 검색 {stats['query_with_pending_ms']:.2f} ms, 병합 {stats['merge_seconds']:.2f}s")
+        print(f"  용어 추출 (합성 특허 40페이지) {stats['terms_per_40_pages_ms']:.1f} ms")
+        return 0
+
+    store = ResultStore(args.store_dir)
+    index_path = args.index or os.path.join(args.store_dir, AppConfig.SIMILAR_INDEX_FILENAME)
+    index = SimilarityIndex() if args.rebuild else load_index(index_path)
+    started = time.perf_counter()
+    changed = index.sync(store)
+    if changed or args.rebuild:
+        index.save(index_path)
+    print(f"유사 특허 인덱스: 문서 {len(index):,}건 (반영 {changed:,}건, {time.perf_counter() - started:.2f}s) -> {index_path}")
+
+    if args.document_id:
+        record = store.load(args.document_id)
+        if record is None:
+            print(f"오류: 저장된 문서가 없습니다: {args.document_id}", file=sys.stderr)
+            return 1
+        terms = document_terms(record.get("page_texts") or [], record.get("structured_data"))
+    elif args.text:
+        terms = document_terms([args.text])
+    else:
+        return 0
+    started = time.perf_counter()
+    results = index.query(terms, args.top_k, exclude_ids=[args.document_id] if args.document_id else [])
+    print(f"유사 문서 {len(results)}건 ({(time.perf_counter() - started) * 1000:.2f} ms)")
+    for result in results:
+        print(f"  {result['score']:.3f}  {result['document_id'][:16]}  {result['publication_number'] or '-'}  {result['title'] or result['source_file_name']}")
+        print(f"         공통 핵심어: {', '.join(display_term(term) for term in result['shared_terms'])}")
+    return 0
+
+def cmd_bundle(args: argparse.Namespace) -> int:
+    """분석 번들 목록을 출력하거나, 번들 하나의 내용을 확인하거나(읽기 시간 포함), 합성 PDF로 기록/다시 열기 속도를 측정합니다."""
+    if args.benchmark:
+        stats = benchmark_analysis_bundle(args.benchmark)
+        print(f"합성 {int(stats['pages']):,}페이지: 번들 {stats['bundle_mb']:.2f} MB (이미지 {int(stats['images'])}장)")
+        print(f"  기록: 이미지 렌더링 {stats['render_images_seconds']:.2f}s + 번들 쓰기 {stats['write_seconds']:.2f}s")
+        print(f"  다시 열기: 읽기 {stats['read_ms']:.1f} ms + 렌더링 캐시 채우기 {stats['seed_ms']:.1f} ms = {stats['reopen_ms']:.1f} ms (LLM 호출 없음)")
+        print(f"  뷰어 첫 페이지: 캐시 {stats['first_page_cached_ms']:.2f} ms (새로 렌더링 {stats['first_page_render_ms']:.1f} ms)")
+        return 0
+
+    store = AnalysisBundleStore(args.bundle_dir)
+    if args.inspect:
+        started = time.perf_counter()
+        try:
+            bundle = store.read(args.inspect)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"오류: 번들을 읽을 수 없습니다: {e}", file=sys.stderr)
+            return 1
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        manifest = bundle["manifest"]
+        print(f"{manifest['source']['file_name']} ({manifest['document_id'][:16]}) · {manifest['created_at']} · {manifest.get('analysis_mode', '-')}")
+        print(f"  페이지 {manifest['page_count']:,} · 채워진 스키마 경로 {manifest['filled_paths']:,} · 이미지 {len(bundle['images'])}장 · "
+              f"원본 PDF {'포함' if bundle['source_pdf'] is not None else '미포함'} · 읽기 {elapsed_ms:.1f} ms")
+        print("  소요 시간: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in manifest["timings"].items()))
+        return 0
+
+    manifests = store.list_manifests()
+    print(f"분석 번들 {len(manifests):,}건 ({args.bundle_dir})")
+    for manifest in manifests:
+        label = manifest.get("label") or {}
+        print(f"  {manifest['created_at']}  {manifest['file_size_bytes'] / 1024 / 1024:6.1f} MB  {manifest['page_count']:4d}p  "
+              f"{label.get('publication_number') or '-'}  {manifest['source']['file_name']}  -> {manifest['path']}")
+    return 0
+
+def _print_compaction_stats(label: str, stats: Dict[str, Any]) -> None:
+    print(
+        f"{label}: {stats['pages']:,}페이지, 반복 패턴 {stats['repeated_line_patterns']}개, 줄 {stats['removed_lines']:,}개 제거 | "
+        f"문자 {stats['original_chars']:,} -> {stats['compacted_chars']:,} | "
+        f"추정 토큰 {stats['original_tokens_estimate']:,} -> {stats['compacted_tokens_estimate']:,} "
+        f"({stats['token_reduction_pct']:.1f}% 절감) | {stats['seconds'] * 1000:.0f} ms"
+    )
+
+def cmd_compact(args: argparse.Namespace) -> int:
+    """저장된 문서(또는 합성 페이지)에 머리말/꼬리말/공백 압축을 적용했을 때의 절감량과 처리 시간을 측정합니다."""
+    if args.benchmark:
+        _print_compaction_stats(f"합성 {args.benchmark:,}페이지", benchmark_compaction(args.benchmark))
+        return 0
+    totals = {"documents": 0, "original_tokens_estimate": 0, "compacted_tokens_estimate": 0, "seconds": 0.0}
+    for record in ResultStore(args.store_dir).iter_records():
+        _, _, stats = compact_page_texts(record.get("page_texts", []), record.get("selected_pages"))
+        if args.verbose:
+            _print_compaction_stats(f"{record['document_id'][:12]} ({record.get('source_file_name', '')})", stats)
+        totals["documents"] += 1
+        for key in ("original_tokens_estimate", "compacted_tokens_estimate", "seconds"):
+            totals[key] += stats[key]
+    saved = totals["original_tokens_estimate"] - totals["compacted_tokens_estimate"]
+    ratio = saved / totals["original_tokens_estimate"] * 100 if totals["original_tokens_estimate"] else 0.0
+    print(
+        f"문서 {totals['documents']:,}건: 추정 토큰 {totals['original_tokens_estimate']:,} -> {totals['compacted_tokens_estimate']:,} "
+        f"({saved:,}개, {ratio:.1f}% 절감), 처리 시간 합계 {totals['seconds']:.2f}s"
+    )
+    return 0
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """저장된 결과 전체를 기본 표(patents)와 리스트 필드별 하위 표로 펼쳐 Parquet/CSV 파일로 스트리밍 저장합니다."""
+    output_dir = args.output or os.path.join(args.store_dir, "export")
+    try:
+        report = export_records(ResultStore(args.store_dir).iter_records(), output_dir,
+                                formats=args.formats, chunk_rows=args.chunk_rows)
+    except (RuntimeError, ValueError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
+    print(f"문서 {report['documents']:,}건 내보내기 완료 ({report['seconds']:.2f}s, 최대 버퍼 {report['max_buffered_rows']:,}행) -> {output_dir}")
+    for name, count in report["rows"].items():
+        print(f"  {name}: {count:,}행")
+    return 0
+
+def _format_run_progress(progress: RunProgress) -> str:
+    eta = f"{progress.eta_seconds / 60:.1f}분" if progress.eta_seconds is not None else "-"
+    return (
+        f"완료 {progress.done}/{progress.total} · 실패 {progress.failed} (포기 {progress.exhausted}) · 남음 {progress.remaining} | "
+        f"{progress.items_per_hour:,.0f}건/시간, ETA {eta} | 비용 ${progress.cost_usd:.4f}"
+    )
+
+def _create_model(args: argparse.Namespace) -> Optional[Any]:
+    """
+    --fake-llm이면 가짜 모델, 아니면 args.model로 Gemini 모델을 만듭니다 (스키마 접두부 캐시를 켰으면 캐시 래퍼로 감쌈).
+    API 키가 없으면 오류를 출력하고 None을 반환합니다.
+    """
+    if args.fake_llm:
+        from fake_llm import FakeChatModel, requested_sections_responder
+        return FakeChatModel(requested_sections_responder(), model_name="fake-model")
+    google_api_key = os.getenv("GOOGLE_API_KEY")
+    if not google_api_key:
+        print("오류: GOOGLE_API_KEY 환경변수가 설정되지 않았습니다.", file=sys.stderr)
+        return None
+    from llm_utils import create_chat_model
+    from prompt_cache import PromptCachedModel, get_prompt_cache_manager
+    model = create_chat_model(args.model, google_api_key)
+    manager = get_prompt_cache_manager(google_api_key) if AppConfig.USE_PROMPT_CACHE else None
+    return PromptCachedModel(model, manager, args.model) if manager is not None else model
+
+def cmd_run(args: argparse.Namespace) -> int:
+    """PDF 파일/디렉토리를 일괄 분석하여 저장소에 기록합니다. 저널로 완료 문서를 건너뛰고 실패 문서를 백오프 후 재시도합니다."""
+    items = collect_pdf_paths(args.inputs)
+    if not items:
+        print("오류: 분석할 PDF가 없습니다.", file=sys.stderr)
+        return 1
+    model = _create_model(args)
+    if model is None:
+        return 1
+
+    journal = RunJournal(args.journal or os.path.join(args.store_dir, "batch_journal.ndjson"))
+    initial = summarize_run(journal, items)
+    print(
+        f"대상 {initial.total}건 중 완료 {initial.done}건은 건너뜀, 이전 실패 {initial.failed - initial.exhausted}건 재시도 대상"
+        f"{'' if args.retry_exhausted else f' (최대 시도 횟수 도달 {initial.exhausted}건 제외)'} (저널: {journal.path})"
+    )
+
+    def _on_progress(progress: RunProgress, item: str, error) -> None:
+        status = f"실패: {error}" if error else "완료"
+        print(f"{os.path.basename(item)} {status} | {_format_run_progress(progress)}", file=sys.stderr if error else sys.stdout)
+
+    progress = run_batch(items, journal, model, args.model, ResultStore(args.store_dir),
+                         progress_callback=_on_progress, retry_exhausted=args.retry_exhausted)
+    print(_format_run_progress(progress))
+    for err in progress.errors:
+        print(f"  실패 ({err['attempts']}회): {err['item']} - {err['error']}", file=sys.stderr)
+    return 1 if progress.failed else 0
+
+def cmd_run_status(args: argparse.Namespace) -> int:
+    """실행 중이거나 중단된 배치의 진행 상황을 저널에서 요약합니다."""
+    journal = RunJournal(args.journal or os.path.join(args.store_dir, "batch_journal.ndjson"))
+    items = collect_pdf_paths(args.inputs) if args.inputs else None
+    progress = summarize_run(journal, items)
+    print(_format_run_progress(progress))
+    for err in progress.errors[:args.show]:
+        print(f"  실패 ({err['attempts']}회): {err['item']} - {err['error']}")
+    return 0
+
+def cmd_large_pdf(args: argparse.Namespace) -> int:
+    """대용량 PDF를 파일 경로에서 열어 선택한 페이지만 추출하고 페이지 선택과 최대 RSS를 출력합니다."""
+    if args.benchmark:
+        stats = benchmark_large_pdf(args.benchmark, memory_ceiling_mb=args.memory_ceiling_mb)
+        print(f"합성 PDF {stats['pages']:,}페이지 ({stats['file_mb']:,.0f} MB)")
+        for mode in ("in_memory", "streaming"):
+            result = stats[mode]
+            print(f"  {mode}: {result['pages_extracted']:,}페이지 추출, {result['seconds']:.1f}s, "
+                  f"최대 RSS {result['peak_rss_mb']:,.0f} MB (시작 {result['baseline_rss_mb']:,.0f} MB)")
+        return 0
+    if not args.path:
+        print("오류: PDF 경로 또는 --benchmark가 필요합니다.", file=sys.stderr)
+        return 1
+    try:
+        page_numbers = None
+        if args.pages:
+            with fitz.open(args.path) as doc:
+                page_numbers = parse_page_ranges(args.pages, len(doc))
+        page_texts, info = extract_large_pdf(args.path, page_numbers, memory_ceiling_mb=args.memory_ceiling_mb)
+    except (MemoryCeilingError, ValueError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
+    metrics = info["metrics"]
+    print(
+        f"전체 {metrics['total_document_pages']:,}페이지 중 {metrics['pages']:,}페이지 추출 ({metrics['total_seconds']:.1f}s), "
+        f"추정 토큰 {metrics['tokens_estimate']:,}, 최대 RSS {metrics['peak_rss_mb']:,.0f} MB / 상한 {metrics['memory_ceiling_mb']:,.0f} MB"
+    )
+    if metrics["page_selection"]:
+        print(f"  자동 선택: {metrics['page_selection']}")
+    print(f"  선택 페이지: {metrics['selected_pages']}")
+    return 0
+
+def cmd_viewer_benchmark(args: argparse.Namespace) -> int:
+    """PDF 뷰어 페이지 렌더링 경로별 페이지당 시간을 비교합니다 (기존 PNG 왕복, 고해상도 직접 JPEG, 저해상도 첫 화면)."""
+    try:
+        stats = benchmark_page_render(args.path, max_pages=args.pages)
+    except Exception as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
+    print(f"{stats['pages']}페이지 렌더링 (고해상도 {AppConfig.DEFAULT_DPI_PDF_PREVIEW} DPI, 미리보기 {AppConfig.PDF_VIEWER_PREVIEW_DPI} DPI)")
+    for mode in ("legacy_png", "direct_jpeg", "first_paint"):
+        result = stats[mode]
+        print(f"  {mode}: 평균 {result['mean_ms']:.1f} ms, 최대 {result['max_ms']:.1f} ms, 평균 {result['mean_kb']:,.0f} KB")
+    return 0
+
+def cmd_render_cache(args: argparse.Namespace) -> int:
+    """페이지 이미지 디스크 캐시를 PDF로 미리 채우거나(--warm, 작업 프로세스 병렬) 비우고, 사용량과 적중률을 출력합니다."""
+    cache = RenderCache(args.cache_dir)
+    if args.clear:
+        print(f"캐시 파일 {cache.clear():,}개 삭제")
+    if args.warm:
+        pdf_paths = collect_pdf_paths(args.warm)
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [executor.submit(warm_render_cache, path, args.cache_dir, args.pages) for path in pdf_paths]
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"  실패: {e}", file=sys.stderr)
+                    continue
+                cache.hits += result["cached"]
+                cache.misses += result["rendered"]
+                print(f"  {os.path.basename(result['path'])}: {result['pages']:,}페이지, 렌더링 {result['rendered']:,} / 캐시 적중 {result['cached']:,} ({result['seconds']:.1f}s)")
+    stats = cache.stats()
+    print(
+        f"디스크 캐시 {args.cache_dir}: {stats['files']:,}개 파일, {stats['bytes'] / (1024 * 1024):,.1f} / {stats['max_bytes'] / (1024 * 1024):,.0f} MB"
+        + (f", 적중률 {stats['hit_rate']:.0%} (적중 {stats['hits']:,} / 미스 {stats['misses']:,})" if stats["hits"] or stats["misses"] else "")
+    )
+    return 0
+
+def _format_ingest_metrics(metrics: Dict[str, Any]) -> str:
+    return (
+        f"백로그 {metrics['backlog_depth']} · 처리 중 {metrics['in_flight']}/{metrics['workers']} · 완료 {metrics['processed']} · "
+        f"실패 {metrics['failed']} (재시도 대기 {metrics['retry_pending']}, 포기 {metrics['gave_up']}) · 기존 문서 건너뜀 {metrics['skipped_existing']} | "
+        f"가장 오래 기다린 파일 {metrics['oldest_waiting_age_seconds']:.0f}s, "
+        f"처리 지연 p50 {metrics['lag_seconds_p50']:.0f}s / p95 {metrics['lag_seconds_p95']:.0f}s, "
+        f"파일별 처리 p50 {metrics['latency_seconds_p50']:.1f}s / p95 {metrics['latency_seconds_p95']:.1f}s"
+    )
+
+def cmd_ingest(args: argparse.Namespace) -> int:
+    """감시 폴더를 주기적으로 스캔하여 새 PDF를 작업 풀에서 분석하고 저장소에 기록합니다 (SIGINT/SIGTERM으로 종료)."""
+    if not os.path.isdir(args.watch_dir):
+        print(f"오류: 감시 폴더가 없습니다: {args.watch_dir}", file=sys.stderr)
+        return 1
+    model = _create_model(args)
+    if model is None:
+        return 1
+    # 작업 스레드들이 같은 API 쿼터를 나눠 쓰도록 앱과 같은 쿼터 관리자로 감쌈
+    model = QuotaLimitedModel(model, get_quota_manager(), session_id="ingest")
+    journal = RunJournal(args.journal or os.path.join(args.store_dir, INGEST_JOURNAL_FILENAME))
+    metrics_path = args.metrics or os.path.join(args.store_dir, INGEST_METRICS_FILENAME)
+    daemon = IngestDaemon(args.watch_dir, ResultStore(args.store_dir), model, args.model, journal,
+                          workers=args.workers, metrics_path=metrics_path, log=print)
+    stop_event = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda signum, frame: stop_event.set())
+    print(f"감시 시작: {args.watch_dir} (작업 {args.workers}개, 스캔 간격 {args.poll_seconds}s, 지표: {metrics_path})")
+    metrics = daemon.run(stop_event, poll_seconds=args.poll_seconds, once=args.once)
+    print(_format_ingest_metrics(metrics))
+    return 0
+
+def cmd_ingest_status(args: argparse.Namespace) -> int:
+    """실행 중인 수집 서비스의 지표 파일을 읽어 출력합니다."""
+    metrics_path = args.metrics or os.path.join(args.store_dir, INGEST_METRICS_FILENAME)
+    metrics = read_ingest_metrics(metrics_path)
+    if metrics is None:
+        print(f"오류: 지표 파일이 없습니다: {metrics_path}", file=sys.stderr)
+        return 1
+    print(f"{metrics['watch_dir']} (갱신 {time.time() - metrics['updated_at']:.0f}s 전, 가동 {metrics['uptime_seconds'] / 3600:.1f}시간)")
+    print(_format_ingest_metrics(metrics))
+    return 0
+
+def cmd_upload_benchmark(args: argparse.Namespace) -> int:
+    """가짜 LLM으로 여러 파일 분석을 순차 처리와 파싱/LLM 파이프라인으로 각각 실행하여 경과 시간을 비교합니다."""
+    stats = benchmark_pipelined_analysis(args.files, llm_latency_seconds=args.llm_latency, llm_concurrency=args.concurrency)
+    print(f"합성 PDF {stats['files']}건, LLM 지연 {stats['llm_latency_seconds']:.1f}s, LLM 동시 호출 {stats['llm_concurrency']}")
+    print(f"  순차 처리: {stats['sequential_seconds']:.1f}s")
+    print(f"  파이프라인: {stats['pipelined_seconds']:.1f}s ({stats['speedup']:.1f}배, 실패 {stats['failed']}건)")
+    return 0
+
+def cmd_error_benchmark(args: argparse.Namespace) -> int:
+    """파싱에 실패한 큰 LLM 응답이 세션에 남기는 메모리를, 결과 딕셔너리에 그대로 둘 때와 디스크 저장소로 옮겼을 때 비교합니다."""
+    stats = benchmark_error_spill(args.response_mb)
+    print(f"실패 응답 {stats['response_chars']:,}자")
+    print(f"  세션 유지 메모리 (결과 + JSON 다운로드 문자열): 그대로 {stats['inline_session_bytes'] / (1024 * 1024):,.1f} MB -> "
+          f"저장소 참조 {stats['spilled_session_bytes'] / 1024:,.1f} KB")
+    print(f"  디스크 (gzip) {stats['stored_bytes'] / 1024:,.1f} KB, 저장 {stats['spill_seconds'] * 1000:.0f} ms, 전체 불러오기 {stats['lazy_load_seconds'] * 1000:.0f} ms")
+    return 0
+
+def cmd_quick_benchmark(args: argparse.Namespace) -> int:
+    """가짜 LLM으로 같은 합성 특허를 전체 분석, 빠른 분석(요약 + 청구항), 빠른 분석 후 업그레이드로 실행하여 입력 토큰과 LLM 시간을 비교합니다."""
+    stats = benchmark_quick_analysis(args.pages, latency_seconds=args.llm_latency, latency_per_1k_input_tokens=args.latency_per_1k)
+    print(f"합성 특허 {stats['pages']}페이지 (요약/청구항 {'탐지' if stats['located'] else '미탐지, 앞/뒤 페이지로 대체'})")
+    print(f"  전체 분석: 입력 {stats['full']['input_tokens']:,} 토큰, {stats['full']['seconds']:.1f}s")
+    print(f"  빠른 분석: 입력 {stats['quick']['input_tokens']:,} 토큰, {stats['quick']['seconds']:.1f}s "
+          f"(구간 탐지 {stats['quick']['locate_seconds'] * 1000:.1f} ms, 전체 대비 {stats['quick']['seconds'] / stats['full']['seconds']:.0%})")
+    print(f"  업그레이드: 입력 {stats['upgrade']['input_tokens']:,} 토큰, {stats['upgrade']['seconds']:.1f}s "
+          f"(재사용 섹션: {', '.join(stats['upgrade']['reused_sections']) or '없음'})")
+    return 0
+
+def cmd_map_reduce_benchmark(args: argparse.Namespace) -> int:
+    """컨텍스트 창을 넘는 합성 장문 특허를 가짜 LLM으로 한 번에 추출할 때와 map-reduce로 추출할 때의 처리량과 완전성을 비교합니다."""
+    stats = benchmark_map_reduce(args.pages, context_tokens=args.context_tokens, window_tokens=args.window_tokens,
+                                 latency_seconds=args.llm_latency, latency_per_1k_input_tokens=args.latency_per_1k, max_workers=args.workers)
+    print(f"합성 특허 {stats['pages']}페이지, 실시예 {stats['examples']}개, 프롬프트 추정 {stats['prompt_tokens_estimate']:,} 토큰 "
+          f"(가짜 모델 컨텍스트 {stats['context_tokens']:,} 토큰)")
+    for label, key in (("한 번에 추출", "single_shot"), ("map-reduce", "map_reduce")):
+        mode = stats[key]
+        print(f"  {label}: {mode['seconds']:.1f}s ({mode['pages_per_second']:.1f} 페이지/s), 입력 {mode['input_tokens']:,} 토큰, "
+              f"실시예 완전성 {mode['completeness']:.0%}")
+    map_reduce = stats["map_reduce"]
+    print(f"  map-reduce 창 {map_reduce['windows']}개, 병합 {map_reduce['merge_seconds'] * 1000:.1f} ms, "
+          f"중복 제거 {sum(map_reduce['duplicates_removed'].values())}건, 스칼라 충돌 {map_reduce['conflict_count']}건")
+    return 0
+
+def cmd_prompt_cache_benchmark(args: argparse.Namespace) -> int:
+    """로컬 시뮬레이터로 스키마 접두부 캐시의 요청별 캐시 적중 토큰/절감액과 TTL 연장, 저장 비용을 계산합니다 (API 호출 없음)."""
+    stats = benchmark_prompt_cache(args.requests, document_tokens=args.document_tokens, request_interval_seconds=args.interval)
+    print(f"{stats['model_name']}: 요청 {len(stats['requests'])}건, {args.interval:.0f}초 간격 (가상 시계), 중간에 스키마 변경 1회")
+    for index, request in enumerate(stats["requests"]):
+        print(f"  #{index + 1:>3} 입력 {request['input_tokens']:>8,} 토큰, 캐시 적중 {request['cached_input_tokens']:>6,} 토큰, "
+              f"절감 ${request['saved_usd']:.6f}  {request['cache_name'] or '-'}")
+    totals = stats["totals"]
+    print(f"  입력 비용 (캐시 없음) ${stats['uncached_input_usd']:.4f}, 절감 ${totals['saved_usd']:.4f}, 저장 비용 ${totals['storage_usd']:.4f}, "
+          f"순 절감 ${totals['net_saved_usd']:.4f}")
+    print(f"  캐시 생성 {totals['created']}회, TTL 연장 {totals['extended']}회, 삭제 {totals['deleted']}회")
+    return 0
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="특허 분석 결과 배치 작업 도구")
+    parser.add_argument("--store-dir", default=AppConfig.RESULT_STORE_DIR, help="분석 결과 저장소 디렉토리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backfill_parser = subparsers.add_parser("backfill", help="변경된 스키마 섹션만 재추출")
+    backfill_parser.add_argument("--model", default=AppConfig.GEMINI_MODEL_NAME, help="재추출에 사용할 모델 이름")
+    backfill_parser.add_argument("--limit", type=int, default=None, help="처리할 최대 문서 수")
+    backfill_parser.add_argument("--dry-run", action="store_true", help="재추출 대상만 집계하고 LLM은 호출하지 않음")
+    backfill_parser.set_defaults(func=cmd_backfill)
+
+    normalize_parser = subparsers.add_parser("normalize", help="수치 필드를 기준 단위로 정규화하여 .npz로 저장")
+    normalize_parser.add_argument("--output", default=None, help="출력 .npz 경로 (기본: 저장소 디렉토리/normalized_properties.npz)")
+    normalize_parser.add_argument("--benchmark", type=int, default=0, metavar="N", help="저장소 대신 합성 데이터 N건으로 정규화 속도만 측정")
+    normalize_parser.set_defaults(func=cmd_normalize)
+
+    elements_parser = subparsers.add_parser("elements", help="화학식 원소 인덱스 생성 및 조성 검색")
+    elements_parser.add_argument("--index", default=None, help="인덱스 .npz 경로 (기본: 저장소 디렉토리/element_index.npz)")
+    elements_parser.add_argument("--rebuild", action="store_true", help="저장소에서 인덱스를 다시 생성")
+    elements_parser.add_argument("--include", nargs="*", default=[], metavar="EL", help="모두 포함해야 하는 원소 (예: Na Mn Ti)")
+    elements_parser.add_argument("--exclude", nargs="*", default=[], metavar="EL", help="포함되면 안 되는 원소 (예: Co)")
+    elements_parser.add_argument("--explicit-only", action="store_true", help="포함 원소를 화학식에 명시된 원소로만 판정")
+    elements_parser.add_argument("--show", type=int, default=20, help="출력할 최대 문서 ID 수")
+    elements_parser.add_argument("--benchmark", type=int, default=0, metavar="N", help="합성 문서 N건으로 검색 속도만 측정")
+    elements_parser.set_defaults(func=cmd_elements)
+
+    similar_parser = subparsers.add_parser("similar", help="유사 특허 TF-IDF 인덱스 동기화 및 유사 문서 검색")
+    similar_parser.add_argument("--index", default=None, help=f"인덱스 .npz 경로 (기본: 저장소 디렉토리/{AppConfig.SIMILAR_INDEX_FILENAME})")
+    similar_parser.add_argument("--rebuild", action="store_true", help="저장소에서 인덱스를 처음부터 다시 생성")
+    similar_parser.add_argument("--document-id", default=None, help="이 저장 문서와 비슷한 문서 검색")
+    similar_parser.add_argument("--text", default=None, help="이 텍스트와 비슷한 문서 검색")
+    similar_parser.add_argument("--top-k", type=int, default=AppConfig.SIMILAR_PATENTS_TOP_K, help="출력할 문서 수")
+    similar_parser.add_argument("--benchmark", type=int, default=0, metavar="N", help="합성 문서 N건으로 인덱스 생성/검색/증분 추가 속도만 측정")
+    similar_parser.set_defaults(func=cmd_similar)
+
+    bundle_parser = subparsers.add_parser("bundle", help="분석 번들 목록/내용 확인, 기록/다시 열기 속도 측정")
+    bundle_parser.add_argument("--bundle-dir", default=AppConfig.ANALYSIS_BUNDLE_DIR, help="분석 번들 디렉토리")
+    bundle_parser.add_argument("--inspect", default=None, metavar="PATH", help="이 번들 파일을 읽어 내용 요약 출력")
+    bundle_parser.add_argument("--benchmark", type=int, default=0, metavar="PAGES", help="합성 PDF(PAGES페이지)로 번들 기록/다시 열기 속도만 측정")
+    bundle_parser.set_defaults(func=cmd_bundle)
+
+    compact_parser = subparsers.add_parser("compact", help="프롬프트 텍스트 압축(머리말/꼬리말/공백) 절감량 측정")
+    compact_parser.add_argument("--verbose", action="store_true", help="문서별 통계 출력")
+    compact_parser.add_argument("--benchmark", type=int, default=0, metavar="PAGES", help="저장소 대신 합성 페이지 PAGES개로 측정")
+    compact_parser.set_defaults(func=cmd_compact)
+
+    export_parser = subparsers.add_parser("export", help="저장된 결과를 정규화된 표(Parquet/CSV)로 내보내기")
+    export_parser.add_argument("--output", default=None, help="출력 디렉토리 (기본: 저장소 디렉토리/export)")
+    export_parser.add_argument("--formats", nargs="+", choices=EXPORT_FORMATS, default=list(EXPORT_FORMATS), help="출력 형식")
+    export_parser.add_argument("--chunk-rows", type=int, default=AppConfig.EXPORT_CHUNK_ROWS, help="파일에 한 번에 기록할 표별 행 수")
+    export_parser.set_defaults(func=cmd_export)
+
+    run_parser = subparsers.add_parser("run", help="PDF 일괄 분석 (저널 기반 재개/재시도)")
+    run_parser.add_argument("inputs", nargs="+", help="PDF 파일 또는 디렉토리 (하위 디렉토리 포함)")
+    run_parser.add_argument("--model", default=AppConfig.GEMINI_MODEL_NAME, help="추출에 사용할 모델 이름")
+    run_parser.add_argument("--journal", default=None, help="NDJSON 저널 경로 (기본: 저장소 디렉토리/batch_journal.ndjson)")
+    run_parser.add_argument("--retry-exhausted", action="store_true", help="최대 시도 횟수에 도달한 문서도 다시 시도")
+    run_parser.add_argument("--fake-llm", action="store_true", help="API 대신 가짜 모델로 실행 (오프라인 점검/측정용)")
+    run_parser.set_defaults(func=cmd_run)
+
+    run_status_parser = subparsers.add_parser("run-status", help="배치 실행 진행 상황 (완료/실패/남음, ETA)")
+    run_status_parser.add_argument("inputs", nargs="*", help="전체 대상 PDF 파일/디렉토리 (생략하면 저널에 기록된 항목만 집계)")
+    run_status_parser.add_argument("--journal", default=None, help="NDJSON 저널 경로 (기본: 저장소 디렉토리/batch_journal.ndjson)")
+    run_status_parser.add_argument("--show", type=int, default=20, help="출력할 최대 실패 항목 수")
+    run_status_parser.set_defaults(func=cmd_run_status)
+
+    large_pdf_parser = subparsers.add_parser("large-pdf", help="대용량 PDF 페이지 선택/지연 추출 및 메모리 측정")
+    large_pdf_parser.add_argument("path", nargs="?", default=None, help="PDF 경로")
+    large_pdf_parser.add_argument("--pages", default=None, help="페이지 범위 (예: '1-5, 40-'). 생략하면 첫 페이지 + 설명/청구항 자동 선택")
+    large_pdf_parser.add_argument("--memory-ceiling-mb", type=float, default=AppConfig.LARGE_PDF_MEMORY_CEILING_MB, help="RSS 상한 (MB)")
+    large_pdf_parser.add_argument("--benchmark", type=int, default=0, metavar="PAGES", help="합성 PDF PAGES페이지로 기존 방식과 최대 RSS 비교")
+    large_pdf_parser.set_defaults(func=cmd_large_pdf)
+
+    viewer_parser = subparsers.add_parser("viewer-bench", help="PDF 뷰어 페이지 렌더링 시간 측정 (첫 화면/고해상도)")
+    viewer_parser.add_argument("path", help="PDF 경로")
+    viewer_parser.add_argument("--pages", type=int, default=20, help="측정할 앞쪽 페이지 수")
+    viewer_parser.set_defaults(func=cmd_viewer_benchmark)
+
+    render_cache_parser = subparsers.add_parser("render-cache", help="페이지 이미지 디스크 캐시 미리 채우기/비우기/사용량")
+    render_cache_parser.add_argument("--cache-dir", default=AppConfig.RENDER_CACHE_DIR, help="캐시 디렉토리")
+    render_cache_parser.add_argument("--warm", nargs="+", default=None, metavar="PDF", help="미리 렌더링할 PDF 파일 또는 디렉토리")
+    render_cache_parser.add_argument("--pages", type=int, default=None, help="문서별로 미리 렌더링할 앞쪽 페이지 수 (기본: 전체)")
+    render_cache_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="작업 프로세스 수")
+    render_cache_parser.add_argument("--clear", action="store_true", help="캐시를 모두 비움")
+    render_cache_parser.set_defaults(func=cmd_render_cache)
+
+    ingest_parser = subparsers.add_parser("ingest", help="감시 폴더의 새 PDF를 자동으로 분석하는 수집 서비스")
+    ingest_parser.add_argument("watch_dir", help="감시할 디렉토리 (하위 디렉토리 포함)")
+    ingest_parser.add_argument("--model", default=AppConfig.GEMINI_MODEL_NAME, help="추출에 사용할 모델 이름")
+    ingest_parser.add_argument("--workers", type=int, default=AppConfig.INGEST_WORKERS, help="동시에 분석할 파일 수")
+    ingest_parser.add_argument("--poll-seconds", type=float, default=AppConfig.INGEST_POLL_SECONDS, help="폴더 스캔 간격 (초)")
+    ingest_parser.add_argument("--journal", default=None, help="저널 파일 경로 (기본: <store-dir>/ingest_journal.ndjson)")
+    ingest_parser.add_argument("--metrics", default=None, help="지표 파일 경로 (기본: <store-dir>/ingest_metrics.stat)")
+    ingest_parser.add_argument("--once", action="store_true", help="현재 폴더의 파일을 모두 처리한 뒤 종료")
+    ingest_parser.add_argument("--fake-llm", action="store_true", help="API 호출 없이 가짜 모델로 실행 (파이프라인 점검용)")
+    ingest_parser.set_defaults(func=cmd_ingest)
+
+    ingest_status_parser = subparsers.add_parser("ingest-status", help="수집 서비스 지표 (백로그, 처리 지연, 처리 시간)")
+    ingest_status_parser.add_argument("--metrics", default=None, help="지표 파일 경로 (기본: <store-dir>/ingest_metrics.stat)")
+    ingest_status_parser.set_defaults(func=cmd_ingest_status)
+
+    upload_bench_parser = subparsers.add_parser("upload-bench", help="여러 파일 분석: 순차 처리 대 파싱/LLM 파이프라인 경과 시간 비교 (가짜 LLM)")
+    upload_bench_parser.add_argument("--files", type=int, default=10, help="합성 PDF 수")
+    upload_bench_parser.add_argument("--llm-latency", type=float, default=2.0, help="가짜 LLM 호출 지연 (초)")
+    upload_bench_parser.add_argument("--concurrency", type=int, default=AppConfig.MULTI_UPLOAD_LLM_CONCURRENCY, help="LLM 동시 호출 수")
+    upload_bench_parser.set_defaults(func=cmd_upload_benchmark)
+
+    error_bench_parser = subparsers.add_parser("error-bench", help="실패 결과의 원본 응답/traceback: 세션 유지 메모리 대 디스크 저장소 비교")
+    error_bench_parser.add_argument("--response-mb", type=float, default=4.0, help="합성 실패 응답 크기 (MB)")
+    error_bench_parser.set_defaults(func=cmd_error_benchmark)
+
+    quick_bench_parser = subparsers.add_parser("quick-bench", help="빠른 분석(요약 + 청구항) 대 전체 분석: 입력 토큰/LLM 시간 비교 (가짜 LLM)")
+    quick_bench_parser.add_argument("--pages", type=int, default=40, help="합성 특허 페이지 수")
+    quick_bench_parser.add_argument("--llm-latency", type=float, default=0.5, help="가짜 LLM 호출당 고정 지연 (초)")
+    quick_bench_parser.add_argument("--latency-per-1k", type=float, default=0.3, help="가짜 LLM 입력 토큰 1,000개당 추가 지연 (초)")
+    quick_bench_parser.set_defaults(func=cmd_quick_benchmark)
+
+    map_reduce_bench_parser = subparsers.add_parser("map-reduce-bench", help="컨텍스트를 넘는 문서: 한 번에 추출 대 map-reduce 처리량/완전성 비교 (가짜 LLM)")
+    map_reduce_bench_parser.add_argument("--pages", type=int, default=300, help="합성 특허 페이지 수")
+    map_reduce_bench_parser.add_argument("--context-tokens", type=int, default=60_000, help="가짜 모델 컨텍스트 창 (넘는 입력은 뒷부분이 누락됨)")
+    map_reduce_bench_parser.add_argument("--window-tokens", type=int, default=20_000, help="map-reduce 창 하나의 토큰 상한")
+    map_reduce_bench_parser.add_argument("--llm-latency", type=float, default=0.5, help="가짜 LLM 호출당 고정 지연 (초)")
+    map_reduce_bench_parser.add_argument("--latency-per-1k", type=float, default=0.05, help="가짜 LLM 입력 토큰 1,000개당 추가 지연 (초)")
+    map_reduce_bench_parser.add_argument("--workers", type=int, default=AppConfig.MAP_REDUCE_MAX_WORKERS, help="동시에 추출할 창 수")
+    map_reduce_bench_parser.set_defaults(func=cmd_map_reduce_benchmark)
+
+    prompt_cache_bench_parser = subparsers.add_parser("prompt-cache-bench", help="스키마 접두부 캐시: 요청별 캐시 적중 토큰/절감액, TTL 연장, 저장 비용 (로컬 시뮬레이터)")
+    prompt_cache_bench_parser.add_argument("--requests", type=int, default=20, help="요청 수")
+    prompt_cache_bench_parser.add_argument("--document-tokens", type=int, default=20_000, help="요청당 문서 텍스트 토큰 수")
+    prompt_cache_bench_parser.add_argument("--interval", type=float, default=60, help="요청 간격 (초, 가상 시계)")
+    prompt_cache_bench_parser.set_defaults(func=cmd_prompt_cache_benchmark)
+    return parser
+
+def main(argv=None) -> int:
+    load_dotenv()
+    args = build_arg_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
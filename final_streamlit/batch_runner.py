@@ -0,0 +1,319 @@
+# batch_runner.py
+# 여러 PDF를 Streamlit 없이 일괄 분석하는 재개 가능한 배치 실행기
+# 문서마다 완료/실패를 NDJSON 저널에 한 줄씩 기록하고 즉시 fsync하므로, 쿼터 소진/타임아웃/OOM으로 중단되어도
+# 다시 실행하면 완료된 문서는 건너뛰고 실패한 문서만 백오프 후 재시도합니다.
+import json
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import fitz  # PyMuPDF
+
+from app_config import AppConfig
+from bibliographic_parser import merge_with_llm_patent_info, parse_front_page
+from map_reduce import run_map_reduce_extraction, should_use_map_reduce
+from pdf_tables import extract_pages_with_tables, merge_table_performance_data
+from prompts import PATENT_DATA_SCHEMA_SECTIONS
+from result_store import ResultStore, compute_file_document_id
+from schema_versioning import compute_schema_versions, extract_sections
+from text_compaction import build_prompt_text
+
+PERFORMANCE_DATA_KEY = "representative_performance_data_from_examples_or_figures"
+
+
+@dataclass
+class PreparedDocument:
+    """LLM 호출 전 단계(텍스트/표 추출, 프롬프트 압축, 규칙 기반 서지 정보)의 결과. 파싱과 LLM 호출을 나눠 파이프라인으로 돌릴 때 사용합니다."""
+    document_id: str
+    source_file_name: str
+    page_texts: List[str]
+    full_text: str
+    text_metrics: Dict[str, Any]
+    performance_data: List[Dict[str, Any]]
+    rule_based_info: Dict[str, Any]
+    parse_seconds: float = 0.0
+
+def prepare_document(doc: Any, document_id: str, source_file_name: str) -> PreparedDocument:
+    """열린 PDF에서 앱과 같은 LLM 전 단계(표 추출 -> 프롬프트 압축 -> 규칙 기반 서지 정보)를 수행합니다. 텍스트가 없으면 RuntimeError."""
+    started = time.perf_counter()
+    page_texts, extraction_info = extract_pages_with_tables(doc, detect_tables=AppConfig.USE_TABLE_EXTRACTION)
+    full_text, _, compaction_stats = build_prompt_text(page_texts)
+    if not full_text.strip():
+        raise RuntimeError("Failed to extract text from PDF.")
+    text_metrics = extraction_info["metrics"]
+    text_metrics["compaction"] = compaction_stats
+    return PreparedDocument(
+        document_id=document_id,
+        source_file_name=source_file_name,
+        page_texts=page_texts,
+        full_text=full_text,
+        text_metrics=text_metrics,
+        performance_data=extraction_info["performance_data"],
+        rule_based_info=parse_front_page(page_texts[0]) if page_texts else {},
+        parse_seconds=time.perf_counter() - started,
+    )
+
+def extract_prepared_document(prepared: PreparedDocument, model: Any, model_name: str, store: ResultStore) -> Dict[str, Any]:
+    """
+    준비된 문서를 LLM으로 추출하고 규칙 기반 서지 정보/표 성능 데이터와 병합하여 저장소에 기록합니다.
+    프롬프트 텍스트가 AppConfig.MAP_REDUCE_TRIGGER_TOKENS를 넘으면 페이지 창으로 나누어 추출합니다 (map_reduce.py).
+    반환: {'document_id', 'source_file_name', 'usage', 'cost_usd', 'latency_seconds'}. 실패하면 RuntimeError를 발생시킵니다.
+    """
+    map_reduce_metrics = None
+    if should_use_map_reduce(prepared.full_text):
+        structured_data, map_reduce_metrics = run_map_reduce_extraction(
+            prepared.page_texts, model, model_name, prepared.source_file_name,
+            prefilled_patent_info=prepared.rule_based_info
+        )
+        if "error" in structured_data:
+            raise RuntimeError(f"{structured_data['error']} {structured_data['details']}")
+        stats = {
+            "usage": {
+                "input_tokens": map_reduce_metrics["input_tokens"],
+                "output_tokens": map_reduce_metrics["output_tokens"],
+                "total_tokens": map_reduce_metrics["input_tokens"] + map_reduce_metrics["output_tokens"],
+            },
+            "cost_usd": map_reduce_metrics["cost_usd"],
+            "latency_seconds": map_reduce_metrics["wall_seconds"],
+        }
+    else:
+        structured_data, stats = extract_sections(
+            model, model_name, prepared.full_text, prepared.source_file_name, list(PATENT_DATA_SCHEMA_SECTIONS),
+            prefilled_patent_info=prepared.rule_based_info
+        )
+        if stats["error"] or not structured_data:
+            raise RuntimeError(stats["error"] or "No requested sections in response.")
+
+    structured_data.setdefault("source_file_name", prepared.source_file_name)
+    crosscheck = []
+    if prepared.rule_based_info:
+        structured_data["patent_info"], crosscheck = merge_with_llm_patent_info(prepared.rule_based_info, structured_data.get("patent_info"))
+    text_metrics = prepared.text_metrics
+    if prepared.performance_data:
+        structured_data[PERFORMANCE_DATA_KEY], text_metrics["performance_rows_added_from_tables"] = merge_table_performance_data(
+            structured_data.get(PERFORMANCE_DATA_KEY), prepared.performance_data
+        )
+
+    store.save({
+        "document_id": prepared.document_id,
+        "source_file_name": prepared.source_file_name,
+        "page_texts": prepared.page_texts,
+        "structured_data": structured_data,
+        "schema_versions": compute_schema_versions(),
+        "model_name": model_name,
+        "bibliographic_crosscheck": crosscheck,
+        "text_extraction_metrics": text_metrics,
+        "map_reduce_metrics": map_reduce_metrics,
+    })
+    return {
+        "document_id": prepared.document_id,
+        "source_file_name": prepared.source_file_name,
+        "usage": stats["usage"],
+        "cost_usd": stats["cost_usd"],
+        "latency_seconds": stats["latency_seconds"],
+    }
+
+def analyze_pdf(pdf_path: str, model: Any, model_name: str, store: ResultStore) -> Dict[str, Any]:
+    """
+    PDF 한 건을 앱과 같은 단계(표 추출 -> 프롬프트 압축 -> 규칙 기반 서지 정보 -> LLM 추출 -> 병합)로 분석하여 저장소에 기록합니다.
+    반환: {'document_id', 'source_file_name', 'usage', 'cost_usd', 'latency_seconds'}. 실패하면 RuntimeError를 발생시킵니다.
+    """
+    doc = fitz.open(pdf_path) # 경로로 열어 PDF 전체를 메모리에 올리지 않음 (대용량 문서)
+    try:
+        prepared = prepare_document(doc, compute_file_document_id(pdf_path), os.path.basename(pdf_path))
+    finally:
+        doc.close()
+    return extract_prepared_document(prepared, model, model_name, store)
+
+def collect_pdf_paths(inputs: Iterable[str]) -> List[str]:
+    """파일/디렉토리 목록에서 PDF 경로를 (하위 디렉토리 포함) 정렬된 절대 경로로 모읍니다."""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                paths.update(os.path.join(root, name) for name in names if name.lower().endswith(".pdf"))
+        elif item.lower().endswith(".pdf"):
+            paths.add(item)
+    return sorted(os.path.abspath(path) for path in paths)
+
+def retry_delay_seconds(attempts: int) -> float:
+    """실패 attempts회 뒤 다음 시도까지 기다릴 시간 (지수 백오프, 상한 AppConfig.BATCH_RETRY_BACKOFF_MAX_SECONDS)."""
+    if attempts <= 0:
+        return 0.0
+    return min(AppConfig.BATCH_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1), AppConfig.BATCH_RETRY_BACKOFF_MAX_SECONDS)
+
+class RunJournal:
+    """
+    배치 실행 저널 (NDJSON, 한 줄에 이벤트 하나). 이벤트: 'done' (완료), 'failed' (시도 실패).
+    각 줄은 기록 직후 flush + fsync되며, 비정상 종료로 잘린 마지막 줄은 읽을 때 무시합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self.path, "ab+") as f:
+            # 이전 실행이 줄 중간에서 끊겼으면 줄을 바꿔서, 새 이벤트가 잘린 줄에 이어 붙어 함께 버려지지 않게 함
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read_entries(self) -> List[Dict[str, Any]]:
+        """저널의 모든 이벤트를 기록 순서대로 읽습니다. 파일이 없으면 빈 목록."""
+        entries = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue # 기록 도중 중단되어 잘린 줄
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def item_states(self, entries: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        항목(PDF 경로)별 상태: {'status': 'done'|'failed', 'attempts': 실패 횟수, 'last_ts': 마지막 이벤트 시각, 'error': 마지막 오류}.
+        실패 이벤트에 시도한 문서 ID가 있으면(수집 서비스) 'document_id_attempted'에 담고, 문서 ID가 바뀌면 실패 횟수를 새로 셉니다.
+        한 번이라도 완료된 항목은 'done'입니다. entries를 주면 파일을 다시 읽지 않습니다.
+        """
+        states: Dict[str, Dict[str, Any]] = {}
+        for entry in (self.read_entries() if entries is None else entries):
+            state = states.setdefault(entry.get("item", ""), {"status": "failed", "attempts": 0, "last_ts": 0.0, "error": None})
+            state["last_ts"] = entry.get("ts", 0.0)
+            if entry.get("event") == "done":
+                state["status"] = "done"
+                state["document_id"] = entry.get("document_id")
+            elif state["status"] != "done":
+                attempted = entry.get("document_id_attempted")
+                if attempted:
+                    if state.get("document_id_attempted") not in (None, attempted):
+                        state["attempts"] = 0
+                    state["document_id_attempted"] = attempted
+                state["attempts"] += 1
+                state["error"] = entry.get("error")
+        return states
+
+@dataclass
+class RunProgress:
+    """배치 실행의 진행 상황 요약 (저널에서 언제든 다시 계산 가능)"""
+    total: int = 0
+    done: int = 0
+    failed: int = 0          # 아직 완료되지 않은, 한 번 이상 실패한 항목 수
+    exhausted: int = 0       # 그중 최대 시도 횟수에 도달하여 더 이상 재시도하지 않는 항목 수
+    remaining: int = 0       # 완료되지 않은 항목 수 (실패 포함)
+    items_per_hour: float = 0.0
+    eta_seconds: Optional[float] = None
+    cost_usd: float = 0.0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+def _build_progress(
+    items: List[str],
+    states: Dict[str, Dict[str, Any]],
+    done_times: List[float],
+    cost_usd: float
+) -> RunProgress:
+    progress = RunProgress(total=len(items), cost_usd=cost_usd)
+    for item in items:
+        state = states.get(item)
+        if state and state["status"] == "done":
+            progress.done += 1
+        elif state:
+            progress.failed += 1
+            if state["attempts"] >= AppConfig.BATCH_MAX_ATTEMPTS:
+                progress.exhausted += 1
+            progress.errors.append({"item": item, "attempts": state["attempts"], "error": state["error"]})
+    progress.remaining = progress.total - progress.done
+
+    done_times = list(done_times)[-AppConfig.BATCH_THROUGHPUT_WINDOW:]
+    if len(done_times) >= 2 and done_times[-1] > done_times[0]:
+        rate = (len(done_times) - 1) / (done_times[-1] - done_times[0])
+        progress.items_per_hour = rate * 3600
+        progress.eta_seconds = (progress.remaining - progress.exhausted) / rate
+    return progress
+
+def summarize_run(journal: RunJournal, items: Optional[List[str]] = None) -> RunProgress:
+    """
+    저널을 읽어 진행 상황을 요약합니다 (실행 중인 다른 프로세스의 저널도 읽을 수 있음). items가 없으면 저널에 기록된 항목만 대상으로 합니다.
+    처리 속도는 최근 AppConfig.BATCH_THROUGHPUT_WINDOW건의 완료 시각 간격으로 계산하며, ETA = 재시도 가능한 남은 항목 / 처리 속도입니다.
+    """
+    entries = journal.read_entries()
+    states = journal.item_states(entries)
+    done_times = [entry["ts"] for entry in entries if entry.get("event") == "done"]
+    cost_usd = sum(entry.get("cost_usd", 0.0) for entry in entries)
+    return _build_progress(list(items) if items is not None else list(states), states, done_times, cost_usd)
+
+def run_batch(
+    items: List[str],
+    journal: RunJournal,
+    model: Any,
+    model_name: str,
+    store: ResultStore,
+    progress_callback: Optional[Callable[[RunProgress, str, Optional[str]], None]] = None,
+    retry_exhausted: bool = False,
+    sleep: Callable[[float], None] = time.sleep,
+    analyze: Callable[[str, Any, str, ResultStore], Dict[str, Any]] = analyze_pdf
+) -> RunProgress:
+    """
+    items(PDF 경로)를 차례로 분석합니다. 저널에 완료로 기록된 항목은 건너뜁니다.
+    실패한 항목은 마지막 실패 시각으로부터 retry_delay_seconds(실패 횟수)만큼 지난 뒤 다시 시도하며,
+    실패 횟수가 AppConfig.BATCH_MAX_ATTEMPTS에 도달하면 포기합니다 (retry_exhausted=True면 횟수를 다시 셈).
+    progress_callback(진행 요약, 항목, 오류 또는 None)은 항목 처리마다 호출됩니다.
+    """
+    entries = journal.read_entries()
+    states = journal.item_states(entries)
+    done_times = deque((entry["ts"] for entry in entries if entry.get("event") == "done"), maxlen=AppConfig.BATCH_THROUGHPUT_WINDOW)
+    cost_usd = sum(entry.get("cost_usd", 0.0) for entry in entries)
+    if retry_exhausted:
+        for state in states.values():
+            state["attempts"] = 0
+    pending = [
+        item for item in items
+        if item not in states or (states[item]["status"] != "done" and states[item]["attempts"] < AppConfig.BATCH_MAX_ATTEMPTS)
+    ]
+    # 처음 시도하는 항목을 먼저 처리하고, 이전 실행에서 실패한 항목은 백오프를 기다릴 수 있도록 뒤로 보냄
+    pending.sort(key=lambda item: item in states)
+
+    while pending:
+        retry_later = []
+        for item in pending:
+            state = states.get(item)
+            if state:
+                wait_seconds = state["last_ts"] + retry_delay_seconds(state["attempts"]) - time.time()
+                if wait_seconds > 0:
+                    sleep(wait_seconds)
+            started = time.time()
+            try:
+                result = analyze(item, model, model_name, store)
+            except Exception as e:
+                now = time.time()
+                state = states.setdefault(item, {"status": "failed", "attempts": 0, "last_ts": 0.0, "error": None})
+                state.update(attempts=state["attempts"] + 1, last_ts=now, error=f"{type(e).__name__}: {e}")
+                journal.append({"event": "failed", "item": item, "attempt": state["attempts"], "error": state["error"],
+                                "elapsed_seconds": round(now - started, 3), "ts": now})
+                if state["attempts"] < AppConfig.BATCH_MAX_ATTEMPTS:
+                    retry_later.append(item)
+                error = state["error"]
+            else:
+                now = time.time()
+                journal.append({"event": "done", "item": item, "document_id": result["document_id"],
+                                "source_file_name": result["source_file_name"], "usage": result["usage"],
+                                "cost_usd": result["cost_usd"], "elapsed_seconds": round(now - started, 3), "ts": now})
+                states[item] = {"status": "done", "attempts": 0, "last_ts": now, "error": None, "document_id": result["document_id"]}
+                done_times.append(now)
+                cost_usd += result["cost_usd"]
+                error = None
+            if progress_callback:
+                progress_callback(_build_progress(items, states, done_times, cost_usd), item, error)
+        pending = sorted(retry_later, key=lambda item: states[item]["last_ts"] + retry_delay_seconds(states[item]["attempts"]))
+    return _build_progress(items, states, done_times, cost_usd)
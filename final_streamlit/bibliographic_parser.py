@@ -0,0 +1,276 @@
+# bibliographic_parser.py
+# 특허 첫 페이지의 INID 코드 블록((11), (22), (71), (72) ...)에서 서지 정보를 규칙 기반으로 추출
+# LLM 호출 전에 수 밀리초 안에 patent_info 일부를 채우고, LLM 결과는 교차 검증에만 사용합니다.
+import datetime
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# 서지 정보 필드별 INID 코드 (앞에 있는 코드가 우선)
+INID_FIELD_CODES = {
+    "publication_number": ("11", "10"),  # (10): US 특허번호, CN 공개번호
+    "publication_date": ("43", "45"),
+    "application_number": ("21",),
+    "filing_date": ("22",),
+    "priority_data": ("30",),
+    "applicants": ("71", "73"),          # (73): US 양수인(Assignee)
+    "inventors": ("72",),
+    "title_original_language": ("54",),
+}
+# 규칙 기반 파서가 채우는 patent_info 필드 (LLM에는 교차 검증용으로만 전달)
+RULE_BASED_PATENT_INFO_FIELDS = tuple(INID_FIELD_CODES.keys())
+# 레이아웃(줄바꿈, 다단)에 따라 규칙 기반 값이 틀릴 수 있는 필드: 불일치하면 LLM 값을 유지하고 교차 검증 결과로만 표시
+LLM_PREFERRED_ON_MISMATCH_FIELDS = ("applicants", "inventors", "title_original_language")
+
+# 첫 페이지에 등장하는 표준 INID 코드. 본문/요약의 참조 부호 "(10)" 등과 구분하기 위해 화이트리스트로 제한
+_KNOWN_INID_CODES = {
+    "10", "11", "12", "13", "15", "19", "21", "22", "24", "30", "43", "44", "45", "47", "48",
+    "51", "52", "54", "56", "57", "58", "60", "62", "63", "65", "71", "72", "73", "74", "75", "76",
+    "81", "84", "85", "86", "87",
+}
+_INID_MARKER_RE = re.compile(r"\((\d{2})\)")
+_ABSTRACT_CODE = "57" # 요약 이후는 본문이므로 파싱하지 않음
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_DATE_PATTERNS = (
+    # 2024.01.25 / 2024-01-25 / 2024년01월25일 / 2024年1月25日
+    (re.compile(r"(\d{4})\s*[.\-/년年]\s*(\d{1,2})\s*[.\-/월月]\s*(\d{1,2})"), ("y", "m", "d")),
+    # 25.01.2024 (EP)
+    (re.compile(r"\b(\d{1,2})\.(\d{1,2})\.(\d{4})\b"), ("d", "m", "y")),
+    # Jan. 25, 2024 (US)
+    (re.compile(r"\b([A-Z][a-z]{2})[a-z]*\.?\s+(\d{1,2}),?\s+(\d{4})\b"), ("b", "d", "y")),
+    # 25 January 2024
+    (re.compile(r"\b(\d{1,2})\s+([A-Z][a-z]{2})[a-z]*\.?\s+(\d{4})\b"), ("d", "b", "y")),
+)
+# 공개번호: 국가코드(선택) + 숫자열 + 종류 코드(선택, 예: A1, B2)
+_PUBLICATION_NUMBER_RE = re.compile(r"(?:\b[A-Z]{2}\s?)?\d(?:[\d,./-]|(?<=\d) (?=\d))*\d(?:\s?[A-Z]\d?\b)?")
+# 출원번호/우선권번호: 국가코드(선택) + 숫자열
+_APPLICATION_NUMBER_RE = re.compile(r"(?:\b[A-Z]{2}\s?)?\d(?:[\d,./-]|(?<=\d) (?=\d))*\d")
+_COUNTRY_CODE_RE = re.compile(r"\(([A-Z]{2})\)|\b([A-Z]{2})\b")
+
+_NAME_LABEL_RE = re.compile(
+    r"^(?:applicants?|inventors?|assignees?|proprietors?|출원인|발명자|특허권자|申请人|发明人|专利权人)\s*[:：]?\s*",
+    re.IGNORECASE,
+)
+_TITLE_LABEL_RE = re.compile(r"^(?:title(?: of (?:the )?invention)?|발명의\s*명칭|发明名称)\s*[:：]?\s*", re.IGNORECASE)
+_ADDRESS_PREFIX_RE = re.compile(r"^(?:address|주소|地址)\b", re.IGNORECASE)
+_ADDRESS_KEYWORD_RE = re.compile(
+    r"(?:특별시|광역시|[가-힣]+(?:시|도|구|군|읍|면|동|로|길)(?:\s|$)|省|市|区|县|号|\b(?:street|st\.|road|rd\.|avenue|ave\.|city|province|district)\b)",
+    re.IGNORECASE,
+)
+_NAME_BULLET_RE = re.compile(r"^[•·\-\*]\s*")
+# 줄바꿈으로 이름에서 떨어져 나온 법인 형태 ("Contemporary Amperex Technology Co.,\nLimited")
+_LEGAL_SUFFIX_RE = re.compile(
+    r"^(?:co\.?,?\s*)?(?:limited|ltd\.?|gmbh|inc\.?|incorporated|corp\.?|corporation|company|ag|kg|llc|plc|s\.a\.|b\.v\.|n\.v\.)(?:\W|$)",
+    re.IGNORECASE,
+)
+
+
+def split_inid_segments(front_page_text: str) -> Dict[str, str]:
+    """
+    첫 페이지 텍스트를 INID 코드 단위 구간으로 나눕니다.
+    같은 코드가 여러 번 나오면 첫 구간만 사용하며, 요약(57) 이후는 무시합니다.
+    """
+    segments: Dict[str, str] = {}
+    markers = [m for m in _INID_MARKER_RE.finditer(front_page_text) if m.group(1) in _KNOWN_INID_CODES]
+    for idx, marker in enumerate(markers):
+        code = marker.group(1)
+        if code == _ABSTRACT_CODE:
+            break
+        end = markers[idx + 1].start() if idx + 1 < len(markers) else len(front_page_text)
+        if code not in segments:
+            segments[code] = front_page_text[marker.end():end].strip()
+    return segments
+
+def normalize_date(text: str) -> Optional[str]:
+    """문자열에서 첫 번째 날짜를 찾아 'YYYY-MM-DD'로 변환합니다. 유효한 날짜가 없으면 None을 반환합니다."""
+    for pattern, order in _DATE_PATTERNS:
+        for match in pattern.finditer(text):
+            parts = dict(zip(order, match.groups()))
+            month = _MONTHS.get(parts["b"][:3].lower()) if "b" in parts else int(parts["m"])
+            if not month:
+                continue
+            try:
+                return datetime.date(int(parts["y"]), month, int(parts["d"])).isoformat()
+            except ValueError:
+                continue
+    return None
+
+def _chunks(segment: str) -> List[str]:
+    """구간 텍스트를 줄 및 2칸 이상의 공백(다단 레이아웃 경계) 기준으로 나눕니다."""
+    return [chunk.strip() for chunk in re.split(r"\n|\s{2,}", segment) if chunk.strip()]
+
+def _find_number(segment: str, pattern: re.Pattern) -> Optional[str]:
+    for chunk in _chunks(segment):
+        if normalize_date(chunk):
+            continue # 날짜 조각은 번호 후보에서 제외
+        for match in pattern.finditer(chunk):
+            candidate = match.group(0).strip()
+            if sum(ch.isdigit() for ch in candidate) >= 6:
+                return candidate
+    return None
+
+def _looks_like_address(line: str) -> bool:
+    if _ADDRESS_PREFIX_RE.match(line) or re.search(r"\d", line) or re.search(r"\([A-Z]{2}\)\s*$", line):
+        return True
+    return len(line.split()) >= 2 and bool(_ADDRESS_KEYWORD_RE.search(line))
+
+def _join_name_continuations(chunks: List[str]) -> List[str]:
+    """
+    줄바꿈으로 나뉜 이름을 다시 잇습니다: 법인 형태(Limited, GmbH 등)로 시작하는 조각, 또는 쉼표로 끝난 조각 뒤의
+    주소가 아닌 조각은 앞 조각에 붙입니다.
+    """
+    joined: List[str] = []
+    for chunk in chunks:
+        previous = joined[-1] if joined else ""
+        if previous and (
+            _LEGAL_SUFFIX_RE.match(chunk)
+            or (previous.endswith(",") and not _NAME_BULLET_RE.match(chunk) and not _looks_like_address(chunk))
+        ):
+            joined[-1] = f"{previous} {chunk}"
+        else:
+            joined.append(chunk)
+    return joined
+
+def _parse_names(segment: str) -> List[str]:
+    names: List[str] = []
+    for chunk in _join_name_continuations(_chunks(_NAME_LABEL_RE.sub("", segment))):
+        for part in chunk.split(";"):
+            name = _NAME_LABEL_RE.sub("", _NAME_BULLET_RE.sub("", part.strip())).strip(" ,")
+            if re.search(r"\([A-Z]{2}\)\s*$", name) and "," in name:
+                name = name.split(",")[0].strip() # US 형식: "이름, 도시, 주 (US)" / "이름, 도시 (GB)"
+            if name and not _looks_like_address(name) and name not in names:
+                names.append(name)
+    return names
+
+def _parse_priority(segment: str) -> List[Dict[str, Optional[str]]]:
+    priorities = []
+    for chunk in segment.split("\n"):
+        priority_date = normalize_date(chunk)
+        if not priority_date:
+            continue
+        remainder = chunk
+        for pattern, _ in _DATE_PATTERNS:
+            remainder = pattern.sub(" ", remainder)
+        number = _find_number(remainder, _APPLICATION_NUMBER_RE)
+        country_match = _COUNTRY_CODE_RE.search(remainder)
+        country = next((g for g in country_match.groups() if g), None) if country_match else None
+        if number and country and number.startswith(country):
+            number = number[len(country):].strip()
+        priorities.append({
+            "priority_number": f"{country} {number}" if number and country else number,
+            "priority_date": priority_date,
+            "priority_country": country,
+        })
+    return priorities
+
+def parse_front_page(front_page_text: str) -> Dict[str, Any]:
+    """
+    첫 페이지 텍스트에서 INID 코드 기반 서지 정보를 추출합니다.
+    확실히 찾은 필드만 포함한 patent_info 부분 딕셔너리를 반환합니다 (찾지 못한 필드는 키 자체가 없음).
+    """
+    segments = split_inid_segments(front_page_text or "")
+
+    def first_segment(field_name: str) -> Optional[str]:
+        for code in INID_FIELD_CODES[field_name]:
+            if segments.get(code):
+                return segments[code]
+        return None
+
+    patent_info: Dict[str, Any] = {}
+    for field_name, pattern in (("publication_number", _PUBLICATION_NUMBER_RE), ("application_number", _APPLICATION_NUMBER_RE)):
+        segment = first_segment(field_name)
+        value = _find_number(segment, pattern) if segment else None
+        if value:
+            patent_info[field_name] = value
+    for field_name in ("publication_date", "filing_date"):
+        segment = first_segment(field_name)
+        value = normalize_date(segment) if segment else None
+        if value:
+            patent_info[field_name] = value
+
+    priority_segment = first_segment("priority_data")
+    if priority_segment:
+        priorities = _parse_priority(priority_segment)
+        if priorities:
+            patent_info["priority_data"] = priorities
+    for field_name in ("applicants", "inventors"):
+        names = []
+        for code in INID_FIELD_CODES[field_name]:
+            names.extend(name for name in _parse_names(segments.get(code, "")) if name not in names)
+        if names:
+            patent_info[field_name] = names
+
+    title_segment = first_segment("title_original_language")
+    if title_segment:
+        title = re.sub(r"\s+", " ", _TITLE_LABEL_RE.sub("", title_segment)).strip()
+        if title:
+            patent_info["title_original_language"] = title
+    return patent_info
+
+def _normalize_for_compare(field_name: str, value: Any) -> Any:
+    """교차 검증 비교용 정규화 (표기 차이는 무시하고 실제 값만 비교)."""
+    if value is None or value == "" or value == []:
+        return None
+    if field_name in ("publication_number", "application_number"):
+        text = re.sub(r"\s?[A-Z]\d?$", "", str(value).strip()) if field_name == "publication_number" else str(value)
+        return re.sub(r"\D", "", text)
+    if field_name in ("publication_date", "filing_date"):
+        return normalize_date(str(value)) or str(value).strip()
+    if field_name in ("applicants", "inventors"):
+        items = value if isinstance(value, list) else [value]
+        # 이름 순서("LIU, Qian" / "Qian Liu")와 구두점 차이는 무시
+        return sorted(" ".join(sorted(re.findall(r"[0-9a-z가-힣一-鿿]+", str(item).lower()))) for item in items)
+    if field_name == "priority_data":
+        items = value if isinstance(value, list) else [value]
+        return sorted(
+            normalize_date(str(item.get("priority_date", ""))) or ""
+            for item in items if isinstance(item, dict)
+        )
+    return re.sub(r"\s+", " ", str(value)).strip().lower()
+
+def merge_with_llm_patent_info(
+    rule_based_info: Dict[str, Any],
+    llm_patent_info: Optional[Dict[str, Any]]
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    규칙 기반 값을 우선으로 LLM의 patent_info와 병합합니다.
+    (병합된 patent_info, 필드별 교차 검증 결과 리스트)를 반환합니다.
+    교차 검증 status: 'match' (일치), 'mismatch' (불일치), 'rule_only', 'llm_only'.
+    불일치하면 번호/날짜는 규칙 기반 값을, LLM_PREFERRED_ON_MISMATCH_FIELDS(이름, 제목)는 LLM 값을 채택하며 adopted('rule_based'/'llm')로 표시합니다.
+    """
+    merged = dict(llm_patent_info) if isinstance(llm_patent_info, dict) else {}
+    crosscheck = []
+    for field_name in RULE_BASED_PATENT_INFO_FIELDS:
+        rule_value = rule_based_info.get(field_name)
+        llm_value = merged.get(field_name)
+        rule_norm = _normalize_for_compare(field_name, rule_value)
+        llm_norm = _normalize_for_compare(field_name, llm_value)
+        if rule_norm is None and llm_norm is None:
+            continue
+        if rule_norm is None:
+            status = "llm_only"
+        elif llm_norm is None:
+            status = "rule_only"
+        else:
+            status = "match" if rule_norm == llm_norm else "mismatch"
+        adopted = "llm" if rule_norm is None or (status == "mismatch" and field_name in LLM_PREFERRED_ON_MISMATCH_FIELDS) else "rule_based"
+        if adopted == "rule_based":
+            merged[field_name] = rule_value
+        crosscheck.append({
+            "field": field_name, "status": status, "adopted": adopted, "rule_based_value": rule_value, "llm_value": llm_value,
+        })
+    return merged, crosscheck
+
+def build_prefilled_instruction(prefilled_patent_info: Optional[Dict[str, Any]]) -> str:
+    """규칙 기반으로 이미 추출한 서지 필드를 LLM이 다시 찾지 않도록 전달하는 프롬프트 지시문을 만듭니다."""
+    if not prefilled_patent_info:
+        return ""
+    return (
+        "- The following 'patent_info' fields were already extracted from the front page. Do NOT search the document for them; "
+        "copy them into 'patent_info' as given, changing a value only if the text clearly contradicts it:\n" +
+        json.dumps(prefilled_patent_info, ensure_ascii=False) + "\n"
+    )
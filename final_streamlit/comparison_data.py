@@ -0,0 +1,108 @@
+# comparison_data.py
+# 저장된 분석 결과 여러 건을 비교하기 위한 열 지향 표(pandas DataFrame) 생성
+# 문서당 한 행이며, 정규화된 수치 필드(unit_normalization)에서 비교 지표 열을 뽑아 붙입니다.
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from unit_normalization import build_normalized_table
+
+
+class ComparisonMetric(NamedTuple):
+    """비교 지표 정의: 정규화 표에서 (필드, 기준 단위, 항목명 패턴)이 맞는 값을 문서별로 집계합니다."""
+    label: str
+    field: str
+    unit: str
+    name_pattern: str  # 항목명(metric_name/type 등)에 대한 대소문자 무시 정규식. 빈 문자열이면 전체
+    aggregate: str     # 문서 내 여러 값의 집계 방법 ('max', 'min', 'median')
+
+# 열 이름 -> 비교 지표. 열 이름에 기준 단위를 포함하여 표에서 바로 알아볼 수 있게 함
+COMPARISON_METRICS: Dict[str, ComparisonMetric] = {
+    "capacity_mAh_g": ComparisonMetric(
+        "방전 용량 (mAh/g)", "representative_performance_data_from_examples_or_figures", "mAh/g", r"capacity", "max"),
+    "coulombic_efficiency_pct": ComparisonMetric(
+        "쿨롱 효율 (%)", "representative_performance_data_from_examples_or_figures", "%", r"coulombic|efficiency", "max"),
+    "capacity_retention_pct": ComparisonMetric(
+        "용량 유지율 (%)", "representative_performance_data_from_examples_or_figures", "%", r"retention", "max"),
+    "bet_m2_g": ComparisonMetric(
+        "BET 비표면적 (m2/g)", "morphology_structure.specific_surface_area_BET_m2_g", "m2/g", "", "median"),
+    "particle_size_d50_um": ComparisonMetric(
+        "입자 크기 D50/평균 (μm)", "morphology_structure.size_metrics", "um", r"d50|average|mean|median", "median"),
+    "tap_density_g_cm3": ComparisonMetric(
+        "탭 밀도 (g/cm3)", "morphology_structure.density_g_cm3", "g/cm3", r"tap", "max"),
+    "ionic_conductivity_s_cm": ComparisonMetric(
+        "이온 전도도 (S/cm)", "physical_chemical_properties_specific", "S/cm", r"conductivity", "max"),
+}
+
+# 문서 행에 붙는 기본(문자열) 열
+DOCUMENT_COLUMNS = [
+    "document_id", "source_file_name", "publication_number", "publication_date",
+    "applicants", "title", "material_system_type", "chemical_formula_general", "updated_at",
+]
+
+
+def _document_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    data = record.get("structured_data") or {}
+    patent_info = data.get("patent_info") if isinstance(data.get("patent_info"), dict) else {}
+    material = data.get("material_description") if isinstance(data.get("material_description"), dict) else {}
+    applicants = patent_info.get("applicants") or []
+    return {
+        "document_id": record.get("document_id", ""),
+        "source_file_name": record.get("source_file_name", ""),
+        "publication_number": patent_info.get("publication_number") or "",
+        "publication_date": patent_info.get("publication_date") or "",
+        "applicants": ", ".join(str(a) for a in applicants) if isinstance(applicants, list) else str(applicants),
+        "title": patent_info.get("title_english_translation") or patent_info.get("title_original_language") or "",
+        "material_system_type": material.get("material_system_type") or "",
+        "chemical_formula_general": material.get("chemical_formula_general") or "",
+        "updated_at": record.get("updated_at", ""),
+    }
+
+def build_comparison_frame(records: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    레코드들로부터 문서당 한 행인 비교 표를 만듭니다.
+    열: DOCUMENT_COLUMNS + COMPARISON_METRICS의 각 지표 (float64, 값이 없으면 NaN)
+    JSON 파싱과 문자열 정규화는 여기서 한 번만 수행되며, 이후 필터/정렬은 열 연산으로 처리합니다.
+    """
+    records = list(records)
+    documents = pd.DataFrame([_document_row(record) for record in records], columns=DOCUMENT_COLUMNS)
+    values = pd.DataFrame(build_normalized_table(records))
+    if not values.empty:
+        # 대표값이 없는 한쪽 경계값("<10", ">250")은 그 경계를 값으로 사용
+        values["value"] = values["typical"].fillna(values["min"]).fillna(values["max"])
+        values = values.dropna(subset=["value"])
+
+    for column, metric in COMPARISON_METRICS.items():
+        if values.empty:
+            documents[column] = np.nan
+            continue
+        mask = (values["field"] == metric.field) & (values["unit"] == metric.unit)
+        if metric.name_pattern:
+            mask &= values["name"].str.contains(metric.name_pattern, case=False, regex=True)
+        per_document = values.loc[mask].groupby("document_id")["value"].agg(metric.aggregate)
+        documents[column] = documents["document_id"].map(per_document).astype("float64")
+    return documents
+
+def filter_comparison_frame(
+    frame: pd.DataFrame,
+    ranges: Dict[str, tuple],
+    text_query: str = "",
+    require_values: List[str] = (),
+    row_mask: Optional[np.ndarray] = None
+) -> pd.DataFrame:
+    """
+    지표별 (최소, 최대) 범위와 텍스트 검색어로 행을 거릅니다. 모든 조건은 불리언 마스크로 한 번에 계산됩니다.
+    범위 조건이 있는 지표에서 값이 없는 문서는 require_values에 포함된 경우에만 제외됩니다.
+    row_mask는 frame과 같은 행 순서의 추가 조건입니다 (예: ElementIndex.match_mask 결과).
+    """
+    mask = np.ones(len(frame), dtype=bool) if row_mask is None else row_mask.copy()
+    for column, (low, high) in ranges.items():
+        values = frame[column].to_numpy()
+        in_range = (values >= low) & (values <= high)
+        mask &= in_range if column in require_values else (in_range | np.isnan(values))
+    if text_query:
+        haystack = (frame["title"] + " " + frame["applicants"] + " " + frame["chemical_formula_general"] + " "
+                    + frame["publication_number"] + " " + frame["source_file_name"])
+        mask &= haystack.str.contains(text_query, case=False, regex=False).to_numpy()
+    return frame.loc[mask]
@@ -0,0 +1,381 @@
+# element_index.py
+# 화학식(material_description.chemical_formula_general)과 formula_parameters[].elements_involved를
+# 원소 집합 + 원소별 화학량론 범위로 파싱하고, 문서별 128비트 원소 비트셋 인덱스로 조성 검색
+# ("Na와 Mn 포함, Co 제외, Ti 도핑")을 밀리초 단위로 처리하기 위한 모듈
+import random
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+
+# 원자 번호 순서의 원소 기호. 비트 위치 = 원자 번호 - 1 (118개 -> uint64 2워드)
+ELEMENT_SYMBOLS = (
+    "H He Li Be B C N O F Ne Na Mg Al Si P S Cl Ar K Ca Sc Ti V Cr Mn Fe Co Ni Cu Zn Ga Ge As Se Br Kr "
+    "Rb Sr Y Zr Nb Mo Tc Ru Rh Pd Ag Cd In Sn Sb Te I Xe Cs Ba La Ce Pr Nd Pm Sm Eu Gd Tb Dy Ho Er Tm Yb Lu "
+    "Hf Ta W Re Os Ir Pt Au Hg Tl Pb Bi Po At Rn Fr Ra Ac Th Pa U Np Pu Am Cm Bk Cf Es Fm Md No Lr "
+    "Rf Db Sg Bh Hs Mt Ds Rg Cn Nh Fl Mc Lv Ts Og"
+).split()
+ELEMENT_INDEX = {symbol: idx for idx, symbol in enumerate(ELEMENT_SYMBOLS)}
+BITSET_WORDS = 2
+
+_NAN_RANGE = (float("nan"), float("nan"))
+_VALUE_RE = r"[-−]?\d+(?:\.\d+)?"
+# 변수 범위 표기: "0 <= x <= 1", "0.01 < z < 0.1", "x = 0.5", "x: 0-1", "0.1 to 0.5", "x is 0~1"
+_DOUBLE_BOUND_RE = re.compile(rf"({_VALUE_RE})\s*(?:<=|≤|<|=<)\s*([A-Za-zα-ωΑ-Ω]\w*)\s*(?:<=|≤|<|=<)\s*({_VALUE_RE})")
+_REVERSED_BOUND_RE = re.compile(rf"({_VALUE_RE})\s*(?:>=|≥|>|=>)\s*([A-Za-zα-ωΑ-Ω]\w*)\s*(?:>=|≥|>|=>)\s*({_VALUE_RE})")
+_SINGLE_VALUE_RE = re.compile(rf"^\s*([A-Za-zα-ωΑ-Ω]\w*)\s*=\s*({_VALUE_RE})\s*$")
+_PLAIN_RANGE_RE = re.compile(rf"({_VALUE_RE})\s*(?:to|~|-|–|—)\s*({_VALUE_RE})")
+_TERM_RE = re.compile(r"([+-]?)\s*(\d+(?:\.\d+)?(?:/\d+(?:\.\d+)?)?)?\s*\*?\s*([a-zα-ωA-Z]\w*'?)?")
+# 원소 기호 뒤의 계수식: 숫자/분수/변수 항을 +, -로 이은 선형식 ("2", "2/3", "x", "1-x-y", "1+a", "0.5+2z").
+# 변수는 소문자 한 글자(+ 숫자/프라임)이며 뒤에 소문자가 이어지면(단어) 변수로 보지 않음
+_COEFFICIENT_NUMBER = r"\d+(?:\.\d+)?(?:/\d+(?:\.\d+)?)?"
+_COEFFICIENT_TERM = rf"(?:(?:{_COEFFICIENT_NUMBER})?\*?[a-zα-ω](?:\d|')?(?![a-z])|{_COEFFICIENT_NUMBER})"
+_COEFFICIENT_RE = re.compile(rf"{_COEFFICIENT_TERM}(?:[+\-−]{_COEFFICIENT_TERM})*")
+
+
+def parse_variable_ranges(formula_parameters: Sequence[Dict[str, Any]]) -> Dict[str, Tuple[float, float]]:
+    """formula_parameters의 value_range 문자열에서 변수별 (최소, 최대) 범위를 읽습니다. 읽을 수 없는 변수는 제외됩니다."""
+    ranges: Dict[str, Tuple[float, float]] = {}
+    for param in formula_parameters or []:
+        if not isinstance(param, dict):
+            continue
+        name = str(param.get("parameter_name") or "").strip()
+        text = str(param.get("value_range") or "").replace("−", "-")
+        for match in _DOUBLE_BOUND_RE.finditer(text):
+            ranges[match.group(2)] = (float(match.group(1)), float(match.group(3)))
+        for match in _REVERSED_BOUND_RE.finditer(text):
+            ranges[match.group(2)] = (float(match.group(3)), float(match.group(1)))
+        single = _SINGLE_VALUE_RE.match(text)
+        if single:
+            ranges[single.group(1)] = (float(single.group(2)),) * 2
+        elif name and name not in ranges:
+            plain = _PLAIN_RANGE_RE.search(text)
+            if plain:
+                ranges[name] = (float(plain.group(1)), float(plain.group(2)))
+    return ranges
+
+def _parse_fraction(text: str) -> float:
+    numerator, _, denominator = text.partition("/")
+    return float(numerator) / float(denominator) if denominator else float(numerator)
+
+def _evaluate_coefficient(expression: str, variables: Dict[str, Tuple[float, float]]) -> Tuple[float, float]:
+    """
+    '1-x-y', '2', '2/3', 'h', '0.5+a' 같은 선형 계수식의 범위를 구간 연산으로 계산합니다. 모르는 변수가 있으면 NaN.
+    범위는 0 이상으로 자릅니다.
+    """
+    expression = expression.replace(" ", "").replace("−", "-")
+    if not expression:
+        return (1.0, 1.0)
+    low = high = 0.0
+    position = 0
+    while position < len(expression):
+        match = _TERM_RE.match(expression, position)
+        if not match or match.end() == position:
+            return _NAN_RANGE
+        sign = -1.0 if match.group(1) == "-" else 1.0
+        factor = _parse_fraction(match.group(2)) if match.group(2) else 1.0
+        variable = match.group(3)
+        if variable:
+            if variable not in variables:
+                return _NAN_RANGE
+            term = sorted((sign * factor * variables[variable][0], sign * factor * variables[variable][1]))
+        elif match.group(2):
+            term = [sign * factor] * 2
+        else:
+            return _NAN_RANGE
+        low += term[0]
+        high += term[1]
+        position = match.end()
+    # 변수들을 각자 범위 끝에 두면 음수가 나올 수 있으나(1-x-y에서 x, y가 모두 최대) 원소 함량은 0 미만이 될 수 없음
+    return (max(low, 0.0), max(high, 0.0))
+
+def _add_range(target: Dict[str, Tuple[float, float]], symbol: str, value: Tuple[float, float]) -> None:
+    current = target.get(symbol, (0.0, 0.0))
+    target[symbol] = (current[0] + value[0], current[1] + value[1])
+
+def _scale_range(value: Tuple[float, float], multiplier: Tuple[float, float]) -> Tuple[float, float]:
+    products = [value[0] * multiplier[0], value[0] * multiplier[1], value[1] * multiplier[0], value[1] * multiplier[1]]
+    return (min(products), max(products))
+
+class _FormulaParser:
+    """화학식 한 개를 왼쪽부터 읽는 재귀 하강 파서. 자리표시자(M, M1, X 등)는 placeholder_elements로 펼칩니다."""
+
+    def __init__(self, text: str, placeholder_elements: Dict[str, List[str]], variables: Dict[str, Tuple[float, float]]):
+        self.text = text
+        self.position = 0
+        self.placeholder_elements = placeholder_elements
+        self.variables = variables
+
+    def _read_coefficient(self) -> Tuple[float, float]:
+        text, start = self.text, self.position
+        if start < len(text) and text[start] in "([" and not re.search(r"[A-Z]", self._bracket_body(start) or "A"):
+            body = self._bracket_body(start)
+            self.position = start + len(body) + 2
+            return _evaluate_coefficient(body, self.variables)
+        match = _COEFFICIENT_RE.match(text.replace("−", "-"), start)
+        if not match:
+            return (1.0, 1.0)
+        self.position = match.end()
+        return _evaluate_coefficient(match.group(0), self.variables)
+
+    def _bracket_body(self, start: int) -> Optional[str]:
+        closing = {"(": ")", "[": "]"}[self.text[start]]
+        depth = 0
+        for idx in range(start, len(self.text)):
+            if self.text[idx] == self.text[start]:
+                depth += 1
+            elif self.text[idx] == closing:
+                depth -= 1
+                if depth == 0:
+                    return self.text[start + 1:idx]
+        return None
+
+    def _read_symbol(self) -> Optional[Tuple[List[str], bool]]:
+        """다음 원소/자리표시자를 읽어 (원소 목록, 자리표시자 여부)를 반환합니다."""
+        text, start = self.text, self.position
+        match = re.compile(r"[A-Z][a-z]?(?:\d+|')?").match(text, start)
+        if not match:
+            return None
+        token = match.group(0)
+        letters = token.rstrip("0123456789'")
+        # 우선순위: 번호/프라임이 붙은 자리표시자("M1", "M'") > 두 글자 원소("Mn") > 두 글자 자리표시자 > 한 글자 자리표시자("M") > 한 글자 원소
+        candidates = []
+        if token != letters:
+            candidates.append((token, True))
+        if len(letters) == 2:
+            candidates += [(letters, False), (letters, True)]
+        candidates += [(letters[0], True), (letters[0], False)]
+        for name, is_placeholder in candidates:
+            if is_placeholder and name in self.placeholder_elements:
+                self.position = start + len(name)
+                return self.placeholder_elements[name], True
+            if not is_placeholder and name in ELEMENT_INDEX:
+                self.position = start + len(name)
+                return [name], False
+        self.position = start + 1
+        return [], True # 정의되지 않은 자리표시자 (원소 정보 없음)
+
+    def parse(self) -> Tuple[Set[str], Dict[str, Tuple[float, float]], Set[str]]:
+        """(화학식에 명시된 원소, 원소별 화학량론 범위, 자리표시자로 가능한 원소)를 반환합니다."""
+        explicit: Set[str] = set()
+        possible: Set[str] = set()
+        stoichiometry: Dict[str, Tuple[float, float]] = {}
+        while self.position < len(self.text):
+            char = self.text[self.position]
+            if char in "([":
+                body = self._bracket_body(self.position)
+                if body is None:
+                    break
+                inner = _FormulaParser(body, self.placeholder_elements, self.variables)
+                inner_explicit, inner_stoich, inner_possible = inner.parse()
+                self.position += len(body) + 2
+                multiplier = self._read_coefficient()
+                explicit |= inner_explicit
+                possible |= inner_possible
+                for symbol, value in inner_stoich.items():
+                    _add_range(stoichiometry, symbol, _scale_range(value, multiplier))
+                continue
+            symbol = self._read_symbol()
+            if symbol is None:
+                self.position += 1 # 구분자(·, /, 공백, 쉼표 등)는 건너뜀
+                continue
+            elements, is_placeholder = symbol
+            coefficient = self._read_coefficient()
+            if is_placeholder:
+                # 자리표시자의 각 원소는 없을 수도 있으므로 하한은 0
+                possible.update(elements)
+                for element in elements:
+                    _add_range(stoichiometry, element, (0.0, coefficient[1]))
+            else:
+                explicit.update(elements)
+                for element in elements:
+                    _add_range(stoichiometry, element, coefficient)
+        return explicit, stoichiometry, possible
+
+def parse_composition(material_description: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    material_description에서 조성 정보를 추출합니다.
+    반환: {'elements': 화학식에 명시된 원소, 'possible_elements': 명시 원소 + 자리표시자/첨가제로 가능한 원소,
+           'stoichiometry': {원소: (최소, 최대)}} (범위를 알 수 없으면 NaN)
+    """
+    material_description = material_description if isinstance(material_description, dict) else {}
+    params = [p for p in material_description.get("formula_parameters") or [] if isinstance(p, dict)]
+    placeholder_elements = {
+        str(p.get("parameter_name") or "").strip(): [e.strip() for e in p.get("elements_involved") or [] if isinstance(e, str) and e.strip() in ELEMENT_INDEX]
+        for p in params if p.get("elements_involved")
+    }
+    placeholder_elements.pop("", None)
+    variables = parse_variable_ranges(params)
+
+    formula = str(material_description.get("chemical_formula_general") or "")
+    formula = re.split(r"\s(?:where|wherein|in which|with)\s|[,;:]\s", formula, maxsplit=1)[0]
+    explicit, stoichiometry, possible = _FormulaParser(formula, placeholder_elements, variables).parse()
+
+    for param_elements in placeholder_elements.values():
+        possible.update(param_elements)
+    for additive in material_description.get("key_additive_or_dopant_info") or []:
+        if isinstance(additive, dict) and additive.get("chemical_identity"):
+            additive_explicit, _, _ = _FormulaParser(str(additive["chemical_identity"]), {}, {}).parse()
+            possible.update(additive_explicit)
+    return {
+        "elements": sorted(explicit, key=ELEMENT_INDEX.get),
+        "possible_elements": sorted(explicit | possible, key=ELEMENT_INDEX.get),
+        "stoichiometry": {symbol: stoichiometry[symbol] for symbol in sorted(stoichiometry, key=ELEMENT_INDEX.get)},
+    }
+
+def _element_words(elements: Iterable[str]) -> Tuple[int, int]:
+    mask = 0
+    for symbol in elements:
+        if symbol not in ELEMENT_INDEX:
+            raise ValueError(f"Unknown element symbol: {symbol}")
+        mask |= 1 << ELEMENT_INDEX[symbol]
+    return mask & 0xFFFFFFFFFFFFFFFF, mask >> 64
+
+def elements_to_bitset(elements: Iterable[str]) -> np.ndarray:
+    """원소 기호 목록을 uint64 2워드 비트셋으로 변환합니다. 모르는 기호는 ValueError."""
+    return np.array(_element_words(elements), dtype=np.uint64)
+
+class ElementIndex:
+    """
+    문서별 원소 비트셋(명시 원소 / 가능 원소)과 원소별 화학량론 범위(CSR 형태)를 담는 검색 인덱스.
+    조성 검색은 비트셋 전체에 대한 벡터 AND 연산 한 번으로 처리됩니다.
+    """
+
+    def __init__(self, document_ids: np.ndarray, element_bits: np.ndarray, possible_bits: np.ndarray,
+                 entry_document: np.ndarray, entry_element: np.ndarray, entry_min: np.ndarray, entry_max: np.ndarray):
+        self.document_ids = document_ids       # (N,) str
+        self.element_bits = element_bits       # (N, 2) uint64, 화학식에 명시된 원소
+        self.possible_bits = possible_bits     # (N, 2) uint64, 명시 + 자리표시자/첨가제 원소
+        self.entry_document = entry_document   # (E,) int32, 화학량론 항목의 문서 위치
+        self.entry_element = entry_element     # (E,) uint8, 원소 위치 (원자 번호 - 1)
+        self.entry_min = entry_min             # (E,) float32
+        self.entry_max = entry_max             # (E,) float32
+
+    def __len__(self) -> int:
+        return len(self.document_ids)
+
+    @classmethod
+    def from_compositions(cls, document_ids: Sequence[str], compositions: Sequence[Dict[str, Any]]) -> "ElementIndex":
+        element_words: List[Tuple[int, int]] = []
+        possible_words: List[Tuple[int, int]] = []
+        entry_document: List[int] = []
+        entry_element: List[int] = []
+        entry_range: List[Tuple[float, float]] = []
+        for row, composition in enumerate(compositions):
+            element_words.append(_element_words(composition["elements"]))
+            possible_words.append(_element_words(composition["possible_elements"]))
+            for symbol, value in composition["stoichiometry"].items():
+                entry_document.append(row)
+                entry_element.append(ELEMENT_INDEX[symbol])
+                entry_range.append(value)
+        ranges = np.array(entry_range, dtype=np.float32).reshape(-1, 2)
+        return cls(
+            np.array(document_ids, dtype=str),
+            np.array(element_words, dtype=np.uint64).reshape(-1, BITSET_WORDS),
+            np.array(possible_words, dtype=np.uint64).reshape(-1, BITSET_WORDS),
+            np.array(entry_document, dtype=np.int32), np.array(entry_element, dtype=np.uint8), ranges[:, 0], ranges[:, 1]
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "ElementIndex":
+        """저장소 레코드들에서 인덱스를 만듭니다."""
+        document_ids: List[str] = []
+        compositions: List[Dict[str, Any]] = []
+        for record in records:
+            data = record.get("structured_data") or {}
+            document_ids.append(str(record.get("document_id", "")))
+            compositions.append(parse_composition(data.get("material_description") or {}))
+        return cls.from_compositions(document_ids, compositions)
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(path, **{name: getattr(self, name) for name in self.__dict__})
+
+    @classmethod
+    def load(cls, path: str) -> "ElementIndex":
+        with np.load(path) as arrays:
+            return cls(**{name: arrays[name] for name in arrays.files})
+
+    def match_mask(
+        self,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        include_explicit_only: bool = False,
+        stoichiometry: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None
+    ) -> np.ndarray:
+        """
+        조성 조건에 맞는 문서의 불리언 마스크를 반환합니다.
+        include: 모두 포함해야 하는 원소 (기본은 자리표시자/첨가제로 가능한 원소까지 인정, include_explicit_only=True면 명시 원소만)
+        exclude: 가능한 원소에도 없어야 하는 원소
+        stoichiometry: {원소: (최소, 최대)} — 문서의 화학량론 범위가 이 구간과 겹치는 문서만 (None은 제한 없음)
+        """
+        include_bits = elements_to_bitset(include)
+        exclude_bits = elements_to_bitset(exclude)
+        include_target = self.element_bits if include_explicit_only else self.possible_bits
+        # 워드별로 비교하여 (N, 2) 중간 배열 없이 마스크 계산
+        mask = np.ones(len(self), dtype=bool)
+        for word in range(BITSET_WORDS):
+            if include_bits[word]:
+                mask &= (include_target[:, word] & include_bits[word]) == include_bits[word]
+            if exclude_bits[word]:
+                mask &= (self.possible_bits[:, word] & exclude_bits[word]) == 0
+        for symbol, (low, high) in (stoichiometry or {}).items():
+            entries = self.entry_element == ELEMENT_INDEX[symbol]
+            if low is not None:
+                entries &= self.entry_max >= low
+            if high is not None:
+                entries &= self.entry_min <= high
+            stoich_mask = np.zeros(len(self), dtype=bool)
+            stoich_mask[self.entry_document[entries]] = True
+            mask &= stoich_mask
+        return mask
+
+    def query(self, include: Iterable[str] = (), exclude: Iterable[str] = (), **kwargs) -> np.ndarray:
+        """조성 조건에 맞는 문서 ID 배열을 반환합니다 (match_mask 참고)."""
+        return self.document_ids[self.match_mask(include, exclude, **kwargs)]
+
+    def elements_of(self, row: int, possible: bool = False) -> List[str]:
+        """인덱스 행의 비트셋을 원소 기호 목록으로 되돌립니다."""
+        bits = (self.possible_bits if possible else self.element_bits)[row]
+        return [symbol for idx, symbol in enumerate(ELEMENT_SYMBOLS) if int(bits[idx // 64]) >> (idx % 64) & 1]
+
+# --- 성능 측정 ---
+_BENCHMARK_BASE_ELEMENTS = ["Na", "Li", "K"]
+_BENCHMARK_TRANSITION_METALS = ["Ni", "Mn", "Fe", "Co", "Cu", "Ti", "V", "Cr", "Zn", "Mg", "Al", "Zr", "Nb"]
+_BENCHMARK_ANIONS = [["O"], ["P", "O"], ["P", "O", "F"], ["S", "O"], ["Si", "O"]]
+
+def make_benchmark_index(n_documents: int, seed: int = 0) -> ElementIndex:
+    """실제 양극재 특허와 비슷한 원소 분포의 합성 인덱스를 만듭니다."""
+    rng = random.Random(seed)
+    compositions = []
+    for _ in range(n_documents):
+        metals = rng.sample(_BENCHMARK_TRANSITION_METALS, rng.randint(1, 4))
+        elements = [rng.choice(_BENCHMARK_BASE_ELEMENTS)] + metals + rng.choice(_BENCHMARK_ANIONS)
+        dopants = rng.sample(_BENCHMARK_TRANSITION_METALS, rng.randint(0, 3))
+        compositions.append({
+            "elements": elements,
+            "possible_elements": sorted(set(elements) | set(dopants)),
+            "stoichiometry": {symbol: (round(rng.uniform(0, 1), 2), round(rng.uniform(1, 2), 2)) for symbol in elements},
+        })
+    return ElementIndex.from_compositions([f"doc{i:06d}" for i in range(n_documents)], compositions)
+
+def benchmark_element_queries(n_documents: int = 100_000, repeats: int = 20, seed: int = 0) -> Dict[str, float]:
+    """합성 인덱스에서 대표적인 조성 검색의 평균 응답 시간(ms)을 측정합니다."""
+    started = time.perf_counter()
+    index = make_benchmark_index(n_documents, seed)
+    build_seconds = time.perf_counter() - started
+    queries = {
+        "include_Na_Mn": dict(include=["Na", "Mn"]),
+        "include_Na_Mn_Ti_exclude_Co": dict(include=["Na", "Mn", "Ti"], exclude=["Co"]),
+        "explicit_Na_Fe_P": dict(include=["Na", "Fe", "P"], include_explicit_only=True),
+        "Na_Mn_with_Na_ge_0.8": dict(include=["Na", "Mn"], stoichiometry={"Na": (0.8, None)}),
+    }
+    results: Dict[str, float] = {"documents": float(n_documents), "build_seconds": build_seconds}
+    for name, kwargs in queries.items():
+        started = time.perf_counter()
+        for _ in range(repeats):
+            matches = index.match_mask(**kwargs)
+        results[f"{name}_ms"] = (time.perf_counter() - started) / repeats * 1000
+        results[f"{name}_matches"] = float(matches.sum())
+    return results
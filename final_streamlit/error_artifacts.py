@@ -0,0 +1,150 @@
+# error_artifacts.py
+# 실패한 분석의 큰 문자열(LLM 원본 응답, 파싱 시도한 JSON, traceback)을 세션 상태 대신 디스크에 보관하는 저장소
+# 내용의 SHA-256으로 파일명을 정하고 gzip으로 압축하여 저장하며(같은 내용은 한 번만 저장), 결과 딕셔너리에는 참조와 짧은 미리보기만 남깁니다.
+# UI는 사용자가 요청할 때만 전체 내용을 읽습니다.
+import gzip
+import hashlib
+import os
+import sys
+import tempfile
+from typing import Any, Dict, Optional
+
+from app_config import AppConfig
+
+# 결과 딕셔너리에서 참조가 들어가는 키 (필드 이름 -> 참조)
+ARTIFACTS_KEY = "error_artifacts"
+ARTIFACT_SUFFIX = ".txt.gz"
+
+
+class ErrorArtifactStore:
+    """오류 산출물을 `<base_dir>/<sha256 앞 2자리>/<sha256>.txt.gz`로 보관합니다. 쓰기는 임시 파일 -> os.replace로 원자적입니다."""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def _path(self, artifact_id: str) -> str:
+        return os.path.join(self.base_dir, artifact_id[:2], f"{artifact_id}{ARTIFACT_SUFFIX}")
+
+    def put(self, text: str) -> str:
+        """문자열을 압축하여 저장하고 산출물 ID(SHA-256)를 반환합니다. 이미 있으면 다시 쓰지 않습니다."""
+        data = text.encode("utf-8", errors="replace")
+        artifact_id = hashlib.sha256(data).hexdigest()
+        path = self._path(artifact_id)
+        if os.path.exists(path):
+            return artifact_id
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(data, compresslevel=AppConfig.ERROR_ARTIFACT_COMPRESS_LEVEL))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return artifact_id
+
+    def get(self, artifact_id: str) -> Optional[str]:
+        """산출물 전체 문자열을 읽습니다. 없으면(정리되었으면) None."""
+        try:
+            with open(self._path(artifact_id), "rb") as f:
+                return gzip.decompress(f.read()).decode("utf-8")
+        except FileNotFoundError:
+            return None
+
+    def stored_bytes(self, artifact_id: str) -> int:
+        """압축된 파일 크기 (바이트). 없으면 0."""
+        try:
+            return os.path.getsize(self._path(artifact_id))
+        except FileNotFoundError:
+            return 0
+
+def spill_error_payload(payload: Dict[str, Any], store: ErrorArtifactStore) -> Dict[str, Any]:
+    """
+    오류 결과 딕셔너리의 큰 문자열 필드(AppConfig.ERROR_ARTIFACT_FIELDS)를 저장소로 옮기고,
+    payload[ARTIFACTS_KEY][필드] = {artifact_id, chars, stored_bytes, preview} 참조로 바꾼 딕셔너리를 반환합니다.
+    저장에 실패한 필드는 미리보기 길이로 잘라 남깁니다 (전체 문자열을 세션에 두지 않음).
+    """
+    spilled = {key: value for key, value in payload.items() if key not in AppConfig.ERROR_ARTIFACT_FIELDS}
+    artifacts = dict(payload.get(ARTIFACTS_KEY) or {})
+    for field in AppConfig.ERROR_ARTIFACT_FIELDS:
+        value = payload.get(field)
+        if value is None:
+            continue
+        text = value if isinstance(value, str) else str(value)
+        preview = text[:AppConfig.ERROR_ARTIFACT_PREVIEW_CHARS]
+        try:
+            artifact_id = store.put(text)
+        except OSError as e:
+            spilled[field] = preview
+            spilled.setdefault("artifact_store_error", f"{type(e).__name__}: {e}")
+            continue
+        artifacts[field] = {
+            "artifact_id": artifact_id,
+            "chars": len(text),
+            "stored_bytes": store.stored_bytes(artifact_id),
+            "preview": preview,
+        }
+    if artifacts:
+        spilled[ARTIFACTS_KEY] = artifacts
+    return spilled
+
+def deep_sizeof(obj: Any) -> int:
+    """객체가 참조하는 딕셔너리/리스트/문자열까지 합한 대략적인 메모리 크기 (바이트, 공유 객체는 한 번만 계산)"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            stack.extend(item)
+    return total
+
+def benchmark_error_spill(response_mb: float = 4.0, store_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    response_mb 크기의 잘린(파싱 불가) LLM 응답으로 만든 실패 결과가 세션에 남기는 메모리를 비교합니다.
+    세션에 남는 것: 결과 딕셔너리(STRUCTURED_DATA) + 결과 탭의 JSON 다운로드 문자열(렌더링 메모).
+    """
+    import json
+    import time
+    from fake_llm import json_response
+
+    body = json.dumps({"items": [{"metric_name": "Discharge capacity", "value": str(index), "unit": "mAh/g"}
+                                 for index in range(int(response_mb * 1024 * 1024 / 64))]})
+    raw_response = json_response({})[:-4] + body[:-10]  # 중간에 끊긴 응답
+    inline_payload = {
+        "error": "Failed to parse extracted JSON from LLM response",
+        "extracted_json_to_parse": raw_response[len("```json\n"):],
+        "raw_response": raw_response,
+        "source_file_name": "bench.pdf",
+        "language_of_document": "Unknown",
+    }
+
+    def _session_bytes(payload: Dict[str, Any]) -> int:
+        return deep_sizeof(payload) + sys.getsizeof(json.dumps(payload, ensure_ascii=False, indent=4))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = ErrorArtifactStore(store_dir or tmp_dir)
+        started = time.perf_counter()
+        spilled_payload = spill_error_payload(inline_payload, store)
+        spill_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        store.get(spilled_payload[ARTIFACTS_KEY]["raw_response"]["artifact_id"])
+        load_seconds = time.perf_counter() - started
+        stored_bytes = sum(ref["stored_bytes"] for ref in spilled_payload[ARTIFACTS_KEY].values())
+    return {
+        "response_chars": len(raw_response),
+        "inline_session_bytes": _session_bytes(inline_payload),
+        "spilled_session_bytes": _session_bytes(spilled_payload),
+        "stored_bytes": stored_bytes,
+        "spill_seconds": spill_seconds,
+        "lazy_load_seconds": load_seconds,
+    }
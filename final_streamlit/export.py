@@ -0,0 +1,262 @@
+# export.py
+# 저장된 분석 결과 전체를 분석용 표 형식(Parquet/CSV)으로 내보내는 모듈
+# SCHEMA_FIELD_DESCRIPTIONS의 필드 경로를 따라 문서당 한 행인 기본 표(patents)와
+# 리스트 필드(priority_data, formula_parameters, key_steps_and_conditions 등)별 하위 표로 정규화하며,
+# 레코드를 하나씩 읽어 일정 행 수마다 파일에 덧붙이므로 저장소 크기와 관계없이 메모리 사용량이 일정합니다.
+import csv
+import io
+import json
+import os
+import time
+import zipfile
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app_config import AppConfig
+from schema_descriptions import SCHEMA_FIELD_DESCRIPTIONS
+
+EXPORT_FORMATS = ("parquet", "csv")
+MAIN_TABLE_NAME = "patents"
+# 기본 표의 레코드 메타데이터 열
+RECORD_COLUMNS = ["document_id", "source_file_name", "model_name", "created_at", "updated_at"]
+# 하위 표의 항목 순번 열 (Parquet에서는 int32, 나머지 열은 모두 nullable string)
+INDEX_COLUMNS = ("parent_item_index", "item_index")
+
+
+class ChildTable(NamedTuple):
+    """리스트 필드 하나를 펼친 하위 표 정의. parent가 있으면 상위 하위 표 항목 안의 리스트(path는 항목 기준 키)입니다."""
+    name: str
+    path: str
+    columns: List[str]
+    parent: Optional[str] = None
+
+# 하위 표 정의 (스키마 프롬프트의 항목 키 순서). 정의에 없는 키는 extra_json 열에 JSON으로 보관
+CHILD_TABLES: Dict[str, ChildTable] = {table.name: table for table in [
+    ChildTable("priority_data", "patent_info.priority_data",
+               ["priority_number", "priority_date", "priority_country"]),
+    ChildTable("formula_parameters", "material_description.formula_parameters",
+               ["parameter_name", "elements_involved", "value_range", "preferred_value_range", "description"]),
+    ChildTable("additives_and_dopants", "material_description.key_additive_or_dopant_info",
+               ["type_or_name", "chemical_identity", "role_or_purpose", "content_description", "source_materials_if_specified"]),
+    ChildTable("size_metrics", "morphology_structure.size_metrics",
+               ["metric_type", "unit", "value_range", "preferred_value_range"]),
+    ChildTable("density", "morphology_structure.density_g_cm3",
+               ["type", "value_range", "conditions", "preferred_value_range"]),
+    ChildTable("crystallinity_features", "morphology_structure.crystallinity_features",
+               ["feature_type", "details"]),
+    ChildTable("physical_chemical_properties", "physical_chemical_properties_specific",
+               ["property_name", "unit", "value_or_range", "conditions_of_measurement", "preferred_value_or_range"]),
+    ChildTable("synthesis_steps", "preparation_method_summary.key_steps_and_conditions",
+               ["step_id", "process_name", "detailed_description_of_step"]),
+    ChildTable("synthesis_step_parameters", "key_parameters_and_values",
+               ["parameter_name", "value_or_range", "unit"], parent="synthesis_steps"),
+    ChildTable("performance_data", "representative_performance_data_from_examples_or_figures",
+               ["metric_name", "value", "unit", "conditions_or_context", "source_reference_in_document"]),
+]}
+
+# 기본 표에서 하위 키별 열로 펼칠 객체 필드 (정의에 없는 키는 무시)
+OBJECT_FIELD_KEYS: Dict[str, List[str]] = {
+    "morphology_structure.specific_surface_area_BET_m2_g": ["value_range", "preferred_value_range"],
+    "morphology_structure.coating_information": [
+        "is_coated", "coating_material", "coating_thickness", "coating_purpose", "coating_method_if_specified"],
+    "preparation_method_summary.raw_material_examples_by_type": [
+        "sodium_source_examples", "lithium_source_examples", "transition_metal_source_examples", "phosphate_source_examples",
+        "halogen_source_examples", "carbon_source_for_coating_examples", "dopant_M_source_examples", "other_precursor_examples"],
+}
+
+
+def _leaf_paths() -> List[str]:
+    """SCHEMA_FIELD_DESCRIPTIONS에서 하위 경로가 없는 필드 경로(리프)를 정의 순서대로 반환합니다."""
+    paths = list(SCHEMA_FIELD_DESCRIPTIONS)
+    return [path for path in paths if not any(other.startswith(path + ".") for other in paths)]
+
+@lru_cache(maxsize=1)
+def main_table_columns() -> tuple:
+    """기본 표(patents)의 열 목록. 하위 표로 빠지는 리스트 필드는 제외하고 객체 필드는 '경로.키' 열로 펼칩니다."""
+    child_paths = {table.path for table in CHILD_TABLES.values() if table.parent is None}
+    columns = list(RECORD_COLUMNS)
+    for path in _leaf_paths():
+        if path in child_paths or path in columns:
+            continue
+        if path in OBJECT_FIELD_KEYS:
+            columns.extend(f"{path}.{key}" for key in OBJECT_FIELD_KEYS[path])
+        else:
+            columns.append(path)
+    return tuple(columns)
+
+def table_columns(table_name: str) -> List[str]:
+    """표 이름별 열 목록 (하위 표는 document_id와 항목 순번 열을 앞에 둠)."""
+    if table_name == MAIN_TABLE_NAME:
+        return list(main_table_columns())
+    table = CHILD_TABLES[table_name]
+    key_columns = ["document_id", "parent_item_index", "item_index"] if table.parent else ["document_id", "item_index"]
+    return key_columns + table.columns + ["extra_json"]
+
+def _get_path(data: Any, path: str) -> Any:
+    for key in path.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+def _to_cell(value: Any) -> Optional[str]:
+    """값을 문자열 셀로 바꿉니다. 문자열 리스트는 '; '로 잇고, 그 밖의 객체는 JSON 문자열로 보관합니다."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, list) and all(not isinstance(item, (dict, list)) for item in value):
+        return "; ".join(str(item) for item in value if item is not None and item != "") or None
+    return json.dumps(value, ensure_ascii=False)
+
+def _item_row(item: Any, columns: List[str], nested_paths: Tuple[str, ...] = ()) -> Dict[str, Optional[str]]:
+    """
+    항목 하나를 행으로 만듭니다. 열에 없는 키는 extra_json에 보관하되,
+    하위 표로 따로 펼치는 리스트(nested_paths, 예: key_parameters_and_values)는 중복을 피해 제외합니다.
+    """
+    if not isinstance(item, dict):
+        return {column: None for column in columns} | {"extra_json": _to_cell(item)}
+    row = {column: _to_cell(item.get(column)) for column in columns}
+    extra = {key: value for key, value in item.items() if key not in columns and key not in nested_paths}
+    row["extra_json"] = json.dumps(extra, ensure_ascii=False) if extra else None
+    return row
+
+def flatten_record(record: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """레코드 하나를 표 이름 -> 행 목록으로 펼칩니다. 항목 순번 열을 제외한 셀은 문자열 또는 None입니다."""
+    data = record.get("structured_data") or {}
+    document_id = record.get("document_id", "")
+    main_row: Dict[str, Optional[str]] = {column: _to_cell(record.get(column)) for column in RECORD_COLUMNS}
+    for column in main_table_columns()[len(RECORD_COLUMNS):]:
+        main_row[column] = _to_cell(_get_path(data, column))
+    main_row["source_file_name"] = main_row["source_file_name"] or _to_cell(data.get("source_file_name"))
+    tables: Dict[str, List[Dict[str, Any]]] = {MAIN_TABLE_NAME: [main_row]}
+
+    for table in CHILD_TABLES.values():
+        if table.parent is not None:
+            continue
+        items = _get_path(data, table.path)
+        rows = tables.setdefault(table.name, [])
+        nested_paths = tuple(nested.path for nested in CHILD_TABLES.values() if nested.parent == table.name)
+        for item_index, item in enumerate(items if isinstance(items, list) else []):
+            rows.append({"document_id": document_id, "item_index": item_index} | _item_row(item, table.columns, nested_paths))
+            for nested in CHILD_TABLES.values():
+                if nested.parent != table.name or not isinstance(item, dict):
+                    continue
+                nested_items = item.get(nested.path)
+                nested_rows = tables.setdefault(nested.name, [])
+                for nested_index, nested_item in enumerate(nested_items if isinstance(nested_items, list) else []):
+                    nested_rows.append({"document_id": document_id, "parent_item_index": item_index,
+                                        "item_index": nested_index} | _item_row(nested_item, nested.columns))
+    return tables
+
+class _CsvTableWriter:
+    """CSV 파일에 행을 덧붙입니다. Excel에서 한글이 깨지지 않도록 UTF-8 BOM으로 씁니다."""
+
+    def __init__(self, path: str, columns: List[str]):
+        self.columns = columns
+        self._file = open(path, "w", encoding="utf-8-sig", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self._writer.writerows([[row.get(column) for column in self.columns] for row in rows])
+
+    def close(self) -> None:
+        self._file.close()
+
+class _ParquetTableWriter:
+    """Parquet 파일에 청크 단위 row group으로 행을 덧붙입니다."""
+
+    def __init__(self, path: str, columns: List[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet 내보내기에는 pyarrow 패키지가 필요합니다. (pip install pyarrow)") from e
+        self._pa = pa
+        self.columns = columns
+        self._schema = pa.schema([(column, pa.int32() if column in INDEX_COLUMNS else pa.string()) for column in columns])
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        table = self._pa.Table.from_pydict(
+            {column: [row.get(column) for row in rows] for column in self.columns}, schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        self._writer.close()
+
+_WRITER_CLASSES = {"parquet": _ParquetTableWriter, "csv": _CsvTableWriter}
+
+def export_records(
+    records: Iterable[Dict[str, Any]],
+    output_dir: str,
+    formats: Iterable[str] = EXPORT_FORMATS,
+    chunk_rows: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    레코드들을 표별 파일(`<output_dir>/<표 이름>.<형식>`)로 스트리밍 저장합니다.
+    표마다 버퍼가 chunk_rows(기본 AppConfig.EXPORT_CHUNK_ROWS) 행을 넘을 때마다 파일에 기록하므로
+    메모리에는 표별로 최대 한 청크만 유지됩니다. 행이 없는 표도 열 정의만 있는 파일로 만듭니다.
+    반환: {'documents', 'rows'(표별 행 수), 'files', 'seconds', 'max_buffered_rows'}
+    """
+    started = time.perf_counter()
+    chunk_rows = chunk_rows or AppConfig.EXPORT_CHUNK_ROWS
+    formats = list(formats)
+    unknown = [fmt for fmt in formats if fmt not in _WRITER_CLASSES]
+    if unknown:
+        raise ValueError(f"지원하지 않는 내보내기 형식: {', '.join(unknown)}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    table_names = [MAIN_TABLE_NAME] + list(CHILD_TABLES)
+    writers: Dict[str, list] = {}
+    files: List[str] = []
+    try:
+        for name in table_names:
+            writers[name] = []
+            for fmt in formats:
+                path = os.path.join(output_dir, f"{name}.{fmt}")
+                writers[name].append(_WRITER_CLASSES[fmt](path, table_columns(name)))
+                files.append(path)
+
+        buffers: Dict[str, List[Dict[str, Any]]] = {name: [] for name in table_names}
+        row_counts = {name: 0 for name in table_names}
+        max_buffered = 0
+        documents = 0
+
+        def flush(name: str) -> None:
+            if buffers[name]:
+                for writer in writers[name]:
+                    writer.write_rows(buffers[name])
+                row_counts[name] += len(buffers[name])
+                buffers[name] = []
+
+        for record in records:
+            documents += 1
+            for name, rows in flatten_record(record).items():
+                buffers[name].extend(rows)
+                max_buffered = max(max_buffered, len(buffers[name]))
+                if len(buffers[name]) >= chunk_rows:
+                    flush(name)
+        for name in table_names:
+            flush(name)
+    finally:
+        for table_writers in writers.values():
+            for writer in table_writers:
+                writer.close()
+    return {"documents": documents, "rows": row_counts, "files": files,
+            "seconds": time.perf_counter() - started, "max_buffered_rows": max_buffered}
+
+def build_export_archive(export_dir: str) -> bytes:
+    """내보낸 파일들을 UI 다운로드용 zip 바이트로 묶습니다 (Parquet는 이미 압축되어 있으므로 저장만)."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name in sorted(os.listdir(export_dir)):
+            path = os.path.join(export_dir, name)
+            compress = zipfile.ZIP_STORED if name.endswith(".parquet") else zipfile.ZIP_DEFLATED
+            archive.write(path, arcname=name, compress_type=compress)
+    return buffer.getvalue()
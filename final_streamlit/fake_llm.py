@@ -0,0 +1,77 @@
+# fake_llm.py
+# 실제 API 없이 파이프라인을 실행하기 위한 가짜 채팅 모델 (테스트, 성능 측정, 오프라인 데모용)
+# ChatGoogleGenerativeAI와 같은 invoke(messages, config=...) 인터페이스를 제공합니다.
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from langchain_core.messages import AIMessage
+
+from llm_utils import CHARS_PER_TOKEN, estimate_tokens
+
+
+def json_response(payload: Dict[str, Any]) -> str:
+    """딕셔너리를 실제 모델 응답과 같은 ```json ... ``` 블록 문자열로 감쌉니다."""
+    return "```json\n" + json.dumps(payload, ensure_ascii=False) + "\n```"
+
+def requested_sections_responder(section_values: Optional[Dict[str, Any]] = None) -> Callable[[str], str]:
+    """
+    섹션 추출 프롬프트(schema_versioning.build_section_extraction_prompt)에서 요청된 최상위 키를 읽어
+    각 키에 section_values의 값(없으면 빈 객체)을 채운 응답을 만드는 함수를 반환합니다. 오프라인 배치 실행/측정용.
+    """
+    marker = "Output ONLY the top-level keys shown in the structure above: "
+
+    def _respond(prompt: str) -> str:
+        start = prompt.find(marker)
+        if start < 0:
+            return json_response(dict(section_values or {}))
+        names = prompt[start + len(marker):].split("\n", 1)[0].split(", ")
+        return json_response({name.strip(): (section_values or {}).get(name.strip(), {}) for name in names})
+    return _respond
+
+class FakeChatModel:
+    """
+    미리 정한 응답을 돌려주는 가짜 모델입니다.
+    responses: 고정 응답 문자열, 또는 프롬프트 문자열을 받아 응답 문자열을 돌려주는 함수.
+    latency_seconds: 호출마다 흉내 낼 지연 시간. 예외 객체를 error로 주면 호출 시 그대로 발생시킵니다.
+    latency_per_1k_input_tokens: 입력 토큰 1,000개당 추가 지연 시간 (입력 길이에 따라 달라지는 실제 모델 지연 흉내).
+    context_window_tokens: 지정하면 이보다 긴 프롬프트의 뒷부분을 잘라 응답 함수에 넘깁니다 (컨텍스트를 넘는 내용을 조용히 놓치는 모델 흉내).
+    """
+
+    def __init__(
+        self,
+        responses: Union[str, Callable[[str], str]],
+        latency_seconds: float = 0.0,
+        error: Optional[Exception] = None,
+        model_name: str = "fake-model",
+        latency_per_1k_input_tokens: float = 0.0,
+        context_window_tokens: Optional[int] = None
+    ):
+        self.responses = responses
+        self.latency_seconds = latency_seconds
+        self.latency_per_1k_input_tokens = latency_per_1k_input_tokens
+        self.context_window_tokens = context_window_tokens
+        self.error = error
+        self.model = model_name
+        self.prompts: List[str] = [] # 호출된 프롬프트 기록 (검증용)
+        self._lock = threading.Lock()
+
+    def invoke(self, messages: List[Any], config: Optional[Dict[str, Any]] = None) -> AIMessage:
+        prompt = "\n".join(str(getattr(message, "content", message)) for message in messages)
+        with self._lock:
+            self.prompts.append(prompt)
+        latency = self.latency_seconds
+        if self.latency_per_1k_input_tokens:
+            latency += estimate_tokens(prompt) / 1000 * self.latency_per_1k_input_tokens
+        if latency:
+            time.sleep(latency)
+        if self.error is not None:
+            raise self.error
+        visible_prompt = prompt if self.context_window_tokens is None else prompt[:self.context_window_tokens * CHARS_PER_TOKEN]
+        content = self.responses(visible_prompt) if callable(self.responses) else self.responses
+        input_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(content)
+        return AIMessage(
+            content=content,
+            usage_metadata={"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens},
+        )
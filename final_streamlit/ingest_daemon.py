@@ -0,0 +1,244 @@
+# ingest_daemon.py
+# 감시 폴더 수집 서비스: 디렉토리를 주기적으로 스캔하여 새로 들어온 PDF를 지문(SHA-256)으로 식별하고,
+# 이미 저장소에 있는 문서는 건너뛰며, 나머지를 크기가 제한된 작업 풀에서 batch_runner.analyze_pdf로 분석하여 결과 저장소에 기록합니다.
+# 백로그 깊이, 처리 지연(파일 도착 -> 저장), 파일별 처리 시간을 지표 파일(JSON)로 내보냅니다.
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from app_config import AppConfig
+from batch_runner import RunJournal, analyze_pdf, collect_pdf_paths, retry_delay_seconds
+from result_store import ResultStore, compute_file_document_id
+
+# 저장소 디렉토리 안의 기본 저널/지표 파일 이름 (CLI와 대시보드 페이지가 공유). 저장소는 *.json을 레코드로 읽으므로 다른 확장자를 씀
+INGEST_JOURNAL_FILENAME = "ingest_journal.ndjson"
+INGEST_METRICS_FILENAME = "ingest_metrics.stat"
+# 스캔 사이에 끝난 작업을 확인하는 간격 (초)
+_WAIT_STEP_SECONDS = 0.2
+
+
+class IngestItem(NamedTuple):
+    """분석 대기 중인 파일"""
+    path: str
+    document_id: str
+    arrived_at: float      # 파일 수정 시각 (감시 폴더에 도착한 시각으로 간주)
+    discovered_at: float   # 스캔에서 처음 발견한 시각
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+class IngestDaemon:
+    """
+    감시 폴더 수집 서비스. poll_once()가 한 번의 스캔/제출/완료 수집을 하며, run()은 중지 신호까지 poll_once를 반복합니다.
+    - 수정된 지 AppConfig.INGEST_SETTLE_SECONDS가 지나지 않은 파일은 아직 복사 중으로 보고 다음 스캔으로 미룹니다.
+    - 파일 지문은 (경로, 크기, 수정 시각)이 바뀔 때만 다시 계산합니다.
+    - 저장소에 같은 문서 ID가 있거나 이미 대기/처리 중인 문서(다른 이름의 사본 포함)는 건너뜁니다.
+    - 동시에 처리하는 파일은 workers개로 제한하고 나머지는 백로그에 둡니다.
+    - 실패는 저널(batch_runner.RunJournal, 항목 = 파일 경로)에 시도한 문서 ID와 함께 기록되며 백오프 후 AppConfig.BATCH_MAX_ATTEMPTS회까지 재시도합니다.
+      같은 경로의 파일이 다른 내용으로 바뀌면 (재시작 후에도) 새 파일로 보고 다시 처리합니다.
+    """
+
+    def __init__(
+        self,
+        watch_dir: str,
+        store: ResultStore,
+        model: Any,
+        model_name: str,
+        journal: RunJournal,
+        workers: int = AppConfig.INGEST_WORKERS,
+        metrics_path: Optional[str] = None,
+        analyze: Callable[[str, Any, str, ResultStore], Dict[str, Any]] = analyze_pdf,
+        log: Optional[Callable[[str], None]] = None
+    ):
+        self.watch_dir = watch_dir
+        self.store = store
+        self.model = model
+        self.model_name = model_name
+        self.journal = journal
+        self.workers = workers
+        self.metrics_path = metrics_path
+        self.analyze = analyze
+        self.log = log or (lambda message: None)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest")
+        self._fingerprints: Dict[str, Tuple[int, int, str]] = {}  # 경로 -> (크기, 수정 시각 ns, 문서 ID)
+        self._failures = {item: state for item, state in journal.item_states().items() if state["status"] != "done"}
+        self._backlog: Deque[IngestItem] = deque()
+        self._in_flight: Dict[Future, Tuple[IngestItem, float]] = {}
+        self._queued_ids: set = set()
+        self._stored_paths: set = set()    # 저장소에 결과가 있는 것으로 확인한 경로 (건너뜀 카운터 중복 방지)
+        self._latencies: Deque[float] = deque(maxlen=AppConfig.INGEST_METRICS_WINDOW)
+        self._lags: Deque[float] = deque(maxlen=AppConfig.INGEST_METRICS_WINDOW)
+        self._counters = {"polls": 0, "processed": 0, "failed": 0, "skipped_existing": 0}
+        self._started_at = time.time()
+        self._last_scan_seconds = 0.0
+
+    def _fingerprint(self, path: str) -> Optional[Tuple[str, float]]:
+        """안정된 파일이면 (문서 ID, 수정 시각)을, 복사 중이거나 사라진 파일이면 None을 반환합니다."""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if time.time() - stat.st_mtime < AppConfig.INGEST_SETTLE_SECONDS:
+            return None
+        known = self._fingerprints.get(path)
+        if known and known[:2] == (stat.st_size, stat.st_mtime_ns):
+            return known[2], stat.st_mtime
+        document_id = compute_file_document_id(path)
+        self._fingerprints[path] = (stat.st_size, stat.st_mtime_ns, document_id)
+        return document_id, stat.st_mtime
+
+    def scan(self) -> int:
+        """감시 폴더를 스캔하여 새 파일을 백로그에 넣고, 새로 넣은 파일 수를 반환합니다."""
+        started = time.perf_counter()
+        added = 0
+        now = time.time()
+        for path in collect_pdf_paths([self.watch_dir]):
+            fingerprint = self._fingerprint(path)
+            if fingerprint is None:
+                continue
+            document_id, arrived_at = fingerprint
+            if document_id in self._queued_ids:
+                continue
+            failure = self._failures.get(path)
+            if failure and failure.get("document_id_attempted") in (None, document_id):
+                if failure["attempts"] >= AppConfig.BATCH_MAX_ATTEMPTS or now < failure["last_ts"] + retry_delay_seconds(failure["attempts"]):
+                    continue
+            elif self.store.exists(document_id):
+                if path not in self._stored_paths:
+                    self._stored_paths.add(path)
+                    self._counters["skipped_existing"] += 1
+                continue
+            self._backlog.append(IngestItem(path, document_id, arrived_at, now))
+            self._queued_ids.add(document_id)
+            added += 1
+        self._last_scan_seconds = time.perf_counter() - started
+        return added
+
+    def _submit(self) -> None:
+        while self._backlog and len(self._in_flight) < self.workers:
+            item = self._backlog.popleft()
+            future = self._executor.submit(self.analyze, item.path, self.model, self.model_name, self.store)
+            self._in_flight[future] = (item, time.time())
+
+    def _collect(self) -> int:
+        """끝난 작업의 결과를 저널/지표에 반영하고, 반영한 작업 수를 반환합니다."""
+        finished = 0
+        for future in [future for future in self._in_flight if future.done()]:
+            item, started = self._in_flight.pop(future)
+            now = time.time()
+            self._queued_ids.discard(item.document_id)
+            finished += 1
+            try:
+                result = future.result()
+            except Exception as e:
+                failure = self._failures.setdefault(item.path, {"attempts": 0, "last_ts": 0.0})
+                if failure.get("document_id_attempted") not in (None, item.document_id):
+                    failure["attempts"] = 0  # 같은 경로에 내용이 바뀐 파일: 시도 횟수를 새로 셈
+                failure.update(attempts=failure["attempts"] + 1, last_ts=now, document_id_attempted=item.document_id)
+                error = f"{type(e).__name__}: {e}"
+                self.journal.append({"event": "failed", "item": item.path, "document_id_attempted": item.document_id,
+                                     "attempt": failure["attempts"], "error": error, "elapsed_seconds": round(now - started, 3), "ts": now})
+                self._counters["failed"] += 1
+                self.log(f"실패 ({failure['attempts']}회): {os.path.basename(item.path)} - {error}")
+                continue
+            self._failures.pop(item.path, None)
+            self._stored_paths.add(item.path)
+            self.journal.append({"event": "done", "item": item.path, "document_id": result["document_id"],
+                                 "source_file_name": result["source_file_name"], "usage": result["usage"],
+                                 "cost_usd": result["cost_usd"], "elapsed_seconds": round(now - started, 3), "ts": now})
+            self._counters["processed"] += 1
+            self._latencies.append(now - started)
+            self._lags.append(now - item.arrived_at)
+            self.log(f"완료: {os.path.basename(item.path)} ({now - started:.1f}s, 도착 후 {now - item.arrived_at:.0f}s)")
+        return finished
+
+    def poll_once(self) -> Dict[str, Any]:
+        """완료된 작업 수집 -> 스캔 -> 빈 작업 슬롯에 제출 -> 지표 기록을 한 번 수행하고 지표를 반환합니다."""
+        self._collect()
+        self.scan()
+        self._submit()
+        self._counters["polls"] += 1
+        return self._write_metrics()
+
+    def _write_metrics(self) -> Dict[str, Any]:
+        metrics = self.metrics()
+        if self.metrics_path:
+            write_ingest_metrics(self.metrics_path, metrics)
+        return metrics
+
+    def run(self, stop_event: threading.Event, poll_seconds: float = AppConfig.INGEST_POLL_SECONDS, once: bool = False) -> Dict[str, Any]:
+        """
+        stop_event가 설정될 때까지 poll_seconds 간격으로 스캔합니다. 스캔 사이에는 작업이 끝나는 대로 빈 슬롯을 백로그로 채웁니다.
+        once=True면 현재 폴더의 파일을 모두 처리한 뒤 종료합니다. 종료 시 처리 중인 파일은 마저 끝내고, 남은 백로그는 다음 실행에서 다시 발견됩니다.
+        """
+        try:
+            while not stop_event.is_set():
+                self.poll_once()
+                if once and not self._backlog and not self._in_flight:
+                    break
+                deadline = time.time() + poll_seconds
+                while not stop_event.is_set():
+                    if self._collect():
+                        self._write_metrics()
+                    self._submit()
+                    if (once and not self._in_flight) or (not once and time.time() >= deadline):
+                        break
+                    stop_event.wait(_WAIT_STEP_SECONDS)
+        finally:
+            self._executor.shutdown(wait=True)
+            self._collect()
+        return self._write_metrics()
+
+    def metrics(self) -> Dict[str, Any]:
+        """백로그 깊이, 처리 중 파일 수, 처리 지연(도착 -> 저장), 파일별 처리 시간 분포와 누적 카운터"""
+        now = time.time()
+        waiting = list(self._backlog) + [item for item, _ in self._in_flight.values()]
+        latencies, lags = list(self._latencies), list(self._lags)
+        return {
+            "updated_at": now,
+            "uptime_seconds": now - self._started_at,
+            "watch_dir": self.watch_dir,
+            "workers": self.workers,
+            "backlog_depth": len(self._backlog),
+            "in_flight": len(self._in_flight),
+            "oldest_waiting_age_seconds": max((now - item.arrived_at for item in waiting), default=0.0),
+            "lag_seconds_p50": _percentile(lags, 50),
+            "lag_seconds_p95": _percentile(lags, 95),
+            "latency_seconds_p50": _percentile(latencies, 50),
+            "latency_seconds_p95": _percentile(latencies, 95),
+            "latency_seconds_mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "retry_pending": sum(1 for state in self._failures.values() if state["attempts"] < AppConfig.BATCH_MAX_ATTEMPTS),
+            "gave_up": sum(1 for state in self._failures.values() if state["attempts"] >= AppConfig.BATCH_MAX_ATTEMPTS),
+            "last_scan_seconds": self._last_scan_seconds,
+            **self._counters,
+        }
+
+def write_ingest_metrics(path: str, metrics: Dict[str, Any]) -> None:
+    """지표를 JSON 파일로 원자적으로 기록합니다 (임시 파일 -> os.replace). 앱/다른 프로세스가 언제든 읽을 수 있습니다."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(metrics, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_ingest_metrics(path: str) -> Optional[Dict[str, Any]]:
+    """지표 파일을 읽습니다. 없거나 손상되었으면 None."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
@@ -0,0 +1,262 @@
+# large_pdf.py
+# 수백 MB 스캔 묶음 같은 대용량 PDF를 위한 처리 모드
+# 업로드를 청크 단위로 디스크에 내려 받고(spool), PyMuPDF로 파일 경로에서 열어 선택한 페이지만 한 장씩 추출하며,
+# 페이지마다 프로세스 RSS를 확인하여 설정한 메모리 상한을 넘으면 추출을 중단합니다.
+import gc
+import hashlib
+import multiprocessing
+import os
+import random
+import re
+import resource
+import sys
+import tempfile
+import time
+from typing import Any, BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from app_config import AppConfig
+from pdf_tables import extract_pages_with_tables
+
+# 자동 페이지 선택: 설명/청구항 시작을 알리는 제목 줄 (청구항 제목은 quick_analysis의 청구항 구간 탐지에도 사용)
+_DESCRIPTION_HEADING_RE = re.compile(
+    r"^\s*[【\[]?\s*(?:detailed description|description|technical field|발명의\s*설명|기술\s*분야|明細書|说明书)",
+    re.IGNORECASE | re.MULTILINE
+)
+CLAIMS_HEADING_RE = re.compile(
+    r"^\s*[【\[]?\s*(?:claims|what is claimed|청구\s*범위|특허\s*청구의\s*범위|請求の範囲|权利要求)",
+    re.IGNORECASE | re.MULTILINE
+)
+_PAGE_RANGE_RE = re.compile(r"^\s*(\d+)?\s*(-)?\s*(\d+)?\s*$")
+
+
+class MemoryCeilingError(RuntimeError):
+    """추출 중 프로세스 RSS가 설정한 메모리 상한을 넘은 경우 발생합니다."""
+
+class SpooledPdf(NamedTuple):
+    """디스크에 내려 받은 업로드 PDF"""
+    path: str
+    document_id: str   # 파일 내용의 SHA-256 (result_store.compute_document_id와 같은 값)
+    size_bytes: int
+    page_count: int
+
+def current_rss_mb() -> float:
+    """현재 프로세스의 RSS(MB). /proc을 읽을 수 없는 환경에서는 최대 RSS(ru_maxrss)로 대신합니다."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+def peak_rss_mb() -> float:
+    """프로세스 시작 이후 최대 RSS(MB). ru_maxrss 단위는 Linux에서 KB, macOS에서 바이트입니다."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def is_large_upload(size_bytes: int) -> bool:
+    """업로드 크기가 대용량 모드 기준(AppConfig.LARGE_PDF_THRESHOLD_MB) 이상인지 여부"""
+    return size_bytes >= AppConfig.LARGE_PDF_THRESHOLD_MB * 1024 * 1024
+
+def cleanup_spool_dir(spool_dir: str, max_age_hours: float = AppConfig.LARGE_PDF_SPOOL_MAX_AGE_HOURS) -> int:
+    """max_age_hours보다 오래된 spool 파일(중단된 .part 포함)을 지우고 지운 파일 수를 반환합니다."""
+    if not os.path.isdir(spool_dir):
+        return 0
+    cutoff = time.time() - max_age_hours * 3600
+    removed = 0
+    for entry in os.scandir(spool_dir):
+        if entry.is_file() and entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+def spool_upload_to_disk(
+    file_obj: BinaryIO,
+    spool_dir: str = AppConfig.LARGE_PDF_SPOOL_DIR,
+    chunk_bytes: int = AppConfig.LARGE_PDF_SPOOL_CHUNK_BYTES
+) -> SpooledPdf:
+    """
+    업로드 파일 객체를 청크 단위로 `<spool_dir>/<SHA-256>.pdf`에 기록합니다 (getvalue()로 전체 사본을 만들지 않음).
+    해시는 기록하면서 함께 계산하며, 임시 파일에 쓴 뒤 os.replace로 옮기므로 같은 문서를 동시에 올려도 안전합니다.
+    """
+    os.makedirs(spool_dir, exist_ok=True)
+    cleanup_spool_dir(spool_dir)
+    file_obj.seek(0)
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=spool_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: file_obj.read(chunk_bytes), b""):
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        path = os.path.join(spool_dir, f"{digest.hexdigest()}.pdf")
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.utime(path) # 같은 문서를 다시 올리면 정리 기준 시각 갱신
+    with fitz.open(path) as doc:
+        page_count = len(doc)
+    return SpooledPdf(path, digest.hexdigest(), size, page_count)
+
+def parse_page_ranges(text: str, total_pages: int) -> List[int]:
+    """
+    "1-5, 10, 40-" 형식의 페이지 범위를 1부터 시작하는 정렬된 페이지 번호 목록으로 바꿉니다.
+    "-3"은 1~3, "40-"은 40~끝. 전체 페이지 수를 넘는 부분은 잘라내며, 형식이 잘못되면 ValueError를 발생시킵니다.
+    """
+    pages = set()
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        match = _PAGE_RANGE_RE.match(part)
+        if not match or not (match.group(1) or match.group(3)):
+            raise ValueError(f"잘못된 페이지 범위: '{part.strip()}'")
+        start = int(match.group(1)) if match.group(1) else 1
+        end = int(match.group(3)) if match.group(3) else (total_pages if match.group(2) else start)
+        if start < 1 or end < start:
+            raise ValueError(f"잘못된 페이지 범위: '{part.strip()}'")
+        pages.update(range(start, min(end, total_pages) + 1))
+    return sorted(pages)
+
+def auto_select_pages(doc: Any, min_text_chars: int = AppConfig.LARGE_PDF_MIN_TEXT_CHARS) -> Tuple[List[int], Dict[str, Any]]:
+    """
+    첫 페이지(서지 정보)와 설명/청구항 구간의 본문 페이지를 자동으로 고릅니다.
+    첫 설명/청구항 제목이 나오는 페이지부터 끝까지 중 텍스트가 min_text_chars자 이상인 페이지를 선택하며,
+    도면 페이지나 텍스트 레이어가 없는 스캔 페이지는 제외됩니다. 제목을 찾지 못하면 텍스트가 충분한 모든 페이지를 선택합니다.
+    반환: (페이지 번호 목록, {'description_start', 'claims_start', 'skipped_low_text'})
+    """
+    char_counts: List[int] = []
+    description_start = claims_start = None
+    for page_idx in range(len(doc)):
+        text = doc.load_page(page_idx).get_text("text")
+        char_counts.append(len(text.strip()))
+        if description_start is None and _DESCRIPTION_HEADING_RE.search(text):
+            description_start = page_idx + 1
+        if claims_start is None and CLAIMS_HEADING_RE.search(text):
+            claims_start = page_idx + 1
+    starts = [page for page in (description_start, claims_start) if page is not None]
+    first_body_page = min(starts) if starts else 1
+    selected = {1} if char_counts else set()
+    skipped = 0
+    for page_number in range(first_body_page, len(char_counts) + 1):
+        if char_counts[page_number - 1] >= min_text_chars:
+            selected.add(page_number)
+        elif page_number != 1:
+            skipped += 1
+    return sorted(selected), {"description_start": description_start, "claims_start": claims_start, "skipped_low_text": skipped}
+
+class MemoryGuard:
+    """
+    extract_pages_with_tables의 page_callback으로 사용하는 메모리 상한 검사기.
+    RSS가 상한을 넘으면 MuPDF 캐시를 비우고 GC를 실행한 뒤 다시 확인하며, 그래도 넘으면 MemoryCeilingError를 발생시킵니다.
+    """
+
+    def __init__(self, ceiling_mb: float = AppConfig.LARGE_PDF_MEMORY_CEILING_MB):
+        self.ceiling_mb = ceiling_mb
+        self.start_rss_mb = current_rss_mb()
+        self.peak_rss_mb = self.start_rss_mb
+        self.cache_shrinks = 0
+        self.pages_done = 0
+
+    def __call__(self, page_number: int) -> None:
+        self.pages_done += 1
+        rss = current_rss_mb()
+        if rss > self.ceiling_mb:
+            fitz.TOOLS.store_shrink(100)
+            gc.collect()
+            self.cache_shrinks += 1
+            rss = current_rss_mb()
+        self.peak_rss_mb = max(self.peak_rss_mb, rss)
+        if rss > self.ceiling_mb:
+            raise MemoryCeilingError(
+                f"메모리 상한 {self.ceiling_mb:,.0f} MB 초과 (RSS {rss:,.0f} MB, {page_number}페이지에서 중단, "
+                f"{self.pages_done}페이지 처리). 페이지 범위를 줄이거나 AppConfig.LARGE_PDF_MEMORY_CEILING_MB를 조정하세요."
+            )
+
+def extract_large_pdf(
+    path: str,
+    page_numbers: Optional[List[int]] = None,
+    detect_tables: bool = AppConfig.USE_TABLE_EXTRACTION,
+    memory_ceiling_mb: float = AppConfig.LARGE_PDF_MEMORY_CEILING_MB
+) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    파일 경로로 PDF를 열어 선택한 페이지만 한 장씩 추출합니다 (page_numbers가 None이면 auto_select_pages로 선택).
+    반환 형식은 extract_pages_with_tables와 같으며, metrics에 선택 페이지와 RSS(시작/최대), 메모리 상한이 추가됩니다.
+    """
+    guard = MemoryGuard(memory_ceiling_mb)
+    with fitz.open(path) as doc:
+        selection_info: Dict[str, Any] = {}
+        if page_numbers is None:
+            page_numbers, selection_info = auto_select_pages(doc)
+        page_texts, extraction_info = extract_pages_with_tables(
+            doc, detect_tables=detect_tables, page_numbers=page_numbers, page_callback=guard
+        )
+    extraction_info["metrics"].update(
+        total_document_pages=len(page_texts),
+        selected_pages=list(page_numbers),
+        page_selection=selection_info,
+        rss_start_mb=guard.start_rss_mb,
+        peak_rss_mb=guard.peak_rss_mb,
+        memory_ceiling_mb=memory_ceiling_mb,
+        cache_shrinks=guard.cache_shrinks,
+    )
+    return page_texts, extraction_info
+
+# --- 성능 측정 ---
+def make_large_benchmark_pdf(path: str, n_pages: int = 200, image_px: int = 1000, seed: int = 0) -> int:
+    """
+    스캔 묶음 형태의 합성 PDF를 만듭니다: 페이지마다 압축이 잘 안 되는 잡음 이미지 + 본문 텍스트,
+    앞쪽에 설명 제목, 뒤쪽에 청구항 제목, 마지막 1/5은 텍스트 없는 도면 페이지. 파일 크기(바이트)를 반환합니다.
+    """
+    rng = random.Random(seed)
+    words = "the cathode material sodium layered oxide capacity particle example calcination electrolyte".split()
+    doc = fitz.open()
+    drawing_start = int(n_pages * 0.8)
+    for page_idx in range(n_pages):
+        page_noise = fitz.Pixmap(fitz.csGRAY, image_px, image_px, rng.randbytes(image_px * image_px), False)
+        page = doc.new_page()
+        page.insert_image(fitz.Rect(0, 0, page.rect.width, page.rect.height), pixmap=page_noise)
+        if page_idx < drawing_start:
+            heading = "DESCRIPTION" if page_idx == 1 else ("CLAIMS" if page_idx == drawing_start - 2 else "")
+            lines = ([heading] if heading else []) + [
+                " ".join(rng.choice(words) for _ in range(12)) for _ in range(30)
+            ]
+            page.insert_textbox(fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 50), "\n".join(lines), fontsize=9)
+    doc.save(path)
+    doc.close()
+    return os.path.getsize(path)
+
+def _benchmark_worker(mode: str, path: str, memory_ceiling_mb: float) -> Dict[str, Any]:
+    """별도 프로세스에서 한 가지 방식으로 추출하고 최대 RSS를 잽니다 (프로세스마다 ru_maxrss가 독립적)."""
+    baseline = current_rss_mb()
+    started = time.perf_counter()
+    if mode == "in_memory":
+        # 기존 방식: 업로드 전체를 bytes로 복사해 스트림으로 열고 모든 페이지 추출
+        with open(path, "rb") as f:
+            pdf_bytes = f.read()
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            page_texts, _ = extract_pages_with_tables(doc, detect_tables=False)
+        pages = len(page_texts)
+    else:
+        page_texts, info = extract_large_pdf(path, page_numbers=None, detect_tables=False, memory_ceiling_mb=memory_ceiling_mb)
+        pages = len(info["metrics"]["selected_pages"])
+    return {"mode": mode, "pages_extracted": pages, "seconds": time.perf_counter() - started,
+            "baseline_rss_mb": baseline, "peak_rss_mb": peak_rss_mb()}
+
+def benchmark_large_pdf(n_pages: int = 200, memory_ceiling_mb: float = AppConfig.LARGE_PDF_MEMORY_CEILING_MB) -> Dict[str, Any]:
+    """합성 대용량 PDF로 기존 메모리 방식과 디스크 스트리밍 방식의 최대 RSS/처리 시간을 각각 별도 프로세스에서 측정합니다."""
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "large_benchmark.pdf")
+        size_bytes = make_large_benchmark_pdf(path, n_pages)
+        results = {"pages": n_pages, "file_mb": size_bytes / (1024 * 1024)}
+        for mode in ("in_memory", "streaming"):
+            with context.Pool(1) as pool:
+                results[mode] = pool.apply(_benchmark_worker, (mode, path, memory_ceiling_mb))
+    return results
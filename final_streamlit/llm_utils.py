@@ -0,0 +1,95 @@
+# llm_utils.py
+# Streamlit에 의존하지 않는 LLM 호출 보조 함수 모음 (앱, 배치 CLI, 백필 작업에서 공용으로 사용)
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from app_config import AppConfig
+
+# 토큰 수 추정 시 사용하는 문자/토큰 비율 (대략적인 값)
+CHARS_PER_TOKEN = 4
+
+
+def find_json_block(response_content_str: str) -> Optional[str]:
+    """응답 문자열에서 ```json ... ``` 블록의 내용을 찾아 반환합니다. 없으면 None을 반환합니다."""
+    start_index = response_content_str.find("```json")
+    if start_index == -1:
+        return None
+    start_index += len("```json") # "```json" 이후부터 시작
+    end_index = response_content_str.find("```", start_index)
+    if end_index == -1:
+        return None
+    json_block_str = response_content_str[start_index:end_index].strip()
+    return json_block_str or None
+
+def parse_json_response(response_content_str: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    LLM 응답에서 JSON 객체를 파싱합니다. UI 출력 없이 (결과, 오류 메시지) 튜플을 반환합니다.
+    ```json 블록이 없으면 응답 전체가 JSON 객체인 경우에만 파싱합니다.
+    """
+    if not response_content_str or not response_content_str.strip():
+        return None, "LLM response is empty"
+    json_to_parse = find_json_block(response_content_str)
+    if json_to_parse is None:
+        json_to_parse = response_content_str.strip()
+        if not json_to_parse.startswith("{") or not json_to_parse.endswith("}"):
+            return None, "LLM response does not contain a JSON block and is not a valid JSON object itself."
+    try:
+        parsed = json.loads(json_to_parse)
+    except json.JSONDecodeError as json_e:
+        return None, f"Failed to parse extracted JSON from LLM response: {json_e}"
+    if not isinstance(parsed, dict):
+        return None, "Parsed JSON is not an object."
+    return parsed, None
+
+def get_token_usage(response: Any) -> Dict[str, int]:
+    """
+    LangChain 응답 메시지의 usage_metadata에서 입력/출력 토큰 수를 읽습니다. 정보가 없으면 0으로 채웁니다.
+    cached_input_tokens는 입력 토큰 중 제공자 측 캐시에서 읽은 토큰 수입니다 (input_token_details.cache_read).
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    input_tokens = int(usage.get("input_tokens", 0) or 0)
+    output_tokens = int(usage.get("output_tokens", 0) or 0)
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": int(usage.get("total_tokens", input_tokens + output_tokens) or 0),
+        "cached_input_tokens": int((usage.get("input_token_details") or {}).get("cache_read", 0) or 0),
+    }
+
+def estimate_tokens(text: str) -> int:
+    """문자 수 기반으로 토큰 수를 대략 추정합니다 (호출 전 쿼터 예약, 가짜 모델 사용량 계산용)."""
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+def estimate_cost_usd(model_name: str, usage: Dict[str, int]) -> float:
+    """
+    토큰 사용량과 AppConfig의 단가표로 호출 비용(USD)을 추정합니다. 단가를 모르는 모델은 0으로 계산합니다.
+    캐시에서 읽은 입력 토큰은 AppConfig.CACHED_INPUT_PRICE_RATIO를 곱한 단가로 계산합니다.
+    """
+    input_price, output_price = AppConfig.MODEL_PRICING_PER_1M_TOKENS.get(model_name, (0.0, 0.0))
+    cached_tokens = usage.get("cached_input_tokens", 0)
+    billed_input = usage.get("input_tokens", 0) - cached_tokens + cached_tokens * AppConfig.CACHED_INPUT_PRICE_RATIO
+    return (billed_input * input_price + usage.get("output_tokens", 0) * output_price) / 1_000_000
+
+def create_chat_model(
+    model_name: str,
+    google_api_key: str,
+    temperature: float = AppConfig.TEMPERATURE,
+    cached_content: Optional[str] = None
+):
+    """ChatGoogleGenerativeAI 모델 객체를 생성합니다 (일반 텍스트 모드). cached_content는 참조할 제공자 측 캐시 이름 (prompt_cache.py)."""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    if cached_content:
+        return ChatGoogleGenerativeAI(model=model_name, google_api_key=google_api_key, temperature=temperature, cached_content=cached_content)
+    return ChatGoogleGenerativeAI(model=model_name, google_api_key=google_api_key, temperature=temperature)
+
+def build_full_text_from_pages(page_texts: list, page_numbers: Optional[List[int]] = None) -> str:
+    """
+    페이지별 텍스트를 페이지 구분자와 함께 LLM 입력용 전체 텍스트로 연결합니다.
+    page_numbers(1부터 시작)를 주면 해당 페이지만 원래 페이지 번호로 포함합니다 (대용량 PDF의 페이지 범위 선택).
+    """
+    total_pages = len(page_texts)
+    selected = page_numbers if page_numbers is not None else range(1, total_pages + 1)
+    return "".join(
+        f"\n\n<<<<< PAGE {page_number} / {total_pages} >>>>>\n\n{page_texts[page_number - 1]}"
+        for page_number in selected
+    )
@@ -0,0 +1,336 @@
+# map_reduce.py
+# 모델 컨텍스트보다 큰 문서의 map-reduce 추출: 페이지 경계에서 겹치는 창(window)으로 나누어 창마다 전체 스키마를 병렬 추출하고,
+# 목록 필드는 중복을 제거하여 합치고 스칼라 값은 창 간 다수결(동률이면 앞쪽 창)로 충돌을 해소합니다. 요약 같은 서술형 필드는 창별 값을 이어 붙입니다.
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app_config import AppConfig
+from llm_utils import estimate_tokens
+from pdf_tables import performance_entry_key
+from prompts import PATENT_DATA_SCHEMA_SECTIONS
+from schema_versioning import extract_sections
+from text_compaction import build_prompt_text
+
+# 목록 필드별 중복 판정에 사용할 항목 키 (경로 -> 항목 딕셔너리의 필드 목록). 없는 목록은 항목 전체를 정규화하여 비교
+LIST_DEDUP_FIELDS = {
+    "preparation_method_summary.key_steps_and_conditions": ("process_name", "key_parameters_and_values"),
+    "physical_chemical_properties_specific": ("property_name", "value_or_range", "unit"),
+}
+# 성능 데이터는 표 병합(pdf_tables.merge_table_performance_data)과 같은 키(지표명, 수치, 시료/조건)에 출처까지 더해 비교
+PERFORMANCE_DATA_PATH = "representative_performance_data_from_examples_or_figures"
+# 창마다 표현이 달라 다수결이 의미 없는 서술형 스칼라 필드 (경로 -> 창별 값을 이어 붙일 구분자). 충돌로 기록하지 않음
+FREE_TEXT_SCALAR_SEPARATORS = {
+    "document_summary_for_user": "\n\n",
+    "morphology_structure.particle_form_summary": "; ",
+    "preparation_method_summary.overall_synthesis_route_description": "; ",
+}
+# 지표에 기록할 스칼라 충돌 최대 개수
+MAX_REPORTED_CONFLICTS = 50
+
+
+def split_page_windows(
+    page_texts: List[str],
+    page_numbers: Optional[List[int]] = None,
+    window_tokens: int = AppConfig.MAP_REDUCE_WINDOW_TOKENS,
+    overlap_pages: int = AppConfig.MAP_REDUCE_OVERLAP_PAGES
+) -> List[List[int]]:
+    """
+    페이지(1부터)를 추정 토큰 합이 window_tokens 이하인 창으로 나눕니다. 창은 페이지 경계에서만 나뉘며,
+    다음 창은 이전 창의 마지막 overlap_pages 페이지부터 시작합니다 (페이지에 걸친 문단/표 보존). 한 페이지가 상한보다 크면 그 페이지 하나가 창입니다.
+    """
+    pages = page_numbers if page_numbers is not None else list(range(1, len(page_texts) + 1))
+    page_tokens = [estimate_tokens(page_texts[page_number - 1]) for page_number in pages]
+    windows: List[List[int]] = []
+    start = 0
+    while start < len(pages):
+        end, total = start, 0
+        while end < len(pages) and (end == start or total + page_tokens[end] <= window_tokens):
+            total += page_tokens[end]
+            end += 1
+        windows.append(pages[start:end])
+        if end >= len(pages):
+            break
+        start = max(start + 1, end - overlap_pages)
+    return windows
+
+def _build_window_text(page_texts: List[str], window_pages: List[int], window_index: int, window_count: int) -> str:
+    window_text, _, _ = build_prompt_text(page_texts, page_numbers=window_pages)
+    return (
+        f"NOTE: This is part {window_index + 1} of {window_count} of a longer patent document (pages {window_pages[0]}-{window_pages[-1]}). "
+        "Extract only information present in this part; use null or empty values for anything not found here.\n\n"
+        + window_text
+    )
+
+# --- 병합 ---
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+def _normalize(value: Any) -> str:
+    """대소문자/공백/구두점 차이를 무시하는 비교용 문자열"""
+    text = json.dumps(value, ensure_ascii=False, sort_keys=True) if not isinstance(value, str) else value
+    return re.sub(r"[^\w.%]+", " ", text.lower()).strip()
+
+def _leaf_count(value: Any) -> int:
+    if isinstance(value, dict):
+        return sum(_leaf_count(child) for child in value.values())
+    if isinstance(value, list):
+        return sum(_leaf_count(child) for child in value)
+    return 0 if _is_empty(value) else 1
+
+def _list_item_key(path: str, item: Any) -> Any:
+    if isinstance(item, dict):
+        if path == PERFORMANCE_DATA_PATH:
+            return performance_entry_key(item, include_source=True)
+        fields = LIST_DEDUP_FIELDS.get(path)
+        if fields and any(not _is_empty(item.get(field)) for field in fields):
+            return tuple(_normalize(item.get(field)) for field in fields)
+    return _normalize(item)
+
+def _merge_lists(path: str, lists: List[List[Any]], report: Dict[str, Any]) -> List[Any]:
+    """창 순서대로 이어 붙이고 중복 항목을 제거합니다. 중복이면 채워진 필드가 더 많은 항목을 남깁니다."""
+    merged: List[Any] = []
+    positions: Dict[Any, int] = {}
+    removed = 0
+    for items in lists:
+        for item in items:
+            if _is_empty(item):
+                continue
+            key = _list_item_key(path, item)
+            if key in positions:
+                removed += 1
+                if _leaf_count(item) > _leaf_count(merged[positions[key]]):
+                    merged[positions[key]] = item
+                continue
+            positions[key] = len(merged)
+            merged.append(item)
+    if removed:
+        report["duplicates_removed"][path] = report["duplicates_removed"].get(path, 0) + removed
+    return merged
+
+def _resolve_scalar(path: str, candidates: List[Tuple[int, Any]], report: Dict[str, Any]) -> Any:
+    """비어 있지 않은 값 중 가장 많은 창이 낸 값을 고릅니다. 동률이면 앞쪽 창의 값 (서지 정보/요약은 앞쪽이 원문에 가까움)."""
+    votes: Dict[str, List[Any]] = {}
+    for window_index, value in candidates:
+        votes.setdefault(_normalize(value), []).append((window_index, value))
+    if len(votes) == 1:
+        return candidates[0][1]
+    ranked = sorted(votes.values(), key=lambda group: (-len(group), group[0][0]))
+    chosen = ranked[0][0][1]
+    report["conflict_count"] += 1
+    if len(report["conflicts"]) < MAX_REPORTED_CONFLICTS:
+        report["conflicts"].append({
+            "path": path,
+            "chosen": chosen,
+            "chosen_windows": [window_index + 1 for window_index, _ in ranked[0]],
+            "alternatives": [group[0][1] for group in ranked[1:]],
+        })
+    return chosen
+
+def _join_free_text(path: str, candidates: List[Tuple[int, Any]]) -> str:
+    """창 순서대로 서로 다른 값을 이어 붙입니다. 다른 창의 값에 포함되는 값(예: 'Solid-state reaction'과 'Solid-state reaction method')은 긴 쪽만 남깁니다."""
+    kept: List[Tuple[str, str]] = []
+    for _, value in candidates:
+        text = str(value).strip()
+        normalized = _normalize(text)
+        if any(normalized in existing for existing, _ in kept):
+            continue
+        covered = [index for index, (existing, _) in enumerate(kept) if existing in normalized]
+        if covered:
+            kept[covered[0]] = (normalized, text)
+            kept = [item for index, item in enumerate(kept) if index not in covered[1:]]
+        else:
+            kept.append((normalized, text))
+    return FREE_TEXT_SCALAR_SEPARATORS[path].join(text for _, text in kept)
+
+def _merge_values(path: str, candidates: List[Tuple[int, Any]], report: Dict[str, Any]) -> Any:
+    present = [(window_index, value) for window_index, value in candidates if not _is_empty(value)]
+    if not present:
+        return candidates[0][1] if candidates else None
+    if all(isinstance(value, dict) for _, value in present):
+        keys: List[str] = []
+        for _, value in present:
+            keys.extend(key for key in value if key not in keys)
+        return {
+            key: _merge_values(f"{path}.{key}" if path else key, [(window_index, value[key]) for window_index, value in present if key in value], report)
+            for key in keys
+        }
+    if all(isinstance(value, list) for _, value in present):
+        return _merge_lists(path, [value for _, value in present], report)
+    if path in FREE_TEXT_SCALAR_SEPARATORS and all(isinstance(value, str) for _, value in present):
+        return _join_free_text(path, present)
+    return _resolve_scalar(path, present, report)
+
+def merge_window_results(window_results: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    창별 추출 결과(창 순서)를 하나로 합칩니다. (병합 결과, 병합 보고서) 튜플을 반환하며,
+    보고서에는 목록 경로별 제거한 중복 수와 스칼라 충돌(선택한 값, 다른 후보)이 담깁니다. 서술형 필드(FREE_TEXT_SCALAR_SEPARATORS)는 충돌 없이 이어 붙입니다.
+    """
+    report: Dict[str, Any] = {"duplicates_removed": {}, "conflict_count": 0, "conflicts": []}
+    merged = _merge_values("", list(enumerate(window_results)), report)
+    return merged or {}, report
+
+# --- 추출 ---
+def run_map_reduce_extraction(
+    page_texts: List[str],
+    model: Any,
+    model_name: str,
+    pdf_filename: str,
+    page_numbers: Optional[List[int]] = None,
+    prefilled_patent_info: Optional[Dict[str, Any]] = None,
+    window_tokens: int = AppConfig.MAP_REDUCE_WINDOW_TOKENS,
+    overlap_pages: int = AppConfig.MAP_REDUCE_OVERLAP_PAGES,
+    max_workers: int = AppConfig.MAP_REDUCE_MAX_WORKERS,
+    timeout: int = AppConfig.API_REQUEST_TIMEOUT_STRUCTURED_DATA
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    페이지 창마다 전체 스키마를 병렬 추출(map)하고 병합(reduce)합니다. (구조화 데이터, 지표) 튜플을 반환합니다.
+    일부 창이 실패하면 나머지 창으로 병합하고 지표의 failed_windows에 기록합니다. 모든 창이 실패하면 구조화 데이터는 'error' 딕셔너리입니다.
+    """
+    started = time.perf_counter()
+    windows = split_page_windows(page_texts, page_numbers, window_tokens, overlap_pages)
+    section_names = list(PATENT_DATA_SCHEMA_SECTIONS)
+
+    def _map(window_index: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        window_text = _build_window_text(page_texts, windows[window_index], window_index, len(windows))
+        return extract_sections(model, model_name, window_text, pdf_filename, section_names,
+                                timeout=timeout, prefilled_patent_info=prefilled_patent_info)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="map-reduce") as executor:
+        results = list(executor.map(_map, range(len(windows))))
+
+    window_metrics = []
+    for window_index, (partial, stats) in enumerate(results):
+        window_metrics.append({
+            "window": window_index + 1,
+            "pages": [windows[window_index][0], windows[window_index][-1]],
+            "page_count": len(windows[window_index]),
+            "latency_seconds": stats["latency_seconds"],
+            "input_tokens": stats["usage"]["input_tokens"],
+            "output_tokens": stats["usage"]["output_tokens"],
+            "cost_usd": stats["cost_usd"],
+            "sections_returned": len(partial),
+            "error": stats["error"] or (None if partial else "No requested sections in response."),
+        })
+    succeeded = [partial for partial, _ in results if partial]
+    merge_started = time.perf_counter()
+    merged, merge_report = merge_window_results(succeeded)
+    metrics = {
+        "window_count": len(windows),
+        "failed_windows": [window["window"] for window in window_metrics if window["error"]],
+        "window_tokens": window_tokens,
+        "overlap_pages": overlap_pages,
+        "input_tokens": sum(window["input_tokens"] for window in window_metrics),
+        "output_tokens": sum(window["output_tokens"] for window in window_metrics),
+        "cost_usd": sum(window["cost_usd"] for window in window_metrics),
+        "sum_latency_seconds": sum(window["latency_seconds"] for window in window_metrics),
+        "merge_seconds": time.perf_counter() - merge_started,
+        "wall_seconds": time.perf_counter() - started,
+        "windows": window_metrics,
+        **merge_report,
+    }
+    if not succeeded:
+        return {
+            "error": "Map-reduce extraction failed for all page windows.",
+            "details": [window["error"] for window in window_metrics][:5],
+            "source_file_name": pdf_filename,
+            "language_of_document": "Unknown",
+        }, metrics
+    structured_data = {name: merged[name] for name in section_names if name in merged}
+    structured_data["source_file_name"] = pdf_filename
+    return structured_data, metrics
+
+def should_use_map_reduce(full_prompt_text: str) -> bool:
+    """프롬프트 텍스트의 추정 토큰이 AppConfig.MAP_REDUCE_TRIGGER_TOKENS를 넘으면 True (한 번의 요청으로는 내용이 누락될 수 있는 크기)"""
+    return estimate_tokens(full_prompt_text) > AppConfig.MAP_REDUCE_TRIGGER_TOKENS
+
+# --- 성능 측정 ---
+_BENCH_EXAMPLE_RE = re.compile(r"Example (\d+): the first cycle discharge capacity was (\d+) mAh/g")
+_BENCH_STEP_RE = re.compile(r"Step (\w+): calcination at (\d+) °C")
+
+def make_benchmark_long_patent_pages(n_pages: int = 300, seed: int = 0) -> Tuple[List[str], int]:
+    """
+    측정용 합성 장문 특허: 5페이지마다 실시예 성능 문장, 20페이지마다 제조 단계 문장을 넣습니다. (페이지 텍스트, 실시예 수) 반환.
+    실제 특허처럼 여러 실시예가 같은 용량 값을 가지므로 (10개 주기), 병합이 수치만으로 중복을 판정하면 완전성이 떨어집니다.
+    """
+    from text_compaction import make_benchmark_pages
+    pages = make_benchmark_pages(n_pages, seed=seed)
+    examples = 0
+    for page_idx in range(0, n_pages, 5):
+        examples += 1
+        pages[page_idx] += f"\nExample {examples}: the first cycle discharge capacity was {120 + examples % 10 * 5} mAh/g.\n"
+        if page_idx % 20 == 0:
+            pages[page_idx] += f"Step S{page_idx // 20 + 1}: calcination at {600 + page_idx} °C for 10 hours.\n"
+    return pages, examples
+
+def _benchmark_responder(prompt: str) -> str:
+    """프롬프트(컨텍스트 창 안에 들어간 부분)에서 실시예/제조 단계 문장을 찾아 응답을 만드는 가짜 모델 응답 함수"""
+    from fake_llm import json_response
+    return json_response({
+        "patent_info": {"title": "Sodium layered oxide cathode material", "publication_number": "EP 3 968 410 A1"},
+        "preparation_method_summary": {"key_steps_and_conditions": [
+            {"step_id": step_id, "process_name": "Calcination",
+             "key_parameters_and_values": [{"parameter_name": "Temperature", "value_or_range": temperature, "unit": "°C"}]}
+            for step_id, temperature in _BENCH_STEP_RE.findall(prompt)
+        ]},
+        PERFORMANCE_DATA_PATH: [
+            {"metric_name": "First Cycle Discharge Specific Capacity", "value": capacity, "unit": "mAh/g",
+             "conditions_or_context": f"Example {example_id}", "source_reference_in_document": f"Example {example_id}"}
+            for example_id, capacity in _BENCH_EXAMPLE_RE.findall(prompt)
+        ],
+        "language_of_document": "English",
+    })
+
+def benchmark_map_reduce(
+    n_pages: int = 300,
+    context_tokens: int = 60_000,
+    window_tokens: int = 20_000,
+    latency_seconds: float = 0.5,
+    latency_per_1k_input_tokens: float = 0.05,
+    max_workers: int = AppConfig.MAP_REDUCE_MAX_WORKERS
+) -> Dict[str, Any]:
+    """
+    컨텍스트 창(context_tokens)을 넘는 입력의 뒷부분을 잃는 가짜 모델로 합성 장문 특허를 한 번에 추출(single-shot)할 때와
+    map-reduce로 추출할 때의 경과 시간/처리량과 완전성(찾아낸 실시예 비율)을 비교합니다.
+    """
+    from fake_llm import FakeChatModel
+
+    page_texts, example_count = make_benchmark_long_patent_pages(n_pages)
+    model = FakeChatModel(_benchmark_responder, latency_seconds=latency_seconds,
+                          latency_per_1k_input_tokens=latency_per_1k_input_tokens, context_window_tokens=context_tokens)
+    full_text, _, _ = build_prompt_text(page_texts)
+
+    def _completeness(data: Dict[str, Any]) -> float:
+        found = {entry["conditions_or_context"] for entry in data.get(PERFORMANCE_DATA_PATH) or []}
+        return len(found) / example_count if example_count else 1.0
+
+    started = time.perf_counter()
+    single_data, single_stats = extract_sections(model, "fake-model", full_text, "bench_long.pdf", list(PATENT_DATA_SCHEMA_SECTIONS))
+    single_seconds = time.perf_counter() - started
+    map_reduce_data, metrics = run_map_reduce_extraction(
+        page_texts, model, "fake-model", "bench_long.pdf", window_tokens=window_tokens, max_workers=max_workers
+    )
+    return {
+        "pages": n_pages,
+        "examples": example_count,
+        "prompt_tokens_estimate": estimate_tokens(full_text),
+        "context_tokens": context_tokens,
+        "single_shot": {
+            "seconds": single_seconds,
+            "pages_per_second": n_pages / single_seconds if single_seconds else 0.0,
+            "input_tokens": single_stats["usage"]["input_tokens"],
+            "completeness": _completeness(single_data),
+        },
+        "map_reduce": {
+            "seconds": metrics["wall_seconds"],
+            "pages_per_second": n_pages / metrics["wall_seconds"] if metrics["wall_seconds"] else 0.0,
+            "input_tokens": metrics["input_tokens"],
+            "completeness": _completeness(map_reduce_data),
+            "windows": metrics["window_count"],
+            "duplicates_removed": metrics["duplicates_removed"],
+            "conflict_count": metrics["conflict_count"],
+            "merge_seconds": metrics["merge_seconds"],
+        },
+    }
@@ -0,0 +1,203 @@
+# model_routing.py
+# 섹션별 모델 라우팅(캐스케이드): 저가 모델로 먼저 추출하고, 검증에 실패하거나 저신뢰로 보이는 섹션만 고성능 모델로 승급
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app_config import AppConfig
+from llm_utils import estimate_cost_usd, estimate_tokens
+from prompts import PATENT_DATA_SCHEMA_SECTIONS
+from schema_versioning import build_section_extraction_prompt, extract_sections
+
+
+def _expected_section_type(section_name: str) -> Optional[type]:
+    """스키마 섹션 프롬프트 텍스트에서 해당 섹션 값의 JSON 타입(dict/list/str)을 알아냅니다."""
+    section_text = PATENT_DATA_SCHEMA_SECTIONS.get(section_name, "")
+    value_text = section_text.split(":", 1)[1].lstrip() if ":" in section_text else ""
+    return {"{": dict, "[": list, '"': str}.get(value_text[:1])
+
+def _iter_leaf_values(value: Any) -> Iterator[Any]:
+    if isinstance(value, dict):
+        for child in value.values():
+            yield from _iter_leaf_values(child)
+    elif isinstance(value, list) and value:
+        for child in value:
+            yield from _iter_leaf_values(child)
+    else:
+        yield value
+
+def validate_section_output(section_name: str, value: Any, present: bool = True) -> List[str]:
+    """
+    추출된 섹션 값을 검증하여 문제 목록을 반환합니다. 빈 리스트면 통과입니다.
+    구조 오류(누락, 타입 불일치)와 저신뢰 신호(빈 섹션, 빈 필드 비율, 화학식 대비 매개변수 누락 등)를 함께 확인합니다.
+    """
+    if not present:
+        return ["missing from response"]
+    expected_type = _expected_section_type(section_name)
+    if value is None:
+        return [] if expected_type is str else ["section is null"]
+    if expected_type and not isinstance(value, expected_type):
+        return [f"expected {expected_type.__name__}, got {type(value).__name__}"]
+
+    if value == {} or value == []:
+        # 빈 섹션은 잎 값이 없어 빈 필드 비율로 걸러지지 않으므로 따로 저신뢰로 표시 (상위 등급도 비우면 그 값을 사용)
+        return ["low confidence: section is empty"]
+    issues = []
+    if isinstance(value, dict):
+        leaves = list(_iter_leaf_values(value))
+        empty_count = sum(1 for leaf in leaves if leaf in (None, "", []))
+        if leaves and empty_count / len(leaves) > AppConfig.CASCADE_MAX_EMPTY_FIELD_RATIO:
+            issues.append(f"low confidence: {empty_count}/{len(leaves)} fields empty")
+    if section_name == "material_description" and isinstance(value, dict):
+        if value.get("chemical_formula_general") and not value.get("formula_parameters"):
+            issues.append("general formula given but formula_parameters empty")
+    if section_name == "preparation_method_summary" and isinstance(value, dict):
+        if value.get("overall_synthesis_route_description") and not value.get("key_steps_and_conditions"):
+            issues.append("synthesis route given but key_steps_and_conditions empty")
+    return issues
+
+def _run_group(
+    group_name: str,
+    section_names: List[str],
+    tiers: List[str],
+    models: Dict[str, Any],
+    model_names: Dict[str, str],
+    full_patent_text: str,
+    pdf_filename: str,
+    prefilled_patent_info: Optional[Dict[str, Any]],
+    timeout: int
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """한 섹션 그룹을 등급 순서대로 추출합니다. 앞 등급에서 통과한 섹션은 다음 등급으로 넘기지 않습니다."""
+    accepted: Dict[str, Any] = {}
+    fallback: Dict[str, Any] = {} # 검증에는 실패했지만 값은 있는 섹션 (상위 등급도 실패하면 사용)
+    call_metrics: List[Dict[str, Any]] = []
+    section_report: Dict[str, Dict[str, Any]] = {}
+    pending = list(section_names)
+
+    for attempt_idx, tier in enumerate(tiers):
+        if not pending:
+            break
+        partial, stats = extract_sections(
+            models[tier], model_names[tier], full_patent_text, pdf_filename, pending,
+            timeout=timeout, prefilled_patent_info=prefilled_patent_info
+        )
+        issues_by_section = {
+            name: ([stats["error"]] if stats["error"] else validate_section_output(name, partial.get(name), name in partial))
+            for name in pending
+        }
+        call_metrics.append({
+            "group": group_name,
+            "attempt": attempt_idx,
+            "tier": tier,
+            "model_name": model_names[tier],
+            "sections": list(pending),
+            "latency_seconds": stats["latency_seconds"],
+            "input_tokens": stats["usage"]["input_tokens"],
+            "output_tokens": stats["usage"]["output_tokens"],
+            "cost_usd": stats["cost_usd"],
+            "error": stats["error"],
+            "issues": {name: issues for name, issues in issues_by_section.items() if issues},
+        })
+        still_pending = []
+        for name in pending:
+            section_report[name] = {
+                "group": group_name,
+                "tier": tier,
+                "model_name": model_names[tier],
+                "escalated": attempt_idx > 0,
+                "issues": issues_by_section[name],
+            }
+            if not issues_by_section[name]:
+                accepted[name] = partial.get(name)
+            else:
+                if name in partial:
+                    fallback[name] = partial[name]
+                still_pending.append(name)
+        pending = still_pending
+
+    for name in pending:
+        if name in fallback:
+            accepted[name] = fallback[name]
+    return accepted, call_metrics, section_report
+
+def run_cascade_extraction(
+    full_patent_text: str,
+    pdf_filename: str,
+    models: Dict[str, Any],
+    model_names: Dict[str, str] = AppConfig.CASCADE_MODEL_NAMES,
+    routes: Dict[str, Tuple[List[str], List[str]]] = AppConfig.SECTION_MODEL_ROUTES,
+    prefilled_patent_info: Optional[Dict[str, Any]] = None,
+    max_workers: int = AppConfig.CASCADE_MAX_WORKERS,
+    timeout: int = AppConfig.API_REQUEST_TIMEOUT_STRUCTURED_DATA
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    라우팅 표에 따라 섹션 그룹을 병렬로 추출하고 스키마 순서대로 합칩니다.
+    (구조화 데이터, 지표) 튜플을 반환합니다. 지표에는 호출별 지연/토큰/비용과 섹션별 사용 모델이 담깁니다.
+    모든 그룹이 실패하면 구조화 데이터는 기존 파이프라인과 같은 'error' 딕셔너리입니다.
+    models는 등급 이름("cheap", "strong")을 모델 객체에 매핑하며, 테스트에서는 FakeChatModel을 넣을 수 있습니다.
+    """
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [
+            executor.submit(
+                _run_group, group_name, section_names, tiers, models, model_names,
+                full_patent_text, pdf_filename, prefilled_patent_info, timeout
+            )
+            for group_name, (section_names, tiers) in routes.items()
+        ]
+        group_results = [future.result() for future in futures]
+
+    extracted: Dict[str, Any] = {}
+    call_metrics: List[Dict[str, Any]] = []
+    section_report: Dict[str, Dict[str, Any]] = {}
+    for accepted, group_calls, group_sections in group_results:
+        extracted.update(accepted)
+        call_metrics.extend(group_calls)
+        section_report.update(group_sections)
+
+    # 비교 기준의 입력: 전체 스키마를 한 번에 요청하는 단일 호출 프롬프트 (문서 텍스트는 한 번만 포함)
+    full_prompt_tokens = estimate_tokens(build_section_extraction_prompt(
+        full_patent_text, pdf_filename, [name for section_names, _ in routes.values() for name in section_names], prefilled_patent_info
+    ))
+    metrics = summarize_cascade_metrics(call_metrics, model_names, full_prompt_tokens)
+    metrics.update(wall_seconds=time.perf_counter() - started, calls=call_metrics, sections=section_report)
+    if not extracted:
+        errors = [call["error"] for call in call_metrics if call["error"]]
+        return {
+            "error": "Model cascade extraction failed for all section groups.",
+            "details": errors[:5],
+            "source_file_name": pdf_filename,
+            "language_of_document": "Unknown",
+        }, metrics
+    # 스키마 순서대로 정렬
+    structured_data = {name: extracted[name] for name in PATENT_DATA_SCHEMA_SECTIONS if name in extracted}
+    structured_data["source_file_name"] = pdf_filename
+    return structured_data, metrics
+
+def summarize_cascade_metrics(
+    call_metrics: List[Dict[str, Any]],
+    model_names: Dict[str, str],
+    full_prompt_tokens: int
+) -> Dict[str, Any]:
+    """
+    호출 지표를 합산하고, 전체 스키마를 고성능 모델 한 번으로 추출했을 때의 비용과 비교합니다.
+    full_prompt_tokens: 단일 호출 프롬프트(문서 텍스트 1회 + 전체 스키마)의 입력 토큰 수.
+    """
+    input_tokens = sum(call["input_tokens"] for call in call_metrics)
+    output_tokens = sum(call["output_tokens"] for call in call_metrics)
+    cost_usd = sum(call["cost_usd"] for call in call_metrics)
+    # 비교 기준: 단일 고성능 호출. 그룹마다 문서를 다시 보내므로 그룹 호출의 입력 토큰을 더하면 문서 토큰이 그룹 수만큼 중복됨.
+    # 출력은 각 그룹 첫 시도의 출력 합계(모든 섹션의 응답 한 번)로 봅니다.
+    baseline_cost_usd = estimate_cost_usd(model_names.get("strong", ""), {
+        "input_tokens": full_prompt_tokens,
+        "output_tokens": sum(call["output_tokens"] for call in call_metrics if call["attempt"] == 0),
+    })
+    return {
+        "call_count": len(call_metrics),
+        "escalated_call_count": sum(1 for call in call_metrics if call["attempt"] > 0),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost_usd": cost_usd,
+        "strong_only_cost_usd": baseline_cost_usd,
+        "sum_latency_seconds": sum(call["latency_seconds"] for call in call_metrics),
+    }
@@ -0,0 +1,113 @@
+# page_render.py
+# PDF 뷰어(Tab 1)용 페이지 렌더링
+# PyMuPDF 픽스맵 버퍼를 PIL로 바로 감싸 JPEG 한 번으로 인코딩합니다. 기존 경로(MuPDF PNG 인코딩 -> PIL 디코딩 -> Streamlit JPEG 재인코딩)를 거치지 않고,
+# 인코딩된 바이트는 st.image가 다시 인코딩하지 않고 그대로 전송합니다. 저해상도 미리보기/썸네일도 같은 함수로 만듭니다.
+# 렌더링 결과는 render_cache.RenderCache(디스크)에 보관하며, warm_render_cache로 미리 채울 수 있습니다.
+import io
+import time
+from typing import Any, Dict, List, Optional, Union
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from app_config import AppConfig
+from render_cache import RenderCache
+from result_store import compute_file_document_id
+
+
+def open_pdf(pdf_source: Union[bytes, str]) -> Any:
+    """PDF 바이트 또는 (대용량 모드) 파일 경로에서 문서를 엽니다."""
+    if isinstance(pdf_source, str):
+        return fitz.open(pdf_source)
+    return fitz.open(stream=pdf_source, filetype="pdf")
+
+def pixmap_to_jpeg(pix: Any, quality: int = AppConfig.PDF_VIEWER_JPEG_QUALITY) -> bytes:
+    """픽스맵 샘플 버퍼를 복사 없이 PIL 이미지로 감싸 JPEG 바이트로 인코딩합니다."""
+    img = Image.frombuffer("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", pix.stride, 1)
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+def render_page_jpeg(doc: Any, page_num: int, dpi: int, quality: int = AppConfig.PDF_VIEWER_JPEG_QUALITY) -> Optional[bytes]:
+    """열린 문서의 페이지(0부터 시작)를 dpi로 렌더링하여 JPEG 바이트로 반환합니다. 범위를 벗어나면 None."""
+    if not 0 <= page_num < len(doc):
+        return None
+    zoom = dpi / 72
+    pix = doc.load_page(page_num).get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False, colorspace=fitz.csRGB)
+    return pixmap_to_jpeg(pix, quality)
+
+def render_pdf_page_jpeg(pdf_source: Union[bytes, str], page_num: int, dpi: int, quality: int = AppConfig.PDF_VIEWER_JPEG_QUALITY) -> Optional[bytes]:
+    """PDF 바이트/경로에서 페이지 하나를 JPEG 바이트로 렌더링합니다."""
+    doc = open_pdf(pdf_source)
+    try:
+        return render_page_jpeg(doc, page_num, dpi, quality)
+    finally:
+        doc.close()
+
+def thumbnail_window(current_page: int, total_pages: int, count: int = AppConfig.PDF_VIEWER_THUMBNAIL_COUNT) -> List[int]:
+    """현재 페이지(0부터 시작)를 가운데에 둔 썸네일 페이지 번호 목록. 문서 끝에서는 창을 안쪽으로 당깁니다."""
+    count = min(count, total_pages)
+    start = max(0, min(current_page - count // 2, total_pages - count))
+    return list(range(start, start + count))
+
+def _render_page_png_roundtrip(doc: Any, page_num: int, dpi: int) -> bytes:
+    """기존 뷰어 경로 재현 (벤치마크용): MuPDF PNG 인코딩 -> PIL 디코딩 -> st.image의 JPEG 재인코딩"""
+    zoom = dpi / 72
+    pix = doc.load_page(page_num).get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    img = Image.open(io.BytesIO(pix.tobytes("png")))
+    buffer = io.BytesIO()
+    img.convert("RGB").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+def benchmark_page_render(pdf_source: Union[bytes, str], max_pages: int = 20) -> Dict[str, Any]:
+    """
+    앞쪽 max_pages 페이지에 대해 페이지당 렌더링 시간(ms)을 비교합니다.
+    legacy_png: 기존 PNG 왕복 경로, direct_jpeg: 고해상도 직접 인코딩, first_paint: 저해상도 미리보기(첫 화면 표시까지).
+    """
+    doc = open_pdf(pdf_source)
+    try:
+        pages = list(range(min(max_pages, len(doc))))
+        render_modes = {
+            "legacy_png": lambda page_num: _render_page_png_roundtrip(doc, page_num, AppConfig.DEFAULT_DPI_PDF_PREVIEW),
+            "direct_jpeg": lambda page_num: render_page_jpeg(doc, page_num, AppConfig.DEFAULT_DPI_PDF_PREVIEW),
+            "first_paint": lambda page_num: render_page_jpeg(doc, page_num, AppConfig.PDF_VIEWER_PREVIEW_DPI),
+        }
+        stats: Dict[str, Any] = {"pages": len(pages)}
+        for mode, render in render_modes.items():
+            timings_ms, total_bytes = [], 0
+            for page_num in pages:
+                started = time.perf_counter()
+                total_bytes += len(render(page_num))
+                timings_ms.append((time.perf_counter() - started) * 1000)
+            stats[mode] = {
+                "mean_ms": sum(timings_ms) / len(timings_ms) if timings_ms else 0.0,
+                "max_ms": max(timings_ms, default=0.0),
+                "mean_kb": total_bytes / 1024 / len(pages) if pages else 0.0,
+            }
+        return stats
+    finally:
+        doc.close()
+
+def warm_render_cache(pdf_path: str, cache_dir: str = AppConfig.RENDER_CACHE_DIR, max_pages: Optional[int] = None) -> Dict[str, Any]:
+    """
+    PDF 앞쪽 max_pages 페이지(None이면 전체)를 미리보기/고해상도 DPI로 렌더링하여 디스크 캐시에 넣습니다 (작업 프로세스에서 실행 가능).
+    이미 캐시된 페이지는 건너뜁니다. 반환: {'path', 'pages', 'rendered', 'cached', 'seconds'}
+    """
+    started = time.perf_counter()
+    cache = RenderCache(cache_dir)
+    document_id = compute_file_document_id(pdf_path)
+    doc = open_pdf(pdf_path)
+    try:
+        page_count = len(doc) if max_pages is None else min(max_pages, len(doc))
+        for page_num in range(page_count):
+            for dpi in (AppConfig.PDF_VIEWER_PREVIEW_DPI, AppConfig.DEFAULT_DPI_PDF_PREVIEW):
+                cache.get_or_render(document_id, page_num, dpi, lambda: render_page_jpeg(doc, page_num, dpi))
+    finally:
+        doc.close()
+    return {
+        "path": pdf_path,
+        "pages": page_count,
+        "rendered": cache.misses,
+        "cached": cache.hits,
+        "seconds": time.perf_counter() - started,
+    }
@@ -0,0 +1,105 @@
+# pages/1_quota_dashboard.py
+# LLM 쿼터 사용 현황 대시보드 (현재 사용량, 대기 중인 작업, 최근 429/타임아웃, 감시 폴더 수집 서비스 지표)
+import os
+import time
+
+import streamlit as st
+
+from app_config import AppConfig
+from ingest_daemon import INGEST_METRICS_FILENAME, read_ingest_metrics
+from quota import get_quota_manager
+
+# 대시보드 자동 갱신 주기 (초)
+DASHBOARD_REFRESH_SECONDS = 2
+
+
+def _usage_bar(label: str, current: int, limit: int):
+    """현재 사용량을 한도 대비 진행 막대로 표시합니다."""
+    ratio = min(current / limit, 1.0) if limit else 0.0
+    st.progress(ratio, text=f"{label}: {current:,} / {limit:,}")
+
+@st.fragment(run_every=DASHBOARD_REFRESH_SECONDS)
+def render_quota_dashboard():
+    snapshot = get_quota_manager().snapshot()
+    usage, limits, totals = snapshot["global"], snapshot["limits"], snapshot["totals"]
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("진행 중 호출", usage["inflight_calls"])
+    col2.metric("진행 중 토큰 (예약)", f"{usage['inflight_tokens']:,}")
+    col3.metric("최근 1분 토큰", f"{usage['tokens_last_minute']:,}")
+    col4.metric("대기 중 작업", usage["queued"])
+
+    _usage_bar("전체 동시 호출", usage["inflight_calls"], limits["max_inflight_calls_global"])
+    _usage_bar("전체 분당 토큰", usage["tokens_last_minute"] + usage["inflight_tokens"], limits["max_tokens_per_minute_global"])
+    st.caption(
+        f"누적 호출 {totals['calls']:,}회 · 누적 토큰 {totals['tokens']:,} · 쿼터 대기 초과 {totals['rejected']}회 · "
+        f"세션별 한도: 동시 호출 {limits['max_inflight_calls_per_session']}, 분당 토큰 {limits['max_tokens_per_minute_per_session']:,}"
+    )
+
+    st.subheader("세션별 사용량")
+    if snapshot["sessions"]:
+        st.dataframe([
+            {
+                "세션": session["session_id"][:8],
+                "진행 중 호출": session["inflight_calls"],
+                "진행 중 토큰": session["inflight_tokens"],
+                "최근 1분 토큰": session["tokens_last_minute"],
+                "대기 중": session["queued"],
+            }
+            for session in snapshot["sessions"]
+        ], use_container_width=True)
+    else:
+        st.markdown("_최근 1분 동안 LLM을 호출한 세션이 없습니다._")
+
+    st.subheader("대기 중인 작업")
+    if snapshot["queued"]:
+        st.dataframe([
+            {
+                "세션": job["session_id"][:8],
+                "모델": job["label"],
+                "예상 토큰": job["estimated_tokens"],
+                "대기 시간(s)": round(job["waiting_seconds"], 1),
+            }
+            for job in snapshot["queued"]
+        ], use_container_width=True)
+    else:
+        st.markdown("_대기 중인 작업이 없습니다._")
+
+    st.subheader("최근 오류 (429 / 타임아웃 / 쿼터 대기 초과)")
+    if snapshot["recent_events"]:
+        st.dataframe([
+            {
+                "시각": time.strftime("%H:%M:%S", time.localtime(event["time"])),
+                "유형": event["type"],
+                "세션": event["session_id"][:8],
+                "상세": event["detail"],
+            }
+            for event in snapshot["recent_events"]
+        ], use_container_width=True)
+    else:
+        st.markdown("_최근 오류가 없습니다._")
+
+@st.fragment(run_every=DASHBOARD_REFRESH_SECONDS)
+def render_ingest_metrics():
+    """감시 폴더 수집 서비스(batch_cli.py ingest)가 기록한 지표 파일을 표시합니다. 서비스는 별도 프로세스이므로 파일로 공유합니다."""
+    metrics = read_ingest_metrics(os.path.join(AppConfig.RESULT_STORE_DIR, INGEST_METRICS_FILENAME))
+    st.subheader("감시 폴더 수집 서비스")
+    if metrics is None:
+        st.markdown("_수집 서비스 지표가 없습니다 (`python batch_cli.py ingest <폴더>`로 실행)._")
+        return
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("백로그", metrics["backlog_depth"])
+    col2.metric("처리 중", f"{metrics['in_flight']} / {metrics['workers']}")
+    col3.metric("처리 지연 p95 (도착 -> 저장)", f"{metrics['lag_seconds_p95']:.0f}s")
+    col4.metric("파일별 처리 p50 / p95", f"{metrics['latency_seconds_p50']:.1f}s / {metrics['latency_seconds_p95']:.1f}s")
+    st.caption(
+        f"{metrics['watch_dir']} · 완료 {metrics['processed']:,} · 실패 {metrics['failed']:,} (재시도 대기 {metrics['retry_pending']}, 포기 {metrics['gave_up']}) · "
+        f"기존 문서 건너뜀 {metrics['skipped_existing']:,} · 가장 오래 기다린 파일 {metrics['oldest_waiting_age_seconds']:.0f}s · "
+        f"지표 갱신 {time.time() - metrics['updated_at']:.0f}s 전"
+    )
+
+st.set_page_config(page_title="LLM 쿼터 대시보드", layout="wide")
+st.title("📈 LLM 쿼터 대시보드")
+st.markdown(f"공유 API 키의 호출/토큰 사용 현황입니다. {DASHBOARD_REFRESH_SECONDS}초마다 자동으로 갱신됩니다.")
+render_quota_dashboard()
+render_ingest_metrics()
@@ -0,0 +1,138 @@
+# pages/2_patent_comparison.py
+# 저장된 분석 결과 여러 건의 수치 지표(용량, BET, 입자 크기 등)를 비교/필터/정렬하는 페이지
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from app_config import AppConfig
+from comparison_data import COMPARISON_METRICS, DOCUMENT_COLUMNS, build_comparison_frame, filter_comparison_frame
+from element_index import ELEMENT_SYMBOLS, ElementIndex
+from export import EXPORT_FORMATS, build_export_archive, export_records
+from result_store import ResultStore
+
+# 표에 한 번에 그릴 최대 행 수 (필터/정렬은 전체 행에 적용)
+MAX_DISPLAY_ROWS = 1000
+HISTOGRAM_BINS = 30
+
+
+@st.cache_data(max_entries=1, show_spinner="저장된 분석 결과에서 비교 표를 만드는 중...")
+def load_comparison_data(store_dir: str, store_fingerprint: str) -> tuple:
+    """
+    비교 표와 원소 인덱스(같은 행 순서)를 만들어 캐시합니다. store_fingerprint가 바뀔 때(문서 추가/갱신)만 다시 계산되므로,
+    위젯을 바꿀 때마다 JSON을 다시 읽거나 파싱하지 않습니다.
+    """
+    records = list(ResultStore(store_dir).iter_records())
+    return build_comparison_frame(records), ElementIndex.from_records(records)
+
+def render_metric_filters(frame: pd.DataFrame) -> tuple:
+    """사이드바에 지표별 범위 슬라이더를 그리고 (범위 조건, 값 필수 지표 목록)을 반환합니다."""
+    ranges = {}
+    require_values = []
+    st.sidebar.subheader("지표 범위")
+    for column, metric in COMPARISON_METRICS.items():
+        values = frame[column].to_numpy()
+        present = values[~np.isnan(values)]
+        if present.size == 0:
+            continue
+        low, high = float(present.min()), float(present.max())
+        if low == high:
+            st.sidebar.caption(f"{metric.label}: {low:g} ({present.size}건)")
+            continue
+        selected = st.sidebar.slider(f"{metric.label} ({present.size}건)", low, high, (low, high), key=f"range_{column}")
+        if selected != (low, high):
+            ranges[column] = selected
+        if st.sidebar.checkbox("값이 없는 문서 제외", key=f"require_{column}"):
+            ranges[column] = selected
+            require_values.append(column)
+    return ranges, require_values
+
+def render_histogram(frame: pd.DataFrame):
+    """선택한 지표의 분포를 필터 결과 기준으로 표시합니다."""
+    available = [column for column in COMPARISON_METRICS if frame[column].notna().any()]
+    if not available:
+        return
+    column = st.selectbox("분포를 볼 지표", available, format_func=lambda c: COMPARISON_METRICS[c].label, key="histogram_metric")
+    values = frame[column].to_numpy()
+    values = values[~np.isnan(values)]
+    counts, edges = np.histogram(values, bins=min(HISTOGRAM_BINS, max(1, np.unique(values).size)))
+    st.bar_chart(pd.DataFrame({"문서 수": counts}, index=[f"{edge:.3g}" for edge in edges[:-1]]))
+
+def render_export_section(store: ResultStore, store_fingerprint: str, filtered_document_ids: list):
+    """전체(또는 필터 결과) 분석 결과를 정규화된 표(Parquet/CSV) zip으로 만들어 다운로드 버튼을 표시합니다."""
+    with st.expander("표 형식으로 내보내기 (Parquet/CSV)"):
+        st.caption("문서당 한 행인 patents 표와 리스트 필드별 하위 표(우선권, 화학식 매개변수, 제조 단계, 성능 데이터 등)를 document_id로 연결합니다.")
+        col1, col2 = st.columns(2)
+        formats = col1.multiselect("형식", EXPORT_FORMATS, default=["parquet"], key="export_formats")
+        filtered_only = col2.checkbox(f"현재 필터 결과만 ({len(filtered_document_ids):,}건)", key="export_filtered_only")
+        document_ids = set(filtered_document_ids) if filtered_only else None
+        export_key = (store_fingerprint, tuple(formats), tuple(sorted(document_ids)) if document_ids is not None else None)
+        if st.button("내보내기 파일 만들기", disabled=not formats, key="export_build_button"):
+            records = (record for record in store.iter_records() if document_ids is None or record["document_id"] in document_ids)
+            with st.spinner("표로 변환하여 파일에 기록하는 중..."), tempfile.TemporaryDirectory() as export_dir:
+                try:
+                    report = export_records(records, export_dir, formats=formats)
+                    st.session_state["export_archive"] = (export_key, build_export_archive(export_dir), report)
+                except (RuntimeError, ValueError) as e:
+                    st.error(f"내보내기 실패: {e}")
+        archive = st.session_state.get("export_archive")
+        if archive and archive[0] == export_key:
+            _, archive_bytes, report = archive
+            st.caption(
+                f"문서 {report['documents']:,}건, {report['seconds']:.2f}s · "
+                + ", ".join(f"{name} {count:,}행" for name, count in report["rows"].items() if count)
+            )
+            st.download_button("zip 다운로드", archive_bytes, file_name="patent_analysis_export.zip",
+                               mime="application/zip", key="export_download_button")
+
+st.set_page_config(page_title="특허 비교", layout="wide")
+st.title("🧮 특허 비교")
+st.markdown("저장된 분석 결과의 수치 지표를 기준 단위로 정규화하여 비교합니다. 필터와 정렬은 캐시된 열 데이터 위에서 바로 계산됩니다.")
+
+store = ResultStore(AppConfig.RESULT_STORE_DIR)
+store_fingerprint = store.fingerprint()
+comparison_frame, element_index = load_comparison_data(AppConfig.RESULT_STORE_DIR, store_fingerprint)
+if comparison_frame.empty:
+    st.info("저장된 분석 결과가 없습니다. 메인 페이지에서 특허 PDF를 분석하면 이곳에서 비교할 수 있습니다.")
+    st.stop()
+
+text_query = st.sidebar.text_input("검색 (제목, 출원인, 화학식, 공개번호, 파일명)", key="comparison_query")
+st.sidebar.subheader("조성 (화학식 원소)")
+include_elements = st.sidebar.multiselect("포함 원소", ELEMENT_SYMBOLS, key="include_elements",
+                                          help="화학식에 명시되었거나 자리표시자(M, X 등)/도펀트로 포함될 수 있는 원소")
+exclude_elements = st.sidebar.multiselect("제외 원소", ELEMENT_SYMBOLS, key="exclude_elements")
+explicit_only = st.sidebar.checkbox("포함 원소는 화학식에 명시된 경우만", key="include_explicit_only")
+metric_ranges, required_metrics = render_metric_filters(comparison_frame)
+
+sort_options = [column for column in COMPARISON_METRICS if comparison_frame[column].notna().any()] + ["publication_date"]
+col1, col2 = st.columns([3, 1])
+sort_column = col1.selectbox(
+    "정렬 기준", sort_options,
+    format_func=lambda c: COMPARISON_METRICS[c].label if c in COMPARISON_METRICS else "공개일",
+    key="comparison_sort"
+)
+sort_ascending = col2.toggle("오름차순", value=False, key="comparison_sort_ascending")
+
+started = time.perf_counter()
+element_mask = None
+if include_elements or exclude_elements:
+    element_mask = element_index.match_mask(include_elements, exclude_elements, include_explicit_only=explicit_only)
+filtered_frame = filter_comparison_frame(comparison_frame, metric_ranges, text_query, required_metrics, row_mask=element_mask)
+filtered_frame = filtered_frame.sort_values(sort_column, ascending=sort_ascending, na_position="last")
+elapsed_ms = (time.perf_counter() - started) * 1000
+
+st.caption(f"전체 {len(comparison_frame):,}건 중 {len(filtered_frame):,}건 · 필터/정렬 {elapsed_ms:.1f} ms")
+st.dataframe(
+    filtered_frame.head(MAX_DISPLAY_ROWS),
+    column_config={column: st.column_config.NumberColumn(metric.label, format="%.4g") for column, metric in COMPARISON_METRICS.items()},
+    column_order=DOCUMENT_COLUMNS[1:] + list(COMPARISON_METRICS),
+    hide_index=True,
+    use_container_width=True
+)
+if len(filtered_frame) > MAX_DISPLAY_ROWS:
+    st.caption(f"상위 {MAX_DISPLAY_ROWS:,}건만 표시합니다. 필터를 좁히거나 정렬 기준을 바꿔보세요.")
+
+render_histogram(filtered_frame)
+render_export_section(store, store_fingerprint, filtered_frame["document_id"].tolist())
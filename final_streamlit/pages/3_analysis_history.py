@@ -0,0 +1,94 @@
+# pages/3_analysis_history.py
+# 지난 분석 결과(분석 번들) 목록에서 하나를 골라 LLM 호출 없이 메인 페이지의 결과 탭 3개로 바로 다시 여는 페이지
+import streamlit as st
+
+from analysis_bundle import PENDING_BUNDLE_SESSION_KEY, AnalysisBundleStore
+from app_config import AppConfig
+
+# 분석 모드 표시 이름
+ANALYSIS_MODE_LABELS = {"full": "전체 분석", "quick": "빠른 분석", "upgraded": "빠른 분석 → 전체 추출"}
+
+
+@st.cache_data(max_entries=1, show_spinner="분석 번들 목록을 읽는 중...")
+def load_bundle_rows(store_dir: str, store_fingerprint: str) -> list:
+    """
+    번들 매니페스트만 읽어 목록 표의 행을 만듭니다 (페이지 텍스트/이미지는 읽지 않음).
+    store_fingerprint가 바뀔 때(번들 추가/갱신)만 다시 읽습니다.
+    """
+    rows = []
+    for manifest in AnalysisBundleStore(store_dir).list_manifests():
+        label, timings = manifest.get("label") or {}, manifest.get("timings") or {}
+        rows.append({
+            "path": manifest["path"],
+            "파일명": manifest["source"].get("file_name"),
+            "공개번호": label.get("publication_number"),
+            "제목": label.get("title"),
+            "분석 시각": manifest.get("created_at"),
+            "페이지": manifest.get("page_count"),
+            "분석 모드": ANALYSIS_MODE_LABELS.get(manifest.get("analysis_mode"), manifest.get("analysis_mode")),
+            "원본 포함": manifest["source"].get("embedded"),
+            "크기 (MB)": manifest["file_size_bytes"] / 1024 / 1024,
+            "분석 소요 (s)": timings.get("pipeline_seconds"),
+        })
+    return rows
+
+def bundle_reader(path: str):
+    """번들 파일을 읽는 함수를 반환합니다. 번들은 수백 MB일 수 있으므로 다운로드 버튼을 누를 때만 읽습니다."""
+    def _read() -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+    return _read
+
+def render_import_section(store: AnalysisBundleStore):
+    """다른 곳에서 내려받은 번들 파일(.zip)을 기록에 추가합니다."""
+    with st.expander("번들 파일 가져오기"):
+        uploaded = st.file_uploader("분석 번들 (.zip)", type=["zip"], key="bundle_import_uploader")
+        if uploaded is not None and st.button("기록에 추가", key="bundle_import_button"):
+            try:
+                path = store.import_bytes(uploaded.getvalue())
+                st.success(f"번들을 추가했습니다: `{path}`")
+            except ValueError as e:
+                st.error(f"번들 가져오기 실패: {e}")
+
+st.set_page_config(page_title="분석 기록", layout="wide")
+st.title("🗂️ 분석 기록")
+st.markdown("지난 분석 결과를 번들(원본 PDF, 페이지 텍스트, 썸네일, 구조화 JSON)에서 바로 다시 엽니다. LLM을 다시 호출하지 않습니다.")
+
+store = AnalysisBundleStore(AppConfig.ANALYSIS_BUNDLE_DIR)
+render_import_section(store)
+bundle_rows = load_bundle_rows(AppConfig.ANALYSIS_BUNDLE_DIR, store.fingerprint())
+if not bundle_rows:
+    st.info("저장된 분석 번들이 없습니다. 메인 페이지에서 특허 PDF를 분석하면 이곳에 기록됩니다.")
+    st.stop()
+
+text_query = st.text_input("검색 (파일명, 공개번호, 제목)", key="history_query").strip().lower()
+filtered_rows = [
+    row for row in bundle_rows
+    if not text_query or any(text_query in str(row[column] or "").lower() for column in ("파일명", "공개번호", "제목"))
+]
+st.caption(f"전체 {len(bundle_rows):,}건 중 {len(filtered_rows):,}건")
+st.dataframe(
+    filtered_rows,
+    column_config={
+        "path": None,
+        "크기 (MB)": st.column_config.NumberColumn(format="%.1f"),
+        "분석 소요 (s)": st.column_config.NumberColumn(format="%.1f"),
+    },
+    hide_index=True,
+    use_container_width=True
+)
+if not filtered_rows:
+    st.stop()
+
+col1, col2, col3 = st.columns([4, 1, 1])
+selected_index = col1.selectbox(
+    "다시 열 분석", range(len(filtered_rows)),
+    format_func=lambda i: f"{filtered_rows[i]['파일명']} · {filtered_rows[i]['공개번호'] or '-'} · {filtered_rows[i]['분석 시각']}",
+    key="history_selected"
+)
+selected_path = filtered_rows[selected_index]["path"]
+if col2.button("결과 열기", type="primary", key="history_open_button"):
+    st.session_state[PENDING_BUNDLE_SESSION_KEY] = selected_path
+    st.switch_page("streamlit_test2.py")
+col3.download_button("번들 다운로드", bundle_reader(selected_path), file_name=f"{filtered_rows[selected_index]['파일명']}.bundle.zip",
+                     mime="application/zip", key="history_download_button")
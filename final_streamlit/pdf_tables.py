@@ -0,0 +1,262 @@
+# pdf_tables.py
+# PDF 페이지의 표를 PyMuPDF 표 탐지(page.find_tables)로 찾아 프롬프트용 TSV 블록으로 바꾸고,
+# 깔끔한 성능 표는 representative_performance_data_from_examples_or_figures 항목으로 미리 변환하는 모듈
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from llm_utils import build_full_text_from_pages, estimate_tokens
+from unit_normalization import parse_quantity
+
+# 표 최소 크기 (헤더 포함 행 수, 열 수). 이보다 작으면 본문 레이아웃 오탐으로 보고 무시
+TABLE_MIN_ROWS = 2
+TABLE_MIN_COLS = 2
+# 성능 열로 인정하기 위한 데이터 행의 숫자 비율
+PERFORMANCE_COLUMN_NUMERIC_RATIO = 0.8
+# 헤더에 이 단어/단위가 있으면 성능 지표 열 후보
+_PERFORMANCE_HEADER_RE = re.compile(
+    r"capacity|efficiency|retention|conductivity|resistance|resistivity|impedance|voltage|energy density|power density|"
+    r"rate|cycle|ice\b|mah|wh/kg|s/cm|ohm|Ω|%",
+    re.IGNORECASE,
+)
+_HEADER_UNIT_RE = re.compile(r"[\(\[]([^\)\]]+)[\)\]]\s*$")
+# 성능 데이터 조건 문자열의 시료 라벨 ("Example 3", "Comparative Example 1", "Comp. Ex. 2", "Sample S1", "실시예 1", "비교예 2")
+_SAMPLE_LABEL_RE = re.compile(
+    r"(comparative\s+example|comp\.?\s*ex\.?|비교예|example|ex\.|실시예|sample)\s*[:#.]?\s*([a-z]?\d+[a-z]?(?:-\d+)?)\b",
+    re.IGNORECASE,
+)
+_SAMPLE_LABEL_NAMES = {"comparative example": "comparative example", "비교예": "comparative example", "example": "example", "실시예": "example", "sample": "sample"}
+# 같은 시료의 다른 측정을 구분하는 조건 토큰: 율속(0.1C), 사이클 수, 온도
+_CONDITION_TOKEN_RE = re.compile(
+    r"\b\d+(?:\.\d+)?\s*c\b(?!\s*/)|\b\d+\s*(?:th\s+)?cycles?\b|\bcycles?\s*\d+\b|-?\d+(?:\.\d+)?\s*(?:°\s*c|℃)",
+    re.IGNORECASE,
+)
+
+
+def _clean_cell(cell: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", cell or "").strip().replace("\t", " ")
+
+def clean_table_rows(rows: List[List[Optional[str]]]) -> List[List[str]]:
+    """셀 내부 줄바꿈/공백을 정리하고, 완전히 빈 행과 열을 제거합니다."""
+    cleaned = [[_clean_cell(cell) for cell in row] for row in rows]
+    cleaned = [row for row in cleaned if any(row)]
+    if not cleaned:
+        return []
+    width = max(len(row) for row in cleaned)
+    cleaned = [row + [""] * (width - len(row)) for row in cleaned]
+    keep_columns = [col for col in range(width) if any(row[col] for row in cleaned)]
+    return [[row[col] for col in keep_columns] for row in cleaned]
+
+def format_table_block(rows: List[List[str]], page_number: int, table_number: int) -> str:
+    """표를 LLM 프롬프트용 TSV 블록으로 만듭니다. 열 정렬용 공백 대신 탭 하나로 구분하여 토큰을 줄입니다."""
+    body = "\n".join("\t".join(row) for row in rows)
+    return f"[TABLE p{page_number}.{table_number}]\n{body}\n[/TABLE]"
+
+def _split_header_unit(header: str) -> Tuple[str, str]:
+    """'Discharge capacity (mAh/g)' -> ('Discharge capacity', 'mAh/g')"""
+    match = _HEADER_UNIT_RE.search(header)
+    if match:
+        return header[:match.start()].strip(), match.group(1).strip()
+    return header, ""
+
+def _is_numeric_cell(cell: str, unit_hint: str) -> bool:
+    parsed = parse_quantity(cell, unit_hint)
+    return parsed.qualifier != "none" and not parsed.condition
+
+def table_to_performance_data(rows: List[List[str]], page_number: int, table_number: int) -> List[Dict[str, Any]]:
+    """
+    깔끔한 성능 표(헤더 1행 + 첫 열이 예시/샘플 라벨 + 숫자 위주의 성능 열)를 스키마의 성능 데이터 항목 목록으로 변환합니다.
+    조건을 만족하지 않는 표는 빈 목록을 반환하며, 이 경우 LLM이 TSV 블록을 보고 직접 추출합니다.
+    """
+    if len(rows) < TABLE_MIN_ROWS or len(rows[0]) < TABLE_MIN_COLS:
+        return []
+    header, data_rows = rows[0], rows[1:]
+    if not all(header) or any(not row[0] for row in data_rows):
+        return []
+
+    performance_columns = []
+    for col in range(1, len(header)):
+        metric_name, unit = _split_header_unit(header[col])
+        if not _PERFORMANCE_HEADER_RE.search(header[col]):
+            continue
+        cells = [row[col] for row in data_rows if row[col]]
+        numeric = sum(1 for cell in cells if _is_numeric_cell(cell, unit))
+        if cells and numeric / len(cells) >= PERFORMANCE_COLUMN_NUMERIC_RATIO:
+            performance_columns.append((col, metric_name, unit))
+    if not performance_columns:
+        return []
+
+    context_columns = [col for col in range(1, len(header)) if col not in {c for c, _, _ in performance_columns}]
+    entries = []
+    for row in data_rows:
+        context = f"{header[0]}: {row[0]}"
+        extra = "; ".join(f"{header[col]}: {row[col]}" for col in context_columns if row[col])
+        for col, metric_name, unit in performance_columns:
+            if not row[col]:
+                continue
+            entries.append({
+                "metric_name": metric_name,
+                "value": row[col],
+                "unit": unit,
+                "conditions_or_context": f"{context}; {extra}" if extra else context,
+                "source_reference_in_document": f"Table p{page_number}.{table_number} (page {page_number})",
+            })
+    return entries
+
+def _page_text_with_tables(page: Any, page_number: int) -> Tuple[str, List[Dict[str, Any]]]:
+    """표 영역의 줄을 TSV 블록으로 대체한 페이지 텍스트와 탐지된 표 목록을 반환합니다."""
+    tables = []
+    for table in page.find_tables().tables:
+        rows = clean_table_rows(table.extract())
+        if len(rows) >= TABLE_MIN_ROWS and len(rows[0]) >= TABLE_MIN_COLS:
+            tables.append({"bbox": tuple(table.bbox), "rows": rows, "number": len(tables) + 1})
+    if not tables:
+        return page.get_text("text", sort=True), []
+
+    lines_out: List[str] = []
+    emitted = set()
+    for block in page.get_text("dict", sort=True)["blocks"]:
+        for line in block.get("lines", []):
+            x0, y0, x1, y1 = line["bbox"]
+            center_x, center_y = (x0 + x1) / 2, (y0 + y1) / 2
+            owner = next(
+                (t for t in tables if t["bbox"][0] <= center_x <= t["bbox"][2] and t["bbox"][1] <= center_y <= t["bbox"][3]),
+                None
+            )
+            if owner is None:
+                lines_out.append("".join(span["text"] for span in line["spans"]))
+            elif owner["number"] not in emitted:
+                # 표의 첫 줄 위치(읽기 순서)에 TSV 블록을 한 번만 삽입
+                emitted.add(owner["number"])
+                lines_out.append(format_table_block(owner["rows"], page_number, owner["number"]))
+    for table in tables:
+        if table["number"] not in emitted:
+            lines_out.append(format_table_block(table["rows"], page_number, table["number"]))
+    return "\n".join(lines_out) + "\n", tables
+
+def extract_pages_with_tables(
+    doc: Any,
+    detect_tables: bool = True,
+    page_numbers: Optional[List[int]] = None,
+    page_callback: Optional[Callable[[int], None]] = None
+) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    열린 fitz 문서의 페이지별 텍스트를 추출합니다. detect_tables=True면 표를 TSV 블록으로 바꿉니다.
+    반환: (페이지별 텍스트, 정보). 정보에는 표 기반 성능 데이터 항목('performance_data')과
+    기존 방식(sort=True 평문) 대비 문자/토큰 수와 지연 시간('metrics')이 담깁니다.
+    표 탐지에 실패한 페이지는 기존 평문 추출로 대체합니다.
+    page_numbers(1부터 시작)를 주면 해당 페이지만 한 장씩 읽고, 나머지 페이지는 빈 문자열로 둡니다 (목록 길이는 전체 페이지 수).
+    page_callback(페이지 번호)은 페이지마다 추출 직후 호출되며, 예외를 발생시켜 추출을 중단할 수 있습니다 (메모리 상한 검사용).
+    """
+    started = time.perf_counter()
+    selected = list(page_numbers) if page_numbers is not None else list(range(1, len(doc) + 1))
+    page_texts: List[str] = [""] * len(doc)
+    plain_texts: List[str] = [""] * len(doc)
+    performance_data: List[Dict[str, Any]] = []
+    table_count = 0
+    table_pages = 0
+    table_seconds = 0.0
+    errors: List[str] = []
+    for page_number in selected:
+        page_idx = page_number - 1
+        page = doc.load_page(page_idx)
+        plain_text = page.get_text("text", sort=True)
+        plain_texts[page_idx] = plain_text
+        if not detect_tables:
+            page_texts[page_idx] = plain_text
+            if page_callback:
+                page_callback(page_number)
+            continue
+        table_started = time.perf_counter()
+        try:
+            text, tables = _page_text_with_tables(page, page_idx + 1)
+        except Exception as e_table:
+            errors.append(f"page {page_idx + 1}: {e_table}")
+            text, tables = plain_text, []
+        table_seconds += time.perf_counter() - table_started
+        page_texts[page_idx] = text
+        if tables:
+            table_pages += 1
+            table_count += len(tables)
+            for table in tables:
+                performance_data.extend(table_to_performance_data(table["rows"], page_idx + 1, table["number"]))
+        if page_callback:
+            page_callback(page_number)
+
+    plain_full_text = build_full_text_from_pages(plain_texts, selected)
+    full_text = build_full_text_from_pages(page_texts, selected)
+    plain_tokens, tokens = estimate_tokens(plain_full_text), estimate_tokens(full_text)
+    metrics = {
+        "pages": len(selected),
+        "tables_found": table_count,
+        "pages_with_tables": table_pages,
+        "plain_chars": len(plain_full_text),
+        "chars": len(full_text),
+        "plain_tokens_estimate": plain_tokens,
+        "tokens_estimate": tokens,
+        "token_reduction_pct": (1 - tokens / plain_tokens) * 100 if plain_tokens else 0.0,
+        "prefilled_performance_rows": len(performance_data),
+        "table_detection_seconds": table_seconds,
+        "total_seconds": time.perf_counter() - started,
+        "errors": errors,
+    }
+    return page_texts, {"performance_data": performance_data, "metrics": metrics}
+
+def _normalize_words(text: Any) -> str:
+    return re.sub(r"[^a-z0-9가-힣.%]+", " ", str(text or "").lower()).strip()
+
+def performance_condition_key(text: str) -> Tuple[str, ...]:
+    """
+    조건 문자열의 비교용 키: 시료 라벨(실시예/비교예 번호)과 조건 토큰(율속, 사이클 수, 온도)을 정규화하여 정렬한 튜플.
+    표 행("Sample: Example 5; Rate: 0.1C")과 LLM 항목("Example 5, 0.1C charge/discharge")처럼 표기가 달라도 같은 측정이면 같은 키가 되며,
+    라벨과 토큰이 모두 없으면 정규화한 조건 문자열 전체를 씁니다.
+    """
+    labels = []
+    for match in _SAMPLE_LABEL_RE.finditer(text or ""):
+        kind = re.sub(r"\s+", " ", match.group(1).lower())
+        kind = "comparative example" if kind.startswith("comp") else _SAMPLE_LABEL_NAMES.get(kind.rstrip("."), "example")
+        labels.append(f"{kind} {match.group(2).lower()}")
+    tokens = [re.sub(r"\s+|°|℃", "", token.lower()) for token in _CONDITION_TOKEN_RE.findall(text or "")]
+    if labels or tokens:
+        return tuple(sorted(set(labels))) + tuple(sorted(set(tokens)))
+    normalized = _normalize_words(text)
+    return (normalized,) if normalized else ()
+
+def performance_entry_key(entry: Dict[str, Any], include_source: bool = False) -> Tuple[Any, ...]:
+    """
+    성능 데이터 항목의 중복 판정 키 (정규화한 지표명, 수치, 조건 키[, 출처]). 표 병합과 map-reduce 병합(map_reduce.py)에서 공용.
+    조건(시료 라벨, 율속 등)이 다르면 값이 같아도 다른 항목입니다 (예: 실시예 1과 비교예 3이 모두 150 mAh/g).
+    include_source=True면 출처(source_reference_in_document)도 비교합니다 (같은 문서의 창 간 병합처럼 출처 표기가 일관된 경우).
+    """
+    parsed = parse_quantity(str(entry.get("value") if entry.get("value") is not None else ""), str(entry.get("unit") or ""))
+    name = re.sub(r"[^a-z0-9]+", " ", str(entry.get("metric_name") or "").lower()).strip()
+    # 대표값이 없는 한쪽 한계("<10", ">=5")는 한계값과 방향으로, 수치가 없으면 None으로 비교 (NaN은 NaN과도 같지 않아 중복이 남음)
+    number = next((value for value in (parsed.typical, parsed.low, parsed.high) if value == value), None)
+    value_key: Any = None if number is None else round(number, 6)
+    if parsed.qualifier in ("lt", "gt") and number is not None:
+        value_key = (parsed.qualifier, value_key)
+    key = (
+        name,
+        value_key,
+        performance_condition_key(str(entry.get("conditions_or_context") or "")),
+    )
+    return key + (_normalize_words(entry.get("source_reference_in_document")),) if include_source else key
+
+def merge_table_performance_data(
+    llm_entries: Optional[List[Dict[str, Any]]],
+    table_entries: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    표에서 미리 변환한 성능 데이터 항목을 LLM 결과에 합칩니다. 지표명, 수치, 조건(시료 라벨 등)이 모두 같은 항목은 LLM 값을 유지합니다.
+    (병합된 목록, 새로 추가된 항목 수)를 반환합니다.
+    """
+    merged = [entry for entry in (llm_entries or []) if isinstance(entry, dict)]
+    existing = {performance_entry_key(entry) for entry in merged}
+    added = 0
+    for entry in table_entries:
+        key = performance_entry_key(entry)
+        if key not in existing:
+            merged.append(dict(entry))
+            existing.add(key)
+            added += 1
+    return merged, added
@@ -0,0 +1,180 @@
+# profiling.py
+# 분석 파이프라인/결과 렌더링용 선택적 프로파일링 (cProfile + tracemalloc)
+# 블록 실행 동안 함수별 시간과 메모리 할당을 기록하여 .prof 파일(snakeviz/pstats로 열람)과 텍스트 보고서로 저장하고,
+# 앱에 표시할 요약(라이브러리별 시간, 상위 함수, 상위 할당 위치)을 반환합니다.
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app_config import AppConfig
+
+# 앱 모듈이 있는 디렉토리 (이 안의 파일은 라이브러리 분류보다 먼저 앱 코드로 분류)
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# 프롬프트 구성 단계로 묶을 앱 모듈
+PROMPT_MODULES = ("prompts.py", "text_compaction.py", "llm_utils.py", "bibliographic_parser.py")
+# 라이브러리 시간 분류: 함수가 정의된 파일 경로에 포함된 문자열 -> 분류 이름 (위에서부터 먼저 일치하는 것)
+TIME_CATEGORIES: List[Tuple[str, str]] = [
+    ("fitz", "PyMuPDF"),
+    ("pymupdf", "PyMuPDF"),
+    ("PIL", "PIL"),
+    ("json", "JSON 파싱"),
+    ("streamlit", "Streamlit"),
+    ("langchain", "LLM API"),
+    ("google", "LLM API"),
+    ("grpc", "LLM API"),
+    ("httpx", "LLM API"),
+    ("requests", "LLM API"),
+    ("threading", "스레드 대기"),
+    ("concurrent", "스레드 대기"),
+]
+
+# tracemalloc의 시작/중지와 최대값은 프로세스 전역이므로, 한 번에 한 블록만 메모리를 기록 (다른 세션의 블록이 겹치면 시간만 기록)
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_in_use = False
+
+
+def is_profiling_enabled_by_env() -> bool:
+    """환경 변수(AppConfig.PROFILING_ENV_VAR)가 1/true/yes이면 프로파일링을 기본으로 켭니다."""
+    return os.getenv(AppConfig.PROFILING_ENV_VAR, "").strip().lower() in ("1", "true", "yes")
+
+def _categorize(filename: str) -> str:
+    if filename.startswith("~") or filename.startswith("<"):
+        return "내장 함수"
+    if filename.startswith(_APP_DIR):
+        module = os.path.basename(filename)
+        return "프롬프트 구성" if module in PROMPT_MODULES else f"앱 코드 ({module})"
+    for marker, category in TIME_CATEGORIES:
+        if marker in filename:
+            return category
+    return "기타"
+
+def _function_label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    return f"{os.path.basename(filename)}:{line}({name})" if line else name
+
+def summarize_profile(profiler: cProfile.Profile, top_n: int = AppConfig.PROFILE_TOP_N) -> Dict[str, Any]:
+    """cProfile 결과를 분류별 자체 시간(tottime) 합계와 누적 시간 기준 상위 함수 목록으로 요약합니다."""
+    stats = pstats.Stats(profiler)
+    category_seconds: Dict[str, float] = {}
+    functions = []
+    for func, (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        category = _categorize(func[0])
+        category_seconds[category] = category_seconds.get(category, 0.0) + tottime
+        functions.append({"function": _function_label(func), "category": category, "calls": ncalls,
+                          "self_seconds": tottime, "cumulative_seconds": cumtime})
+    functions.sort(key=lambda row: row["cumulative_seconds"], reverse=True)
+    return {
+        "categories": sorted(
+            ({"category": category, "self_seconds": seconds} for category, seconds in category_seconds.items()),
+            key=lambda row: row["self_seconds"], reverse=True
+        ),
+        "hot_functions": functions[:top_n],
+    }
+
+def summarize_allocations(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top_n: int = AppConfig.PROFILE_TOP_N) -> List[Dict[str, Any]]:
+    """두 스냅샷 사이에 늘어난 메모리를 할당 위치(파일:줄)별로 정리합니다."""
+    # 프로파일러 자신(tracemalloc/linecache)과 모듈 import에서 생긴 할당은 제외
+    filters = [tracemalloc.Filter(False, pattern) for pattern in
+               (tracemalloc.__file__, "*linecache.py", "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")]
+    diffs = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    return [
+        {"location": f"{os.path.basename(diff.traceback[0].filename)}:{diff.traceback[0].lineno}",
+         "size_kb": diff.size_diff / 1024, "count": diff.count_diff}
+        for diff in sorted(diffs, key=lambda diff: diff.size_diff, reverse=True)[:top_n]
+        if diff.size_diff > 0
+    ]
+
+def _format_peak(summary: Dict[str, Any]) -> str:
+    return f"tracemalloc 최대 {summary['peak_mb']:.1f} MB" if summary["peak_mb"] is not None else "메모리 미기록 (다른 블록이 기록 중)"
+
+def _write_text_report(path: str, label: str, summary: Dict[str, Any], profiler: cProfile.Profile) -> None:
+    buffer = io.StringIO()
+    buffer.write(f"# {label} ({summary['wall_seconds']:.3f}s, {_format_peak(summary)})\n\n")
+    buffer.write("## 분류별 자체 시간\n")
+    for row in summary["categories"]:
+        buffer.write(f"{row['self_seconds']:10.3f}s  {row['category']}\n")
+    buffer.write("\n## 상위 메모리 할당 (블록 실행 중 증가분)\n")
+    for row in summary["top_allocations"]:
+        buffer.write(f"{row['size_kb']:12.1f} KB  {row['count']:8d}개  {row['location']}\n")
+    buffer.write("\n## cProfile (누적 시간 순)\n")
+    pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(AppConfig.PROFILE_TOP_N * 2)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(buffer.getvalue())
+
+def _acquire_tracemalloc() -> bool:
+    """메모리 기록을 맡습니다. 다른 블록이 이미 기록 중이면 False."""
+    global _tracemalloc_in_use
+    with _tracemalloc_lock:
+        if _tracemalloc_in_use:
+            return False
+        _tracemalloc_in_use = True
+        return True
+
+def _release_tracemalloc() -> None:
+    global _tracemalloc_in_use
+    with _tracemalloc_lock:
+        _tracemalloc_in_use = False
+
+@contextmanager
+def profile_block(label: str, output_dir: str, enabled: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    블록을 cProfile + tracemalloc으로 감쌉니다. enabled=False면 아무것도 하지 않습니다.
+    블록이 끝나면(예외/st.stop 포함) 넘겨준 딕셔너리에 요약을 채우고, output_dir에 <label>_<시각>.prof와 _report.txt를 저장합니다.
+    cProfile은 블록을 실행한 스레드만 기록하며(작업 스레드의 LLM 호출은 대기 시간으로 보임), tracemalloc은 프로세스 전체 할당을 봅니다.
+    다른 블록(다른 세션)이 메모리를 기록하는 중이면 이 블록은 시간만 기록합니다 (peak_mb는 None, top_allocations는 빈 목록).
+    """
+    summary: Dict[str, Any] = {}
+    if not enabled:
+        yield summary
+        return
+    trace_memory = _acquire_tracemalloc()
+    started_tracing = False
+    before: Optional[tracemalloc.Snapshot] = None
+    try:
+        if trace_memory:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start(AppConfig.PROFILE_TRACEMALLOC_FRAMES)
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+    except BaseException:
+        _release_tracemalloc()
+        raise
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield summary
+    finally:
+        profiler.disable()
+        wall_seconds = time.perf_counter() - started
+        peak_mb: Optional[float] = None
+        top_allocations: List[Dict[str, Any]] = []
+        if trace_memory:
+            try:
+                after = tracemalloc.take_snapshot()
+                _, peak_bytes = tracemalloc.get_traced_memory()
+                if started_tracing:
+                    tracemalloc.stop()
+            finally:
+                _release_tracemalloc()
+            peak_mb = peak_bytes / (1024 * 1024)
+            top_allocations = summarize_allocations(before, after)
+        summary.update(summarize_profile(profiler))
+        summary.update(
+            label=label,
+            wall_seconds=wall_seconds,
+            peak_mb=peak_mb,
+            top_allocations=top_allocations,
+        )
+        os.makedirs(output_dir, exist_ok=True)
+        base_path = os.path.join(output_dir, f"{label}_{time.strftime('%Y%m%d_%H%M%S')}_{int(time.time() * 1000) % 1000:03d}")
+        profiler.dump_stats(base_path + ".prof")
+        _write_text_report(base_path + "_report.txt", label, summary, profiler)
+        summary["files"] = [base_path + ".prof", base_path + "_report.txt"]
@@ -0,0 +1,390 @@
+# prompt_cache.py
+# 정적인 스키마 프롬프트 접두부(지시문 + JSON 스키마)를 제공자 측 캐시(Gemini context caching)에 한 번 등록하고,
+# 이후 호출은 캐시를 참조한 채 문서별 부분만 보내도록 하는 모델 래퍼와 캐시 수명 관리(TTL 연장, prompts.py 변경 시 폐기)
+# 로컬 시뮬레이터 백엔드는 실제 캐시 없이 같은 흐름을 흉내 내며, 응답 사용량에 캐시 적중 토큰을 기록하여 절감액을 오프라인으로 측정합니다.
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.messages import HumanMessage
+
+from app_config import AppConfig
+from llm_utils import estimate_tokens, get_token_usage
+
+logger = logging.getLogger(__name__)
+
+# 정적 접두부가 끝나는 위치. 전체 추출 프롬프트(_build_llm_extraction_prompt)와 섹션 추출 프롬프트
+# (schema_versioning.build_section_extraction_prompt) 모두 스키마 블록 바로 뒤에 이 문구로 문서별 지시를 시작합니다.
+STATIC_PREFIX_END_MARKER = "\n\nIMPORTANT INSTRUCTIONS FOR THIS SPECIFIC TASK:\n"
+PROMPTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts.py")
+
+
+def split_static_prefix(prompt: str) -> Tuple[Optional[str], str]:
+    """프롬프트를 (정적 접두부, 문서별 나머지)로 나눕니다. 표식이 없으면 (None, 프롬프트 전체)."""
+    index = prompt.find(STATIC_PREFIX_END_MARKER)
+    if index <= 0:
+        return None, prompt
+    return prompt[:index], prompt[index:]
+
+def prefix_version(prefix_text: str) -> str:
+    return hashlib.sha256(prefix_text.encode("utf-8")).hexdigest()[:16]
+
+def _prompts_fingerprint() -> Tuple[int, int]:
+    """prompts.py의 (수정 시각 ns, 크기). 파일이 없으면 (0, 0)."""
+    try:
+        stat = os.stat(PROMPTS_PATH)
+    except OSError:
+        return 0, 0
+    return stat.st_mtime_ns, stat.st_size
+
+@dataclass
+class PromptCacheHandle:
+    """제공자 측에 등록된 캐시 하나 (모델 + 접두부 버전별)"""
+    name: str
+    model_name: str
+    version: str
+    prefix_tokens: int
+    created_at: float
+    expires_at: float
+    last_used_at: float
+    requests: int = 0
+
+# --- 백엔드 ---
+class GeminiContextCacheBackend:
+    """Gemini context caching (google-genai SDK). 캐시를 참조하는 호출은 cached_content를 지정한 채팅 모델로 보냅니다."""
+    name = "gemini"
+
+    def __init__(self, google_api_key: str):
+        from google import genai
+        self._client = genai.Client(api_key=google_api_key)
+        self._google_api_key = google_api_key
+        self._bound_models: Dict[str, Any] = {}
+
+    def create(self, model_name: str, prefix_text: str, ttl_seconds: int, display_name: str) -> Tuple[str, int]:
+        """캐시를 만들고 (캐시 이름, 캐시된 토큰 수)를 반환합니다."""
+        from google.genai import types
+        cache = self._client.caches.create(model=model_name, config=types.CreateCachedContentConfig(
+            contents=[types.Content(role="user", parts=[types.Part(text=prefix_text)])],
+            ttl=f"{int(ttl_seconds)}s",
+            display_name=display_name,
+        ))
+        usage = getattr(cache, "usage_metadata", None)
+        return cache.name, int(getattr(usage, "total_token_count", 0) or estimate_tokens(prefix_text))
+
+    def extend(self, name: str, ttl_seconds: int) -> None:
+        from google.genai import types
+        self._client.caches.update(name=name, config=types.UpdateCachedContentConfig(ttl=f"{int(ttl_seconds)}s"))
+
+    def delete(self, name: str) -> None:
+        self._bound_models.pop(name, None)
+        self._client.caches.delete(name=name)
+
+    def invoke(self, handle: PromptCacheHandle, base_model: Any, prefix_text: str, suffix: str, config: Optional[Dict[str, Any]]) -> Any:
+        model = self._bound_models.get(handle.name)
+        if model is None:
+            from llm_utils import create_chat_model
+            model = create_chat_model(handle.model_name, self._google_api_key, cached_content=handle.name)
+            self._bound_models[handle.name] = model
+        return model.invoke([HumanMessage(content=suffix)], config=config)
+
+class SimulatedPromptCacheBackend:
+    """
+    로컬 대체 백엔드: 접두부를 메모리에 보관하고, 호출 때 다시 붙여 원래 모델(FakeChatModel 등)을 호출한 뒤
+    응답 사용량의 input_token_details.cache_read에 접두부 토큰 수를 기록합니다 (실제 청구와 무관한 캐시 토큰 계산 흉내).
+    """
+    name = "simulated"
+
+    def __init__(self):
+        self._prefixes: Dict[str, str] = {}
+
+    def create(self, model_name: str, prefix_text: str, ttl_seconds: int, display_name: str) -> Tuple[str, int]:
+        name = f"simulatedCachedContents/{uuid.uuid4().hex[:12]}"
+        self._prefixes[name] = prefix_text
+        return name, estimate_tokens(prefix_text)
+
+    def extend(self, name: str, ttl_seconds: int) -> None:
+        if name not in self._prefixes:
+            raise KeyError(f"cached content not found: {name}")
+
+    def delete(self, name: str) -> None:
+        self._prefixes.pop(name, None)
+
+    def invoke(self, handle: PromptCacheHandle, base_model: Any, prefix_text: str, suffix: str, config: Optional[Dict[str, Any]]) -> Any:
+        if handle.name not in self._prefixes:
+            raise KeyError(f"cached content not found: {handle.name}")
+        response = base_model.invoke([HumanMessage(content=self._prefixes[handle.name] + suffix)], config=config)
+        usage = dict(getattr(response, "usage_metadata", None) or {})
+        usage["input_token_details"] = {**(usage.get("input_token_details") or {}), "cache_read": handle.prefix_tokens}
+        return response.model_copy(update={"usage_metadata": usage})
+
+def is_cache_missing_error(error: Exception) -> bool:
+    """
+    캐시 호출 오류가 캐시 없음/만료 때문인지 확인합니다 (시뮬레이터의 KeyError, Gemini의 404 또는 'not found'/'expired' 메시지).
+    시간 초과, 429, 네트워크 오류 등은 False: 캐시는 유효하므로 버리지 않고 호출한 쪽에 그대로 전달합니다.
+    """
+    if isinstance(error, KeyError):
+        return True
+    if getattr(error, "code", None) == 404 or getattr(error, "status_code", None) == 404:
+        return True
+    message = str(error).lower()
+    return "cache" in message and any(word in message for word in ("not found", "not_found", "expired"))
+
+# --- 수명 관리 ---
+class PromptCacheManager:
+    """
+    (모델, 접두부 버전)별 캐시 핸들을 관리합니다 (프로세스 전역, 스레드 안전).
+    - 남은 TTL이 AppConfig.PROMPT_CACHE_REFRESH_MARGIN_SECONDS보다 짧으면 TTL을 연장하고, 연장에 실패하면 새로 만듭니다.
+    - prompts.py가 바뀌면(수정 시각/크기) 기존 핸들을 모두 삭제합니다. 새 접두부는 다음 호출 때 새 버전으로 등록됩니다.
+    - 핸들 수가 AppConfig.PROMPT_CACHE_MAX_HANDLES를 넘으면 가장 오래 쓰지 않은 것부터 삭제합니다.
+    - 생성에 실패하면 PROMPT_CACHE_RETRY_SECONDS 동안 캐시 없이(전체 프롬프트로) 호출합니다.
+    """
+
+    def __init__(self, backend: Any, clock: Callable[[], float] = time.time):
+        self.backend = backend
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._handles: Dict[Tuple[str, str], PromptCacheHandle] = {}
+        self._prompts_fingerprint = _prompts_fingerprint()
+        self._retry_after = 0.0
+        self.totals = {"requests": 0, "cached_requests": 0, "input_tokens": 0, "cached_input_tokens": 0,
+                       "saved_usd": 0.0, "storage_usd": 0.0, "created": 0, "extended": 0, "deleted": 0, "failures": 0}
+        self.events: deque = deque(maxlen=AppConfig.PROMPT_CACHE_EVENT_HISTORY)
+        self.recent_requests: deque = deque(maxlen=AppConfig.PROMPT_CACHE_EVENT_HISTORY)
+
+    def _event(self, kind: str, detail: str) -> None:
+        self.events.append({"time": self.clock(), "event": kind, "detail": detail})
+
+    def _delete(self, key: Tuple[str, str], reason: str) -> None:
+        handle = self._handles.pop(key)
+        now = self.clock()
+        # 저장 비용 추정: 캐시가 유지된 시간(만료 전 삭제면 삭제 시점까지) x 토큰 수
+        alive_hours = max(0.0, min(now, handle.expires_at) - handle.created_at) / 3600
+        self.totals["storage_usd"] += handle.prefix_tokens * alive_hours * AppConfig.PROMPT_CACHE_STORAGE_USD_PER_1M_TOKEN_HOUR / 1_000_000
+        self.totals["deleted"] += 1
+        self._event("deleted", f"{handle.name} ({reason})")
+        if handle.expires_at > now:
+            try:
+                self.backend.delete(handle.name)
+            except Exception as e:
+                self._event("delete_failed", f"{handle.name}: {type(e).__name__}: {e}")
+
+    def _check_prompts_changed(self) -> None:
+        fingerprint = _prompts_fingerprint()
+        if fingerprint != self._prompts_fingerprint:
+            self._prompts_fingerprint = fingerprint
+            for key in list(self._handles):
+                self._delete(key, "prompts.py changed")
+
+    def acquire(self, model_name: str, prefix_text: str) -> Optional[PromptCacheHandle]:
+        """접두부에 대한 유효한 캐시 핸들을 반환합니다. 캐시할 수 없으면(너무 짧음, 생성 실패 후 대기 중) None."""
+        prefix_tokens = estimate_tokens(prefix_text)
+        if prefix_tokens < AppConfig.PROMPT_CACHE_MIN_TOKENS:
+            return None
+        key = (model_name, prefix_version(prefix_text))
+        with self._lock:
+            now = self.clock()
+            self._check_prompts_changed()
+            handle = self._handles.get(key)
+            if handle is not None and handle.expires_at <= now:
+                self._delete(key, "expired")
+                handle = None
+            if handle is not None and handle.expires_at - now < AppConfig.PROMPT_CACHE_REFRESH_MARGIN_SECONDS:
+                try:
+                    self.backend.extend(handle.name, AppConfig.PROMPT_CACHE_TTL_SECONDS)
+                    handle.expires_at = now + AppConfig.PROMPT_CACHE_TTL_SECONDS
+                    self.totals["extended"] += 1
+                    self._event("extended", handle.name)
+                except Exception as e:
+                    self._event("extend_failed", f"{handle.name}: {type(e).__name__}: {e}")
+                    self._delete(key, "extend failed")
+                    handle = None
+            if handle is None:
+                if now < self._retry_after:
+                    return None
+                try:
+                    name, cached_tokens = self.backend.create(
+                        model_name, prefix_text, AppConfig.PROMPT_CACHE_TTL_SECONDS, f"patent-schema-{key[1]}"
+                    )
+                except Exception as e:
+                    self.totals["failures"] += 1
+                    self._retry_after = now + AppConfig.PROMPT_CACHE_RETRY_SECONDS
+                    self._event("create_failed", f"{model_name}: {type(e).__name__}: {e}")
+                    return None
+                handle = PromptCacheHandle(name=name, model_name=model_name, version=key[1], prefix_tokens=cached_tokens,
+                                           created_at=now, expires_at=now + AppConfig.PROMPT_CACHE_TTL_SECONDS, last_used_at=now)
+                self._handles[key] = handle
+                self.totals["created"] += 1
+                self._event("created", f"{name} ({model_name}, {cached_tokens:,} 토큰, 버전 {key[1]})")
+                while len(self._handles) > AppConfig.PROMPT_CACHE_MAX_HANDLES:
+                    oldest = min(self._handles, key=lambda k: self._handles[k].last_used_at)
+                    self._delete(oldest, "evicted")
+            handle.last_used_at = now
+            handle.requests += 1
+            return handle
+
+    def invalidate(self, handle: PromptCacheHandle, reason: str) -> None:
+        """호출이 캐시 오류(만료/삭제됨)로 실패했을 때 핸들을 버립니다. 다음 호출에서 다시 만듭니다."""
+        with self._lock:
+            key = (handle.model_name, handle.version)
+            if self._handles.get(key) is handle:
+                self._delete(key, reason)
+
+    def record_request(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.totals["requests"] += 1
+            self.totals["cached_requests"] += 1 if entry["cached_input_tokens"] else 0
+            self.totals["input_tokens"] += entry["input_tokens"]
+            self.totals["cached_input_tokens"] += entry["cached_input_tokens"]
+            self.totals["saved_usd"] += entry["saved_usd"]
+            self.recent_requests.append(entry)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """대시보드용 현재 상태 (핸들 목록, 누적 통계, 최근 요청/이벤트). 저장 비용에는 살아 있는 핸들의 경과분을 더합니다."""
+        with self._lock:
+            now = self.clock()
+            live_storage = sum(
+                handle.prefix_tokens * max(0.0, min(now, handle.expires_at) - handle.created_at) / 3600
+                for handle in self._handles.values()
+            ) * AppConfig.PROMPT_CACHE_STORAGE_USD_PER_1M_TOKEN_HOUR / 1_000_000
+            totals = dict(self.totals)
+            totals["storage_usd"] += live_storage
+            totals["net_saved_usd"] = totals["saved_usd"] - totals["storage_usd"]
+            return {
+                "backend": self.backend.name,
+                "handles": [
+                    {**handle.__dict__, "ttl_remaining_seconds": max(0.0, handle.expires_at - now)}
+                    for handle in sorted(self._handles.values(), key=lambda h: -h.last_used_at)
+                ],
+                "totals": totals,
+                "recent_requests": list(self.recent_requests),
+                "events": list(self.events),
+            }
+
+def cache_savings_usd(model_name: str, cached_input_tokens: int) -> float:
+    """캐시 적중 토큰을 일반 입력 단가 대신 할인 단가로 처리해 아낀 금액 (USD)"""
+    input_price, _ = AppConfig.MODEL_PRICING_PER_1M_TOKENS.get(model_name, (0.0, 0.0))
+    return cached_input_tokens * input_price * (1 - AppConfig.CACHED_INPUT_PRICE_RATIO) / 1_000_000
+
+class PromptCachedModel:
+    """
+    채팅 모델을 감싸, 정적 접두부가 있는 프롬프트는 캐시 핸들을 참조하고 문서별 나머지만 보내도록 합니다.
+    원래 모델과 같은 invoke 인터페이스를 제공합니다 (QuotaLimitedModel로 다시 감쌀 수 있음).
+    캐시를 쓸 수 없거나 캐시가 삭제되었거나 만료되었으면 전체 프롬프트로 원래 모델을 호출합니다.
+    requests에는 이 래퍼를 통한 요청별 토큰/캐시 적중/절감액이 기록됩니다.
+    """
+
+    def __init__(self, base_model: Any, manager: PromptCacheManager, model_name: str):
+        self.base_model = base_model
+        self.manager = manager
+        self.model = model_name
+        self.requests: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def invoke(self, messages: List[Any], config: Optional[Dict[str, Any]] = None) -> Any:
+        prompt = messages[0].content if len(messages) == 1 and isinstance(getattr(messages[0], "content", None), str) else None
+        prefix_text, suffix = split_static_prefix(prompt) if prompt is not None else (None, "")
+        handle = self.manager.acquire(self.model, prefix_text) if prefix_text else None
+        started = time.perf_counter()
+        response = None
+        if handle is not None:
+            try:
+                response = self.manager.backend.invoke(handle, self.base_model, prefix_text, suffix, config)
+            except Exception as e:
+                # 캐시가 만료/삭제된 경우에만 핸들을 버리고 전체 프롬프트로 한 번 더 호출 (그 밖의 오류는 재시도 정책에 맡김)
+                if not is_cache_missing_error(e):
+                    raise
+                self.manager.invalidate(handle, f"invoke failed: {type(e).__name__}")
+                handle = None
+        if response is None:
+            response = self.base_model.invoke(messages, config=config)
+        usage = get_token_usage(response)
+        entry = {
+            "time": time.time(),
+            "model_name": self.model,
+            "cache_name": handle.name if handle else None,
+            "prefix_tokens": handle.prefix_tokens if handle else 0,
+            "input_tokens": usage["input_tokens"],
+            "cached_input_tokens": usage["cached_input_tokens"],
+            "saved_usd": cache_savings_usd(self.model, usage["cached_input_tokens"]),
+            "latency_seconds": time.perf_counter() - started,
+        }
+        with self._lock:
+            self.requests.append(entry)
+        self.manager.record_request(entry)
+        return response
+
+def summarize_cache_requests(requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """요청 목록의 캐시 적중/절감 합계 (분석 1건의 요약 표시용)"""
+    input_tokens = sum(entry["input_tokens"] for entry in requests)
+    cached_input_tokens = sum(entry["cached_input_tokens"] for entry in requests)
+    return {
+        "request_count": len(requests),
+        "cached_requests": sum(1 for entry in requests if entry["cached_input_tokens"]),
+        "input_tokens": input_tokens,
+        "cached_input_tokens": cached_input_tokens,
+        "cached_ratio": cached_input_tokens / input_tokens if input_tokens else 0.0,
+        "saved_usd": sum(entry["saved_usd"] for entry in requests),
+    }
+
+_prompt_cache_manager: Optional[PromptCacheManager] = None
+_prompt_cache_manager_lock = threading.Lock()
+
+def get_prompt_cache_manager(google_api_key: Optional[str] = None) -> Optional[PromptCacheManager]:
+    """
+    프로세스 전역 캐시 관리자를 반환합니다 (모든 Streamlit 세션과 페이지가 공유).
+    AppConfig.PROMPT_CACHE_BACKEND가 'gemini'면 API 키가 필요하며, 없거나 SDK를 불러올 수 없으면 None (캐시 없이 호출).
+    """
+    global _prompt_cache_manager
+    with _prompt_cache_manager_lock:
+        if _prompt_cache_manager is None:
+            if AppConfig.PROMPT_CACHE_BACKEND == "simulated":
+                _prompt_cache_manager = PromptCacheManager(SimulatedPromptCacheBackend())
+            elif google_api_key:
+                try:
+                    _prompt_cache_manager = PromptCacheManager(GeminiContextCacheBackend(google_api_key))
+                except ImportError as e:
+                    logger.warning("프롬프트 캐시 비활성화 (google-genai를 불러올 수 없음): %s", e)
+        return _prompt_cache_manager
+
+# --- 성능 측정 ---
+def benchmark_prompt_cache(
+    n_requests: int = 20,
+    document_tokens: int = 20_000,
+    request_interval_seconds: float = 600,
+    model_name: str = AppConfig.GEMINI_MODEL_NAME
+) -> Dict[str, Any]:
+    """
+    시뮬레이터 백엔드와 가짜 모델로 request_interval_seconds 간격(가상 시계)의 요청 n_requests건을 보내
+    요청별 캐시 적중 토큰과 절감액, TTL 연장/재생성 횟수, 저장 비용을 계산합니다. 중간에 prompts.py 변경(버전 교체)도 한 번 흉내 냅니다.
+    """
+    from fake_llm import FakeChatModel, requested_sections_responder
+    from prompts import PATENT_DATA_SCHEMA_SECTIONS
+    from schema_versioning import build_section_extraction_prompt
+
+    clock = {"now": 0.0}
+    manager = PromptCacheManager(SimulatedPromptCacheBackend(), clock=lambda: clock["now"])
+    model = PromptCachedModel(FakeChatModel(requested_sections_responder(), model_name=model_name), manager, model_name)
+    document_text = "The cathode material sodium layered oxide capacity. " * (document_tokens * 4 // 52)
+    sections = list(PATENT_DATA_SCHEMA_SECTIONS)
+    for index in range(n_requests):
+        prompt = build_section_extraction_prompt(document_text, f"bench_{index:03d}.pdf", sections)
+        if index >= n_requests // 2:
+            # 스키마 변경 흉내: 바뀐 접두부는 새 버전으로 등록되고, 이전 버전은 더 쓰이지 않다가 만료됨
+            prompt = prompt.replace("You are an expert", "You are a careful expert", 1)
+        model.invoke([HumanMessage(content=prompt)])
+        clock["now"] += request_interval_seconds
+    snapshot = manager.snapshot()
+    input_price, _ = AppConfig.MODEL_PRICING_PER_1M_TOKENS.get(model_name, (0.0, 0.0))
+    return {
+        "model_name": model_name,
+        "requests": model.requests,
+        "totals": snapshot["totals"],
+        "uncached_input_usd": snapshot["totals"]["input_tokens"] * input_price / 1_000_000,
+        "events": snapshot["events"],
+    }
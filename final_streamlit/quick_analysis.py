@@ -0,0 +1,247 @@
+# quick_analysis.py
+# 관련성 판단용 빠른 분석: 페이지 텍스트에서 요약(57)과 청구항 구간만 찾아 축소 스키마(서지 정보, 소재 설명, 요약)로 추출합니다.
+# 전체 추출로 업그레이드할 때는 빠른 분석에서 검증을 통과한 섹션은 그대로 쓰고, 나머지 섹션만 전체 텍스트로 추출합니다.
+import re
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app_config import AppConfig
+from large_pdf import CLAIMS_HEADING_RE
+from llm_utils import estimate_tokens
+from model_routing import validate_section_output
+from prompts import PATENT_DATA_SCHEMA_SECTIONS
+from schema_versioning import build_section_extraction_prompt, extract_sections
+
+# 빠른 분석에서 추출하는 섹션 (요약/청구항만으로 채울 수 있는 항목)
+QUICK_SECTIONS = ["patent_info", "material_description", "document_summary_for_user", "language_of_document", "source_file_name"]
+
+_ABSTRACT_INID_RE = re.compile(r"\(57\)")
+_ABSTRACT_HEADING_RE = re.compile(r"^\s*[【\[]?\s*(?:abstract(?: of the disclosure)?|요\s*약(?:서)?|要約|摘要)\s*[】\]]?\s*$", re.IGNORECASE | re.MULTILINE)
+# 청구항 제목 뒤에 첫 청구항 번호가 나오는지 확인 (본문 중 'Claims ...'로 시작하는 줄과 구분)
+_FIRST_CLAIM_RE = re.compile(r"(?:^|\n)\s*(?:1\s*[.)]|[【\[]\s*청구항\s*1\s*[】\]]|청구항\s*1|【請求項1】)")
+_FIRST_CLAIM_WINDOW_CHARS = 400
+
+
+class QuickSections(NamedTuple):
+    """요약/청구항 구간 탐지 결과 (페이지 번호는 1부터)"""
+    abstract: str
+    claims: str
+    abstract_page: Optional[int]
+    claims_pages: List[int]
+    located: bool   # 요약과 청구항을 모두 찾았는지 (못 찾은 부분은 앞/뒤 페이지로 대체)
+
+def _find_abstract(page_texts: List[str]) -> Tuple[str, Optional[int]]:
+    """첫 몇 페이지에서 INID (57) 또는 '요약/Abstract' 제목 뒤의 텍스트를 찾습니다."""
+    for page_idx, text in enumerate(page_texts[:AppConfig.QUICK_ABSTRACT_SEARCH_PAGES]):
+        match = _ABSTRACT_INID_RE.search(text) or _ABSTRACT_HEADING_RE.search(text)
+        if match:
+            return text[match.end():].strip()[:AppConfig.QUICK_ABSTRACT_MAX_CHARS], page_idx + 1
+    return "", None
+
+def _find_claims(page_texts: List[str]) -> Tuple[str, List[int]]:
+    """
+    청구항 제목 중 바로 뒤에 첫 청구항 번호가 나오는 마지막 제목을 찾아, 그 위치부터 문서 끝까지(상한 길이) 청구항 구간으로 봅니다.
+    청구항은 보통 문서 끝(도면 앞)에 있으므로 본문에서 'Claims'로 시작하는 줄보다 뒤쪽 제목을 우선합니다.
+    """
+    found: Optional[Tuple[int, int]] = None
+    for page_idx, text in enumerate(page_texts):
+        for match in CLAIMS_HEADING_RE.finditer(text):
+            if _FIRST_CLAIM_RE.search(text[match.end():match.end() + _FIRST_CLAIM_WINDOW_CHARS]):
+                found = (page_idx, match.start())
+    if found is None:
+        return "", []
+    start_page, start_offset = found
+    parts, pages, remaining = [], [], AppConfig.QUICK_CLAIMS_MAX_CHARS
+    for page_idx in range(start_page, len(page_texts)):
+        part = page_texts[page_idx][start_offset if page_idx == start_page else 0:].strip()
+        if not part:
+            continue
+        parts.append(part[:remaining])
+        pages.append(page_idx + 1)
+        remaining -= len(parts[-1])
+        if remaining <= 0:
+            break
+    return "\n".join(parts), pages
+
+def locate_quick_sections(page_texts: List[str]) -> QuickSections:
+    """
+    페이지 텍스트에서 요약과 청구항 구간을 찾습니다.
+    요약을 못 찾으면 첫 페이지, 청구항을 못 찾으면 마지막 페이지들(상한 길이까지)로 대체하고 located=False로 표시합니다.
+    """
+    abstract, abstract_page = _find_abstract(page_texts)
+    claims, claims_pages = _find_claims(page_texts)
+    located = bool(abstract and claims)
+    if not abstract and page_texts:
+        abstract, abstract_page = page_texts[0][:AppConfig.QUICK_ABSTRACT_MAX_CHARS], 1
+    if not claims and page_texts:
+        tail, tail_pages = [], []
+        for page_idx in range(len(page_texts) - 1, 0, -1):
+            if sum(len(part) for part in tail) >= AppConfig.QUICK_CLAIMS_MAX_CHARS:
+                break
+            if page_texts[page_idx].strip():
+                tail.insert(0, page_texts[page_idx].strip())
+                tail_pages.insert(0, page_idx + 1)
+        claims, claims_pages = "\n".join(tail)[:AppConfig.QUICK_CLAIMS_MAX_CHARS], tail_pages
+    return QuickSections(abstract, claims, abstract_page, claims_pages, located)
+
+def build_quick_text(sections: QuickSections) -> str:
+    """LLM에 보낼 빠른 분석 입력 (요약 + 청구항, 출처 페이지 표시)"""
+    claims_pages = f"p{sections.claims_pages[0]}-{sections.claims_pages[-1]}" if sections.claims_pages else "?"
+    return (
+        "NOTE: Only the abstract and the claims of the patent are provided below (quick triage mode). "
+        "Fill fields that cannot be determined from this text with null or empty values.\n\n"
+        f"[ABSTRACT (p{sections.abstract_page or '?'})]\n{sections.abstract}\n\n"
+        f"[CLAIMS ({claims_pages})]\n{sections.claims}"
+    )
+
+def run_quick_analysis(
+    page_texts: List[str],
+    model: Any,
+    model_name: str,
+    pdf_filename: str,
+    prefilled_patent_info: Optional[Dict[str, Any]] = None,
+    full_prompt_text: Optional[str] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    요약/청구항만으로 QUICK_SECTIONS를 추출합니다. (구조화 데이터, 지표) 튜플을 반환하며, 실패 시 구조화 데이터는 'error' 딕셔너리입니다.
+    full_prompt_text(전체 모드 입력 텍스트)를 주면 지표에 전체 모드 대비 입력 토큰 비율을 함께 기록합니다.
+    """
+    started = time.perf_counter()
+    sections = locate_quick_sections(page_texts)
+    quick_text = build_quick_text(sections)
+    locate_seconds = time.perf_counter() - started
+    extracted, stats = extract_sections(
+        model, model_name, quick_text, pdf_filename, QUICK_SECTIONS,
+        timeout=AppConfig.QUICK_ANALYSIS_TIMEOUT, prefilled_patent_info=prefilled_patent_info
+    )
+    metrics = {
+        "located": sections.located,
+        "abstract_page": sections.abstract_page,
+        "claims_pages": sections.claims_pages,
+        "input_chars": len(quick_text),
+        "prompt_tokens_estimate": estimate_tokens(build_section_extraction_prompt(quick_text, pdf_filename, QUICK_SECTIONS, prefilled_patent_info)),
+        "full_prompt_tokens_estimate": (
+            estimate_tokens(build_section_extraction_prompt(full_prompt_text, pdf_filename, list(PATENT_DATA_SCHEMA_SECTIONS), prefilled_patent_info))
+            if full_prompt_text is not None else None
+        ),
+        "locate_seconds": locate_seconds,
+        "llm_seconds": stats.get("latency_seconds"),
+        "usage": stats.get("usage"),
+        "cost_usd": stats.get("cost_usd"),
+        "model_name": model_name,
+    }
+    if stats["error"] or not extracted:
+        return {
+            "error": f"Quick analysis failed: {stats['error'] or 'No requested sections in response.'}",
+            "source_file_name": pdf_filename,
+            "language_of_document": "Unknown",
+        }, metrics
+    structured_data = {name: extracted[name] for name in QUICK_SECTIONS if name in extracted}
+    structured_data["source_file_name"] = pdf_filename
+    return structured_data, metrics
+
+def sections_to_upgrade(quick_data: Dict[str, Any]) -> List[str]:
+    """
+    전체 추출 업그레이드에서 다시 추출할 섹션을 스키마 순서대로 반환합니다.
+    빠른 분석 섹션 중 검증(model_routing.validate_section_output)을 통과한 것은 재사용하고, 실패한 섹션과 나머지 섹션을 추출합니다.
+    """
+    return [
+        name for name in PATENT_DATA_SCHEMA_SECTIONS
+        if name not in QUICK_SECTIONS or validate_section_output(name, quick_data.get(name), name in quick_data)
+    ]
+
+def upgrade_to_full_analysis(
+    quick_data: Dict[str, Any],
+    full_prompt_text: str,
+    model: Any,
+    model_name: str,
+    pdf_filename: str,
+    prefilled_patent_info: Optional[Dict[str, Any]] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    빠른 분석 결과를 재사용하여 전체 추출을 완성합니다. (스키마 순서로 병합한 구조화 데이터, 지표) 튜플을 반환하며,
+    추출이 실패하면 구조화 데이터는 'error' 딕셔너리입니다 (빠른 분석 결과는 호출한 쪽에 그대로 남음).
+    """
+    section_names = sections_to_upgrade(quick_data)
+    extracted, stats = extract_sections(
+        model, model_name, full_prompt_text, pdf_filename, section_names,
+        prefilled_patent_info=prefilled_patent_info if "patent_info" in section_names else None
+    )
+    metrics = {
+        "sections": section_names,
+        "reused_sections": [name for name in QUICK_SECTIONS if name not in section_names and name in quick_data],
+        "llm_seconds": stats.get("latency_seconds"),
+        "usage": stats.get("usage"),
+        "cost_usd": stats.get("cost_usd"),
+        "model_name": model_name,
+    }
+    if stats["error"] or not extracted:
+        return {
+            "error": f"Full extraction upgrade failed: {stats['error'] or 'No requested sections in response.'}",
+            "source_file_name": pdf_filename,
+            "language_of_document": "Unknown",
+        }, metrics
+    merged = {**quick_data, **extracted}
+    structured_data = {name: merged[name] for name in PATENT_DATA_SCHEMA_SECTIONS if name in merged}
+    structured_data["source_file_name"] = pdf_filename
+    return structured_data, metrics
+
+def make_benchmark_patent_pages(n_pages: int = 40, seed: int = 0) -> List[str]:
+    """측정용 합성 특허 페이지: 첫 페이지에 (57) 요약, 끝에서 두 번째 페이지에 청구항이 있는 공보 형태"""
+    from text_compaction import make_benchmark_pages
+    pages = make_benchmark_pages(n_pages, seed=seed)
+    pages[0] = (
+        "(19) European Patent Office\n(11) EP 3 968 410 A1\n(54) SODIUM LAYERED OXIDE CATHODE MATERIAL\n"
+        "(57) A sodium layered oxide cathode material represented by NaxMnyNizO2 is provided. "
+        "The material shows a discharge capacity of 150 mAh/g and improved cycle retention.\n\n" + pages[0]
+    )
+    pages[-2] = (
+        "Claims\n\n1. A cathode material comprising a sodium layered oxide represented by NaxMnyNizO2, "
+        "wherein 0.6 <= x <= 1.0.\n\n2. The cathode material according to claim 1, wherein the particle size is 5 to 15 um.\n\n"
+        + pages[-2]
+    )
+    return pages
+
+def benchmark_quick_analysis(
+    n_pages: int = 40,
+    latency_seconds: float = 0.5,
+    latency_per_1k_input_tokens: float = 0.3
+) -> Dict[str, Any]:
+    """
+    가짜 LLM(고정 지연 + 입력 토큰 비례 지연)으로 합성 특허 n_pages 페이지를 전체 분석, 빠른 분석, 빠른 분석 후 업그레이드로 각각 실행하여
+    입력 토큰과 LLM 시간을 비교합니다.
+    """
+    from fake_llm import FakeChatModel, requested_sections_responder
+    from text_compaction import build_prompt_text
+
+    page_texts = make_benchmark_patent_pages(n_pages)
+    full_text, _, _ = build_prompt_text(page_texts)
+    section_values = {
+        "patent_info": {"title": "Sodium layered oxide cathode material", "publication_number": "EP 3 968 410 A1"},
+        "material_description": {"material_type": "sodium layered oxide", "chemical_formula_general": "NaxMnyNizO2",
+                                 "formula_parameters": [{"symbol": "x", "range": "0.6-1.0"}]},
+        "document_summary_for_user": "Sodium layered oxide cathode with 150 mAh/g discharge capacity.",
+        "language_of_document": "English",
+    }
+    model = FakeChatModel(requested_sections_responder(section_values), latency_seconds=latency_seconds,
+                          latency_per_1k_input_tokens=latency_per_1k_input_tokens)
+    pdf_filename = "bench_quick.pdf"
+
+    started = time.perf_counter()
+    _, full_stats = extract_sections(model, "fake-model", full_text, pdf_filename, list(PATENT_DATA_SCHEMA_SECTIONS))
+    full_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    quick_data, quick_metrics = run_quick_analysis(page_texts, model, "fake-model", pdf_filename, full_prompt_text=full_text)
+    quick_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    upgraded, upgrade_metrics = upgrade_to_full_analysis(quick_data, full_text, model, "fake-model", pdf_filename)
+    upgrade_seconds = time.perf_counter() - started
+    return {
+        "pages": n_pages,
+        "located": quick_metrics["located"],
+        "full": {"seconds": full_seconds, "input_tokens": full_stats["usage"]["input_tokens"]},
+        "quick": {"seconds": quick_seconds, "input_tokens": quick_metrics["usage"]["input_tokens"],
+                  "locate_seconds": quick_metrics["locate_seconds"]},
+        "upgrade": {"seconds": upgrade_seconds, "input_tokens": upgrade_metrics["usage"]["input_tokens"],
+                    "reused_sections": upgrade_metrics["reused_sections"], "failed": "error" in upgraded},
+    }
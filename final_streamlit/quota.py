@@ -0,0 +1,204 @@
+# quota.py
+# 공유 GOOGLE_API_KEY의 LLM 호출을 세션별/전체 한도로 제한하고 사용 현황을 집계하는 쿼터 관리자
+# 모든 세션(및 대시보드 페이지)이 같은 프로세스 전역 인스턴스를 사용합니다.
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app_config import AppConfig
+from llm_utils import estimate_tokens, get_token_usage
+
+# 토큰 한도를 계산하는 슬라이딩 윈도우 길이 (초)
+TOKEN_WINDOW_SECONDS = 60.0
+
+
+class QuotaExceededError(RuntimeError):
+    """대기열 제한 시간 안에 쿼터를 확보하지 못한 경우 발생합니다."""
+
+def classify_llm_error(error: BaseException) -> Optional[str]:
+    """예외를 대시보드 이벤트 유형('429', 'timeout')으로 분류합니다. 해당하지 않으면 None."""
+    name = type(error).__name__.lower()
+    message = str(error).lower()
+    if "resourceexhausted" in name or "ratelimit" in name or "429" in message or "quota" in message:
+        return "429"
+    if "timeout" in name or "deadlineexceeded" in name or "timed out" in message or "deadline" in message:
+        return "timeout"
+    return None
+
+class QuotaManager:
+    """
+    진행 중인 호출 수와 토큰 사용량(최근 60초, 진행 중 예약 포함)을 세션별/전체로 추적하고,
+    한도를 넘는 호출은 한도 안으로 들어올 때까지 대기시킵니다.
+    """
+
+    def __init__(
+        self,
+        max_inflight_calls_global: int = AppConfig.QUOTA_MAX_INFLIGHT_CALLS_GLOBAL,
+        max_inflight_calls_per_session: int = AppConfig.QUOTA_MAX_INFLIGHT_CALLS_PER_SESSION,
+        max_tokens_per_minute_global: int = AppConfig.QUOTA_MAX_TOKENS_PER_MINUTE_GLOBAL,
+        max_tokens_per_minute_per_session: int = AppConfig.QUOTA_MAX_TOKENS_PER_MINUTE_PER_SESSION,
+        queue_timeout_seconds: float = AppConfig.QUOTA_QUEUE_TIMEOUT_SECONDS,
+        recent_events_limit: int = AppConfig.QUOTA_RECENT_EVENTS_LIMIT
+    ):
+        self.max_inflight_calls_global = max_inflight_calls_global
+        self.max_inflight_calls_per_session = max_inflight_calls_per_session
+        self.max_tokens_per_minute_global = max_tokens_per_minute_global
+        self.max_tokens_per_minute_per_session = max_tokens_per_minute_per_session
+        self.queue_timeout_seconds = queue_timeout_seconds
+
+        self._condition = threading.Condition()
+        self._inflight_calls: Dict[str, int] = {}
+        self._inflight_tokens: Dict[str, int] = {}
+        self._token_window: Deque[Tuple[float, str, int]] = deque() # (완료 시각, 세션 ID, 토큰 수)
+        self._queued: Dict[int, Dict[str, Any]] = {}
+        self._next_ticket = 0
+        self._recent_events: Deque[Dict[str, Any]] = deque(maxlen=recent_events_limit)
+        self._totals = {"calls": 0, "tokens": 0, "rejected": 0}
+
+    # --- 내부 집계 (잠금 보유 상태에서 호출) ---
+    def _prune_window(self, now: float) -> None:
+        while self._token_window and now - self._token_window[0][0] > TOKEN_WINDOW_SECONDS:
+            self._token_window.popleft()
+
+    def _window_tokens(self, session_id: Optional[str] = None) -> int:
+        return sum(tokens for _, sid, tokens in self._token_window if session_id is None or sid == session_id)
+
+    def _has_capacity(self, session_id: str, estimated_tokens: int) -> bool:
+        self._prune_window(time.time())
+        global_calls = sum(self._inflight_calls.values())
+        session_calls = self._inflight_calls.get(session_id, 0)
+        if global_calls >= self.max_inflight_calls_global or session_calls >= self.max_inflight_calls_per_session:
+            return False
+        global_tokens = self._window_tokens() + sum(self._inflight_tokens.values())
+        session_tokens = self._window_tokens(session_id) + self._inflight_tokens.get(session_id, 0)
+        # 한도보다 큰 단일 요청도 사용량이 0일 때는 통과시켜 영구 대기를 막음
+        if global_tokens and global_tokens + estimated_tokens > self.max_tokens_per_minute_global:
+            return False
+        if session_tokens and session_tokens + estimated_tokens > self.max_tokens_per_minute_per_session:
+            return False
+        return True
+
+    # --- 공개 API ---
+    @contextmanager
+    def reserve(self, session_id: str, estimated_tokens: int, label: str = "") -> Iterator[Dict[str, int]]:
+        """
+        호출 1건의 쿼터를 예약합니다. 한도 초과 시 대기하며, 제한 시간을 넘기면 QuotaExceededError를 발생시킵니다.
+        with 블록 안에서 반환된 딕셔너리의 'actual_tokens'를 채우면 완료 시 예약 토큰 대신 실제 사용량이 기록됩니다.
+        """
+        usage = {"estimated_tokens": estimated_tokens, "actual_tokens": 0}
+        with self._condition:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._queued[ticket] = {"session_id": session_id, "label": label, "estimated_tokens": estimated_tokens, "queued_at": time.time()}
+            deadline = time.monotonic() + self.queue_timeout_seconds
+            try:
+                while not self._has_capacity(session_id, estimated_tokens):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._totals["rejected"] += 1
+                        self._record_event_locked("quota_rejected", session_id, f"queue timeout after {self.queue_timeout_seconds:g}s ({label})")
+                        raise QuotaExceededError(
+                            f"LLM 쿼터 대기 시간({self.queue_timeout_seconds:.0f}초)을 초과했습니다. 잠시 후 다시 시도해주세요."
+                        )
+                    # 윈도우 만료로 여유가 생기는 경우도 있으므로 주기적으로 다시 확인
+                    self._condition.wait(timeout=min(remaining, 1.0))
+            finally:
+                self._queued.pop(ticket, None)
+            self._inflight_calls[session_id] = self._inflight_calls.get(session_id, 0) + 1
+            self._inflight_tokens[session_id] = self._inflight_tokens.get(session_id, 0) + estimated_tokens
+        try:
+            yield usage
+        finally:
+            with self._condition:
+                self._inflight_calls[session_id] -= 1
+                self._inflight_tokens[session_id] -= estimated_tokens
+                if not self._inflight_calls[session_id]:
+                    self._inflight_calls.pop(session_id)
+                    self._inflight_tokens.pop(session_id)
+                used_tokens = usage["actual_tokens"] or estimated_tokens
+                self._token_window.append((time.time(), session_id, used_tokens))
+                self._totals["calls"] += 1
+                self._totals["tokens"] += used_tokens
+                self._condition.notify_all()
+
+    def record_event(self, event_type: str, session_id: str, detail: str) -> None:
+        """429, 타임아웃 등 대시보드에 표시할 이벤트를 기록합니다."""
+        with self._condition:
+            self._record_event_locked(event_type, session_id, detail)
+
+    def _record_event_locked(self, event_type: str, session_id: str, detail: str) -> None:
+        self._recent_events.appendleft({"time": time.time(), "type": event_type, "session_id": session_id, "detail": detail[:300]})
+
+    def snapshot(self) -> Dict[str, Any]:
+        """대시보드용 현재 사용 현황 스냅샷을 반환합니다."""
+        with self._condition:
+            now = time.time()
+            self._prune_window(now)
+            session_ids = set(self._inflight_calls) | {sid for _, sid, _ in self._token_window} | {q["session_id"] for q in self._queued.values()}
+            sessions: List[Dict[str, Any]] = [
+                {
+                    "session_id": sid,
+                    "inflight_calls": self._inflight_calls.get(sid, 0),
+                    "inflight_tokens": self._inflight_tokens.get(sid, 0),
+                    "tokens_last_minute": self._window_tokens(sid),
+                    "queued": sum(1 for q in self._queued.values() if q["session_id"] == sid),
+                }
+                for sid in sorted(session_ids)
+            ]
+            return {
+                "global": {
+                    "inflight_calls": sum(self._inflight_calls.values()),
+                    "inflight_tokens": sum(self._inflight_tokens.values()),
+                    "tokens_last_minute": self._window_tokens(),
+                    "queued": len(self._queued),
+                },
+                "limits": {
+                    "max_inflight_calls_global": self.max_inflight_calls_global,
+                    "max_inflight_calls_per_session": self.max_inflight_calls_per_session,
+                    "max_tokens_per_minute_global": self.max_tokens_per_minute_global,
+                    "max_tokens_per_minute_per_session": self.max_tokens_per_minute_per_session,
+                },
+                "sessions": sessions,
+                "queued": [dict(q, waiting_seconds=now - q["queued_at"]) for q in self._queued.values()],
+                "recent_events": list(self._recent_events),
+                "totals": dict(self._totals),
+            }
+
+class QuotaLimitedModel:
+    """
+    채팅 모델을 감싸 invoke 전에 쿼터를 예약하고, 완료 후 실제 토큰 사용량과 429/타임아웃 이벤트를 기록합니다.
+    원래 모델과 같은 invoke 인터페이스를 제공하므로 기존 추출 함수에 그대로 넘길 수 있습니다.
+    """
+
+    def __init__(self, model: Any, manager: QuotaManager, session_id: str):
+        self.model = model
+        self.manager = manager
+        self.session_id = session_id
+
+    def invoke(self, messages: List[Any], config: Optional[Dict[str, Any]] = None) -> Any:
+        prompt_chars = "".join(str(getattr(message, "content", message)) for message in messages)
+        estimated_tokens = estimate_tokens(prompt_chars)
+        model_name = getattr(self.model, "model", type(self.model).__name__)
+        with self.manager.reserve(self.session_id, estimated_tokens, label=str(model_name)) as usage:
+            try:
+                response = self.model.invoke(messages, config=config)
+            except Exception as e:
+                event_type = classify_llm_error(e)
+                if event_type:
+                    self.manager.record_event(event_type, self.session_id, f"{type(e).__name__}: {e}")
+                raise
+            usage["actual_tokens"] = get_token_usage(response)["total_tokens"]
+            return response
+
+_quota_manager: Optional[QuotaManager] = None
+_quota_manager_lock = threading.Lock()
+
+def get_quota_manager() -> QuotaManager:
+    """프로세스 전역 쿼터 관리자를 반환합니다 (모든 Streamlit 세션과 페이지가 공유)."""
+    global _quota_manager
+    with _quota_manager_lock:
+        if _quota_manager is None:
+            _quota_manager = QuotaManager()
+        return _quota_manager
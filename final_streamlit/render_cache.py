@@ -0,0 +1,154 @@
+# render_cache.py
+# PDF 뷰어 페이지 이미지의 디스크 캐시 (세션/프로세스/재시작 간 공유)
+# 파일명은 (문서 ID, 페이지, DPI, JPEG 품질)로 정해지며, 용량 상한을 넘으면 가장 오래 쓰지 않은 파일부터 지웁니다.
+# 쓰기는 같은 디렉토리의 임시 파일에 쓴 뒤 os.replace로 교체하므로, 여러 세션과 작업 프로세스가 동시에 읽고 써도 반쯤 쓴 파일을 읽지 않습니다.
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from app_config import AppConfig
+
+RENDER_CACHE_SUFFIX = ".jpg"
+# 비정상 종료로 남은 임시 파일을 정리할 기준 (초)
+_STALE_TMP_SECONDS = 3600
+
+
+class RenderCache:
+    """
+    렌더링된 페이지 JPEG를 `<cache_dir>/<document_id 앞 2자리>/<document_id>_p<페이지>_d<DPI>_q<품질>.jpg`로 보관합니다.
+    적중 시 파일 수정 시각을 갱신하여(LRU), 용량 초과 시 수정 시각이 오래된 파일부터 삭제합니다.
+    적중/미스 횟수는 프로세스 단위로 집계합니다.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = AppConfig.RENDER_CACHE_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 다른 프로세스의 기록은 반영되지 않는 추정치. 상한을 넘으면 디렉토리를 다시 스캔하여 바로잡음
+        self._estimated_bytes = sum(size for _, size, _ in self._scan())
+
+    def _path(self, document_id: str, page_num: int, dpi: int, quality: int) -> str:
+        return os.path.join(self.cache_dir, document_id[:2], f"{document_id}_p{page_num}_d{dpi}_q{quality}{RENDER_CACHE_SUFFIX}")
+
+    def _scan(self) -> Iterator[Tuple[str, int, float]]:
+        """캐시 파일 (경로, 크기, 수정 시각)을 나열합니다. 오래된 임시 파일은 지웁니다."""
+        now = time.time()
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue # 다른 프로세스가 방금 삭제
+                if entry.name.endswith(RENDER_CACHE_SUFFIX):
+                    yield entry.path, stat.st_size, stat.st_mtime
+                elif now - stat.st_mtime > _STALE_TMP_SECONDS:
+                    self._remove(entry.path)
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def get(self, document_id: str, page_num: int, dpi: int, quality: int = AppConfig.PDF_VIEWER_JPEG_QUALITY) -> Optional[bytes]:
+        """캐시된 JPEG 바이트를 반환합니다. 없으면(또는 다른 프로세스가 방금 삭제했으면) None."""
+        path = self._path(document_id, page_num, dpi, quality)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def contains(self, document_id: str, page_num: int, dpi: int, quality: int = AppConfig.PDF_VIEWER_JPEG_QUALITY) -> bool:
+        """파일을 읽지 않고(적중/미스 집계 없이) 캐시 여부만 확인합니다."""
+        return os.path.exists(self._path(document_id, page_num, dpi, quality))
+
+    def put(self, document_id: str, page_num: int, dpi: int, data: bytes, quality: int = AppConfig.PDF_VIEWER_JPEG_QUALITY) -> None:
+        """JPEG 바이트를 원자적으로 기록하고(임시 파일 -> os.replace), 용량 상한을 넘으면 오래된 파일부터 삭제합니다."""
+        path = self._path(document_id, page_num, dpi, quality)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced_bytes = os.path.getsize(path) # 같은 페이지를 다시 쓰면 기존 파일 크기만큼 추정 용량에서 뺌
+        except OSError:
+            replaced_bytes = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            self._remove(tmp_path)
+            raise
+        with self._lock:
+            self._estimated_bytes += len(data) - replaced_bytes
+            over_budget = self._estimated_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def get_or_render(
+        self,
+        document_id: str,
+        page_num: int,
+        dpi: int,
+        render: Callable[[], Optional[bytes]],
+        quality: int = AppConfig.PDF_VIEWER_JPEG_QUALITY
+    ) -> Optional[bytes]:
+        """캐시에 있으면 그대로, 없으면 render()로 만들어 저장한 뒤 반환합니다."""
+        data = self.get(document_id, page_num, dpi, quality)
+        if data is None:
+            data = render()
+            if data is not None:
+                self.put(document_id, page_num, dpi, data, quality)
+        return data
+
+    def evict(self, target_ratio: float = AppConfig.RENDER_CACHE_EVICT_TARGET_RATIO) -> int:
+        """전체 크기가 max_bytes * target_ratio 이하가 될 때까지 수정 시각이 오래된 파일부터 삭제합니다. 삭제한 파일 수를 반환합니다."""
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        total_bytes = sum(size for _, size, _ in entries)
+        target_bytes = self.max_bytes * target_ratio
+        removed = 0
+        for path, size, _ in entries:
+            if total_bytes <= target_bytes:
+                break
+            if self._remove(path):
+                removed += 1
+            total_bytes -= size
+        with self._lock:
+            self._estimated_bytes = total_bytes
+            self.evictions += removed
+        return removed
+
+    def clear(self) -> int:
+        """캐시 파일을 모두 삭제하고 삭제한 파일 수를 반환합니다."""
+        return sum(self._remove(path) for path, _, _ in list(self._scan()))
+
+    def stats(self) -> Dict[str, Any]:
+        """디스크 사용량(파일 수, 바이트)과 이 프로세스의 적중/미스/삭제 횟수, 적중률을 반환합니다."""
+        entries = list(self._scan())
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "files": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,115 @@
+# result_store.py
+# 분석 결과를 문서 단위 JSON 파일로 보관하는 디스크 저장소
+# 파일명은 PDF 바이트의 SHA-256 다이제스트이므로 같은 문서를 다시 분석하면 기존 레코드를 덮어씁니다.
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+# 문서 ID 형식 (SHA-256 16진수). 저장소 디렉토리의 다른 .json 파일은 레코드로 보지 않음
+_DOCUMENT_ID_RE = re.compile(r"[0-9a-f]{64}")
+_RECORD_SUFFIX = ".json"
+
+
+def compute_document_id(pdf_bytes: bytes) -> str:
+    """PDF 바이트 내용으로부터 문서 ID(SHA-256 16진수 문자열)를 계산합니다."""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+def is_document_id(value: str) -> bool:
+    """문서 ID 형식(소문자 64자리 16진수)인지 확인합니다."""
+    return bool(_DOCUMENT_ID_RE.fullmatch(value or ""))
+
+def compute_file_document_id(path: str, chunk_size: int = 8 * 1024 * 1024) -> str:
+    """파일을 chunk_size 단위로 읽어 문서 ID를 계산합니다 (compute_document_id와 같은 값, 파일 전체를 메모리에 올리지 않음)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ResultStore:
+    """
+    문서별 분석 레코드를 `<base_dir>/<document_id>.json`으로 저장합니다. 문서 ID는 SHA-256 16진수만 허용하며,
+    같은 디렉토리의 다른 파일(저널, 지표, 인덱스 등)은 목록/지문/순회에서 제외됩니다.
+    레코드 필드: document_id, source_file_name, page_texts, structured_data, schema_versions, model_name, created_at, updated_at
+    """
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def _path(self, document_id: str) -> str:
+        return os.path.join(self.base_dir, f"{document_id}{_RECORD_SUFFIX}")
+
+    @staticmethod
+    def _record_id(file_name: str) -> Optional[str]:
+        """레코드 파일 이름이면 문서 ID, 아니면 None"""
+        if not file_name.endswith(_RECORD_SUFFIX):
+            return None
+        document_id = file_name[:-len(_RECORD_SUFFIX)]
+        return document_id if is_document_id(document_id) else None
+
+    def save(self, record: Dict[str, Any]) -> None:
+        """레코드를 원자적으로 기록합니다 (임시 파일에 쓴 뒤 os.replace). 문서 ID 형식이 아니면 ValueError."""
+        if not is_document_id(record.get("document_id")):
+            raise ValueError(f"Invalid document_id: {record.get('document_id')!r}")
+        now = time.strftime("%Y-%m-%dT%H:%M:%S")
+        record.setdefault("created_at", now)
+        record["updated_at"] = now
+        fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(record["document_id"]))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """문서 ID로 레코드를 읽습니다. 없거나 손상되었거나 문서 ID 형식이 아니면 None을 반환합니다."""
+        if not is_document_id(document_id):
+            return None
+        try:
+            with open(self._path(document_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def exists(self, document_id: str) -> bool:
+        """레코드를 읽지 않고 문서 ID의 저장 여부만 확인합니다."""
+        return is_document_id(document_id) and os.path.exists(self._path(document_id))
+
+    def list_ids(self) -> List[str]:
+        """저장된 문서 ID 목록을 정렬하여 반환합니다."""
+        return sorted(document_id for document_id in map(self._record_id, os.listdir(self.base_dir)) if document_id)
+
+    def list_versions(self) -> Dict[str, int]:
+        """저장된 문서 ID별 파일 수정 시각(ns)을 반환합니다. 레코드를 읽지 않고 추가/갱신/삭제된 문서를 찾는 데 사용합니다."""
+        with os.scandir(self.base_dir) as entries:
+            return {
+                self._record_id(entry.name): entry.stat().st_mtime_ns
+                for entry in entries if self._record_id(entry.name)
+            }
+
+    def fingerprint(self) -> str:
+        """
+        저장소 내용의 지문(파일명, 크기, 수정 시각 기반)을 반환합니다. 레코드를 읽지 않으므로 매 재실행마다 호출해도 저렴하며,
+        문서가 추가/갱신될 때만 값이 바뀌어 파생 데이터 캐시의 무효화 키로 사용할 수 있습니다.
+        """
+        digest = hashlib.sha256()
+        with os.scandir(self.base_dir) as entries:
+            for entry in sorted((e for e in entries if self._record_id(e.name)), key=lambda e: e.name):
+                stat = entry.stat()
+                digest.update(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+        return digest.hexdigest()
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """저장된 모든 레코드를 하나씩 읽어 반환합니다 (전체를 메모리에 올리지 않음)."""
+        for document_id in self.list_ids():
+            record = self.load(document_id)
+            if record is not None:
+                yield record
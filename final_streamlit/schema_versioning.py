@@ -0,0 +1,199 @@
+# schema_versioning.py
+# 프롬프트 스키마를 섹션(최상위 JSON 키) 단위로 버전 관리하고, 변경된 섹션만 재추출하는 백필 작업
+import hashlib
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.messages import HumanMessage
+
+from app_config import AppConfig
+from bibliographic_parser import build_prefilled_instruction, merge_with_llm_patent_info, parse_front_page
+from llm_utils import estimate_cost_usd, get_token_usage, parse_json_response
+from prompts import PATENT_DATA_PROMPT_INSTRUCTIONS, PATENT_DATA_SCHEMA_SECTIONS
+from result_store import ResultStore
+from text_compaction import build_prompt_text
+
+# 공통 지시문의 버전을 기록하는 키. 지시문이 바뀌면 모든 섹션이 재추출 대상이 됩니다.
+SHARED_INSTRUCTIONS_KEY = "_instructions"
+
+
+def _hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+def compute_schema_versions(
+    sections: Dict[str, str] = PATENT_DATA_SCHEMA_SECTIONS,
+    instructions: str = PATENT_DATA_PROMPT_INSTRUCTIONS
+) -> Dict[str, str]:
+    """섹션별 프롬프트 텍스트의 해시(버전)와 공통 지시문의 해시를 계산합니다."""
+    versions = {name: _hash_text(text) for name, text in sections.items()}
+    versions[SHARED_INSTRUCTIONS_KEY] = _hash_text(instructions)
+    return versions
+
+def find_stale_sections(stored_versions: Optional[Dict[str, str]], current_versions: Dict[str, str]) -> List[str]:
+    """저장된 버전과 현재 버전을 비교하여 재추출이 필요한 섹션 이름을 스키마 순서대로 반환합니다."""
+    section_names = [name for name in current_versions if name != SHARED_INSTRUCTIONS_KEY]
+    if not stored_versions or stored_versions.get(SHARED_INSTRUCTIONS_KEY) != current_versions.get(SHARED_INSTRUCTIONS_KEY):
+        return section_names
+    return [name for name in section_names if stored_versions.get(name) != current_versions[name]]
+
+def build_section_extraction_prompt(
+    full_patent_text: str,
+    pdf_filename: str,
+    section_names: List[str],
+    prefilled_patent_info: Optional[Dict[str, Any]] = None
+) -> str:
+    """지정한 섹션만 포함하는 축소 스키마로 추출 프롬프트를 구성합니다."""
+    selected_sections = ",\n".join(PATENT_DATA_SCHEMA_SECTIONS[name] for name in section_names)
+    return (
+        PATENT_DATA_PROMPT_INSTRUCTIONS +
+        "{\n" + selected_sections + "\n}\n" +
+        "\n\nIMPORTANT INSTRUCTIONS FOR THIS SPECIFIC TASK:\n" +
+        "- Output ONLY the top-level keys shown in the structure above: " + ", ".join(section_names) + "\n" +
+        f"- If 'source_file_name' is requested, it MUST be exactly: \"{pdf_filename}\"\n" +
+        (build_prefilled_instruction(prefilled_patent_info) if "patent_info" in section_names else "") +
+        "Here is the full patent text to analyze:\n\n--- BEGIN PATENT TEXT ---\n" +
+        full_patent_text +
+        "\n--- END PATENT TEXT ---\n\n" +
+        "Based on the schema and instructions provided above, generate a response containing the JSON object. The JSON object should be enclosed in ```json ... ```."
+    )
+
+def extract_sections(
+    model: Any,
+    model_name: str,
+    full_patent_text: str,
+    pdf_filename: str,
+    section_names: List[str],
+    timeout: int = AppConfig.API_REQUEST_TIMEOUT_STRUCTURED_DATA,
+    prefilled_patent_info: Optional[Dict[str, Any]] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    지정한 섹션만 LLM으로 추출합니다 (백필 재추출 및 모델 캐스케이드에서 공용).
+    (추출된 섹션 딕셔너리, 호출 통계) 튜플을 반환하며, 실패 시 통계의 'error'에 사유가 담깁니다.
+    """
+    prompt = build_section_extraction_prompt(full_patent_text, pdf_filename, section_names, prefilled_patent_info)
+    started = time.perf_counter()
+    stats: Dict[str, Any] = {"model_name": model_name, "sections": list(section_names), "error": None}
+    try:
+        response = model.invoke([HumanMessage(content=prompt)], config={"request_timeout": timeout})
+    except Exception as e:
+        stats.update(latency_seconds=time.perf_counter() - started, error=f"API call failed: {e}",
+                     usage=get_token_usage(None), cost_usd=0.0)
+        return {}, stats
+
+    usage = get_token_usage(response)
+    stats.update(latency_seconds=time.perf_counter() - started, usage=usage, cost_usd=estimate_cost_usd(model_name, usage))
+    content = response.content if isinstance(getattr(response, "content", None), str) else ""
+    parsed, error = parse_json_response(content)
+    if error:
+        stats["error"] = error
+        return {}, stats
+    # 요청하지 않은 키는 버리고, 요청한 섹션 중 응답에 있는 것만 반환
+    return {name: parsed[name] for name in section_names if name in parsed}, stats
+
+def merge_sections(structured_data: Dict[str, Any], partial_data: Dict[str, Any]) -> Dict[str, Any]:
+    """기존 추출 결과에 재추출된 섹션을 덮어써서 새 딕셔너리를 반환합니다. 나머지 섹션은 그대로 유지됩니다."""
+    merged = dict(structured_data)
+    merged.update(partial_data)
+    return merged
+
+@dataclass
+class BackfillReport:
+    """백필 작업의 진행 상황 및 비용 집계"""
+    total_documents: int = 0
+    stale_documents: int = 0
+    processed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    sections_reextracted: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    elapsed_seconds: float = 0.0
+    errors: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def remaining(self) -> int:
+        return self.stale_documents - self.processed
+
+def plan_backfill(store: ResultStore, current_versions: Optional[Dict[str, str]] = None) -> Tuple[int, List[Tuple[str, List[str]]]]:
+    """저장소 전체를 훑어 (전체 문서 수, [(문서 ID, 재추출할 섹션 목록), ...])을 반환합니다."""
+    current_versions = current_versions or compute_schema_versions()
+    plan = []
+    total = 0
+    for record in store.iter_records():
+        total += 1
+        structured_data = record.get("structured_data")
+        if not isinstance(structured_data, dict) or "error" in structured_data:
+            continue # 추출 자체가 실패한 문서는 백필이 아닌 전체 재분석 대상
+        stale = find_stale_sections(record.get("schema_versions"), current_versions)
+        if stale:
+            plan.append((record["document_id"], stale))
+    return total, plan
+
+def run_backfill(
+    store: ResultStore,
+    model: Any,
+    model_name: str,
+    progress_callback: Optional[Callable[[BackfillReport, str], None]] = None,
+    limit: Optional[int] = None,
+    dry_run: bool = False
+) -> BackfillReport:
+    """
+    저장된 문서 중 스키마가 변경된 섹션만 재추출하여 기존 결과에 병합합니다.
+    실패한 문서는 버전을 갱신하지 않으므로 다음 실행 때 다시 시도됩니다.
+    """
+    started = time.perf_counter()
+    current_versions = compute_schema_versions()
+    total, plan = plan_backfill(store, current_versions)
+    if limit is not None:
+        plan = plan[:limit]
+    report = BackfillReport(total_documents=total, stale_documents=len(plan))
+    if dry_run:
+        return report
+
+    for document_id, stale_sections in plan:
+        record = store.load(document_id)
+        if record is None:
+            report.processed += 1
+            report.failed += 1
+            report.errors.append({"document_id": document_id, "error": "Record could not be loaded."})
+            continue
+
+        full_text, _, _ = build_prompt_text(record.get("page_texts", []), page_numbers=record.get("selected_pages"))
+        partial_data, stats = extract_sections(
+            model, model_name, full_text, record.get("source_file_name", ""), stale_sections
+        )
+        report.processed += 1
+        report.input_tokens += stats["usage"]["input_tokens"]
+        report.output_tokens += stats["usage"]["output_tokens"]
+        report.cost_usd += stats["cost_usd"]
+
+        if stats["error"] or not partial_data:
+            report.failed += 1
+            report.errors.append({"document_id": document_id, "error": stats["error"] or "No requested sections in response."})
+        else:
+            page_texts = record.get("page_texts") or []
+            if "patent_info" in partial_data and page_texts:
+                # 앱과 동일하게 첫 페이지 규칙 기반 서지 정보를 우선 적용
+                partial_data["patent_info"], record["bibliographic_crosscheck"] = merge_with_llm_patent_info(
+                    parse_front_page(page_texts[0]), partial_data["patent_info"]
+                )
+            record["structured_data"] = merge_sections(record["structured_data"], partial_data)
+            stored_versions = dict(record.get("schema_versions") or {})
+            for name in partial_data:
+                stored_versions[name] = current_versions[name]
+            if all(name in partial_data for name in stale_sections):
+                # 공통 지시문 버전은 요청한 섹션이 모두 갱신된 경우에만 올림
+                stored_versions[SHARED_INSTRUCTIONS_KEY] = current_versions[SHARED_INSTRUCTIONS_KEY]
+            record["schema_versions"] = stored_versions
+            store.save(record)
+            report.succeeded += 1
+            report.sections_reextracted += len(partial_data)
+
+        report.elapsed_seconds = time.perf_counter() - started
+        if progress_callback:
+            progress_callback(report, document_id)
+
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,460 @@
+# similar_patents.py
+# 분석된 문서 전체에 대한 오프라인 유사 특허 검색: 페이지 텍스트 + 주요 추출 필드로 만든 TF-IDF 희소 행렬(SciPy CSC)에서
+# 코사인 유사도 상위 k개를 찾습니다. 새 문서는 대기 행에 쌓였다가 일정 수마다 주 행렬에 병합됩니다 (증분 갱신).
+import logging
+import math
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from app_config import AppConfig
+from element_index import parse_composition
+from result_store import ResultStore
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9]*(?:-[a-z0-9]+)*|[가-힣]{2,}")
+# 특허 문서 어디에나 나오는 영어 기능어/상투어 (용어 수 상한을 이런 단어에 쓰지 않도록 제외)
+STOPWORDS = frozenset("""
+a about above according after all also an and any are as at be been being below between both but by can claim claimed claims
+comprise comprised comprises comprising could described does each embodiment embodiments example examples fig figs figure figures
+first for from further has have having herein however if in including includes into invention is it its may more most no not
+of on one or other present preferably provided second same shown such than that the their then there thereof these this those
+three to two under use used using was were when where wherein which while with within
+""".split())
+# 유사도 계산에 추가 가중치로 들어가는 추출 필드 (점 경로). 목록 값은 이어 붙여 사용
+KEY_FIELD_PATHS = (
+    "patent_info.title_english_translation",
+    "patent_info.title_original_language",
+    "material_description.application_focus",
+    "material_description.material_system_type",
+    "material_description.chemical_formula_general",
+    "morphology_structure.particle_form_summary",
+    "preparation_method_summary.overall_synthesis_route_description",
+    "application_details.specific_component_role",
+    "key_claimed_advantages_or_problems_solved_by_invention",
+    "document_summary_for_user",
+)
+# 검색 결과에 함께 표시하는 문서 정보 (인덱스에 보관하여 결과 표시 때 레코드를 다시 읽지 않음)
+LABEL_FIELDS = ("source_file_name", "publication_number", "title", "material_system_type")
+# 조성 원소 용어의 접두어 (본문 단어 'na', 'co' 등과 구분)
+ELEMENT_TERM_PREFIX = "el:"
+# 결과마다 표시할 공통 핵심어 수
+SHARED_TERMS_PER_RESULT = 5
+
+
+def tokenize(text: str) -> List[str]:
+    """소문자 영문/숫자 단어(하이픈 연결 포함)와 두 글자 이상 한글 단어를 뽑습니다. 불용어와 한 글자 단어는 제외됩니다."""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if len(token) > 1 and token not in STOPWORDS]
+
+def _field_text(structured_data: Dict[str, Any], path: str) -> str:
+    value: Any = structured_data
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return ""
+        value = value.get(key)
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value if isinstance(item, (str, int, float)))
+    return value if isinstance(value, str) else ""
+
+def document_terms(page_texts: Sequence[str], structured_data: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """
+    문서 한 건의 용어 가중치를 계산합니다.
+    본문은 빈도 상위 SIMILAR_MAX_TERMS_PER_DOCUMENT개 용어에 1 + log(tf), 주요 추출 필드에 나온 용어와
+    조성 원소(el:na 등)에는 SIMILAR_FIELD_WEIGHT를 더합니다. idf는 검색 시점에 곱합니다.
+    """
+    counts = Counter(token for page in page_texts for token in tokenize(page or ""))
+    terms = {term: 1.0 + math.log(count) for term, count in counts.most_common(AppConfig.SIMILAR_MAX_TERMS_PER_DOCUMENT)}
+    structured_data = structured_data if isinstance(structured_data, dict) and "error" not in structured_data else {}
+    field_tokens = {token for path in KEY_FIELD_PATHS for token in tokenize(_field_text(structured_data, path))}
+    for token in field_tokens:
+        terms[token] = terms.get(token, 0.0) + AppConfig.SIMILAR_FIELD_WEIGHT
+    if isinstance(structured_data.get("material_description"), dict):
+        for symbol in parse_composition(structured_data["material_description"])["possible_elements"]:
+            terms[ELEMENT_TERM_PREFIX + symbol.lower()] = AppConfig.SIMILAR_FIELD_WEIGHT
+    return terms
+
+def display_term(term: str) -> str:
+    """화면 표시용 용어 ('el:na' -> 'Na (원소)')."""
+    if term.startswith(ELEMENT_TERM_PREFIX):
+        return term[len(ELEMENT_TERM_PREFIX):].capitalize() + " (원소)"
+    return term
+
+def document_label(record: Dict[str, Any]) -> Dict[str, str]:
+    """검색 결과에 표시할 문서 정보 (LABEL_FIELDS)를 레코드에서 뽑습니다."""
+    data = record.get("structured_data") if isinstance(record.get("structured_data"), dict) else {}
+    patent_info = data.get("patent_info") if isinstance(data.get("patent_info"), dict) else {}
+    material = data.get("material_description") if isinstance(data.get("material_description"), dict) else {}
+    return {
+        "source_file_name": str(record.get("source_file_name") or ""),
+        "publication_number": str(patent_info.get("publication_number") or ""),
+        "title": str(patent_info.get("title_english_translation") or patent_info.get("title_original_language") or ""),
+        "material_system_type": str(material.get("material_system_type") or ""),
+    }
+
+def _gather_columns(matrix: sp.csc_matrix, columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """CSC 행렬에서 지정한 열들의 0이 아닌 항목을 (행, 열 위치, 값) 배열로 모읍니다. 비용은 해당 열의 항목 수에만 비례합니다."""
+    starts = matrix.indptr[columns]
+    lengths = matrix.indptr[columns + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    return matrix.indices[offsets], np.repeat(np.arange(len(columns)), lengths), matrix.data[offsets]
+
+class SimilarityIndex:
+    """
+    문서 x 용어 가중치 행렬로 된 TF-IDF 검색 인덱스. 저장 값은 document_terms의 용어 가중치이며,
+    idf(log((1+N)/(1+df)) + 1)와 문서 노름은 인덱스의 문서 빈도로 계산합니다.
+    검색은 쿼리 용어 열만 CSC에서 모아 점수를 더하므로, 문서 수가 아니라 해당 용어를 가진 문서 수에 비례합니다.
+    추가된 문서는 대기 행(CSR)에 쌓였다가 SIMILAR_PENDING_MERGE_ROWS개마다 주 행렬에 병합되며, 병합 때 갱신/삭제된 행을 걷어내고
+    df, idf, 노름을 다시 계산합니다. 병합 사이에는 주 행렬에 있던 용어의 idf를 병합 시점 값으로 고정하고(주 행렬 노름과 일치),
+    새 용어의 idf만 현재 df로 계산하며, 대기 행의 노름은 검색 때 그 idf로 계산합니다. 그래서 점수는 항상 1 이하이고 추가 순서와 무관합니다.
+    여러 세션이 공유하므로 잠금으로 보호됩니다.
+    """
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.document_ids: List[str] = []       # 행 -> 문서 ID (갱신된 문서는 새 행을 받고, 옛 행은 alive=False)
+        self.labels: List[Dict[str, str]] = []  # 행 -> 표시 정보
+        self.rows: Dict[str, int] = {}          # 문서 ID -> 현재 행
+        self.versions: Dict[str, int] = {}      # 문서 ID -> 색인한 저장소 파일의 수정 시각 (sync 비교용)
+        self.alive = np.zeros(0, dtype=bool)
+        self.norms = np.zeros(0, dtype=np.float32)       # 주 행렬 행의 노름 (병합 시점 idf)
+        self.merged_idf = np.zeros(0, dtype=np.float32)  # 병합 시점의 용어별 idf
+        self.df = np.zeros(0, dtype=np.int32)
+        self.matrix = sp.csc_matrix((0, 0), dtype=np.float32)
+        self._pending: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._pending_matrix: Optional[sp.csr_matrix] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def idf(self) -> np.ndarray:
+        """현재 문서 빈도로 계산한 idf"""
+        return (np.log((1.0 + len(self.rows)) / (1.0 + self.df)) + 1.0).astype(np.float32)
+
+    def scoring_idf(self) -> np.ndarray:
+        """검색 점수에 쓰는 idf: 주 행렬에 있던 용어는 병합 시점 값, 그 뒤 새로 나온 용어는 현재 값"""
+        idf = self.idf()
+        idf[:len(self.merged_idf)] = self.merged_idf
+        return idf
+
+    def add(self, document_id: str, terms: Dict[str, float], label: Optional[Dict[str, str]] = None, version: Optional[int] = None) -> None:
+        """문서 한 건을 추가합니다. 같은 ID가 있으면 대체됩니다."""
+        self.add_many([(document_id, terms, label, version)])
+
+    def add_many(self, items: Iterable[Tuple[str, Dict[str, float], Optional[Dict[str, str]], Optional[int]]]) -> int:
+        """(문서 ID, 용어 가중치, 표시 정보, 저장소 버전) 목록을 추가하고 추가한 수를 반환합니다."""
+        with self._lock:
+            first_row = len(self.document_ids)
+            replaced_rows = []
+            for document_id, terms, label, version in items:
+                if document_id in self.rows:
+                    replaced_rows.append(self.rows[document_id])
+                columns = np.fromiter((self._term_column(term) for term in terms), dtype=np.int32, count=len(terms))
+                weights = np.fromiter(terms.values(), dtype=np.float32, count=len(terms))
+                order = np.argsort(columns)
+                self._pending.append((columns[order], weights[order]))
+                self.rows[document_id] = len(self.document_ids)
+                self.document_ids.append(document_id)
+                self.labels.append(label or {})
+                if version is not None:
+                    self.versions[document_id] = version
+            added = len(self.document_ids) - first_row
+            if not added:
+                return 0
+            if len(self.df) < len(self.terms):
+                self.df = np.concatenate([self.df, np.zeros(len(self.terms) - len(self.df), dtype=np.int32)])
+            new_rows = self._pending[-added:]
+            np.add.at(self.df, np.concatenate([columns for columns, _ in new_rows]), 1)
+            self.alive = np.concatenate([self.alive, np.ones(added, dtype=bool)])
+            self.alive[replaced_rows] = False
+            self._pending_matrix = None
+            if len(self._pending) >= AppConfig.SIMILAR_PENDING_MERGE_ROWS:
+                self._merge_locked()
+            return added
+
+    def _term_column(self, term: str) -> int:
+        column = self.vocabulary.get(term)
+        if column is None:
+            column = self.vocabulary[term] = len(self.terms)
+            self.terms.append(term)
+        return column
+
+    def remove(self, document_id: str) -> bool:
+        """문서를 검색 대상에서 뺍니다 (행은 다음 병합 때 정리됨)."""
+        with self._lock:
+            row = self.rows.pop(document_id, None)
+            self.versions.pop(document_id, None)
+            if row is None:
+                return False
+            self.alive[row] = False
+            return True
+
+    def _pending_csr(self) -> sp.csr_matrix:
+        if self._pending_matrix is None:
+            lengths = [len(columns) for columns, _ in self._pending]
+            indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+            indices = np.concatenate([columns for columns, _ in self._pending]) if self._pending else np.zeros(0, dtype=np.int32)
+            data = np.concatenate([weights for _, weights in self._pending]) if self._pending else np.zeros(0, dtype=np.float32)
+            self._pending_matrix = sp.csr_matrix((data, indices, indptr), shape=(len(self._pending), len(self.terms)))
+        return self._pending_matrix
+
+    def merge(self) -> None:
+        """대기 행을 주 행렬에 병합합니다."""
+        with self._lock:
+            self._merge_locked()
+
+    def _merge_locked(self) -> None:
+        """대기 행을 주 행렬에 합치고, 대체/삭제된 행을 걷어낸 뒤 df와 문서 노름을 다시 계산합니다."""
+        vocabulary_size = len(self.terms)
+        main = self.matrix.tocsr()
+        main.resize((main.shape[0], vocabulary_size))
+        combined = sp.vstack([main, self._pending_csr()], format="csr")
+        keep = np.flatnonzero(self.alive)
+        if len(keep) < combined.shape[0]:
+            combined = combined[keep]
+            self.document_ids = [self.document_ids[row] for row in keep]
+            self.labels = [self.labels[row] for row in keep]
+            self.rows = {document_id: row for row, document_id in enumerate(self.document_ids)}
+        self.alive = np.ones(len(self.document_ids), dtype=bool)
+        self.df = np.bincount(combined.indices, minlength=vocabulary_size).astype(np.int32)
+        self.merged_idf = self.idf()
+        idf_squared = self.merged_idf ** 2
+        row_of_entry = np.repeat(np.arange(combined.shape[0]), np.diff(combined.indptr))
+        self.norms = np.sqrt(np.bincount(row_of_entry, weights=combined.data.astype(np.float64) ** 2 * idf_squared[combined.indices],
+                                         minlength=combined.shape[0])).astype(np.float32)
+        self.matrix = combined.tocsc()
+        self._pending = []
+        self._pending_matrix = None
+
+    def query(self, terms: Dict[str, float], k: int = AppConfig.SIMILAR_PATENTS_TOP_K, exclude_ids: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """
+        용어 가중치(document_terms)와 코사인 유사도가 높은 문서 상위 k개를 반환합니다.
+        문서가 충분히 많으면 쿼리 용어 중 df 비율이 SIMILAR_MAX_DF_RATIO를 넘는 용어는 건너뛰고, tf-idf 상위 SIMILAR_QUERY_MAX_TERMS개만 사용합니다.
+        결과: [{'document_id', 'score', 'shared_terms', **LABEL_FIELDS}, ...] (점수 내림차순, 0점 문서 제외)
+        """
+        with self._lock:
+            if not self.rows:
+                return []
+            idf = self.scoring_idf()
+            known = [(self.vocabulary[term], weight) for term, weight in terms.items() if term in self.vocabulary]
+            if not known:
+                return []
+            columns = np.array([column for column, _ in known], dtype=np.int32)
+            query_weights = np.array([weight for _, weight in known], dtype=np.float32) * idf[columns]
+            query_norm = float(np.linalg.norm(query_weights)) or 1.0
+            usable = np.arange(len(columns))
+            if len(self.rows) >= AppConfig.SIMILAR_MAX_DF_MIN_DOCUMENTS:
+                usable = np.flatnonzero(self.df[columns] <= AppConfig.SIMILAR_MAX_DF_RATIO * len(self.rows))
+            usable = usable[np.argsort(-query_weights[usable], kind="stable")[:AppConfig.SIMILAR_QUERY_MAX_TERMS]]
+            columns = columns[usable]
+            coefficients = query_weights[usable] * idf[columns]
+
+            main_rows = self.matrix.shape[0]
+            scores = np.zeros(len(self.document_ids), dtype=np.float64)
+            in_main = np.flatnonzero(columns < self.matrix.shape[1])
+            hit_rows, hit_terms, hit_values = _gather_columns(self.matrix, columns[in_main])
+            hit_terms = in_main[hit_terms]
+            hit_contributions = hit_values * coefficients[hit_terms]
+            scores[:main_rows] = np.bincount(hit_rows, weights=hit_contributions, minlength=main_rows)
+            pending = self._pending_csr()[:, columns] if self._pending else None
+            norms = self.norms
+            if pending is not None:
+                scores[main_rows:] = pending @ coefficients
+                pending_all = self._pending_csr()
+                pending_norms = np.sqrt(pending_all.multiply(pending_all).astype(np.float64) @ (idf.astype(np.float64) ** 2))
+                norms = np.concatenate([norms, pending_norms])
+
+            norms = np.where(norms > 0, norms, 1.0) * query_norm
+            scores /= norms
+            scores[~self.alive] = 0.0
+            for document_id in exclude_ids:
+                if document_id in self.rows:
+                    scores[self.rows[document_id]] = 0.0
+            k = min(k, len(scores))
+            top_rows = np.argpartition(-scores, k - 1)[:k]
+            top_rows = top_rows[np.argsort(-scores[top_rows], kind="stable")]
+            top_rows = top_rows[scores[top_rows] > 0]
+
+            results = []
+            for row in top_rows:
+                if row < main_rows:
+                    entries = hit_rows == row
+                    row_terms, row_contributions = hit_terms[entries], hit_contributions[entries]
+                else:
+                    pending_row = pending.getrow(row - main_rows)
+                    row_terms, row_contributions = pending_row.indices, pending_row.data * coefficients[pending_row.indices]
+                strongest = np.argsort(-row_contributions, kind="stable")[:SHARED_TERMS_PER_RESULT]
+                results.append({
+                    "document_id": self.document_ids[row],
+                    "score": float(scores[row]),
+                    "shared_terms": [self.terms[columns[row_terms[position]]] for position in strongest],
+                    **{field: self.labels[row].get(field, "") for field in LABEL_FIELDS},
+                })
+            return results
+
+    def sync(self, store: ResultStore) -> int:
+        """
+        저장소와 비교하여 새로 추가/갱신된 레코드를 색인하고 삭제된 레코드를 뺍니다 (파일 수정 시각 비교, 바뀐 레코드만 읽음).
+        반영한 문서 수를 반환합니다.
+        """
+        store_versions = store.list_versions()
+        with self._lock:
+            removed = [document_id for document_id in self.versions if document_id not in store_versions]
+            for document_id in removed:
+                self.remove(document_id)
+            changed = [document_id for document_id, version in store_versions.items() if self.versions.get(document_id) != version]
+        items = []
+        for document_id in changed:
+            record = store.load(document_id)
+            if record is not None:
+                items.append((document_id, document_terms(record.get("page_texts") or [], record.get("structured_data")),
+                              document_label(record), store_versions[document_id]))
+        return self.add_many(items) + len(removed)
+
+    def save(self, path: str) -> None:
+        """대기 행을 병합한 뒤 인덱스를 .npz 파일로 원자적으로 기록합니다 (압축하지 않음: 큰 인덱스도 빠르게 읽고 쓰도록)."""
+        with self._lock:
+            self._merge_locked()
+            arrays = {
+                "indptr": self.matrix.indptr, "indices": self.matrix.indices, "data": self.matrix.data,
+                "shape": np.array(self.matrix.shape, dtype=np.int64),
+                "terms": np.array(self.terms, dtype=str),
+                "document_ids": np.array(self.document_ids, dtype=str),
+                "versions": np.array([self.versions.get(document_id, -1) for document_id in self.document_ids], dtype=np.int64),
+                **{f"label_{field}": np.array([label.get(field, "") for label in self.labels], dtype=str) for field in LABEL_FIELDS},
+            }
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.savez(f, **arrays)
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    @classmethod
+    def load(cls, path: str) -> "SimilarityIndex":
+        index = cls()
+        with np.load(path) as arrays:
+            shape = tuple(int(value) for value in arrays["shape"])
+            index.matrix = sp.csc_matrix((arrays["data"], arrays["indices"], arrays["indptr"]), shape=shape)
+            index.terms = arrays["terms"].tolist()
+            index.document_ids = arrays["document_ids"].tolist()
+            label_columns = {field: arrays[f"label_{field}"].tolist() for field in LABEL_FIELDS}
+            versions = arrays["versions"].tolist()
+        index.vocabulary = {term: column for column, term in enumerate(index.terms)}
+        index.labels = [{field: label_columns[field][row] for field in LABEL_FIELDS} for row in range(len(index.document_ids))]
+        index.rows = {document_id: row for row, document_id in enumerate(index.document_ids)}
+        index.versions = {document_id: version for document_id, version in zip(index.document_ids, versions) if version >= 0}
+        index.alive = np.ones(len(index.document_ids), dtype=bool)
+        index._merge_locked()
+        return index
+
+def load_index(path: str) -> SimilarityIndex:
+    """저장된 인덱스 파일을 읽습니다. 없거나 읽을 수 없으면 빈 인덱스를 반환합니다 (sync로 저장소에서 다시 만듦)."""
+    if os.path.exists(path):
+        try:
+            return SimilarityIndex.load(path)
+        except Exception as e:
+            logger.warning("유사 특허 인덱스를 읽을 수 없어 다시 만듭니다 (%s): %s", path, e)
+    return SimilarityIndex()
+
+def sync_index_file(index: SimilarityIndex, store: ResultStore, path: str) -> int:
+    """
+    인덱스를 저장소와 맞춘 뒤, 반영한 문서가 SIMILAR_INDEX_SAVE_MIN_CHANGES개 이상이거나 인덱스 파일이 아직 없으면 파일에 기록합니다.
+    그보다 적은 변경은 다음 시작 때 sync가 저장소에서 다시 반영하므로, 분석할 때마다 큰 인덱스 파일을 다시 쓰지 않습니다.
+    """
+    changed = index.sync(store)
+    if changed >= AppConfig.SIMILAR_INDEX_SAVE_MIN_CHANGES or (changed and not os.path.exists(path)):
+        index.save(path)
+    return changed
+
+# --- 성능 측정 ---
+def make_benchmark_term_vectors(
+    n_documents: int,
+    vocabulary_size: int = 200_000,
+    terms_per_document: int = 200,
+    seed: int = 0
+) -> List[Dict[str, float]]:
+    """용어 빈도가 Zipf 분포를 따르는 합성 문서별 용어 가중치 (본문 상위 용어 + 필드 가중치 범위)를 만듭니다."""
+    rng = np.random.default_rng(seed)
+    vocabulary = [f"term{column}" for column in range(vocabulary_size)]
+    cumulative = np.cumsum(1.0 / (np.arange(vocabulary_size) + 10.0))
+    cumulative /= cumulative[-1]
+    documents = []
+    chunk = 10_000
+    for start in range(0, n_documents, chunk):
+        rows = min(chunk, n_documents - start)
+        columns = np.searchsorted(cumulative, rng.random((rows, terms_per_document)))
+        weights = 1.0 + np.log1p(rng.integers(0, 20, size=(rows, terms_per_document))).astype(np.float32)
+        for row_columns, row_weights in zip(columns.tolist(), weights.tolist()):
+            documents.append({vocabulary[column]: weight for column, weight in zip(row_columns, row_weights)})
+    return documents
+
+def benchmark_similarity_index(n_documents: int = 100_000, n_queries: int = 50, k: int = 5, seed: int = 0) -> Dict[str, float]:
+    """
+    합성 코퍼스로 인덱스 구축(일괄 추가 + 병합), 상위 k 검색 지연(평균/p95), 증분 추가(대기 행)와 병합 시간을 측정하고,
+    합성 특허 본문의 용어 추출 시간(문서당)도 함께 측정합니다.
+    """
+    from quick_analysis import make_benchmark_patent_pages
+    results: Dict[str, float] = {"documents": float(n_documents)}
+    started = time.perf_counter()
+    documents = make_benchmark_term_vectors(n_documents + n_queries, seed=seed)
+    results["generate_seconds"] = time.perf_counter() - started
+
+    index = SimilarityIndex()
+    started = time.perf_counter()
+    index.add_many((f"doc{row:06d}", terms, None, None) for row, terms in enumerate(documents[:n_documents]))
+    index.merge()
+    results["build_seconds"] = time.perf_counter() - started
+    results["vocabulary_size"] = float(len(index.terms))
+    results["nonzeros"] = float(index.matrix.nnz)
+    results["matrix_mb"] = (index.matrix.data.nbytes + index.matrix.indices.nbytes + index.matrix.indptr.nbytes) / 1e6
+
+    rng = random.Random(seed)
+    latencies = []
+    for query_number in range(n_queries):
+        # 기존 문서와 절반쯤 겹치는 쿼리 (새 문서가 기존 문서와 비슷한 경우)
+        base = documents[rng.randrange(n_documents)]
+        fresh = documents[n_documents + query_number]
+        query = {**dict(list(fresh.items())[:len(fresh) // 2]), **dict(list(base.items())[:len(base) // 2])}
+        started = time.perf_counter()
+        index.query(query, k)
+        latencies.append((time.perf_counter() - started) * 1000)
+    results["query_mean_ms"] = float(np.mean(latencies))
+    results["query_p95_ms"] = float(np.percentile(latencies, 95))
+    results["query_max_ms"] = float(np.max(latencies))
+
+    started = time.perf_counter()
+    for query_number in range(n_queries):
+        index.add(f"new{query_number:06d}", documents[n_documents + query_number])
+    results["insert_ms"] = (time.perf_counter() - started) / n_queries * 1000
+    started = time.perf_counter()
+    index.query(documents[n_documents], k)
+    results["query_with_pending_ms"] = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    index.merge()
+    results["merge_seconds"] = time.perf_counter() - started
+
+    pages = make_benchmark_patent_pages(40, seed=seed)
+    started = time.perf_counter()
+    document_terms(pages)
+    results["terms_per_40_pages_ms"] = (time.perf_counter() - started) * 1000
+    return results
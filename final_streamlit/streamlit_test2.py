@@ -1,546 +1,1576 @@
-# streamlit_test_refactored_v4_no_structured_output.py
-import streamlit as st
-import os
-import fitz  # PyMuPDF
-from PIL import Image
-import io
-import json
-import traceback # 오류 추적을 위한 traceback 모듈 임포트
-from dotenv import load_dotenv # 환경 변수 로드를 위한 dotenv 모듈 임포트
-from typing import List, Tuple, Dict, Any, Optional # 타입 힌팅을 위한 typing 모듈 임포트
-
-from langchain_google_genai import ChatGoogleGenerativeAI # Langchain Google Generative AI 모델 임포트
-from langchain_core.messages import HumanMessage # Langchain 메시지 타입 임포트
-from langchain_core.outputs import LLMResult # LLM 응답 결과 타입을 위한 임포트 (오류 처리 시 사용 가능)
-
-# --- 외부 파일에서 프롬프트 및 스키마 설명 임포트 ---
-try:
-    # prompts.py에서 LLM에 전달할 프롬프트 (개선된 버전 사용 가정)
-    from prompts import PATENT_DATA_SCHEMA_FOR_LLM_PROMPT_FULL
-    # schema_descriptions.py에서 UI에 표시할 각 필드에 대한 한글 설명 (개선된 버전 사용 가정)
-    from schema_descriptions import SCHEMA_FIELD_DESCRIPTIONS
-except ImportError:
-    st.error("오류: `prompts.py` 또는 `schema_descriptions.py` 파일을 찾을 수 없습니다. 해당 파일들이 이 스크립트와 동일한 디렉토리에 있는지 확인해주세요.")
-    PATENT_DATA_SCHEMA_FOR_LLM_PROMPT_FULL = "{}" # LLM 호출 시도를 위해 최소한의 빈 JSON 형태라도 설정
-    SCHEMA_FIELD_DESCRIPTIONS = {} # 빈 딕셔너리로 설정
-    # st.stop() # 또는 앱 실행을 중단할 수 있음
-
-# --- 전역 설정 및 상수 ---
-class AppConfig:
-    # 사용할 Gemini 모델 이름
-    GEMINI_MODEL_NAME = "gemini-2.5-flash-preview-05-20" # 혹은 "gemini-1.5-pro-latest" 등 사용 가능한 최신 모델
-    # 모델의 창의성/일관성 조절 (0.0은 가장 일관성 있는 답변)
-    TEMPERATURE = 0.0
-    # LLM API 요청 타임아웃 시간 (초 단위, 예: 20분)
-    API_REQUEST_TIMEOUT_STRUCTURED_DATA = 1200
-    # PDF 페이지 이미지 뷰어용 DPI (해상도)
-    DEFAULT_DPI_PDF_PREVIEW = 150
-
-class SessionStateKeys:
-    # Streamlit 세션 상태에서 사용할 키 값들 정의
-    ANALYSIS_COMPLETE = 'analysis_complete' # 분석 완료 여부
-    STRUCTURED_DATA = 'structured_data'     # 추출된 구조화 데이터
-    PDF_PAGE_TEXTS = 'pdf_page_texts'       # PDF 페이지별 텍스트 리스트
-    CURRENT_PAGE_PDF_VIEW = 'current_page_for_pdf_view' # PDF 뷰어 현재 페이지 번호
-    ORIGINAL_FILENAME = 'original_filename' # 원본 파일명
-    PDF_BYTES_FOR_VIEWER = 'pdf_bytes_for_viewer' # PDF 뷰어용 바이트 데이터
-
-# --- 환경 변수 로드 및 LLM 초기화 ---
-load_dotenv() # .env 파일에서 환경 변수 로드
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY") # GOOGLE_API_KEY 환경 변수 가져오기
-llm: Optional[ChatGoogleGenerativeAI] = None # LLM 객체 초기화
-
-if not GOOGLE_API_KEY:
-    # 이 메시지는 개발 중 콘솔에 출력됨
-    # Streamlit 앱에서는 분석 시작 시 llm 객체가 None이면 UI에 오류를 표시함
-    print("치명적 오류: GOOGLE_API_KEY 환경변수가 설정되지 않았습니다. 앱 실행 시 오류가 발생할 수 있습니다.")
-else:
-    try:
-        # ChatGoogleGenerativeAI 객체 생성 (JSON 모드 설정 제거)
-        llm = ChatGoogleGenerativeAI(
-            model=AppConfig.GEMINI_MODEL_NAME,
-            google_api_key=GOOGLE_API_KEY,
-            temperature=AppConfig.TEMPERATURE
-            # model_kwargs={"generation_config": {"response_mime_type": "application/json"}} # JSON 모드 설정 제거
-        )
-        print(f"Gemini 모델 '{AppConfig.GEMINI_MODEL_NAME}' 초기화 성공 (일반 텍스트 모드).")
-    except Exception as e_model_init:
-        print(f"Gemini 모델 '{AppConfig.GEMINI_MODEL_NAME}' 초기화 중 심각한 오류: {e_model_init}")
-        llm = None # 초기화 실패 시 llm을 None으로 확실히 설정
-
-# --- PDF 처리 유틸리티 ---
-def convert_pdf_to_text(
-    uploaded_file_content: bytes # 업로드된 파일의 바이트 내용
-) -> Tuple[List[str], str]:
-    """
-    PDF의 각 페이지에서 텍스트를 추출합니다.
-    페이지별 텍스트 리스트와 전체 연결된 텍스트를 반환합니다.
-    """
-    full_text_for_extraction = "" # 전체 텍스트를 저장할 변수
-    page_texts = [] # 페이지별 텍스트를 저장할 리스트
-
-    try:
-        doc = fitz.open(stream=uploaded_file_content, filetype="pdf") # 바이트 스트림으로 PDF 문서 열기
-        for page_num_idx, page in enumerate(doc): # 각 페이지에 대해 반복 (페이지 객체 직접 사용)
-            actual_page_num = page_num_idx + 1 # 실제 페이지 번호 (1부터 시작)
-            try:
-                text = page.get_text("text", sort=True) # 페이지에서 텍스트 추출 (정렬 옵션 사용)
-            except Exception as e_page_text:
-                st.warning(f"페이지 {actual_page_num} 텍스트 추출 오류: {e_page_text}")
-                text = "" # 오류 발생 시 해당 페이지 텍스트는 비움
-
-            page_texts.append(text) # 추출된 텍스트를 리스트에 추가
-            # 전체 텍스트에 페이지 구분자와 함께 추가
-            full_text_for_extraction += f"\n\n<<<<< PAGE {actual_page_num} / {len(doc)} >>>>>\n\n{text}"
-        doc.close() # PDF 문서 닫기
-        return page_texts, full_text_for_extraction # 페이지별 텍스트 리스트와 전체 텍스트 반환
-    except Exception as e:
-        st.error(f"PyMuPDF로 PDF 처리 중 오류: {e}")
-        return [], "" # 오류 발생 시 빈 리스트와 빈 문자열 반환
-
-# --- LLM 상호작용 유틸리티 ---
-def _build_llm_extraction_prompt(full_patent_text: str, pdf_filename: str) -> str:
-    """LLM에 전달할 전체 프롬프트를 구성합니다."""
-    return (
-        PATENT_DATA_SCHEMA_FOR_LLM_PROMPT_FULL +
-        f"\n\nIMPORTANT INSTRUCTIONS FOR THIS SPECIFIC TASK:\n" +
-        f"- The 'source_file_name' field in the JSON output MUST be exactly: \"{pdf_filename}\"\n" +
-        "Here is the full patent text to analyze:\n\n--- BEGIN PATENT TEXT ---\n" +
-        full_patent_text +
-        "\n--- END PATENT TEXT ---\n\n" +
-        # JSON 모드를 사용하지 않으므로, LLM이 JSON을 포함한 텍스트를 반환하도록 유도
-        "Based on the schema and instructions provided above, generate a response containing the JSON object. The JSON object should be enclosed in ```json ... ```."
-    )
-
-def _parse_llm_text_response(response_content_str: str, pdf_filename: str, full_patent_text_for_lang_detect: str) -> Dict[str, Any]:
-    """
-    LLM의 일반 텍스트 응답에서 JSON 객체를 추출하고 파싱합니다.
-    필수 기본 필드들이 있는지 확인 및 기본값을 설정합니다.
-    """
-    # 응답 문자열이 비어있는 경우 먼저 확인
-    if not response_content_str or not response_content_str.strip():
-        st.error("LLM 응답이 비어있습니다.")
-        return {"error": "LLM response is empty", "raw_response": response_content_str, "source_file_name": pdf_filename, "language_of_document": "Unknown"}
-
-    # ```json ... ``` 블록 추출
-    json_block_match = None
-    try:
-        # 정규 표현식 대신 단순 문자열 검색으로 변경 (더 견고할 수 있음)
-        start_index = response_content_str.find("```json")
-        if start_index != -1:
-            start_index += len("```json") # "```json" 이후부터 시작
-            end_index = response_content_str.find("```", start_index)
-            if end_index != -1:
-                json_block_str = response_content_str[start_index:end_index].strip()
-                if json_block_str: # 추출된 JSON 문자열이 비어있지 않은지 확인
-                    json_block_match = json_block_str
-    except Exception as e_find: # 문자열 검색 중 예외 발생 시 (일반적이지 않음)
-         st.warning(f"LLM 응답에서 JSON 블록 검색 중 오류: {e_find}")
-         json_block_match = None
-
-
-    if not json_block_match:
-        # 만약 ```json ... ``` 블록이 없다면, 응답 전체를 JSON으로 가정하고 파싱 시도
-        # 또는 다른 휴리스틱 (예: 첫 { 와 마지막 } 사이)을 사용할 수 있으나, 우선 전체 시도
-        st.warning("LLM 응답에서 ```json ... ``` 블록을 찾지 못했습니다. 응답 전체를 JSON으로 간주하고 파싱을 시도합니다.")
-        json_to_parse = response_content_str.strip()
-        # 응답 전체가 JSON이 아닐 가능성이 높으므로, 간단한 유효성 검사
-        if not json_to_parse.startswith("{") or not json_to_parse.endswith("}"):
-            st.error("LLM 응답이 유효한 JSON 형식이 아닙니다 (```json ... ``` 블록 없음, 전체 내용도 JSON 아님).")
-            st.text_area("LLM 원본 응답 (형식 오류)", response_content_str[:3000], height=150)
-            return {"error": "LLM response does not contain a JSON block and is not a valid JSON object itself.", "raw_response": response_content_str, "source_file_name": pdf_filename, "language_of_document": "Unknown"}
-    else:
-        json_to_parse = json_block_match
-
-
-    try:
-        structured_data = json.loads(json_to_parse)
-    except json.JSONDecodeError as json_e:
-        st.error(f"LLM 응답 JSON 파싱 오류: {json_e}")
-        st.text_area("파싱 시도한 JSON 부분", json_to_parse[:3000], height=150)
-        st.text_area("LLM 전체 원본 응답 (파싱 실패 시)", response_content_str[:3000], height=150)
-        return {"error": "Failed to parse extracted JSON from LLM response", "extracted_json_to_parse": json_to_parse, "raw_response": response_content_str, "source_file_name": pdf_filename, "language_of_document": "Unknown"}
-    except TypeError as type_e:
-        st.error(f"LLM 응답 JSON 파싱 중 TypeError: {type_e}")
-        st.text_area("LLM 원본 응답 (TypeError)", str(response_content_str)[:3000], height=300)
-        return {"error": "LLM response was not suitable for JSON parsing (e.g. None type)", "raw_response": str(response_content_str), "source_file_name": pdf_filename, "language_of_document": "Unknown"}
-
-    # 필수 필드가 누락된 경우 기본값 설정
-    if "source_file_name" not in structured_data:
-        structured_data["source_file_name"] = pdf_filename
-    if "language_of_document" not in structured_data or not structured_data["language_of_document"]:
-        if any(char.isalpha() and ord(char) > 127 for char in full_patent_text_for_lang_detect[:2000]):
-            structured_data["language_of_document"] = "Non-English (Auto-Detected)"
-        else:
-            structured_data["language_of_document"] = "English (Auto-Detected)"
-    if "document_summary_for_user" not in structured_data or not structured_data["document_summary_for_user"]:
-        structured_data["document_summary_for_user"] = "요약 정보가 생성되지 않았습니다."
-
-    return structured_data
-
-def _handle_llm_error_response(response: Optional[LLMResult], pdf_filename: str) -> Dict[str, Any]:
-    """LLM 응답이 유효하지 않거나 오류(예: 안전 필터)를 나타내는 경우를 처리합니다."""
-    st.error("LLM으로부터 유효한 콘텐츠 응답을 받지 못했습니다 (구조화 데이터 추출).")
-    err_payload: Dict[str, Any] = {
-        "error": "Invalid or empty content from LLM for structured data extraction.",
-        "source_file_name": pdf_filename,
-        "language_of_document": "Unknown"
-    }
-    if response and response.generations:
-        for i, gen_list in enumerate(response.generations):
-            for j, gen in enumerate(gen_list):
-                finish_reason = gen.generation_info.get('finish_reason', 'N/A') if gen.generation_info else 'N/A'
-                safety_ratings = gen.generation_info.get('safety_ratings', []) if gen.generation_info else []
-                err_payload[f'generation_{i}_{j}_finish_reason'] = str(finish_reason)
-                err_payload[f'generation_{i}_{j}_safety_ratings'] = str(safety_ratings)
-    elif response and hasattr(response, 'llm_output') and response.llm_output:
-         err_payload['llm_output_details'] = str(response.llm_output)
-
-    st.json(err_payload)
-    return err_payload
-
-def extract_structured_data_with_llm(
-    full_patent_text: str,
-    model: ChatGoogleGenerativeAI,
-    pdf_filename: str
-) -> Dict[str, Any]:
-    """
-    LLM을 사용하여 특허 텍스트에서 구조화된 데이터를 추출합니다.
-    프롬프트 구성, API 호출, 응답 파싱 및 오류 보고를 처리합니다.
-    """
-    if not full_patent_text.strip():
-        st.warning("구조화된 데이터 추출을 위한 입력 텍스트가 비어 있습니다.")
-        return {"error": "Input text for structured data extraction is empty.", "source_file_name": pdf_filename, "language_of_document": "Unknown"}
-
-    final_prompt = _build_llm_extraction_prompt(full_patent_text, pdf_filename)
-    messages = [HumanMessage(content=final_prompt)]
-
-    try:
-        st.info(f"LLM ({AppConfig.GEMINI_MODEL_NAME}) 호출하여 특허 핵심 정보 추출 중 (일반 텍스트 모드)... (파일명: {pdf_filename}). 이 작업은 최대 {AppConfig.API_REQUEST_TIMEOUT_STRUCTURED_DATA // 60}분 정도 소요될 수 있습니다.")
-        response = model.invoke(
-            messages,
-            config={"request_timeout": AppConfig.API_REQUEST_TIMEOUT_STRUCTURED_DATA}
-        )
-
-        # LLM 응답 내용 디버깅을 위해 임시로 출력 (문제가 해결되면 삭제)
-        # st.warning("LLM 응답 내용 확인 (디버그용):")
-        # if hasattr(response, 'content'):
-        #     st.text_area("LLM Raw Response Content", str(response.content), height=200)
-        # else:
-        #     st.error("LLM 응답 객체에 'content' 속성이 없습니다. 응답 객체 전체를 확인합니다:")
-        #     try:
-        #         st.json(response)
-        #     except Exception:
-        #         st.text(str(response))
-
-
-        if response and hasattr(response, 'content') and isinstance(response.content, str) :
-            if response.content.strip():
-                return _parse_llm_text_response(response.content, pdf_filename, full_patent_text)
-            else:
-                st.error("LLM 응답 내용은 있으나 비어있는 문자열입니다.")
-                return {"error": "LLM response content is an empty string.", "raw_response": response.content, "source_file_name": pdf_filename, "language_of_document": "Unknown"}
-        else:
-            return _handle_llm_error_response(response if hasattr(response, 'generations') else None, pdf_filename)
-
-    except Exception as e:
-        st.error(f"LLM API 호출 중 오류 (구조화 데이터 추출): {e}")
-        st.text_area("LLM API 호출 오류 상세", traceback.format_exc(), height=300)
-        return {"error": f"API call failed: {str(e)}", "traceback": traceback.format_exc(), "source_file_name": pdf_filename, "language_of_document": "Unknown"}
-
-# --- UI 렌더링 유틸리티 ---
-@st.cache_data
-def render_pdf_page_as_image(pdf_bytes: bytes, page_num: int, dpi: int = AppConfig.DEFAULT_DPI_PDF_PREVIEW) -> Optional[Image.Image]:
-    """PDF의 특정 페이지를 PIL Image 객체로 렌더링합니다. 결과는 캐시됩니다."""
-    try:
-        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        if 0 <= page_num < len(doc):
-            page = doc.load_page(page_num)
-            zoom = dpi / 72
-            matrix = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=matrix, alpha=False)
-            img = Image.open(io.BytesIO(pix.tobytes("png")))
-            doc.close()
-            return img
-        doc.close()
-        return None
-    except Exception as e:
-        st.warning(f"PDF 페이지 이미지 렌더링 중 오류 (페이지 {page_num + 1}): {e}")
-        return None
-
-def get_value_by_path(data_dict: Dict[str, Any], path_string: str) -> Any:
-    """점(.)으로 구분된 경로 문자열을 사용하여 딕셔너리에서 중첩된 값을 안전하게 가져옵니다."""
-    keys = path_string.split('.')
-    val = data_dict
-    try:
-        for key in keys:
-            if isinstance(val, list) and key.isdigit():
-                idx = int(key)
-                if 0 <= idx < len(val):
-                    val = val[idx]
-                else:
-                    return None
-            elif isinstance(val, dict):
-                val = val.get(key)
-                if val is None: return None
-            else:
-                return None
-        return val
-    except (TypeError, IndexError, AttributeError):
-        return None
-
-def display_details_section(title: str, data: Any, expanded: bool = False):
-    """제목과 데이터를 가진 섹션을 표시합니다 (주로 st.expander 사용)."""
-    with st.expander(title, expanded=expanded):
-        if isinstance(data, str):
-            st.info(data)
-        elif isinstance(data, dict) or isinstance(data, list):
-            st.json(data)
-        elif data is None:
-            st.markdown("_정보 없음_")
-        else:
-            st.write(data)
-
-def display_patent_info_item(title: str, value: Any):
-    """특허 정보의 단일 항목을 적절한 형식으로 표시합니다."""
-    display_title = title.replace('_', ' ').title()
-    if isinstance(value, list):
-        if not value:
-            st.markdown(f"**{display_title}:** 정보 없음")
-        elif all(isinstance(item, dict) for item in value):
-            st.markdown(f"**{display_title}:**")
-            for item_dict in value:
-                item_str_list = [f"{k.replace('_',' ').title()}: {v}" for k, v in item_dict.items()]
-                st.markdown(f"- {', '.join(item_str_list)}")
-        else:
-            st.markdown(f"**{display_title}:** {', '.join(map(str, value))}")
-    elif value is None or str(value).strip() == "":
-        st.markdown(f"**{display_title}:** 정보 없음")
-    else:
-        st.markdown(f"**{display_title}:** {value}")
-
-def display_extracted_value_for_schema_item(value: Any):
-    """Tab 3에서 추출된 값을 적절한 Streamlit 요소로 표시합니다."""
-    if value is None:
-        st.markdown("_정보 없음 또는 해당 경로에 값이 없습니다._")
-    elif isinstance(value, list):
-        if value:
-            try:
-                if all(isinstance(i, dict) for i in value):
-                    st.dataframe(value)
-                elif all(isinstance(i, (str, int, float, bool, type(None))) for i in value):
-                    st.table(value)
-                else:
-                    st.json(value, expanded=True)
-            except Exception:
-                st.json(value, expanded=True)
-        else:
-            st.markdown("_빈 리스트입니다._")
-    elif isinstance(value, dict):
-        st.json(value, expanded=True)
-    else:
-        st.code(str(value), language=None)
-
-# --- Streamlit UI 구성 및 메인 로직 ---
-def initialize_session_state():
-    """세션 상태 변수가 존재하지 않으면 초기화합니다."""
-    defaults = {
-        SessionStateKeys.ANALYSIS_COMPLETE: False,
-        SessionStateKeys.STRUCTURED_DATA: None,
-        SessionStateKeys.PDF_PAGE_TEXTS: [],
-        SessionStateKeys.CURRENT_PAGE_PDF_VIEW: 0,
-        SessionStateKeys.ORIGINAL_FILENAME: "",
-        SessionStateKeys.PDF_BYTES_FOR_VIEWER: None,
-    }
-    for key, default_value in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = default_value
-
-def run_analysis_pipeline(uploaded_file_obj):
-    """PDF 업로드부터 결과 표시까지 전체 분석 파이프라인을 처리합니다."""
-    st.session_state[SessionStateKeys.ORIGINAL_FILENAME] = uploaded_file_obj.name
-    st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] = False
-
-    with st.spinner(f"'{uploaded_file_obj.name}' 분석 중... PDF 텍스트 추출 후 LLM 호출 중입니다. 몇 분 정도 소요될 수 있습니다..."):
-        if llm is None:
-            st.error("LLM 모델이 초기화되지 않아 분석을 진행할 수 없습니다. GOOGLE_API_KEY를 확인해주세요.")
-            st.stop()
-
-        try:
-            pdf_bytes = uploaded_file_obj.getvalue()
-            st.session_state[SessionStateKeys.PDF_BYTES_FOR_VIEWER] = pdf_bytes
-
-            page_texts, full_text_from_pdf = convert_pdf_to_text(pdf_bytes)
-            st.session_state[SessionStateKeys.PDF_PAGE_TEXTS] = page_texts
-
-            if not full_text_from_pdf.strip():
-                st.error("PDF에서 텍스트를 추출하지 못했습니다. 파일 내용을 확인해주세요.")
-                st.session_state[SessionStateKeys.STRUCTURED_DATA] = {"error": "Failed to extract text from PDF."}
-                st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] = True
-                st.stop()
-
-            extracted_data = extract_structured_data_with_llm(
-                full_text_from_pdf,
-                llm,
-                uploaded_file_obj.name
-            )
-            st.session_state[SessionStateKeys.STRUCTURED_DATA] = extracted_data
-            st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] = True
-
-            if "error" not in extracted_data:
-                st.success(f"'{uploaded_file_obj.name}' 분석이 완료되었습니다!")
-            else:
-                st.error(f"'{uploaded_file_obj.name}' 분석 중 문제가 발생했습니다. 상세 내용을 확인하세요.")
-                if "raw_response" in extracted_data:
-                    st.text_area("LLM 원본 응답 (분석 파이프라인 오류 시)", extracted_data["raw_response"][:3000], height=150)
-
-
-        except Exception as e:
-            st.error(f"분석 파이프라인 중 예기치 않은 오류 발생: {e}")
-            st.exception(e)
-            st.session_state[SessionStateKeys.STRUCTURED_DATA] = {"error": f"Unexpected analysis error: {str(e)}", "traceback": traceback.format_exc()}
-            st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] = True
-
-def display_results_tabs():
-    """분석 결과를 여러 탭에 나누어 표시합니다."""
-    data = st.session_state[SessionStateKeys.STRUCTURED_DATA]
-    original_filename_base = os.path.splitext(st.session_state[SessionStateKeys.ORIGINAL_FILENAME])[0]
-
-    st.markdown("---")
-    st.header("📊 분석 결과")
-
-    tab1, tab2, tab3 = st.tabs(["📄 PDF 원문 보기 (이미지 기반)", "💡 분석 요약 및 JSON", "🔬 항목별 상세 설명"])
-
-    with tab1:
-        st.subheader("PDF 원문 보기")
-        if st.session_state[SessionStateKeys.PDF_PAGE_TEXTS]:
-            total_pages = len(st.session_state[SessionStateKeys.PDF_PAGE_TEXTS])
-            page_selection = st.number_input(
-                f"페이지 번호 (1-{total_pages})",
-                min_value=1,
-                max_value=total_pages,
-                value=st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW] + 1,
-                key="pdf_page_selector_input"
-            )
-            st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW] = page_selection - 1
-
-            if SessionStateKeys.PDF_BYTES_FOR_VIEWER in st.session_state:
-                page_image = render_pdf_page_as_image(
-                    st.session_state[SessionStateKeys.PDF_BYTES_FOR_VIEWER],
-                    st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW]
-                )
-                if page_image:
-                    st.image(page_image, caption=f"페이지 {st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW] + 1}/{total_pages}", use_container_width=True)
-                else:
-                    st.warning(f"페이지 {st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW] + 1} 이미지를 렌더링할 수 없습니다.")
-            else:
-                st.warning("PDF 내용을 로드할 수 없습니다 (세션에 바이트 데이터 없음).")
-        else:
-            st.warning("표시할 PDF 페이지 정보가 없습니다 (텍스트 추출 실패 또는 파일 없음).")
-
-    with tab2:
-        st.subheader("특허 기본 정보 (추출 결과 기반)")
-        if "patent_info" in data and isinstance(data["patent_info"], dict):
-            for key, val in data["patent_info"].items():
-                display_patent_info_item(key, val)
-        elif "error" not in data :
-            st.markdown("_특허 기본 정보를 찾을 수 없습니다._")
-
-        st.subheader("문서 전체 요약 (LLM 생성)")
-        summary_val = data.get("document_summary_for_user")
-        if summary_val and isinstance(summary_val, str) and summary_val != "요약 정보가 생성되지 않았습니다.":
-            display_details_section("요약 보기", summary_val, expanded=True)
-        elif "error" not in data :
-            st.warning("문서 요약 정보를 찾을 수 없거나 생성되지 않았습니다.")
-
-        st.subheader("추출된 전체 JSON 데이터")
-        st.json(data, expanded=False)
-
-        try:
-            json_string = json.dumps(data, ensure_ascii=False, indent=4)
-            st.download_button(
-                label="JSON 파일 다운로드",
-                data=json_string,
-                file_name=f"{original_filename_base}_structured_data.json",
-                mime="application/json",
-                key="json_download_button"
-            )
-        except Exception as e_json_dl:
-            st.error(f"JSON 다운로드 준비 중 오류: {e_json_dl}")
-
-        if "error" in data:
-            st.error(f"데이터 추출/표시 중 문제 발생: {data.get('error')}")
-            if "raw_response" in data:
-                 st.text_area("LLM 원본 응답 (오류 시)", data['raw_response'][:3000], height=150)
-            if "extracted_json_to_parse" in data: # 파싱 시도했던 JSON 부분도 표시
-                 st.text_area("파싱 시도한 JSON 부분 (오류 시)", data['extracted_json_to_parse'][:3000], height=150)
-            if "traceback" in data:
-                 st.text_area("오류 상세 정보", data['traceback'], height=150)
-
-
-    with tab3:
-        st.subheader("주요 항목별 상세 설명 및 추출 값")
-        if "error" in data:
-            st.error(f"데이터 추출 중 오류가 발생하여 항목별 상세 정보를 표시할 수 없습니다: {data.get('error')}")
-            if "raw_response" in data:
-                st.text_area("LLM 원본 응답 (오류 시)", data['raw_response'][:2000], height=200)
-            if "extracted_json_to_parse" in data:
-                 st.text_area("파싱 시도한 JSON 부분 (오류 시)", data['extracted_json_to_parse'][:2000], height=150)
-            if "traceback" in data:
-                 st.text_area("오류 상세 정보 (Traceback)", data['traceback'], height=200)
-
-        elif not SCHEMA_FIELD_DESCRIPTIONS:
-             st.warning("스키마 설명 정보(`schema_descriptions.py`)가 비어있거나 로드되지 않았습니다.")
-        else:
-            field_options = {
-                f"{path.split('.')[-1].replace('_', ' ').title()} (Path: {path})": path
-                for path in SCHEMA_FIELD_DESCRIPTIONS.keys()
-            }
-            sorted_display_labels = sorted(list(field_options.keys()))
-
-            if not sorted_display_labels:
-                st.warning("표시할 스키마 설명 정보가 없습니다. `schema_descriptions.py` 파일 내용을 확인해주세요.")
-            else:
-                selected_display_label = st.selectbox(
-                    "상세 설명을 보고 싶은 항목을 선택하세요:",
-                    options=sorted_display_labels,
-                    key="field_selector_tab3"
-                )
-
-                if selected_display_label and selected_display_label in field_options:
-                    selected_path = field_options[selected_display_label]
-                    description = SCHEMA_FIELD_DESCRIPTIONS.get(selected_path, "해당 항목에 대한 설명이 없습니다.")
-                    extracted_value = get_value_by_path(data, selected_path)
-
-                    st.markdown(f"#### 📜 항목 경로: `{selected_path}`")
-                    st.markdown("**항목 설명 (고정):**")
-                    st.info(description)
-                    st.markdown("**추출된 값:**")
-                    display_extracted_value_for_schema_item(extracted_value)
-                else:
-                    st.warning("설명을 표시할 항목을 목록에서 선택해주세요.")
-
-# --- 메인 앱 실행 로직 ---
-def main():
-    st.set_page_config(page_title="특허 문서 분석 프로토타입", layout="wide")
-    st.title("📜 특허 문서 분석 프로토타입 v3.4")
-    st.markdown("PDF 특허 문서를 업로드하면 주요 정보를 분석하여 구조화된 JSON 데이터로 제공하고, 각 항목에 대한 설명을 함께 보여줍니다.")
-
-    initialize_session_state()
-
-    uploaded_file = st.file_uploader("특허 PDF 파일을 업로드하세요 (.pdf)", type="pdf", key="pdf_uploader")
-
-    if uploaded_file is not None:
-        if st.button("특허 분석 시작", key="analyze_button"):
-            st.session_state[SessionStateKeys.STRUCTURED_DATA] = None
-            st.session_state[SessionStateKeys.PDF_PAGE_TEXTS] = []
-            st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW] = 0
-            run_analysis_pipeline(uploaded_file)
-
-    if st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] and st.session_state[SessionStateKeys.STRUCTURED_DATA]:
-        display_results_tabs()
-    elif not uploaded_file:
-        st.info("페이지 상단의 파일 업로더를 사용하여 분석할 특허 PDF 파일을 업로드해주세요.")
-
-if __name__ == "__main__":
+# streamlit_test_refactored_v4_no_structured_output.py
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx # 쿼터 집계용 세션 ID 조회
+import os
+import fitz  # PyMuPDF
+import json
+import time
+import functools
+import traceback # 오류 추적을 위한 traceback 모듈 임포트
+from dotenv import load_dotenv # 환경 변수 로드를 위한 dotenv 모듈 임포트
+from typing import List, Tuple, Dict, Any, Optional, Callable, Union # 타입 힌팅을 위한 typing 모듈 임포트
+from collections import deque
+from contextlib import contextmanager
+
+from langchain_google_genai import ChatGoogleGenerativeAI # Langchain Google Generative AI 모델 임포트
+from langchain_core.messages import HumanMessage # Langchain 메시지 타입 임포트
+from langchain_core.outputs import LLMResult # LLM 응답 결과 타입을 위한 임포트 (오류 처리 시 사용 가능)
+
+# --- 외부 파일에서 프롬프트 및 스키마 설명 임포트 ---
+try:
+    # prompts.py에서 LLM에 전달할 프롬프트 (개선된 버전 사용 가정)
+    from prompts import PATENT_DATA_SCHEMA_FOR_LLM_PROMPT_FULL
+    # schema_descriptions.py에서 UI에 표시할 각 필드에 대한 한글 설명 (개선된 버전 사용 가정)
+    from schema_descriptions import SCHEMA_FIELD_DESCRIPTIONS
+except ImportError:
+    st.error("오류: `prompts.py` 또는 `schema_descriptions.py` 파일을 찾을 수 없습니다. 해당 파일들이 이 스크립트와 동일한 디렉토리에 있는지 확인해주세요.")
+    PATENT_DATA_SCHEMA_FOR_LLM_PROMPT_FULL = "{}" # LLM 호출 시도를 위해 최소한의 빈 JSON 형태라도 설정
+    SCHEMA_FIELD_DESCRIPTIONS = {} # 빈 딕셔너리로 설정
+    # st.stop() # 또는 앱 실행을 중단할 수 있음
+
+# --- 전역 설정 및 상수 ---
+from app_config import AppConfig # 앱과 배치 CLI가 공유하는 설정 (모델명, 타임아웃, 저장소 경로 등)
+from llm_utils import create_chat_model, estimate_tokens, find_json_block
+from result_store import ResultStore, compute_document_id
+from schema_versioning import compute_schema_versions, plan_backfill, run_backfill
+from bibliographic_parser import build_prefilled_instruction, merge_with_llm_patent_info, parse_front_page
+from model_routing import run_cascade_extraction
+from quota import QuotaLimitedModel, get_quota_manager
+from pdf_tables import extract_pages_with_tables, merge_table_performance_data
+from text_compaction import build_prompt_text
+from page_render import render_pdf_page_jpeg, thumbnail_window
+from render_cache import RenderCache
+from upload_pipeline import STATUS_DONE, STATUS_FAILED, PipelineReport, run_pipelined_analysis, status_rows
+from profiling import is_profiling_enabled_by_env, profile_block
+from error_artifacts import ARTIFACTS_KEY, ErrorArtifactStore, spill_error_payload
+from quick_analysis import run_quick_analysis, sections_to_upgrade, upgrade_to_full_analysis
+from map_reduce import run_map_reduce_extraction, should_use_map_reduce
+from prompt_cache import PromptCachedModel, get_prompt_cache_manager, summarize_cache_requests
+from similar_patents import SimilarityIndex, display_term, document_terms, load_index, sync_index_file
+from analysis_bundle import PENDING_BUNDLE_SESSION_KEY, AnalysisBundleStore, build_path_index, render_bundle_images, seed_render_cache
+from large_pdf import MemoryCeilingError, SpooledPdf, extract_large_pdf, is_large_upload, parse_page_ranges, spool_upload_to_disk
+
+class SessionStateKeys:
+    # Streamlit 세션 상태에서 사용할 키 값들 정의
+    ANALYSIS_COMPLETE = 'analysis_complete' # 분석 완료 여부
+    STRUCTURED_DATA = 'structured_data'     # 추출된 구조화 데이터
+    PDF_PAGE_TEXTS = 'pdf_page_texts'       # PDF 페이지별 텍스트 리스트
+    CURRENT_PAGE_PDF_VIEW = 'current_page_for_pdf_view' # PDF 뷰어 현재 페이지 번호
+    ORIGINAL_FILENAME = 'original_filename' # 원본 파일명
+    PDF_BYTES_FOR_VIEWER = 'pdf_bytes_for_viewer' # PDF 뷰어용 바이트 데이터
+    PDF_PATH_FOR_VIEWER = 'pdf_path_for_viewer' # 대용량 모드에서 디스크에 내려 받은 PDF 경로 (바이트 대신 사용)
+    LARGE_PDF_SPOOL = 'large_pdf_spool'     # 대용량 모드 spool 결과 (업로드 file_id, SpooledPdf)
+    DOCUMENT_ID = 'document_id'             # 결과 저장소의 문서 ID (PDF 바이트 SHA-256)
+    RULE_BASED_PATENT_INFO = 'rule_based_patent_info' # 첫 페이지 INID 코드에서 규칙 기반으로 추출한 서지 정보
+    BIBLIOGRAPHIC_CROSSCHECK = 'bibliographic_crosscheck' # 규칙 기반 서지 정보와 LLM 결과의 교차 검증 결과
+    USE_MODEL_CASCADE = 'use_model_cascade' # 섹션별 모델 캐스케이드 사용 여부 (사이드바 위젯 키)
+    EXTRACTION_METRICS = 'extraction_metrics' # 캐스케이드 추출의 호출별 지연/토큰/비용 지표
+    TEXT_EXTRACTION_METRICS = 'text_extraction_metrics' # 표 탐지 기반 텍스트 추출의 토큰 절감/지연 지표
+    RESULTS_VERSION = 'results_version'     # 분석 시작마다 증가하는 결과 버전 (렌더링 메모 무효화용)
+    RENDER_MEMO = 'render_memo'             # 결과 탭 렌더링용 파생 값 메모 (RESULTS_VERSION 기준)
+    RENDER_TIMINGS = 'render_timings'       # 영역별 재실행 지연 기록 (ms, 최근 N회)
+    VIEWER_FULL_RES_PAGES = 'viewer_full_res_pages' # 이 세션에서 고해상도로 렌더링한 (문서 ID, 페이지) 집합 (저해상도 미리보기 생략용)
+    MULTI_UPLOAD_REPORT = 'multi_upload_report' # 여러 파일 분석 결과 (업로드 file_id 튜플, PipelineReport)
+    PROFILING_ENABLED = 'profiling_enabled' # 프로파일링(cProfile + tracemalloc) 사용 여부 (사이드바 위젯 키)
+    PROFILE_SUMMARIES = 'profile_summaries' # 프로파일링한 영역별 마지막 요약 (영역 이름 -> 요약 딕셔너리)
+    MAP_REDUCE_METRICS = 'map_reduce_metrics' # 큰 문서의 map-reduce 추출 지표 (창별 지연/토큰, 중복 제거, 스칼라 충돌)
+    PROMPT_CACHE_USAGE = 'prompt_cache_usage' # 현재 결과의 LLM 요청별 스키마 접두부 캐시 적중/절감 (요약 + 요청 목록)
+    QUICK_ANALYSIS = 'quick_analysis'       # 빠른 분석(요약 + 청구항) 상태: 지표, 표 성능 데이터, 업그레이드 지표 (전체 분석이면 None)
+    FIELD_PATH_INDEX = 'field_path_index'   # Tab 3용 스키마 경로 -> 추출 값 인덱스 (번들을 기록/불러올 때 설정, 없으면 경로를 직접 조회)
+    BUNDLE_PATH = 'bundle_path'             # 현재 결과의 분석 번들 파일 경로 (기록했거나 불러온 경우)
+    PENDING_BUNDLE_PATH = PENDING_BUNDLE_SESSION_KEY # 분석 기록 페이지에서 열도록 요청한 번들 경로 (다음 실행 때 불러온 뒤 지움)
+
+# --- 환경 변수 로드 및 LLM 초기화 ---
+load_dotenv() # .env 파일에서 환경 변수 로드
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY") # GOOGLE_API_KEY 환경 변수 가져오기
+llm: Optional[ChatGoogleGenerativeAI] = None # LLM 객체 초기화
+
+if not GOOGLE_API_KEY:
+    # 이 메시지는 개발 중 콘솔에 출력됨
+    # Streamlit 앱에서는 분석 시작 시 llm 객체가 None이면 UI에 오류를 표시함
+    print("치명적 오류: GOOGLE_API_KEY 환경변수가 설정되지 않았습니다. 앱 실행 시 오류가 발생할 수 있습니다.")
+else:
+    try:
+        # ChatGoogleGenerativeAI 객체 생성 (JSON 모드 설정 제거)
+        llm = ChatGoogleGenerativeAI(
+            model=AppConfig.GEMINI_MODEL_NAME,
+            google_api_key=GOOGLE_API_KEY,
+            temperature=AppConfig.TEMPERATURE
+            # model_kwargs={"generation_config": {"response_mime_type": "application/json"}} # JSON 모드 설정 제거
+        )
+        print(f"Gemini 모델 '{AppConfig.GEMINI_MODEL_NAME}' 초기화 성공 (일반 텍스트 모드).")
+    except Exception as e_model_init:
+        print(f"Gemini 모델 '{AppConfig.GEMINI_MODEL_NAME}' 초기화 중 심각한 오류: {e_model_init}")
+        llm = None # 초기화 실패 시 llm을 None으로 확실히 설정
+
+# --- PDF 처리 유틸리티 ---
+def convert_pdf_to_text(
+    uploaded_file_content: Union[bytes, str], # 업로드된 파일의 바이트 내용, 또는 대용량 모드에서 디스크에 내려 받은 파일 경로
+    detect_tables: bool = AppConfig.USE_TABLE_EXTRACTION, # 표를 TSV 블록으로 변환할지 여부
+    page_numbers: Optional[List[int]] = None # 추출할 페이지 (1부터 시작). 경로 입력에서 None이면 첫 페이지 + 설명/청구항 자동 선택
+) -> Tuple[List[str], str, Dict[str, Any]]:
+    """
+    PDF의 각 페이지에서 텍스트를 추출합니다. 표는 PyMuPDF 표 탐지로 찾아 TSV 블록으로 바꿉니다.
+    페이지별 텍스트 리스트, 전체 연결된 텍스트, 추출 정보(표 기반 성능 데이터와 토큰/지연 지표)를 반환합니다.
+    파일 경로를 주면 대용량 모드로 선택한 페이지만 한 장씩 추출하며(선택하지 않은 페이지는 빈 문자열), 메모리 상한을 넘으면 중단합니다.
+    """
+    try:
+        if isinstance(uploaded_file_content, str):
+            page_texts, extraction_info = extract_large_pdf(uploaded_file_content, page_numbers, detect_tables=detect_tables)
+        else:
+            doc = fitz.open(stream=uploaded_file_content, filetype="pdf") # 바이트 스트림으로 PDF 문서 열기
+            try:
+                page_texts, extraction_info = extract_pages_with_tables(doc, detect_tables=detect_tables, page_numbers=page_numbers)
+            finally:
+                doc.close() # PDF 문서 닫기
+        for table_error in extraction_info["metrics"]["errors"]:
+            st.warning(f"표 탐지 오류 (평문 추출로 대체): {table_error}")
+        # 전체 텍스트는 페이지 표식과 함께 연결 (백필 작업과 동일한 형식 사용, 설정에 따라 머리말/꼬리말/공백 압축)
+        full_text_for_extraction, page_map, compaction_stats = build_prompt_text(
+            page_texts, page_numbers=extraction_info["metrics"].get("selected_pages", page_numbers)
+        )
+        extraction_info["page_map"] = page_map
+        extraction_info["metrics"]["compaction"] = compaction_stats
+        return page_texts, full_text_for_extraction, extraction_info # 페이지별 텍스트 리스트, 전체 텍스트, 추출 정보 반환
+    except MemoryCeilingError as e_memory:
+        st.error(f"대용량 PDF 추출 중단: {e_memory}")
+        return [], "", {"performance_data": [], "page_map": [], "metrics": {}}
+    except Exception as e:
+        st.error(f"PyMuPDF로 PDF 처리 중 오류: {e}")
+        return [], "", {"performance_data": [], "page_map": [], "metrics": {}} # 오류 발생 시 빈 결과 반환
+
+# --- LLM 상호작용 유틸리티 ---
+def _build_llm_extraction_prompt(
+    full_patent_text: str,
+    pdf_filename: str,
+    prefilled_patent_info: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    LLM에 전달할 전체 프롬프트를 구성합니다.
+    prefilled_patent_info가 있으면 해당 서지 필드는 이미 추출된 값으로 제공하여 LLM이 다시 찾지 않도록 합니다.
+    """
+    return (
+        PATENT_DATA_SCHEMA_FOR_LLM_PROMPT_FULL +
+        f"\n\nIMPORTANT INSTRUCTIONS FOR THIS SPECIFIC TASK:\n" +
+        f"- The 'source_file_name' field in the JSON output MUST be exactly: \"{pdf_filename}\"\n" +
+        build_prefilled_instruction(prefilled_patent_info) +
+        "Here is the full patent text to analyze:\n\n--- BEGIN PATENT TEXT ---\n" +
+        full_patent_text +
+        "\n--- END PATENT TEXT ---\n\n" +
+        # JSON 모드를 사용하지 않으므로, LLM이 JSON을 포함한 텍스트를 반환하도록 유도
+        "Based on the schema and instructions provided above, generate a response containing the JSON object. The JSON object should be enclosed in ```json ... ```."
+    )
+
+def _parse_llm_text_response(response_content_str: str, pdf_filename: str, full_patent_text_for_lang_detect: str) -> Dict[str, Any]:
+    """
+    LLM의 일반 텍스트 응답에서 JSON 객체를 추출하고 파싱합니다.
+    필수 기본 필드들이 있는지 확인 및 기본값을 설정합니다.
+    """
+    # 응답 문자열이 비어있는 경우 먼저 확인
+    if not response_content_str or not response_content_str.strip():
+        st.error("LLM 응답이 비어있습니다.")
+        return {"error": "LLM response is empty", "raw_response": response_content_str, "source_file_name": pdf_filename, "language_of_document": "Unknown"}
+
+    # ```json ... ``` 블록 추출
+    json_block_match = find_json_block(response_content_str)
+
+    if not json_block_match:
+        # 만약 ```json ... ``` 블록이 없다면, 응답 전체를 JSON으로 가정하고 파싱 시도
+        # 또는 다른 휴리스틱 (예: 첫 { 와 마지막 } 사이)을 사용할 수 있으나, 우선 전체 시도
+        st.warning("LLM 응답에서 ```json ... ``` 블록을 찾지 못했습니다. 응답 전체를 JSON으로 간주하고 파싱을 시도합니다.")
+        json_to_parse = response_content_str.strip()
+        # 응답 전체가 JSON이 아닐 가능성이 높으므로, 간단한 유효성 검사
+        if not json_to_parse.startswith("{") or not json_to_parse.endswith("}"):
+            st.error("LLM 응답이 유효한 JSON 형식이 아닙니다 (```json ... ``` 블록 없음, 전체 내용도 JSON 아님).")
+            st.text_area("LLM 원본 응답 (형식 오류)", response_content_str[:3000], height=150)
+            return {"error": "LLM response does not contain a JSON block and is not a valid JSON object itself.", "raw_response": response_content_str, "source_file_name": pdf_filename, "language_of_document": "Unknown"}
+    else:
+        json_to_parse = json_block_match
+
+
+    try:
+        structured_data = json.loads(json_to_parse)
+    except json.JSONDecodeError as json_e:
+        st.error(f"LLM 응답 JSON 파싱 오류: {json_e}")
+        st.text_area("파싱 시도한 JSON 부분", json_to_parse[:3000], height=150)
+        st.text_area("LLM 전체 원본 응답 (파싱 실패 시)", response_content_str[:3000], height=150)
+        return {"error": "Failed to parse extracted JSON from LLM response", "extracted_json_to_parse": json_to_parse, "raw_response": response_content_str, "source_file_name": pdf_filename, "language_of_document": "Unknown"}
+    except TypeError as type_e:
+        st.error(f"LLM 응답 JSON 파싱 중 TypeError: {type_e}")
+        st.text_area("LLM 원본 응답 (TypeError)", str(response_content_str)[:3000], height=300)
+        return {"error": "LLM response was not suitable for JSON parsing (e.g. None type)", "raw_response": str(response_content_str), "source_file_name": pdf_filename, "language_of_document": "Unknown"}
+
+    return _apply_default_fields(structured_data, pdf_filename, full_patent_text_for_lang_detect)
+
+def _apply_default_fields(structured_data: Dict[str, Any], pdf_filename: str, full_patent_text_for_lang_detect: str) -> Dict[str, Any]:
+    """필수 필드가 누락된 경우 기본값을 설정합니다 (단일 호출/캐스케이드 추출 공용)."""
+    if "source_file_name" not in structured_data:
+        structured_data["source_file_name"] = pdf_filename
+    if "language_of_document" not in structured_data or not structured_data["language_of_document"]:
+        if any(char.isalpha() and ord(char) > 127 for char in full_patent_text_for_lang_detect[:2000]):
+            structured_data["language_of_document"] = "Non-English (Auto-Detected)"
+        else:
+            structured_data["language_of_document"] = "English (Auto-Detected)"
+    if "document_summary_for_user" not in structured_data or not structured_data["document_summary_for_user"]:
+        structured_data["document_summary_for_user"] = "요약 정보가 생성되지 않았습니다."
+
+    return structured_data
+
+def _handle_llm_error_response(response: Optional[LLMResult], pdf_filename: str) -> Dict[str, Any]:
+    """LLM 응답이 유효하지 않거나 오류(예: 안전 필터)를 나타내는 경우를 처리합니다."""
+    st.error("LLM으로부터 유효한 콘텐츠 응답을 받지 못했습니다 (구조화 데이터 추출).")
+    err_payload: Dict[str, Any] = {
+        "error": "Invalid or empty content from LLM for structured data extraction.",
+        "source_file_name": pdf_filename,
+        "language_of_document": "Unknown"
+    }
+    if response and response.generations:
+        for i, gen_list in enumerate(response.generations):
+            for j, gen in enumerate(gen_list):
+                finish_reason = gen.generation_info.get('finish_reason', 'N/A') if gen.generation_info else 'N/A'
+                safety_ratings = gen.generation_info.get('safety_ratings', []) if gen.generation_info else []
+                err_payload[f'generation_{i}_{j}_finish_reason'] = str(finish_reason)
+                err_payload[f'generation_{i}_{j}_safety_ratings'] = str(safety_ratings)
+    elif response and hasattr(response, 'llm_output') and response.llm_output:
+         err_payload['llm_output_details'] = str(response.llm_output)
+
+    st.json(err_payload)
+    return err_payload
+
+def extract_structured_data_with_llm(
+    full_patent_text: str,
+    model: Any, # ChatGoogleGenerativeAI 또는 같은 invoke 인터페이스의 래퍼 (QuotaLimitedModel, FakeChatModel)
+    pdf_filename: str,
+    prefilled_patent_info: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    LLM을 사용하여 특허 텍스트에서 구조화된 데이터를 추출합니다.
+    프롬프트 구성, API 호출, 응답 파싱 및 오류 보고를 처리합니다.
+    """
+    if not full_patent_text.strip():
+        st.warning("구조화된 데이터 추출을 위한 입력 텍스트가 비어 있습니다.")
+        return {"error": "Input text for structured data extraction is empty.", "source_file_name": pdf_filename, "language_of_document": "Unknown"}
+
+    final_prompt = _build_llm_extraction_prompt(full_patent_text, pdf_filename, prefilled_patent_info)
+    messages = [HumanMessage(content=final_prompt)]
+
+    try:
+        st.info(f"LLM ({AppConfig.GEMINI_MODEL_NAME}) 호출하여 특허 핵심 정보 추출 중 (일반 텍스트 모드)... (파일명: {pdf_filename}). 이 작업은 최대 {AppConfig.API_REQUEST_TIMEOUT_STRUCTURED_DATA // 60}분 정도 소요될 수 있습니다.")
+        response = model.invoke(
+            messages,
+            config={"request_timeout": AppConfig.API_REQUEST_TIMEOUT_STRUCTURED_DATA}
+        )
+
+        # LLM 응답 내용 디버깅을 위해 임시로 출력 (문제가 해결되면 삭제)
+        # st.warning("LLM 응답 내용 확인 (디버그용):")
+        # if hasattr(response, 'content'):
+        #     st.text_area("LLM Raw Response Content", str(response.content), height=200)
+        # else:
+        #     st.error("LLM 응답 객체에 'content' 속성이 없습니다. 응답 객체 전체를 확인합니다:")
+        #     try:
+        #         st.json(response)
+        #     except Exception:
+        #         st.text(str(response))
+
+
+        if response and hasattr(response, 'content') and isinstance(response.content, str) :
+            if response.content.strip():
+                return _parse_llm_text_response(response.content, pdf_filename, full_patent_text)
+            else:
+                st.error("LLM 응답 내용은 있으나 비어있는 문자열입니다.")
+                return {"error": "LLM response content is an empty string.", "raw_response": response.content, "source_file_name": pdf_filename, "language_of_document": "Unknown"}
+        else:
+            return _handle_llm_error_response(response if hasattr(response, 'generations') else None, pdf_filename)
+
+    except Exception as e:
+        st.error(f"LLM API 호출 중 오류 (구조화 데이터 추출): {e}")
+        st.text_area("LLM API 호출 오류 상세", traceback.format_exc(), height=300)
+        return {"error": f"API call failed: {str(e)}", "traceback": traceback.format_exc(), "source_file_name": pdf_filename, "language_of_document": "Unknown"}
+
+# --- UI 렌더링 유틸리티 ---
+@st.cache_resource
+def get_render_cache() -> RenderCache:
+    """페이지 이미지 디스크 캐시 객체를 반환합니다 (세션 간 공유, 재시작 후에도 파일이 남음)."""
+    return RenderCache(AppConfig.RENDER_CACHE_DIR)
+
+@st.cache_data
+def render_pdf_page_as_image(document_id: str, _pdf_source: Union[bytes, str], page_num: int, dpi: int = AppConfig.DEFAULT_DPI_PDF_PREVIEW) -> Optional[bytes]:
+    """
+    PDF의 특정 페이지를 JPEG 바이트로 렌더링합니다 (st.image가 재인코딩 없이 그대로 전송). 결과는 캐시됩니다.
+    캐시 키는 문서 ID(PDF 바이트 SHA-256)로 잡고 _pdf_source는 해싱에서 제외하여, 재실행마다 PDF 전체를 다시 해싱하지 않습니다.
+    _pdf_source는 PDF 바이트 또는 (대용량 모드) 디스크의 파일 경로입니다.
+    메모리 캐시에 없으면 디스크 캐시(다른 세션/재시작 이전에 렌더링한 결과)를 먼저 확인합니다.
+    """
+    try:
+        return get_render_cache().get_or_render(document_id, page_num, dpi, lambda: render_pdf_page_jpeg(_pdf_source, page_num, dpi))
+    except Exception as e:
+        st.warning(f"PDF 페이지 이미지 렌더링 중 오류 (페이지 {page_num + 1}): {e}")
+        return None
+
+def get_value_by_path(data_dict: Dict[str, Any], path_string: str) -> Any:
+    """점(.)으로 구분된 경로 문자열을 사용하여 딕셔너리에서 중첩된 값을 안전하게 가져옵니다."""
+    keys = path_string.split('.')
+    val = data_dict
+    try:
+        for key in keys:
+            if isinstance(val, list) and key.isdigit():
+                idx = int(key)
+                if 0 <= idx < len(val):
+                    val = val[idx]
+                else:
+                    return None
+            elif isinstance(val, dict):
+                val = val.get(key)
+                if val is None: return None
+            else:
+                return None
+        return val
+    except (TypeError, IndexError, AttributeError):
+        return None
+
+def display_details_section(title: str, data: Any, expanded: bool = False):
+    """제목과 데이터를 가진 섹션을 표시합니다 (주로 st.expander 사용)."""
+    with st.expander(title, expanded=expanded):
+        if isinstance(data, str):
+            st.info(data)
+        elif isinstance(data, dict) or isinstance(data, list):
+            st.json(data)
+        elif data is None:
+            st.markdown("_정보 없음_")
+        else:
+            st.write(data)
+
+def display_patent_info_item(title: str, value: Any):
+    """특허 정보의 단일 항목을 적절한 형식으로 표시합니다."""
+    display_title = title.replace('_', ' ').title()
+    if isinstance(value, list):
+        if not value:
+            st.markdown(f"**{display_title}:** 정보 없음")
+        elif all(isinstance(item, dict) for item in value):
+            st.markdown(f"**{display_title}:**")
+            for item_dict in value:
+                item_str_list = [f"{k.replace('_',' ').title()}: {v}" for k, v in item_dict.items()]
+                st.markdown(f"- {', '.join(item_str_list)}")
+        else:
+            st.markdown(f"**{display_title}:** {', '.join(map(str, value))}")
+    elif value is None or str(value).strip() == "":
+        st.markdown(f"**{display_title}:** 정보 없음")
+    else:
+        st.markdown(f"**{display_title}:** {value}")
+
+def display_extracted_value_for_schema_item(value: Any):
+    """Tab 3에서 추출된 값을 적절한 Streamlit 요소로 표시합니다."""
+    if value is None:
+        st.markdown("_정보 없음 또는 해당 경로에 값이 없습니다._")
+    elif isinstance(value, list):
+        if value:
+            try:
+                if all(isinstance(i, dict) for i in value):
+                    st.dataframe(value)
+                elif all(isinstance(i, (str, int, float, bool, type(None))) for i in value):
+                    st.table(value)
+                else:
+                    st.json(value, expanded=True)
+            except Exception:
+                st.json(value, expanded=True)
+        else:
+            st.markdown("_빈 리스트입니다._")
+    elif isinstance(value, dict):
+        st.json(value, expanded=True)
+    else:
+        st.code(str(value), language=None)
+
+# 오류 산출물 필드별 표시 이름
+ERROR_ARTIFACT_LABELS = {
+    "raw_response": "LLM 원본 응답 (오류 시)",
+    "extracted_json_to_parse": "파싱 시도한 JSON 부분 (오류 시)",
+    "traceback": "오류 상세 정보 (Traceback)",
+}
+
+def display_error_artifacts(data: Dict[str, Any], key_prefix: str):
+    """
+    오류 결과의 원본 응답/파싱 시도 JSON/traceback을 표시합니다. 디스크 저장소로 옮겨진 필드는 미리보기만 보여주고,
+    '전체 내용 불러오기'를 켰을 때만 저장소에서 읽어 표시(앞부분)하고 다운로드를 제공합니다. 세션에 직접 남아 있는 값(이전 형식)은 그대로 표시합니다.
+    """
+    artifacts = data.get(ARTIFACTS_KEY) or {}
+    for field, label in ERROR_ARTIFACT_LABELS.items():
+        if field in data:
+            st.text_area(label, str(data[field])[:AppConfig.ERROR_ARTIFACT_DISPLAY_CHARS], height=150, key=f"{key_prefix}_{field}_inline")
+            continue
+        ref = artifacts.get(field)
+        if not ref:
+            continue
+        if not st.toggle(f"{label}: 전체 내용 불러오기 ({ref['chars']:,}자, 압축 저장 {ref['stored_bytes'] / 1024:,.1f} KB)", key=f"{key_prefix}_{field}_load"):
+            st.text_area(f"{label} - 미리보기", ref["preview"], height=150, key=f"{key_prefix}_{field}_preview")
+            continue
+        text = get_error_artifact_store().get(ref["artifact_id"])
+        if text is None:
+            st.warning(f"저장된 내용을 찾을 수 없습니다 (`{ref['artifact_id'][:12]}…`, 정리되었을 수 있음).")
+            continue
+        shown = text[:AppConfig.ERROR_ARTIFACT_DISPLAY_CHARS]
+        st.text_area(label + (f" - 앞 {len(shown):,}자" if len(shown) < len(text) else ""), shown, height=300, key=f"{key_prefix}_{field}_full")
+        st.download_button(f"{label} 전체 다운로드", data=text, file_name=f"{field}_{ref['artifact_id'][:12]}.txt", mime="text/plain", key=f"{key_prefix}_{field}_download")
+
+def display_cascade_metrics(metrics: Dict[str, Any]):
+    """모델 캐스케이드의 호출별 지연/토큰/비용과 고성능 모델 단독 대비 절감액을 표시합니다."""
+    saving = metrics["strong_only_cost_usd"] - metrics["cost_usd"]
+    with st.expander(f"섹션별 모델 라우팅 지표 (호출 {metrics['call_count']}회, 승급 {metrics['escalated_call_count']}회)", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("추정 비용", f"${metrics['cost_usd']:.4f}", delta=f"{'-' if saving >= 0 else '+'}${abs(saving):.4f} (고성능 단일 호출 대비)", delta_color="inverse")
+        col2.metric("토큰 (입력/출력)", f"{metrics['input_tokens']:,} / {metrics['output_tokens']:,}")
+        col3.metric("경과 시간", f"{metrics['wall_seconds']:.1f}s", delta=f"호출 합계 {metrics['sum_latency_seconds']:.1f}s", delta_color="off")
+        st.dataframe([
+            {
+                "그룹": call["group"],
+                "모델": call["model_name"],
+                "섹션": ", ".join(call["sections"]),
+                "지연(s)": round(call["latency_seconds"], 2),
+                "입력 토큰": call["input_tokens"],
+                "출력 토큰": call["output_tokens"],
+                "비용($)": round(call["cost_usd"], 5),
+                "검증 문제": "; ".join(f"{name}: {', '.join(issues)}" for name, issues in call["issues"].items()),
+            }
+            for call in metrics["calls"]
+        ], use_container_width=True)
+
+def display_map_reduce_metrics(metrics: Dict[str, Any]):
+    """map-reduce 추출의 창별 지연/토큰과 병합 결과(목록 중복 제거, 스칼라 충돌)를 표시합니다."""
+    failed = metrics["failed_windows"]
+    with st.expander(f"페이지 창 분할 추출 지표 (창 {metrics['window_count']}개, 실패 {len(failed)}개)", expanded=bool(failed)):
+        if failed:
+            st.warning(f"창 {', '.join(map(str, failed))}의 추출이 실패하여 해당 페이지 내용이 결과에서 빠졌을 수 있습니다.")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("경과 시간", f"{metrics['wall_seconds']:.1f}s", delta=f"호출 합계 {metrics['sum_latency_seconds']:.1f}s", delta_color="off")
+        col2.metric("토큰 (입력/출력)", f"{metrics['input_tokens']:,} / {metrics['output_tokens']:,}")
+        col3.metric("병합", f"중복 {sum(metrics['duplicates_removed'].values())}건 제거", delta=f"스칼라 충돌 {metrics['conflict_count']}건", delta_color="off")
+        st.dataframe([
+            {
+                "창": window["window"],
+                "페이지": f"{window['pages'][0]}-{window['pages'][1]}",
+                "지연(s)": round(window["latency_seconds"], 2),
+                "입력 토큰": window["input_tokens"],
+                "출력 토큰": window["output_tokens"],
+                "추출 섹션": window["sections_returned"],
+                "오류": window["error"] or "",
+            }
+            for window in metrics["windows"]
+        ], use_container_width=True)
+        if metrics["conflicts"]:
+            st.caption("스칼라 충돌 (가장 많은 창이 낸 값, 동률이면 앞쪽 창의 값을 채택)")
+            st.dataframe([
+                {
+                    "경로": conflict["path"],
+                    "채택 값": json.dumps(conflict["chosen"], ensure_ascii=False),
+                    "채택 창": ", ".join(map(str, conflict["chosen_windows"])),
+                    "다른 후보": "; ".join(json.dumps(value, ensure_ascii=False) for value in conflict["alternatives"]),
+                }
+                for conflict in metrics["conflicts"]
+            ], use_container_width=True)
+
+def display_prompt_cache_usage(usage: Dict[str, Any]):
+    """현재 결과의 LLM 요청별 스키마 접두부 캐시 적중 토큰과 절감액을 표시합니다."""
+    with st.expander(
+        f"스키마 프롬프트 캐시 (요청 {usage['request_count']}건 중 {usage['cached_requests']}건 적중, 입력의 {usage['cached_ratio']:.0%}, 약 ${usage['saved_usd']:.4f} 절감)",
+        expanded=False
+    ):
+        st.dataframe([
+            {
+                "요청": index + 1,
+                "캐시": request["cache_name"] or "(캐시 없이 전체 전송)",
+                "입력 토큰": request["input_tokens"],
+                "캐시 적중 토큰": request["cached_input_tokens"],
+                "절감($)": round(request["saved_usd"], 6),
+                "지연(s)": round(request["latency_seconds"], 2),
+            }
+            for index, request in enumerate(usage["requests"])
+        ], use_container_width=True)
+        st.caption(f"캐시 적중 토큰은 일반 입력 단가의 {AppConfig.CACHED_INPUT_PRICE_RATIO:.0%}로 계산합니다. 캐시 저장 비용은 사이드바의 프롬프트 캐시 현황에 누적됩니다.")
+
+def display_text_extraction_metrics(metrics: Dict[str, Any]):
+    """PDF 텍스트 추출 단계의 표 탐지 결과와 기존 평문 추출 대비 토큰 절감/지연을 표시합니다."""
+    with st.expander(f"텍스트 추출 지표 (표 {metrics['tables_found']}개, {metrics['pages']}페이지)", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("추정 입력 토큰", f"{metrics['tokens_estimate']:,}",
+                    delta=f"{metrics['tokens_estimate'] - metrics['plain_tokens_estimate']:,} (평문 대비)", delta_color="inverse")
+        col2.metric("표 탐지 시간", f"{metrics['table_detection_seconds']:.2f}s", delta=f"전체 {metrics['total_seconds']:.2f}s", delta_color="off")
+        col3.metric("표 기반 성능 데이터", f"{metrics['prefilled_performance_rows']}건",
+                    delta=f"LLM 결과에 {metrics.get('performance_rows_added_from_tables', 0)}건 추가", delta_color="off")
+        compaction = metrics.get("compaction")
+        if compaction:
+            st.caption(
+                f"머리말/꼬리말·공백 압축: 반복 패턴 {compaction['repeated_line_patterns']}개, 줄 {compaction['removed_lines']:,}개 제거, "
+                f"문자 {compaction['chars_saved']:,}자 / 추정 토큰 {compaction['tokens_saved_estimate']:,}개 절감 "
+                f"({compaction['token_reduction_pct']:.1f}%), {compaction['seconds'] * 1000:.0f} ms"
+            )
+
+# --- Streamlit UI 구성 및 메인 로직 ---
+def initialize_session_state():
+    """세션 상태 변수가 존재하지 않으면 초기화합니다."""
+    defaults = {
+        SessionStateKeys.ANALYSIS_COMPLETE: False,
+        SessionStateKeys.STRUCTURED_DATA: None,
+        SessionStateKeys.PDF_PAGE_TEXTS: [],
+        SessionStateKeys.CURRENT_PAGE_PDF_VIEW: 0,
+        SessionStateKeys.ORIGINAL_FILENAME: "",
+        SessionStateKeys.PDF_BYTES_FOR_VIEWER: None,
+        SessionStateKeys.PDF_PATH_FOR_VIEWER: None,
+        SessionStateKeys.LARGE_PDF_SPOOL: None,
+        SessionStateKeys.DOCUMENT_ID: None,
+        SessionStateKeys.RULE_BASED_PATENT_INFO: {},
+        SessionStateKeys.BIBLIOGRAPHIC_CROSSCHECK: [],
+        SessionStateKeys.USE_MODEL_CASCADE: AppConfig.USE_MODEL_CASCADE,
+        SessionStateKeys.EXTRACTION_METRICS: None,
+        SessionStateKeys.TEXT_EXTRACTION_METRICS: None,
+        SessionStateKeys.RESULTS_VERSION: 0,
+        SessionStateKeys.RENDER_MEMO: {},
+        SessionStateKeys.RENDER_TIMINGS: {},
+        SessionStateKeys.VIEWER_FULL_RES_PAGES: set(),
+        SessionStateKeys.MULTI_UPLOAD_REPORT: None,
+        SessionStateKeys.PROFILING_ENABLED: is_profiling_enabled_by_env(),
+        SessionStateKeys.PROFILE_SUMMARIES: {},
+        SessionStateKeys.MAP_REDUCE_METRICS: None,
+        SessionStateKeys.PROMPT_CACHE_USAGE: None,
+        SessionStateKeys.QUICK_ANALYSIS: None,
+        SessionStateKeys.FIELD_PATH_INDEX: None,
+        SessionStateKeys.BUNDLE_PATH: None,
+    }
+    for key, default_value in defaults.items():
+        if key not in st.session_state:
+            st.session_state[key] = default_value
+
+@st.cache_resource
+def get_result_store() -> ResultStore:
+    """분석 결과 저장소 객체를 반환합니다 (세션 간 공유)."""
+    return ResultStore(AppConfig.RESULT_STORE_DIR)
+
+@st.cache_resource
+def get_similarity_index() -> SimilarityIndex:
+    """유사 특허 검색 인덱스를 반환합니다 (세션 간 공유, 저장된 인덱스 파일이 있으면 읽고 이후 저장소와 증분 동기화)."""
+    return load_index(os.path.join(AppConfig.RESULT_STORE_DIR, AppConfig.SIMILAR_INDEX_FILENAME))
+
+@st.cache_resource
+def get_analysis_bundle_store() -> AnalysisBundleStore:
+    """분석 번들 저장소 객체를 반환합니다 (세션 간 공유)."""
+    return AnalysisBundleStore(AppConfig.ANALYSIS_BUNDLE_DIR)
+
+@st.cache_resource
+def get_error_artifact_store() -> ErrorArtifactStore:
+    """실패 결과의 큰 문자열(원본 응답, traceback)을 보관하는 디스크 저장소를 반환합니다 (세션 간 공유)."""
+    return ErrorArtifactStore(AppConfig.ERROR_ARTIFACT_DIR)
+
+def store_failed_result(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """오류 결과의 원본 응답/traceback을 디스크 저장소로 옮긴 뒤 세션 상태에 결과로 기록합니다 (세션에는 참조와 미리보기만 남음)."""
+    spilled = spill_error_payload(payload, get_error_artifact_store())
+    st.session_state[SessionStateKeys.STRUCTURED_DATA] = spilled
+    return spilled
+
+def save_analysis_result(
+    document_id: str,
+    pdf_filename: str,
+    page_texts: List[str],
+    structured_data: Dict[str, Any],
+    extra_fields: Optional[Dict[str, Any]] = None
+):
+    """성공한 분석 결과를 현재 스키마 섹션 버전과 함께 저장소에 기록합니다. extra_fields는 레코드에 그대로 추가됩니다."""
+    try:
+        record = {
+            "document_id": document_id,
+            "source_file_name": pdf_filename,
+            "page_texts": page_texts,
+            "structured_data": structured_data,
+            "schema_versions": compute_schema_versions(),
+            "model_name": AppConfig.GEMINI_MODEL_NAME,
+        }
+        record.update(extra_fields or {})
+        get_result_store().save(record)
+    except Exception as e_store:
+        st.warning(f"분석 결과 저장 중 오류: {e_store}")
+
+@st.cache_data
+def get_backfill_plan(store_fingerprint: str, schema_versions: Dict[str, str]) -> Tuple[int, List[Tuple[str, List[str]]]]:
+    """
+    백필 계획(plan_backfill)을 저장소 지문과 현재 스키마 버전을 키로 캐시합니다.
+    plan_backfill은 모든 레코드를 읽으므로, 문서가 추가/갱신되거나 프롬프트가 바뀔 때만 다시 계산합니다.
+    """
+    return plan_backfill(get_result_store(), schema_versions)
+
+def render_schema_backfill_sidebar():
+    """사이드바에 저장된 결과의 스키마 버전 상태와 백필(변경 섹션 재추출) 실행 버튼을 표시합니다."""
+    with st.sidebar.expander("🗂️ 저장된 분석 결과 / 스키마 버전", expanded=False):
+        store = get_result_store()
+        total_documents, plan = get_backfill_plan(store.fingerprint(), compute_schema_versions())
+        stale_section_count = sum(len(sections) for _, sections in plan)
+        st.markdown(f"저장된 문서: **{total_documents}건** / 재추출 필요: **{len(plan)}건** (섹션 {stale_section_count}개)")
+        if not plan:
+            return
+        if st.button("변경된 섹션만 재추출 (백필)", key="schema_backfill_button", disabled=llm is None):
+            progress_bar = st.progress(0.0)
+            status_text = st.empty()
+
+            def _on_progress(report, document_id):
+                progress_bar.progress(report.processed / max(report.stale_documents, 1))
+                status_text.caption(
+                    f"{report.processed}/{report.stale_documents} 처리 (실패 {report.failed}) · "
+                    f"토큰 {report.input_tokens + report.output_tokens:,} · 추정 비용 ${report.cost_usd:.4f}"
+                )
+
+            report = run_backfill(store, with_session_quota(with_prompt_cache(llm)), AppConfig.GEMINI_MODEL_NAME, progress_callback=_on_progress)
+            if report.failed:
+                st.warning(f"백필 완료: 성공 {report.succeeded}건, 실패 {report.failed}건 (실패 문서는 다음 실행 때 재시도됩니다).")
+            else:
+                st.success(f"백필 완료: {report.succeeded}건, 섹션 {report.sections_reextracted}개 재추출, {report.elapsed_seconds:.1f}초")
+
+def with_session_quota(model: Any) -> QuotaLimitedModel:
+    """모델을 현재 세션의 쿼터로 감쌉니다. 모든 LLM 호출은 이 래퍼를 거쳐 한도 검사 후 실행됩니다."""
+    ctx = get_script_run_ctx()
+    session_id = ctx.session_id if ctx else "no-session"
+    return QuotaLimitedModel(model, get_quota_manager(), session_id)
+
+def with_prompt_cache(model: Any, model_name: str = AppConfig.GEMINI_MODEL_NAME) -> Any:
+    """
+    정적 스키마 접두부를 제공자 측 캐시로 참조하도록 모델을 감쌉니다 (prompt_cache.py). 캐시를 끄거나 쓸 수 없으면 모델을 그대로 반환합니다.
+    호출마다 새 래퍼를 만들므로 래퍼의 requests에는 이번 작업의 요청만 기록됩니다. 쿼터 래퍼(with_session_quota)는 이 래퍼 바깥에 씌웁니다.
+    """
+    manager = get_prompt_cache_manager(GOOGLE_API_KEY) if AppConfig.USE_PROMPT_CACHE else None
+    return PromptCachedModel(model, manager, model_name) if manager is not None else model
+
+def record_prompt_cache_usage(cached_model: Any, previous: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """캐시 래퍼의 요청 기록을 결과용 요약으로 만듭니다 (previous가 있으면 요청을 이어 붙임, 빠른 분석 -> 업그레이드). 래퍼가 아니면 None."""
+    if not isinstance(cached_model, PromptCachedModel) or not cached_model.requests:
+        return previous
+    requests = (previous or {}).get("requests", []) + cached_model.requests
+    return {**summarize_cache_requests(requests), "requests": requests}
+
+@st.cache_resource
+def get_cascade_models() -> Dict[str, Any]:
+    """캐스케이드용 등급별 모델 객체를 반환합니다. 저가 모델은 기본 llm과 같은 모델이면 재사용합니다."""
+    models = {}
+    for tier, model_name in AppConfig.CASCADE_MODEL_NAMES.items():
+        models[tier] = llm if model_name == AppConfig.GEMINI_MODEL_NAME else create_chat_model(model_name, GOOGLE_API_KEY)
+    return models
+
+def render_large_pdf_options(uploaded_file_obj) -> Optional[Tuple[SpooledPdf, Optional[List[int]]]]:
+    """
+    대용량 모드: 업로드를 디스크에 청크 단위로 내려 받고(업로드마다 한 번) 분석할 페이지 범위를 고르게 합니다.
+    (SpooledPdf, 페이지 번호 목록 또는 자동 선택이면 None)을 반환하며, 페이지 범위가 잘못되면 None을 반환합니다.
+    """
+    spooled_state = st.session_state[SessionStateKeys.LARGE_PDF_SPOOL]
+    if not spooled_state or spooled_state[0] != uploaded_file_obj.file_id:
+        with st.spinner("대용량 PDF를 디스크에 저장하는 중..."):
+            spooled_state = (uploaded_file_obj.file_id, spool_upload_to_disk(uploaded_file_obj))
+        st.session_state[SessionStateKeys.LARGE_PDF_SPOOL] = spooled_state
+    spooled = spooled_state[1]
+    st.caption(f"📦 대용량 모드: {spooled.size_bytes / (1024 * 1024):,.1f} MB, {spooled.page_count:,}페이지 (디스크에서 페이지 단위로 읽음, "
+               f"메모리 상한 {AppConfig.LARGE_PDF_MEMORY_CEILING_MB:,} MB)")
+    selection_mode = st.radio("분석할 페이지", ["자동 (첫 페이지 + 설명/청구항)", "직접 지정"], horizontal=True, key="large_pdf_page_mode")
+    if selection_mode.startswith("자동"):
+        return spooled, None
+    page_range_text = st.text_input("페이지 범위 (예: 1-5, 40-)", value=f"1-{min(spooled.page_count, 50)}", key="large_pdf_page_range")
+    try:
+        page_numbers = parse_page_ranges(page_range_text, spooled.page_count)
+    except ValueError as e:
+        st.error(str(e))
+        return None
+    if not page_numbers:
+        st.error("선택된 페이지가 없습니다.")
+        return None
+    st.caption(f"{len(page_numbers):,}페이지 선택됨")
+    return spooled, page_numbers
+
+@st.cache_resource
+def get_full_analysis_latency_history() -> deque:
+    """최근 전체 분석의 LLM 추출 시간(초) 기록 (프로세스 전체 공유, 빠른 분석 화면의 지연 비교용)"""
+    return deque(maxlen=AppConfig.FULL_ANALYSIS_LATENCY_HISTORY)
+
+def run_analysis_pipeline(
+    uploaded_file_obj,
+    large_pdf_options: Optional[Tuple[SpooledPdf, Optional[List[int]]]] = None,
+    quick_mode: bool = False
+):
+    """
+    PDF 업로드부터 결과 표시까지 전체 분석 파이프라인을 처리합니다.
+    large_pdf_options(render_large_pdf_options 결과)가 있으면 업로드 바이트 대신 디스크의 파일을 경로로 열어 선택한 페이지만 처리합니다.
+    quick_mode면 요약/청구항만으로 축소 스키마를 추출하며(quick_analysis.py), 결과는 저장소에 기록하지 않고 전체 추출로 업그레이드할 수 있습니다.
+    """
+    st.session_state[SessionStateKeys.ORIGINAL_FILENAME] = uploaded_file_obj.name
+    st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] = False
+
+    with st.spinner(f"'{uploaded_file_obj.name}' 분석 중... PDF 텍스트 추출 후 LLM 호출 중입니다. 몇 분 정도 소요될 수 있습니다..."):
+        if llm is None:
+            st.error("LLM 모델이 초기화되지 않아 분석을 진행할 수 없습니다. GOOGLE_API_KEY를 확인해주세요.")
+            st.stop()
+
+        try:
+            pipeline_started = time.perf_counter()
+            if large_pdf_options:
+                spooled, page_numbers = large_pdf_options
+                st.session_state[SessionStateKeys.PDF_BYTES_FOR_VIEWER] = None
+                st.session_state[SessionStateKeys.PDF_PATH_FOR_VIEWER] = spooled.path
+                st.session_state[SessionStateKeys.DOCUMENT_ID] = spooled.document_id
+                page_texts, full_text_from_pdf, text_extraction_info = convert_pdf_to_text(spooled.path, page_numbers=page_numbers)
+            else:
+                pdf_bytes = uploaded_file_obj.getvalue()
+                st.session_state[SessionStateKeys.PDF_BYTES_FOR_VIEWER] = pdf_bytes
+                st.session_state[SessionStateKeys.PDF_PATH_FOR_VIEWER] = None
+                st.session_state[SessionStateKeys.DOCUMENT_ID] = compute_document_id(pdf_bytes)
+                page_texts, full_text_from_pdf, text_extraction_info = convert_pdf_to_text(pdf_bytes)
+            st.session_state[SessionStateKeys.PDF_PAGE_TEXTS] = page_texts
+            text_extraction_seconds = time.perf_counter() - pipeline_started
+            text_metrics = text_extraction_info["metrics"]
+            st.session_state[SessionStateKeys.TEXT_EXTRACTION_METRICS] = text_metrics
+            if text_metrics.get("compaction"):
+                st.caption(
+                    f"🗜️ 프롬프트 텍스트 압축: 추정 토큰 {text_metrics['compaction']['original_tokens_estimate']:,} → "
+                    f"{text_metrics['compaction']['compacted_tokens_estimate']:,} ({text_metrics['compaction']['token_reduction_pct']:.1f}% 절감)"
+                )
+            if text_metrics.get("total_document_pages"):
+                st.caption(
+                    f"📦 대용량 모드: 전체 {text_metrics['total_document_pages']:,}페이지 중 {text_metrics['pages']:,}페이지 추출, "
+                    f"최대 RSS {text_metrics['peak_rss_mb']:,.0f} MB / 상한 {text_metrics['memory_ceiling_mb']:,.0f} MB"
+                )
+            if text_metrics.get("tables_found"):
+                st.caption(
+                    f"📋 표 {text_metrics['tables_found']}개를 TSV로 변환: 추정 토큰 {text_metrics['plain_tokens_estimate']:,} → "
+                    f"{text_metrics['tokens_estimate']:,} ({text_metrics['token_reduction_pct']:.1f}% 절감), "
+                    f"표 탐지 {text_metrics['table_detection_seconds']:.2f}s, 성능 데이터 {text_metrics['prefilled_performance_rows']}건 사전 추출"
+                )
+
+            if not full_text_from_pdf.strip():
+                st.error("PDF에서 텍스트를 추출하지 못했습니다. 파일 내용을 확인해주세요.")
+                st.session_state[SessionStateKeys.STRUCTURED_DATA] = {"error": "Failed to extract text from PDF."}
+                st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] = True
+                st.stop()
+
+            # 첫 페이지 INID 코드에서 서지 정보를 규칙 기반으로 즉시 추출하여 LLM 호출 전에 표시
+            parse_started = time.perf_counter()
+            rule_based_info = parse_front_page(page_texts[0]) if page_texts else {}
+            parse_elapsed_ms = (time.perf_counter() - parse_started) * 1000
+            st.session_state[SessionStateKeys.RULE_BASED_PATENT_INFO] = rule_based_info
+            if rule_based_info:
+                with st.expander(f"⚡ 첫 페이지 서지 정보 (규칙 기반, {parse_elapsed_ms:.1f} ms)", expanded=True):
+                    for key, val in rule_based_info.items():
+                        display_patent_info_item(key, val)
+
+            cached_llm = with_prompt_cache(llm)
+            extraction_started = time.perf_counter()
+            if quick_mode:
+                st.info(f"요약/청구항만으로 빠른 분석 중... (파일명: {uploaded_file_obj.name})")
+                extracted_data, quick_metrics = run_quick_analysis(
+                    page_texts,
+                    with_session_quota(cached_llm),
+                    AppConfig.GEMINI_MODEL_NAME,
+                    uploaded_file_obj.name,
+                    prefilled_patent_info=rule_based_info,
+                    full_prompt_text=full_text_from_pdf
+                )
+                st.session_state[SessionStateKeys.QUICK_ANALYSIS] = {
+                    "metrics": quick_metrics,
+                    "table_performance_data": text_extraction_info["performance_data"],
+                    "upgrade_metrics": None,
+                }
+                if "error" not in extracted_data:
+                    extracted_data = _apply_default_fields(extracted_data, uploaded_file_obj.name, full_text_from_pdf)
+            elif should_use_map_reduce(full_text_from_pdf):
+                # 한 번의 요청에 담기 어려운 크기: 페이지 창으로 나누어 병렬 추출 후 병합 (캐스케이드 설정보다 우선)
+                st.info(f"문서가 커서 페이지 창으로 나누어 병렬 추출 중... (추정 {estimate_tokens(full_text_from_pdf):,} 토큰, 파일명: {uploaded_file_obj.name})")
+                extracted_data, map_reduce_metrics = run_map_reduce_extraction(
+                    page_texts,
+                    with_session_quota(cached_llm),
+                    AppConfig.GEMINI_MODEL_NAME,
+                    uploaded_file_obj.name,
+                    page_numbers=text_metrics.get("selected_pages"),
+                    prefilled_patent_info=rule_based_info
+                )
+                st.session_state[SessionStateKeys.MAP_REDUCE_METRICS] = map_reduce_metrics
+                if "error" not in extracted_data:
+                    extracted_data = _apply_default_fields(extracted_data, uploaded_file_obj.name, full_text_from_pdf)
+            elif st.session_state[SessionStateKeys.USE_MODEL_CASCADE]:
+                st.info(f"섹션별 모델 캐스케이드로 추출 중... (그룹 {len(AppConfig.SECTION_MODEL_ROUTES)}개 병렬, 파일명: {uploaded_file_obj.name})")
+                extracted_data, cascade_metrics = run_cascade_extraction(
+                    full_text_from_pdf,
+                    uploaded_file_obj.name,
+                    {tier: with_session_quota(model) for tier, model in get_cascade_models().items()},
+                    prefilled_patent_info=rule_based_info
+                )
+                st.session_state[SessionStateKeys.EXTRACTION_METRICS] = cascade_metrics
+                if "error" not in extracted_data:
+                    extracted_data = _apply_default_fields(extracted_data, uploaded_file_obj.name, full_text_from_pdf)
+            else:
+                extracted_data = extract_structured_data_with_llm(
+                    full_text_from_pdf,
+                    with_session_quota(cached_llm),
+                    uploaded_file_obj.name,
+                    prefilled_patent_info=rule_based_info
+                )
+            llm_seconds = time.perf_counter() - extraction_started
+            if not quick_mode and "error" not in extracted_data:
+                get_full_analysis_latency_history().append(llm_seconds)
+            cache_usage = record_prompt_cache_usage(cached_llm)
+            st.session_state[SessionStateKeys.PROMPT_CACHE_USAGE] = cache_usage
+            if "error" not in extracted_data and rule_based_info:
+                # 규칙 기반 값을 우선 채택하고, LLM 값은 교차 검증에만 사용
+                extracted_data["patent_info"], crosscheck = merge_with_llm_patent_info(rule_based_info, extracted_data.get("patent_info"))
+                st.session_state[SessionStateKeys.BIBLIOGRAPHIC_CROSSCHECK] = crosscheck
+            if not quick_mode and "error" not in extracted_data and text_extraction_info["performance_data"]:
+                # 깔끔한 표에서 변환한 성능 데이터로 LLM이 빠뜨린 행을 채움 (같은 지표/수치는 LLM 값 유지)
+                performance_key = "representative_performance_data_from_examples_or_figures"
+                extracted_data[performance_key], added_rows = merge_table_performance_data(
+                    extracted_data.get(performance_key), text_extraction_info["performance_data"]
+                )
+                text_metrics["performance_rows_added_from_tables"] = added_rows
+            if "error" in extracted_data:
+                extracted_data = store_failed_result(extracted_data)
+            else:
+                st.session_state[SessionStateKeys.STRUCTURED_DATA] = extracted_data
+            st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] = True
+            if "error" not in extracted_data:
+                write_analysis_bundle(uploaded_file_obj.name, {
+                    "text_extraction_seconds": text_extraction_seconds,
+                    "llm_seconds": llm_seconds,
+                    "pipeline_seconds": time.perf_counter() - pipeline_started,
+                })
+
+            if quick_mode and "error" not in extracted_data:
+                st.success(f"'{uploaded_file_obj.name}' 빠른 분석이 완료되었습니다 (LLM {quick_metrics['llm_seconds']:.1f}s). 필요하면 결과 위의 버튼으로 전체 추출을 이어서 실행하세요.")
+            elif "error" not in extracted_data:
+                save_analysis_result(
+                    st.session_state[SessionStateKeys.DOCUMENT_ID],
+                    uploaded_file_obj.name,
+                    page_texts,
+                    extracted_data,
+                    extra_fields={
+                        "bibliographic_crosscheck": st.session_state[SessionStateKeys.BIBLIOGRAPHIC_CROSSCHECK],
+                        "extraction_metrics": st.session_state[SessionStateKeys.EXTRACTION_METRICS],
+                        "map_reduce_metrics": st.session_state[SessionStateKeys.MAP_REDUCE_METRICS],
+                        "prompt_cache_usage": cache_usage,
+                        "text_extraction_metrics": text_metrics,
+                        "selected_pages": text_metrics.get("selected_pages"),
+                    }
+                )
+                st.success(f"'{uploaded_file_obj.name}' 분석이 완료되었습니다!")
+            else:
+                st.error(f"'{uploaded_file_obj.name}' 분석 중 문제가 발생했습니다. 상세 내용은 결과 탭에서 확인하세요.")
+
+
+        except Exception as e:
+            st.error(f"분석 파이프라인 중 예기치 않은 오류 발생: {e}")
+            st.exception(e)
+            store_failed_result({"error": f"Unexpected analysis error: {str(e)}", "traceback": traceback.format_exc()})
+            st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] = True
+
+def display_quick_analysis_panel():
+    """
+    빠른 분석 결과 위에 요약/청구항 탐지 결과와 전체 분석 대비 입력 토큰/지연 비교를 표시하고,
+    빠른 분석 섹션을 재사용하는 전체 추출 업그레이드 버튼을 제공합니다.
+    """
+    quick_state = st.session_state[SessionStateKeys.QUICK_ANALYSIS]
+    metrics, upgrade_metrics = quick_state["metrics"], quick_state["upgrade_metrics"]
+    st.markdown("---")
+    st.subheader("⚡ 빠른 분석 (요약 + 청구항)")
+    claims_pages = metrics["claims_pages"]
+    st.caption(
+        (f"요약 p{metrics['abstract_page']}, 청구항 p{claims_pages[0]}-{claims_pages[-1]}에서 추출" if metrics["located"] and claims_pages
+         else "요약/청구항 구간을 찾지 못해 첫 페이지와 마지막 페이지들로 대체했습니다.")
+        + f" (입력 {metrics['input_chars']:,}자, 구간 탐지 {metrics['locate_seconds'] * 1000:.1f} ms)"
+    )
+    full_history = get_full_analysis_latency_history()
+    rows = [{
+        "모드": "빠른 분석",
+        "입력 토큰(추정)": metrics["prompt_tokens_estimate"],
+        "LLM 시간(s)": round(metrics["llm_seconds"] or 0.0, 2),
+        "비용($)": round(metrics["cost_usd"] or 0.0, 4),
+    }, {
+        "모드": f"전체 분석 (최근 {len(full_history)}건 평균)" if full_history else "전체 분석 (기록 없음)",
+        "입력 토큰(추정)": metrics["full_prompt_tokens_estimate"],
+        "LLM 시간(s)": round(sum(full_history) / len(full_history), 2) if full_history else None,
+        "비용($)": None,
+    }]
+    if upgrade_metrics:
+        rows.append({
+            "모드": f"업그레이드 ({len(upgrade_metrics['sections'])}개 섹션 추출, {len(upgrade_metrics['reused_sections'])}개 재사용)",
+            "입력 토큰(추정)": upgrade_metrics["usage"].get("input_tokens") if upgrade_metrics.get("usage") else None,
+            "LLM 시간(s)": round(upgrade_metrics["llm_seconds"] or 0.0, 2),
+            "비용($)": round(upgrade_metrics["cost_usd"] or 0.0, 4),
+        })
+    st.dataframe(rows, use_container_width=True)
+
+    data = st.session_state[SessionStateKeys.STRUCTURED_DATA]
+    if upgrade_metrics is None and "error" not in data:
+        remaining = sections_to_upgrade(data)
+        if st.button(f"🔄 전체 추출로 업그레이드 (빠른 분석 섹션 재사용, {len(remaining)}개 섹션 추출)", key="quick_upgrade_button"):
+            run_quick_upgrade()
+
+def run_quick_upgrade():
+    """빠른 분석 결과를 재사용하여 나머지 섹션을 전체 텍스트로 추출하고, 결과를 병합하여 저장합니다. 실패하면 빠른 분석 결과를 유지합니다."""
+    if llm is None:
+        st.error("LLM 모델이 초기화되지 않아 전체 추출을 진행할 수 없습니다. GOOGLE_API_KEY를 확인해주세요.")
+        return
+    quick_state = st.session_state[SessionStateKeys.QUICK_ANALYSIS]
+    page_texts = st.session_state[SessionStateKeys.PDF_PAGE_TEXTS]
+    pdf_filename = st.session_state[SessionStateKeys.ORIGINAL_FILENAME]
+    text_metrics = st.session_state[SessionStateKeys.TEXT_EXTRACTION_METRICS] or {}
+    rule_based_info = st.session_state[SessionStateKeys.RULE_BASED_PATENT_INFO]
+    full_text, _, _ = build_prompt_text(page_texts, page_numbers=text_metrics.get("selected_pages"))
+    cached_llm = with_prompt_cache(llm)
+    with st.spinner(f"'{pdf_filename}' 전체 추출 중 (빠른 분석 섹션 재사용)..."):
+        upgraded, upgrade_metrics = upgrade_to_full_analysis(
+            st.session_state[SessionStateKeys.STRUCTURED_DATA], full_text, with_session_quota(cached_llm),
+            AppConfig.GEMINI_MODEL_NAME, pdf_filename, prefilled_patent_info=rule_based_info
+        )
+    quick_state["upgrade_metrics"] = upgrade_metrics
+    st.session_state[SessionStateKeys.PROMPT_CACHE_USAGE] = record_prompt_cache_usage(cached_llm, st.session_state[SessionStateKeys.PROMPT_CACHE_USAGE])
+    if "error" in upgraded:
+        st.error(f"전체 추출 업그레이드 실패 (빠른 분석 결과 유지): {upgraded['error']}")
+        return
+    upgraded = _apply_default_fields(upgraded, pdf_filename, full_text)
+    if rule_based_info and "patent_info" in upgrade_metrics["sections"]:
+        upgraded["patent_info"], crosscheck = merge_with_llm_patent_info(rule_based_info, upgraded.get("patent_info"))
+        st.session_state[SessionStateKeys.BIBLIOGRAPHIC_CROSSCHECK] = crosscheck
+    if quick_state["table_performance_data"]:
+        performance_key = "representative_performance_data_from_examples_or_figures"
+        upgraded[performance_key], added_rows = merge_table_performance_data(upgraded.get(performance_key), quick_state["table_performance_data"])
+        text_metrics["performance_rows_added_from_tables"] = added_rows
+    st.session_state[SessionStateKeys.STRUCTURED_DATA] = upgraded
+    st.session_state[SessionStateKeys.RESULTS_VERSION] += 1
+    save_analysis_result(
+        st.session_state[SessionStateKeys.DOCUMENT_ID],
+        pdf_filename,
+        page_texts,
+        upgraded,
+        extra_fields={
+            "bibliographic_crosscheck": st.session_state[SessionStateKeys.BIBLIOGRAPHIC_CROSSCHECK],
+            "text_extraction_metrics": text_metrics,
+            "selected_pages": text_metrics.get("selected_pages"),
+            "quick_analysis_metrics": {"quick": quick_state["metrics"], "upgrade": upgrade_metrics},
+            "prompt_cache_usage": st.session_state[SessionStateKeys.PROMPT_CACHE_USAGE],
+        }
+    )
+    write_analysis_bundle(pdf_filename, {"llm_seconds": upgrade_metrics["llm_seconds"]})
+    st.success(f"전체 추출 완료 (LLM {upgrade_metrics['llm_seconds']:.1f}s, 빠른 분석 섹션 {len(upgrade_metrics['reused_sections'])}개 재사용).")
+
+# 번들에 함께 저장하여 다시 열 때 복원하는 결과 탭용 세션 상태 (JSON으로 직렬화 가능한 값)
+BUNDLE_SESSION_FIELDS = (
+    SessionStateKeys.RULE_BASED_PATENT_INFO,
+    SessionStateKeys.BIBLIOGRAPHIC_CROSSCHECK,
+    SessionStateKeys.EXTRACTION_METRICS,
+    SessionStateKeys.TEXT_EXTRACTION_METRICS,
+    SessionStateKeys.MAP_REDUCE_METRICS,
+    SessionStateKeys.PROMPT_CACHE_USAGE,
+    SessionStateKeys.QUICK_ANALYSIS,
+)
+
+def analysis_mode_label(quick_state: Optional[Dict[str, Any]]) -> str:
+    """번들 매니페스트의 분석 모드: 'full' (전체 분석), 'quick' (빠른 분석), 'upgraded' (빠른 분석 후 전체 추출)."""
+    if not quick_state:
+        return "full"
+    return "upgraded" if quick_state.get("upgrade_metrics") else "quick"
+
+def write_analysis_bundle(pdf_filename: str, timings: Dict[str, float]):
+    """
+    현재 세션의 분석 결과(페이지 텍스트, 구조화 JSON, 경로 인덱스, 썸네일, 원본 PDF, 결과 탭 상태, 소요 시간)를 번들 한 파일로 기록합니다.
+    분석 기록 페이지에서 LLM 호출 없이 다시 열 수 있습니다. 기록에 실패해도 분석 결과 표시는 계속됩니다.
+    """
+    data = st.session_state[SessionStateKeys.STRUCTURED_DATA]
+    st.session_state[SessionStateKeys.FIELD_PATH_INDEX] = build_path_index(data, SCHEMA_FIELD_DESCRIPTIONS.keys())
+    if not AppConfig.USE_ANALYSIS_BUNDLES:
+        return
+    try:
+        started = time.perf_counter()
+        document_id = st.session_state[SessionStateKeys.DOCUMENT_ID]
+        page_texts = st.session_state[SessionStateKeys.PDF_PAGE_TEXTS]
+        pdf_source = st.session_state[SessionStateKeys.PDF_BYTES_FOR_VIEWER] or st.session_state[SessionStateKeys.PDF_PATH_FOR_VIEWER]
+        images = render_bundle_images(pdf_source, document_id, len(page_texts), get_render_cache()) if pdf_source else {}
+        store = get_analysis_bundle_store()
+        store.write(
+            document_id, pdf_filename, page_texts, data, st.session_state[SessionStateKeys.FIELD_PATH_INDEX],
+            session_fields={key: st.session_state[key] for key in BUNDLE_SESSION_FIELDS},
+            images=images,
+            source_pdf=pdf_source,
+            timings={**timings, "bundle_images_seconds": time.perf_counter() - started},
+            extra_manifest={
+                "model_name": AppConfig.GEMINI_MODEL_NAME,
+                "analysis_mode": analysis_mode_label(st.session_state[SessionStateKeys.QUICK_ANALYSIS]),
+                "schema_versions": compute_schema_versions(),
+            }
+        )
+        st.session_state[SessionStateKeys.BUNDLE_PATH] = store.path(document_id)
+        st.caption(
+            f"📦 분석 번들 저장: `{store.path(document_id)}` ({os.path.getsize(store.path(document_id)) / 1024 / 1024:.1f} MB, "
+            f"이미지 {len(images)}장, {time.perf_counter() - started:.2f}s) — 분석 기록 페이지에서 다시 열 수 있습니다."
+        )
+    except Exception as e_bundle:
+        st.warning(f"분석 번들 저장 중 오류: {e_bundle}")
+
+def load_analysis_bundle(path: str) -> bool:
+    """분석 번들에서 결과 탭 3개의 세션 상태를 복원합니다 (LLM 호출 없음). 읽을 수 없으면 오류를 표시하고 False."""
+    started = time.perf_counter()
+    try:
+        bundle = get_analysis_bundle_store().read(path)
+    except Exception as e_bundle:
+        st.error(f"분석 번들을 읽을 수 없습니다 ({path}): {e_bundle}")
+        return False
+    manifest = bundle["manifest"]
+    reset_analysis_state()
+    st.session_state[SessionStateKeys.DOCUMENT_ID] = manifest["document_id"]
+    st.session_state[SessionStateKeys.ORIGINAL_FILENAME] = manifest["source"]["file_name"]
+    st.session_state[SessionStateKeys.PDF_BYTES_FOR_VIEWER] = bundle["source_pdf"]
+    st.session_state[SessionStateKeys.PDF_PATH_FOR_VIEWER] = None
+    st.session_state[SessionStateKeys.PDF_PAGE_TEXTS] = bundle["page_texts"]
+    st.session_state[SessionStateKeys.STRUCTURED_DATA] = bundle["structured_data"]
+    st.session_state[SessionStateKeys.FIELD_PATH_INDEX] = bundle["path_index"]
+    st.session_state[SessionStateKeys.BUNDLE_PATH] = path
+    for key in BUNDLE_SESSION_FIELDS:
+        if key in bundle["session_fields"]:
+            st.session_state[key] = bundle["session_fields"][key]
+    seed_render_cache(get_render_cache(), manifest["document_id"], bundle["images"])
+    st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] = True
+    st.success(
+        f"📦 '{manifest['source']['file_name']}' 분석 번들을 불러왔습니다 ({(time.perf_counter() - started) * 1000:.0f} ms, LLM 호출 없음, "
+        f"분석 시각 {manifest['created_at']})."
+    )
+    return True
+
+def reset_analysis_state():
+    """새 분석 또는 다른 결과를 표시하기 전에 결과 탭이 참조하는 세션 상태를 초기화합니다."""
+    st.session_state[SessionStateKeys.STRUCTURED_DATA] = None
+    st.session_state[SessionStateKeys.PDF_PAGE_TEXTS] = []
+    st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW] = 0
+    st.session_state[SessionStateKeys.RULE_BASED_PATENT_INFO] = {}
+    st.session_state[SessionStateKeys.BIBLIOGRAPHIC_CROSSCHECK] = []
+    st.session_state[SessionStateKeys.EXTRACTION_METRICS] = None
+    st.session_state[SessionStateKeys.TEXT_EXTRACTION_METRICS] = None
+    st.session_state[SessionStateKeys.MAP_REDUCE_METRICS] = None
+    st.session_state[SessionStateKeys.PROMPT_CACHE_USAGE] = None
+    st.session_state[SessionStateKeys.QUICK_ANALYSIS] = None
+    st.session_state[SessionStateKeys.FIELD_PATH_INDEX] = None
+    st.session_state[SessionStateKeys.BUNDLE_PATH] = None
+    st.session_state[SessionStateKeys.RESULTS_VERSION] += 1
+
+def load_stored_result(document_id: str, pdf_bytes: bytes) -> bool:
+    """저장소의 분석 레코드와 업로드 바이트를 결과 탭용 세션 상태로 불러옵니다. 레코드가 없으면 False."""
+    record = get_result_store().load(document_id)
+    if record is None:
+        return False
+    reset_analysis_state()
+    st.session_state[SessionStateKeys.DOCUMENT_ID] = document_id
+    st.session_state[SessionStateKeys.ORIGINAL_FILENAME] = record["source_file_name"]
+    st.session_state[SessionStateKeys.PDF_BYTES_FOR_VIEWER] = pdf_bytes
+    st.session_state[SessionStateKeys.PDF_PATH_FOR_VIEWER] = None
+    st.session_state[SessionStateKeys.PDF_PAGE_TEXTS] = record["page_texts"]
+    st.session_state[SessionStateKeys.STRUCTURED_DATA] = record["structured_data"]
+    st.session_state[SessionStateKeys.BIBLIOGRAPHIC_CROSSCHECK] = record.get("bibliographic_crosscheck", [])
+    st.session_state[SessionStateKeys.TEXT_EXTRACTION_METRICS] = record.get("text_extraction_metrics")
+    st.session_state[SessionStateKeys.MAP_REDUCE_METRICS] = record.get("map_reduce_metrics")
+    st.session_state[SessionStateKeys.PROMPT_CACHE_USAGE] = record.get("prompt_cache_usage")
+    st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] = True
+    return True
+
+def run_multi_upload_pipeline(uploaded_files: List[Any]) -> PipelineReport:
+    """
+    여러 업로드 파일을 파싱/LLM 파이프라인으로 분석합니다. 다음 파일을 파싱하는 동안 앞 파일의 LLM 호출이 진행되며,
+    LLM 호출은 AppConfig.MULTI_UPLOAD_LLM_CONCURRENCY개까지 동시에 실행됩니다. 파일별 진행 표는 결과가 나오는 대로 갱신됩니다.
+    """
+    progress_table = st.empty()
+    progress_caption = st.empty()
+
+    def _on_update(items):
+        progress_table.dataframe(status_rows(items), use_container_width=True, hide_index=True)
+        finished = sum(1 for item in items if item.status in (STATUS_DONE, STATUS_FAILED))
+        progress_caption.caption(f"{finished}/{len(items)} 처리")
+
+    report = run_pipelined_analysis(
+        [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files],
+        with_session_quota(with_prompt_cache(llm)),
+        AppConfig.GEMINI_MODEL_NAME,
+        get_result_store(),
+        on_update=_on_update
+    )
+    progress_table.empty()
+    progress_caption.empty()
+    return report
+
+def render_multi_upload_section(uploaded_files: List[Any]):
+    """여러 파일 업로드: 일괄 분석 버튼, 파일별 진행/결과 표, 순차 처리 대비 경과 시간, 결과를 볼 파일 선택"""
+    file_ids = tuple(uploaded_file.file_id for uploaded_file in uploaded_files)
+    if st.button(f"{len(uploaded_files)}개 파일 분석 시작", key="multi_analyze_button", disabled=llm is None):
+        reset_analysis_state()
+        st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] = False
+        st.session_state[SessionStateKeys.MULTI_UPLOAD_REPORT] = (file_ids, run_multi_upload_pipeline(uploaded_files))
+
+    saved = st.session_state[SessionStateKeys.MULTI_UPLOAD_REPORT]
+    if not saved or saved[0] != file_ids:
+        return
+    report = saved[1]
+    st.dataframe(status_rows(report.items), use_container_width=True, hide_index=True)
+    st.caption(
+        f"⏱️ 전체 {report.wall_seconds:.1f}s (순차 처리 시 단계 시간 합 {report.sequential_seconds:.1f}s, {report.speedup:.1f}배) · "
+        f"LLM 동시 호출 {AppConfig.MULTI_UPLOAD_LLM_CONCURRENCY}"
+    )
+    completed = [(index, item) for index, item in enumerate(report.items) if item.status == STATUS_DONE]
+    if not completed:
+        return
+    selected_index = st.selectbox(
+        "결과를 볼 파일",
+        [index for index, _ in completed],
+        format_func=lambda index: report.items[index].file_name,
+        key="multi_upload_result_select"
+    )
+    selected = report.items[selected_index]
+    if st.session_state[SessionStateKeys.DOCUMENT_ID] != selected.document_id or not st.session_state[SessionStateKeys.ANALYSIS_COMPLETE]:
+        if not load_stored_result(selected.document_id, uploaded_files[selected_index].getvalue()):
+            st.warning(f"'{selected.file_name}'의 저장된 결과를 찾을 수 없습니다.")
+
+def get_render_memo(name: str, builder: Callable[[], Any]) -> Any:
+    """
+    결과 렌더링에 쓰이는 파생 값(직렬화된 JSON, 표 데이터 등)을 현재 분석 결과 기준으로 메모이즈합니다.
+    새 분석 결과가 저장되어 RESULTS_VERSION이 바뀌면 자동으로 다시 계산됩니다.
+    """
+    memo = st.session_state.setdefault(SessionStateKeys.RENDER_MEMO, {})
+    version = st.session_state[SessionStateKeys.RESULTS_VERSION]
+    if memo.get("__version__") != version:
+        memo.clear()
+        memo["__version__"] = version
+    if name not in memo:
+        memo[name] = builder()
+    return memo[name]
+
+@functools.lru_cache(maxsize=1)
+def get_schema_field_options() -> Tuple[Dict[str, str], List[str]]:
+    """Tab 3 항목 선택용 (레이블 -> 경로) 매핑과 정렬된 레이블 목록. 스키마 설명은 고정이므로 프로세스당 한 번만 계산합니다."""
+    field_options = {
+        f"{path.split('.')[-1].replace('_', ' ').title()} (Path: {path})": path
+        for path in SCHEMA_FIELD_DESCRIPTIONS.keys()
+    }
+    return field_options, sorted(field_options.keys())
+
+def record_render_timing(name: str, elapsed_ms: float):
+    """영역별 지연 기록(ms)을 세션 상태에 최근 N회까지 남깁니다."""
+    timings = st.session_state.setdefault(SessionStateKeys.RENDER_TIMINGS, {})
+    history = timings.setdefault(name, deque(maxlen=AppConfig.RENDER_TIMING_HISTORY))
+    history.append(elapsed_ms)
+
+@contextmanager
+def measure_render(name: str):
+    """블록 실행 시간을 측정하여 세션 상태에 최근 기록으로 남깁니다 (상호작용별 재실행 지연 측정용)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_render_timing(name, (time.perf_counter() - started) * 1000)
+
+def render_timing_caption(name: str):
+    """해당 영역의 마지막 렌더링 시간을 캡션으로 표시합니다."""
+    history = st.session_state.get(SessionStateKeys.RENDER_TIMINGS, {}).get(name)
+    if history:
+        st.caption(f"⏱️ 이 영역 재실행 {history[-1]:.0f} ms (최근 {len(history)}회 평균 {sum(history) / len(history):.0f} ms)")
+
+def render_timing_sidebar():
+    """사이드바에 영역별(전체 스크립트/각 프래그먼트) 재실행 지연 기록과 페이지 이미지 디스크 캐시 적중률을 표시합니다."""
+    timings = st.session_state.get(SessionStateKeys.RENDER_TIMINGS, {})
+    if not timings:
+        return
+    with st.sidebar.expander("⏱️ 재실행 지연 측정", expanded=False):
+        st.dataframe([
+            {
+                "영역": name,
+                "횟수": len(history),
+                "마지막(ms)": round(history[-1], 1),
+                "평균(ms)": round(sum(history) / len(history), 1),
+                "최대(ms)": round(max(history), 1),
+            }
+            for name, history in timings.items()
+        ], use_container_width=True)
+        st.caption("프래그먼트 재실행은 해당 탭만 다시 그리며, 전체 스크립트 기록에는 포함되지 않습니다.")
+        cache_stats = get_render_cache().stats()
+        if cache_stats["hits"] or cache_stats["misses"]:
+            st.caption(
+                f"🗂️ 페이지 이미지 디스크 캐시: 적중률 {cache_stats['hit_rate']:.0%} (적중 {cache_stats['hits']:,} / 미스 {cache_stats['misses']:,}, "
+                f"메모리 캐시 미스 기준), {cache_stats['files']:,}개 파일 {cache_stats['bytes'] / (1024 * 1024):,.1f} / "
+                f"{cache_stats['max_bytes'] / (1024 * 1024):,.0f} MB, 삭제 {cache_stats['evictions']:,}"
+            )
+
+def jump_to_pdf_page(page_num: int):
+    """썸네일 클릭 콜백: 뷰어 페이지와 페이지 번호 입력 위젯 값을 함께 바꿉니다."""
+    st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW] = page_num
+    st.session_state["pdf_page_selector_input"] = page_num + 1
+
+def render_page_thumbnail_strip(pdf_source: Union[bytes, str], total_pages: int):
+    """현재 페이지 주변의 저해상도 썸네일 줄. 썸네일은 첫 화면용 미리보기와 같은 캐시 항목을 씁니다."""
+    document_id = st.session_state[SessionStateKeys.DOCUMENT_ID]
+    current_page = st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW]
+    window = thumbnail_window(current_page, total_pages)
+    if len(window) < 2:
+        return
+    for column, page_num in zip(st.columns(len(window)), window):
+        with column:
+            thumbnail = render_pdf_page_as_image(document_id, pdf_source, page_num, AppConfig.PDF_VIEWER_PREVIEW_DPI)
+            if thumbnail:
+                st.image(thumbnail, use_container_width=True)
+            st.button(
+                f"▶ {page_num + 1}" if page_num == current_page else str(page_num + 1),
+                key=f"pdf_thumbnail_{page_num}",
+                on_click=jump_to_pdf_page,
+                args=(page_num,),
+                use_container_width=True,
+                disabled=page_num == current_page
+            )
+
+def render_progressive_page(pdf_source: Union[bytes, str], page_num: int, total_pages: int):
+    """
+    저해상도 미리보기를 먼저 그리고 같은 자리를 고해상도 이미지로 교체합니다. 이미 고해상도로 본 페이지는 바로 그립니다.
+    첫 화면 표시(tab1_first_paint)와 고해상도 표시(tab1_full_resolution)까지의 시간을 재실행 지연 기록에 남깁니다.
+    """
+    document_id = st.session_state[SessionStateKeys.DOCUMENT_ID]
+    full_res_pages = st.session_state[SessionStateKeys.VIEWER_FULL_RES_PAGES]
+    caption = f"페이지 {page_num + 1}/{total_pages}"
+    placeholder = st.empty()
+    started = time.perf_counter()
+    first_paint_ms = None
+    if (document_id, page_num) not in full_res_pages:
+        preview_image = render_pdf_page_as_image(document_id, pdf_source, page_num, AppConfig.PDF_VIEWER_PREVIEW_DPI)
+        if preview_image:
+            placeholder.image(preview_image, caption=f"{caption} (미리보기)", use_container_width=True)
+            first_paint_ms = (time.perf_counter() - started) * 1000
+    page_image = render_pdf_page_as_image(document_id, pdf_source, page_num)
+    if not page_image:
+        placeholder.warning(f"페이지 {page_num + 1} 이미지를 렌더링할 수 없습니다.")
+        return
+    placeholder.image(page_image, caption=caption, use_container_width=True)
+    full_resolution_ms = (time.perf_counter() - started) * 1000
+    full_res_pages.add((document_id, page_num))
+
+    record_render_timing("tab1_first_paint", first_paint_ms if first_paint_ms is not None else full_resolution_ms)
+    record_render_timing("tab1_full_resolution", full_resolution_ms)
+    st.caption(
+        (f"🖼️ 미리보기({AppConfig.PDF_VIEWER_PREVIEW_DPI} DPI) 표시 {first_paint_ms:.0f} ms, " if first_paint_ms is not None else "🖼️ ")
+        + f"고해상도({AppConfig.DEFAULT_DPI_PDF_PREVIEW} DPI) 표시 {full_resolution_ms:.0f} ms"
+    )
+
+def prefetch_next_pages(pdf_source: Union[bytes, str], page_num: int, total_pages: int):
+    """현재 페이지를 모두 그린 뒤 다음 페이지를 고해상도로 미리 렌더링하여 캐시에 넣어 둡니다 (다음 이동 시 미리보기 생략)."""
+    document_id = st.session_state[SessionStateKeys.DOCUMENT_ID]
+    full_res_pages = st.session_state[SessionStateKeys.VIEWER_FULL_RES_PAGES]
+    for next_page in range(page_num + 1, min(page_num + 1 + AppConfig.PDF_VIEWER_PREFETCH_PAGES, total_pages)):
+        if (document_id, next_page) not in full_res_pages and render_pdf_page_as_image(document_id, pdf_source, next_page):
+            full_res_pages.add((document_id, next_page))
+
+@st.fragment
+def render_pdf_viewer_tab():
+    """Tab 1: PDF 페이지 뷰어. 페이지 번호를 바꾸면 이 프래그먼트만 다시 실행됩니다."""
+    with measure_render("tab1_pdf_viewer"):
+        st.subheader("PDF 원문 보기")
+        if st.session_state[SessionStateKeys.PDF_PAGE_TEXTS]:
+            total_pages = len(st.session_state[SessionStateKeys.PDF_PAGE_TEXTS])
+            page_selection = st.number_input(
+                f"페이지 번호 (1-{total_pages})",
+                min_value=1,
+                max_value=total_pages,
+                value=st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW] + 1,
+                key="pdf_page_selector_input"
+            )
+            st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW] = page_selection - 1
+
+            pdf_source = st.session_state[SessionStateKeys.PDF_BYTES_FOR_VIEWER] or st.session_state[SessionStateKeys.PDF_PATH_FOR_VIEWER]
+            if pdf_source:
+                render_progressive_page(pdf_source, st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW], total_pages)
+                render_page_thumbnail_strip(pdf_source, total_pages)
+                prefetch_next_pages(pdf_source, st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW], total_pages)
+            elif st.session_state[SessionStateKeys.BUNDLE_PATH]:
+                # 원본 PDF를 넣지 않은(크기 상한 초과) 번들: 번들의 썸네일로만 표시
+                page_num = st.session_state[SessionStateKeys.CURRENT_PAGE_PDF_VIEW]
+                thumbnail = get_render_cache().get(st.session_state[SessionStateKeys.DOCUMENT_ID], page_num, AppConfig.PDF_VIEWER_PREVIEW_DPI)
+                if thumbnail:
+                    st.image(thumbnail, caption=f"페이지 {page_num + 1}/{total_pages} (번들 썸네일, 원본 PDF 미포함)", use_container_width=True)
+                else:
+                    st.warning("이 번들에는 원본 PDF와 이 페이지의 썸네일이 없습니다.")
+            else:
+                st.warning("PDF 내용을 로드할 수 없습니다 (세션에 바이트 데이터 없음).")
+        else:
+            st.warning("표시할 PDF 페이지 정보가 없습니다 (텍스트 추출 실패 또는 파일 없음).")
+    render_timing_caption("tab1_pdf_viewer")
+
+@st.fragment
+def render_summary_tab():
+    """Tab 2: 분석 요약 및 전체 JSON. 다른 탭의 상호작용에는 다시 실행되지 않습니다."""
+    data = st.session_state[SessionStateKeys.STRUCTURED_DATA]
+    original_filename_base = os.path.splitext(st.session_state[SessionStateKeys.ORIGINAL_FILENAME])[0]
+    with measure_render("tab2_summary_json"):
+        st.subheader("특허 기본 정보 (추출 결과 기반)")
+        if "patent_info" in data and isinstance(data["patent_info"], dict):
+            for key, val in data["patent_info"].items():
+                display_patent_info_item(key, val)
+        elif st.session_state[SessionStateKeys.RULE_BASED_PATENT_INFO]:
+            # LLM 추출이 실패해도 첫 페이지 규칙 기반 서지 정보는 표시
+            st.caption("첫 페이지 INID 코드에서 규칙 기반으로 추출한 값입니다.")
+            for key, val in st.session_state[SessionStateKeys.RULE_BASED_PATENT_INFO].items():
+                display_patent_info_item(key, val)
+        elif "error" not in data :
+            st.markdown("_특허 기본 정보를 찾을 수 없습니다._")
+
+        crosscheck = st.session_state[SessionStateKeys.BIBLIOGRAPHIC_CROSSCHECK]
+        if crosscheck:
+            mismatch_count = sum(1 for item in crosscheck if item["status"] == "mismatch")
+            with st.expander(f"서지 정보 교차 검증 (규칙 기반 vs LLM, 불일치 {mismatch_count}건)", expanded=mismatch_count > 0):
+                st.dataframe(get_render_memo("crosscheck_rows", lambda: [
+                    {
+                        "항목": item["field"],
+                        "상태": (
+                            ("불일치 (LLM 채택, 확인 필요)" if item.get("adopted") == "llm" else "불일치 (규칙 기반 채택)")
+                            if item["status"] == "mismatch" else {"match": "일치", "rule_only": "규칙 기반만", "llm_only": "LLM만"}[item["status"]]
+                        ),
+                        "규칙 기반 값": json.dumps(item["rule_based_value"], ensure_ascii=False),
+                        "LLM 값": json.dumps(item["llm_value"], ensure_ascii=False),
+                    }
+                    for item in crosscheck
+                ]), use_container_width=True)
+
+        cascade_metrics = st.session_state[SessionStateKeys.EXTRACTION_METRICS]
+        if cascade_metrics:
+            display_cascade_metrics(cascade_metrics)
+        map_reduce_metrics = st.session_state[SessionStateKeys.MAP_REDUCE_METRICS]
+        if map_reduce_metrics:
+            display_map_reduce_metrics(map_reduce_metrics)
+        cache_usage = st.session_state[SessionStateKeys.PROMPT_CACHE_USAGE]
+        if cache_usage:
+            display_prompt_cache_usage(cache_usage)
+        text_metrics = st.session_state[SessionStateKeys.TEXT_EXTRACTION_METRICS]
+        if text_metrics:
+            display_text_extraction_metrics(text_metrics)
+
+        st.subheader("문서 전체 요약 (LLM 생성)")
+        summary_val = data.get("document_summary_for_user")
+        if summary_val and isinstance(summary_val, str) and summary_val != "요약 정보가 생성되지 않았습니다.":
+            display_details_section("요약 보기", summary_val, expanded=True)
+        elif "error" not in data :
+            st.warning("문서 요약 정보를 찾을 수 없거나 생성되지 않았습니다.")
+
+        st.subheader("추출된 전체 JSON 데이터")
+        st.json(data, expanded=False)
+
+        try:
+            # 다운로드용 JSON 문자열은 결과가 바뀔 때만 다시 직렬화
+            json_string = get_render_memo("json_download_string", lambda: json.dumps(data, ensure_ascii=False, indent=4))
+            st.download_button(
+                label="JSON 파일 다운로드",
+                data=json_string,
+                file_name=f"{original_filename_base}_structured_data.json",
+                mime="application/json",
+                key="json_download_button"
+            )
+        except Exception as e_json_dl:
+            st.error(f"JSON 다운로드 준비 중 오류: {e_json_dl}")
+
+        if "error" in data:
+            st.error(f"데이터 추출/표시 중 문제 발생: {data.get('error')}")
+            display_error_artifacts(data, "tab2")
+    render_timing_caption("tab2_summary_json")
+
+@st.fragment
+def render_field_explorer_tab():
+    """Tab 3: 항목별 상세 설명. 항목 선택을 바꾸면 이 프래그먼트만 다시 실행됩니다."""
+    data = st.session_state[SessionStateKeys.STRUCTURED_DATA]
+    with measure_render("tab3_field_explorer"):
+        st.subheader("주요 항목별 상세 설명 및 추출 값")
+        if "error" in data:
+            st.error(f"데이터 추출 중 오류가 발생하여 항목별 상세 정보를 표시할 수 없습니다: {data.get('error')}")
+            display_error_artifacts(data, "tab3")
+
+        elif not SCHEMA_FIELD_DESCRIPTIONS:
+             st.warning("스키마 설명 정보(`schema_descriptions.py`)가 비어있거나 로드되지 않았습니다.")
+        else:
+            field_options, sorted_display_labels = get_schema_field_options()
+
+            if not sorted_display_labels:
+                st.warning("표시할 스키마 설명 정보가 없습니다. `schema_descriptions.py` 파일 내용을 확인해주세요.")
+            else:
+                selected_display_label = st.selectbox(
+                    "상세 설명을 보고 싶은 항목을 선택하세요:",
+                    options=sorted_display_labels,
+                    key="field_selector_tab3"
+                )
+
+                if selected_display_label and selected_display_label in field_options:
+                    selected_path = field_options[selected_display_label]
+                    description = SCHEMA_FIELD_DESCRIPTIONS.get(selected_path, "해당 항목에 대한 설명이 없습니다.")
+                    path_index = st.session_state[SessionStateKeys.FIELD_PATH_INDEX]
+                    extracted_value = path_index.get(selected_path) if path_index is not None else get_value_by_path(data, selected_path)
+
+                    st.markdown(f"#### 📜 항목 경로: `{selected_path}`")
+                    st.markdown("**항목 설명 (고정):**")
+                    st.info(description)
+                    st.markdown("**추출된 값:**")
+                    display_extracted_value_for_schema_item(extracted_value)
+                else:
+                    st.warning("설명을 표시할 항목을 목록에서 선택해주세요.")
+    render_timing_caption("tab3_field_explorer")
+
+@contextmanager
+def profile_if_enabled(name: str, pdf_filename: Optional[str] = None):
+    """
+    사이드바의 프로파일링 토글이 켜져 있으면 블록을 cProfile + tracemalloc으로 감싸고,
+    보고서를 <DEBUG_OUTPUT_BASE_DIR>/<PDF 이름>/profiles/에 저장한 뒤 요약을 세션 상태에 남깁니다 (st.stop/st.rerun으로 끝나도 기록).
+    """
+    enabled = st.session_state.get(SessionStateKeys.PROFILING_ENABLED, False)
+    pdf_base_filename = os.path.splitext(pdf_filename or st.session_state.get(SessionStateKeys.ORIGINAL_FILENAME) or "no_file")[0]
+    output_dir = os.path.join(AppConfig.DEBUG_OUTPUT_BASE_DIR, pdf_base_filename, "profiles")
+    summary: Dict[str, Any] = {}
+    try:
+        with profile_block(name, output_dir, enabled) as summary:
+            yield
+    finally:
+        if summary:
+            st.session_state.setdefault(SessionStateKeys.PROFILE_SUMMARIES, {})[name] = summary
+
+def render_prompt_cache_sidebar():
+    """사이드바에 프로세스 전역 스키마 프롬프트 캐시 현황(핸들, TTL, 누적 절감/저장 비용, 최근 이벤트)을 표시합니다."""
+    manager = get_prompt_cache_manager(GOOGLE_API_KEY) if AppConfig.USE_PROMPT_CACHE else None
+    if manager is None:
+        return
+    snapshot = manager.snapshot()
+    totals = snapshot["totals"]
+    with st.sidebar.expander(f"💾 프롬프트 캐시 ({snapshot['backend']}, 핸들 {len(snapshot['handles'])}개)", expanded=False):
+        col1, col2 = st.columns(2)
+        col1.metric("캐시 적중 요청", f"{totals['cached_requests']:,} / {totals['requests']:,}")
+        col2.metric("순 절감", f"${totals['net_saved_usd']:.4f}", delta=f"저장 비용 ${totals['storage_usd']:.4f}", delta_color="off")
+        if snapshot["handles"]:
+            st.dataframe([
+                {"모델": handle["model_name"], "버전": handle["version"], "토큰": handle["prefix_tokens"],
+                 "요청": handle["requests"], "남은 TTL(분)": round(handle["ttl_remaining_seconds"] / 60, 1)}
+                for handle in snapshot["handles"]
+            ], use_container_width=True, hide_index=True)
+        st.caption(f"생성 {totals['created']} · 연장 {totals['extended']} · 삭제 {totals['deleted']} · 실패 {totals['failures']}")
+        for event in snapshot["events"][-5:]:
+            st.caption(f"{time.strftime('%H:%M:%S', time.localtime(event['time']))} {event['event']}: {event['detail']}")
+
+def render_profiling_sidebar():
+    """사이드바에 프로파일링 토글과, 영역별 마지막 프로파일 요약(분류별 시간, 상위 함수, 상위 메모리 할당)을 표시합니다."""
+    st.sidebar.checkbox(
+        "🔬 프로파일링 (cProfile + tracemalloc)",
+        key=SessionStateKeys.PROFILING_ENABLED,
+        help=f"분석 실행과 결과 탭 렌더링의 함수별 시간과 메모리 할당을 기록하여 `{AppConfig.DEBUG_OUTPUT_BASE_DIR}/`에 저장합니다. "
+             f"환경 변수 `{AppConfig.PROFILING_ENV_VAR}=1`이면 기본으로 켜집니다. 켜져 있는 동안은 실행이 느려집니다."
+    )
+    summaries = st.session_state.get(SessionStateKeys.PROFILE_SUMMARIES, {})
+    if not st.session_state[SessionStateKeys.PROFILING_ENABLED] or not summaries:
+        return
+    with st.sidebar.expander("🔬 프로파일 결과", expanded=False):
+        for name, summary in summaries.items():
+            peak_text = f"tracemalloc 최대 {summary['peak_mb']:.1f} MB" if summary["peak_mb"] is not None else "메모리 미기록 (다른 세션이 기록 중)"
+            st.markdown(f"**{name}**: {summary['wall_seconds']:.2f}s, {peak_text}")
+            st.dataframe([
+                {"분류": row["category"], "자체 시간(s)": round(row["self_seconds"], 3)}
+                for row in summary["categories"][:8]
+            ], use_container_width=True)
+            st.dataframe([
+                {"함수": row["function"], "호출": row["calls"], "누적(s)": round(row["cumulative_seconds"], 3), "자체(s)": round(row["self_seconds"], 3)}
+                for row in summary["hot_functions"][:10]
+            ], use_container_width=True)
+            if summary["top_allocations"]:
+                st.dataframe([
+                    {"할당 위치": row["location"], "증가(KB)": round(row["size_kb"], 1), "블록 수": row["count"]}
+                    for row in summary["top_allocations"][:10]
+                ], use_container_width=True)
+            st.caption("저장된 보고서: " + ", ".join(f"`{path}`" for path in summary["files"]))
+        st.caption("cProfile은 스크립트 스레드만 기록하므로, 작업 스레드의 LLM 호출은 스레드 대기 시간으로 나타납니다. 프래그먼트만 재실행될 때는 기록되지 않습니다.")
+
+@st.fragment
+def render_similar_patents_panel():
+    """결과 탭 옆 패널: 저장된 분석 결과 중 현재 문서와 비슷한 특허 (페이지 텍스트 + 주요 추출 필드의 TF-IDF 코사인 유사도)."""
+    with measure_render("similar_patents_panel"):
+        st.subheader("🔗 유사 특허")
+        index = get_similarity_index()
+        try:
+            with st.spinner("유사 특허 인덱스 갱신 중..."):
+                sync_index_file(index, get_result_store(), os.path.join(AppConfig.RESULT_STORE_DIR, AppConfig.SIMILAR_INDEX_FILENAME))
+        except Exception as e_index:
+            st.caption(f"유사 특허 인덱스 갱신 중 오류: {e_index}")
+        terms = get_render_memo("similar_patent_terms", lambda: document_terms(
+            st.session_state[SessionStateKeys.PDF_PAGE_TEXTS], st.session_state[SessionStateKeys.STRUCTURED_DATA]
+        ))
+        started = time.perf_counter()
+        results = index.query(terms, AppConfig.SIMILAR_PATENTS_TOP_K, exclude_ids=[st.session_state[SessionStateKeys.DOCUMENT_ID]])
+        query_ms = (time.perf_counter() - started) * 1000
+        if not results:
+            st.caption("비슷한 분석 결과가 없습니다.")
+        for rank, result in enumerate(results, start=1):
+            st.markdown(f"**{rank}. {result['title'] or result['source_file_name'] or result['document_id'][:12]}**")
+            details = [value for value in (result["publication_number"], result["material_system_type"], result["source_file_name"]) if value]
+            if details:
+                st.caption(" · ".join(details))
+            st.progress(min(result["score"], 1.0), text=f"유사도 {result['score']:.2f}")
+            st.caption("공통 핵심어: " + ", ".join(display_term(term) for term in result["shared_terms"]))
+        st.caption(f"저장된 분석 결과 {len(index):,}건에서 검색 {query_ms:.1f} ms")
+    render_timing_caption("similar_patents_panel")
+
+def display_results_tabs():
+    """분석 결과를 여러 탭에 나누어 표시합니다. 각 탭은 독립적으로 재실행되는 프래그먼트이며, 오른쪽에 유사 특허 패널을 둡니다."""
+    st.markdown("---")
+    st.header("📊 분석 결과")
+
+    results_column = st.container()
+    if AppConfig.USE_SIMILAR_PATENTS:
+        results_column, similar_column = st.columns([4, 1])
+        with similar_column:
+            render_similar_patents_panel()
+
+    with results_column:
+        tab1, tab2, tab3 = st.tabs(["📄 PDF 원문 보기 (이미지 기반)", "💡 분석 요약 및 JSON", "🔬 항목별 상세 설명"])
+        with tab1:
+            render_pdf_viewer_tab()
+        with tab2:
+            render_summary_tab()
+        with tab3:
+            render_field_explorer_tab()
+
+# --- 메인 앱 실행 로직 ---
+def main():
+    st.set_page_config(page_title="특허 문서 분석 프로토타입", layout="wide")
+    st.title("📜 특허 문서 분석 프로토타입 v3.4")
+    st.markdown("PDF 특허 문서를 업로드하면 주요 정보를 분석하여 구조화된 JSON 데이터로 제공하고, 각 항목에 대한 설명을 함께 보여줍니다.")
+
+    initialize_session_state()
+    pending_bundle_path = st.session_state.pop(SessionStateKeys.PENDING_BUNDLE_PATH, None)
+    if pending_bundle_path:
+        load_analysis_bundle(pending_bundle_path)
+    render_timing_sidebar()
+    # 프래그먼트 재실행은 main()을 거치지 않으므로 이 기록은 전체 스크립트 재실행만 집계
+    with measure_render("full_script_run"):
+        st.sidebar.checkbox(
+            "모델 캐스케이드 (섹션별 모델 라우팅)",
+            key=SessionStateKeys.USE_MODEL_CASCADE,
+            help="간단한 섹션은 저가 모델로 추출하고, 검증 실패/저신뢰 섹션만 고성능 모델로 다시 추출합니다."
+        )
+        render_schema_backfill_sidebar()
+        render_prompt_cache_sidebar()
+
+        uploaded_files = st.file_uploader("특허 PDF 파일을 업로드하세요 (.pdf, 여러 개 선택 가능)", type="pdf", key="pdf_uploader", accept_multiple_files=True)
+        uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
+
+        if len(uploaded_files) > 1:
+            render_multi_upload_section(uploaded_files)
+        elif uploaded_file is not None:
+            large_pdf_options = None
+            if st.checkbox("대용량 PDF 모드 (디스크 스트리밍 + 페이지 범위)", value=is_large_upload(uploaded_file.size), key="large_pdf_mode",
+                           help=f"{AppConfig.LARGE_PDF_THRESHOLD_MB} MB 이상의 파일은 기본으로 켜집니다. 업로드를 디스크에 저장하고 선택한 페이지만 한 장씩 추출합니다."):
+                large_pdf_options = render_large_pdf_options(uploaded_file)
+            analysis_mode = st.radio(
+                "분석 모드", ["전체 분석", "빠른 분석 (요약 + 청구항)"], key="analysis_mode", horizontal=True,
+                help="빠른 분석은 요약과 청구항만 보내 서지 정보, 소재 설명, 요약을 수 초 안에 추출합니다. 결과 화면에서 전체 추출로 이어서 실행할 수 있습니다."
+            )
+            if st.button("특허 분석 시작", key="analyze_button", disabled=st.session_state["large_pdf_mode"] and large_pdf_options is None):
+                reset_analysis_state()
+                with profile_if_enabled("run_analysis_pipeline", uploaded_file.name):
+                    run_analysis_pipeline(uploaded_file, large_pdf_options, quick_mode=analysis_mode != "전체 분석")
+
+        if st.session_state[SessionStateKeys.ANALYSIS_COMPLETE] and st.session_state[SessionStateKeys.STRUCTURED_DATA]:
+            if st.session_state[SessionStateKeys.QUICK_ANALYSIS]:
+                display_quick_analysis_panel()
+            with profile_if_enabled("display_results_tabs"):
+                display_results_tabs()
+        elif not uploaded_files:
+            st.info("페이지 상단의 파일 업로더를 사용하여 분석할 특허 PDF 파일을 업로드해주세요.")
+    # 이번 실행에서 기록한 프로파일까지 보이도록 본문 다음에 그림
+    render_profiling_sidebar()
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
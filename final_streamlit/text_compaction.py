@@ -0,0 +1,184 @@
+# text_compaction.py
+# LLM 프롬프트에 넣기 전 페이지 텍스트를 압축하는 단계
+# 여러 페이지에 반복되는 머리말/꼬리말(공보 번호, 페이지 번호 등)을 제거하고 레이아웃 공백을 줄이며,
+# 긴 페이지 구분자를 짧은 표식으로 바꾸되 압축된 텍스트의 위치 -> 원래 페이지 번호 매핑(page map)을 유지합니다.
+import bisect
+import random
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from app_config import AppConfig
+from llm_utils import build_full_text_from_pages, estimate_tokens
+
+# 페이지 위/아래에서 머리말/꼬리말 후보로 볼 비어 있지 않은 줄 수
+EDGE_LINE_COUNT = 4
+# 이 비율 이상의 페이지(최소 COMPACTION_MIN_PAGES 페이지)에서 반복되는 가장자리 줄을 머리말/꼬리말로 간주
+REPEATED_LINE_MIN_PAGE_RATIO = 0.5
+COMPACTION_MIN_PAGES = 3
+
+_DIGITS_RE = re.compile(r"\d+")
+_SPACES_RE = re.compile(r"[  ]{2,}")
+_PAGE_NUMBER_LINE_RE = re.compile(
+    r"^\s*(?:page|페이지|p\.)?\s*[-–—]?\s*\d{1,4}\s*(?:(?:/|of)\s*\d{1,4})?\s*[-–—]?\s*$", re.IGNORECASE
+)
+_TABLE_START, _TABLE_END = "[TABLE ", "[/TABLE]"
+
+
+def page_marker(page_number: int) -> str:
+    """압축 텍스트에서 페이지 시작을 나타내는 짧은 표식"""
+    return f"[[p{page_number}]]"
+
+def _line_signature(line: str) -> str:
+    """페이지 번호 등 숫자 차이를 무시하고 비교하기 위한 줄 서명 ("EP 3 968 410 A1 5" -> "ep # # # a#")"""
+    return _DIGITS_RE.sub("#", " ".join(line.split())).lower()
+
+def _edge_line_indices(lines: List[str]) -> List[int]:
+    non_empty = [idx for idx, line in enumerate(lines) if line.strip()]
+    return sorted(set(non_empty[:EDGE_LINE_COUNT] + non_empty[-EDGE_LINE_COUNT:]))
+
+def find_repeated_edge_lines(page_lines: List[List[str]]) -> set:
+    """여러 페이지의 가장자리에 반복되는 줄 서명 집합을 찾습니다."""
+    if len(page_lines) < COMPACTION_MIN_PAGES:
+        return set()
+    counts: Counter = Counter()
+    for lines in page_lines:
+        counts.update({_line_signature(lines[idx]) for idx in _edge_line_indices(lines)})
+    threshold = max(COMPACTION_MIN_PAGES, REPEATED_LINE_MIN_PAGE_RATIO * len(page_lines))
+    return {signature for signature, count in counts.items() if count >= threshold and signature.strip("# ")}
+
+def _compact_page(lines: List[str], repeated: set) -> Tuple[str, int]:
+    """한 페이지를 압축하여 (압축 텍스트, 제거한 줄 수)를 반환합니다. 표 블록 안의 줄은 건드리지 않습니다."""
+    edge_indices = set(_edge_line_indices(lines))
+    output: List[str] = []
+    removed = 0
+    in_table = False
+    for idx, line in enumerate(lines):
+        if line.startswith(_TABLE_START):
+            in_table = True
+        if not in_table and idx in edge_indices and (
+            _PAGE_NUMBER_LINE_RE.match(line) or _line_signature(line) in repeated
+        ):
+            removed += 1
+            continue
+        if line.startswith(_TABLE_END):
+            in_table = False
+        compacted = _SPACES_RE.sub(" ", line).strip("  ")
+        if compacted or (output and output[-1]):
+            output.append(compacted) # 연속된 빈 줄은 하나로
+    while output and not output[-1]:
+        output.pop()
+    return "\n".join(output), removed
+
+def compact_page_texts(
+    page_texts: List[str],
+    page_numbers: Optional[List[int]] = None
+) -> Tuple[str, List[Dict[str, int]], Dict[str, Any]]:
+    """
+    페이지별 텍스트를 압축하여 프롬프트용 전체 텍스트로 연결합니다. page_numbers(1부터 시작)를 주면 해당 페이지만 포함합니다.
+    반환: (압축된 전체 텍스트, page map, 통계)
+    page map은 [{'page': n, 'start': 시작 오프셋, 'end': 끝 오프셋}, ...]이며 page_for_offset()으로 위치를 페이지로 되돌립니다.
+    통계에는 기존 형식(build_full_text_from_pages) 대비 문자/토큰 절감과 처리 시간이 담깁니다.
+    """
+    started = time.perf_counter()
+    if page_numbers is None:
+        page_numbers = list(range(1, len(page_texts) + 1))
+    if not page_numbers:
+        return "", [], {"pages": 0, "repeated_line_patterns": 0, "removed_lines": 0, "original_chars": 0, "compacted_chars": 0,
+                        "chars_saved": 0, "original_tokens_estimate": 0, "compacted_tokens_estimate": 0,
+                        "tokens_saved_estimate": 0, "token_reduction_pct": 0.0, "seconds": 0.0}
+    page_lines = [page_texts[page_number - 1].splitlines() for page_number in page_numbers]
+    repeated = find_repeated_edge_lines(page_lines)
+
+    parts = [f"(Page markers: {page_marker(page_numbers[0])} ... {page_marker(page_numbers[-1])} mark the start of each page.)\n"]
+    offset = len(parts[0])
+    page_map: List[Dict[str, int]] = []
+    removed_lines = 0
+    for page_number, lines in zip(page_numbers, page_lines):
+        page_text, removed = _compact_page(lines, repeated)
+        removed_lines += removed
+        chunk = f"{page_marker(page_number)}\n{page_text}\n"
+        page_map.append({"page": page_number, "start": offset, "end": offset + len(chunk)})
+        parts.append(chunk)
+        offset += len(chunk)
+    compacted_text = "".join(parts)
+
+    original_text = build_full_text_from_pages(page_texts, page_numbers)
+    original_tokens, compacted_tokens = estimate_tokens(original_text), estimate_tokens(compacted_text)
+    stats = {
+        "pages": len(page_numbers),
+        "repeated_line_patterns": len(repeated),
+        "removed_lines": removed_lines,
+        "original_chars": len(original_text),
+        "compacted_chars": len(compacted_text),
+        "chars_saved": len(original_text) - len(compacted_text),
+        "original_tokens_estimate": original_tokens,
+        "compacted_tokens_estimate": compacted_tokens,
+        "tokens_saved_estimate": original_tokens - compacted_tokens,
+        "token_reduction_pct": (1 - compacted_tokens / original_tokens) * 100 if original_tokens else 0.0,
+        "seconds": time.perf_counter() - started,
+    }
+    return compacted_text, page_map, stats
+
+def build_prompt_text(
+    page_texts: List[str],
+    compact: Optional[bool] = None,
+    page_numbers: Optional[List[int]] = None
+) -> Tuple[str, List[Dict[str, int]], Optional[Dict[str, Any]]]:
+    """
+    LLM 프롬프트에 넣을 전체 텍스트를 만듭니다 (앱과 백필 공용).
+    compact가 None이면 AppConfig.USE_TEXT_COMPACTION을 따릅니다. 압축하지 않으면 기존 페이지 구분자 형식과 page map, 통계 None을 반환합니다.
+    page_numbers(1부터 시작)를 주면 선택한 페이지만 원래 페이지 번호로 포함합니다 (대용량 PDF 모드의 페이지 범위).
+    """
+    if compact is None:
+        compact = AppConfig.USE_TEXT_COMPACTION
+    if compact:
+        return compact_page_texts(page_texts, page_numbers)
+    full_text = build_full_text_from_pages(page_texts, page_numbers)
+    page_map = []
+    offset = 0
+    for page_number in (page_numbers if page_numbers is not None else range(1, len(page_texts) + 1)):
+        chunk_length = len(f"\n\n<<<<< PAGE {page_number} / {len(page_texts)} >>>>>\n\n") + len(page_texts[page_number - 1])
+        page_map.append({"page": page_number, "start": offset, "end": offset + chunk_length})
+        offset += chunk_length
+    return full_text, page_map, None
+
+def page_for_offset(page_map: List[Dict[str, int]], offset: int) -> Optional[int]:
+    """프롬프트 텍스트의 문자 위치가 속한 원래 페이지 번호를 반환합니다. 범위 밖이면 None."""
+    starts = [entry["start"] for entry in page_map]
+    idx = bisect.bisect_right(starts, offset) - 1
+    if 0 <= idx < len(page_map) and offset < page_map[idx]["end"]:
+        return page_map[idx]["page"]
+    return None
+
+def find_snippet_pages(prompt_text: str, page_map: List[Dict[str, int]], snippet: str) -> List[int]:
+    """인용 문구가 프롬프트 텍스트에 나타나는 원래 페이지 번호 목록을 반환합니다 (공백 차이는 무시)."""
+    pattern = r"\s+".join(re.escape(word) for word in snippet.split())
+    if not pattern:
+        return []
+    pages = {page_for_offset(page_map, match.start()) for match in re.finditer(pattern, prompt_text)}
+    return sorted(page for page in pages if page is not None)
+
+# --- 성능 측정 ---
+def make_benchmark_pages(n_pages: int = 1000, seed: int = 0) -> List[str]:
+    """머리말/꼬리말과 레이아웃 공백이 있는 공보 형태의 합성 페이지를 만듭니다."""
+    rng = random.Random(seed)
+    words = "the cathode material sodium layered oxide capacity particle example calcination electrolyte".split()
+    pages = []
+    for page_number in range(1, n_pages + 1):
+        body = [
+            f"[{page_number * 10 + line:04d}]    " + " ".join(rng.choice(words) for _ in range(rng.randint(8, 16))) + "     "
+            for line in range(rng.randint(25, 40))
+        ]
+        pages.append(
+            f"EP 3 968 410 A1                                                    {page_number}\n\n"
+            + "\n\n".join(body)
+            + f"\n\n\n                                   {page_number}\n"
+        )
+    return pages
+
+def benchmark_compaction(n_pages: int = 1000, seed: int = 0) -> Dict[str, Any]:
+    """합성 n_pages 페이지 입력에 대한 압축 통계(절감량과 처리 시간)를 반환합니다."""
+    _, _, stats = compact_page_texts(make_benchmark_pages(n_pages, seed))
+    return stats
@@ -0,0 +1,418 @@
+# unit_normalization.py
+# 추출된 물성/성능 문자열("120–135 mAh/g at 0.1C", "D50 3~5 μm" 등)을 값/범위/단위/조건으로 파싱하고
+# 필드별 기준 단위로 환산하여 NumPy 열(min, max, typical, unit, condition)로 만드는 정규화 단계
+import functools
+import random
+import re
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# 단위 기호 -> (기준 단위, 배율, 오프셋). 기준 값 = 원래 값 * 배율 + 오프셋
+# 대소문자를 구분합니다 (MΩ/mΩ, MPa/mPa, S(지멘스)/s(초)는 대소문자만 다름).
+# 기호는 _unit_key()로 정규화된 형태(공백 제거, μ -> u, 위첨자 -> 숫자)로 적습니다.
+UNIT_CONVERSIONS: Dict[str, Tuple[str, float, float]] = {
+    # 길이 (입자 크기 등) -> μm
+    "nm": ("um", 1e-3, 0.0),
+    "um": ("um", 1.0, 0.0),
+    "mm": ("um", 1e3, 0.0),
+    "cm": ("um", 1e4, 0.0),
+    "Å": ("um", 1e-4, 0.0),
+    # 비표면적 -> m2/g
+    "m2/g": ("m2/g", 1.0, 0.0),
+    "m^2/g": ("m2/g", 1.0, 0.0),
+    "cm2/g": ("m2/g", 1e-4, 0.0),
+    # 밀도 -> g/cm3
+    "g/cm3": ("g/cm3", 1.0, 0.0),
+    "g/cm^3": ("g/cm3", 1.0, 0.0),
+    "g/cc": ("g/cm3", 1.0, 0.0),
+    "g/mL": ("g/cm3", 1.0, 0.0),
+    "g/ml": ("g/cm3", 1.0, 0.0),
+    "kg/m3": ("g/cm3", 1e-3, 0.0),
+    # 비용량 -> mAh/g
+    "mAh/g": ("mAh/g", 1.0, 0.0),
+    "mAhg-1": ("mAh/g", 1.0, 0.0),
+    "mAh·g-1": ("mAh/g", 1.0, 0.0),
+    "Ah/kg": ("mAh/g", 1.0, 0.0),
+    "Ah/g": ("mAh/g", 1e3, 0.0),
+    # 에너지 밀도 -> Wh/kg
+    "Wh/kg": ("Wh/kg", 1.0, 0.0),
+    "Whkg-1": ("Wh/kg", 1.0, 0.0),
+    "mWh/g": ("Wh/kg", 1.0, 0.0),
+    # 전도도 -> S/cm
+    "S/cm": ("S/cm", 1.0, 0.0),
+    "Scm-1": ("S/cm", 1.0, 0.0),
+    "S·cm-1": ("S/cm", 1.0, 0.0),
+    "mS/cm": ("S/cm", 1e-3, 0.0),
+    "mScm-1": ("S/cm", 1e-3, 0.0),
+    "S/m": ("S/cm", 1e-2, 0.0),
+    # 전도도(컨덕턴스) -> S
+    "S": ("S", 1.0, 0.0),
+    "mS": ("S", 1e-3, 0.0),
+    "uS": ("S", 1e-6, 0.0),
+    # 비저항 -> ohm·cm
+    "Ω·cm": ("ohm·cm", 1.0, 0.0),
+    "Ωcm": ("ohm·cm", 1.0, 0.0),
+    "Ω-cm": ("ohm·cm", 1.0, 0.0),
+    "kΩ·cm": ("ohm·cm", 1e3, 0.0),
+    "kohm-cm": ("ohm·cm", 1e3, 0.0),
+    "MΩ·cm": ("ohm·cm", 1e6, 0.0),
+    # 저항 -> ohm
+    "Ω": ("ohm", 1.0, 0.0),
+    "kΩ": ("ohm", 1e3, 0.0),
+    "kohm": ("ohm", 1e3, 0.0),
+    "kOhm": ("ohm", 1e3, 0.0),
+    "mΩ": ("ohm", 1e-3, 0.0),
+    "mohm": ("ohm", 1e-3, 0.0),
+    "mOhm": ("ohm", 1e-3, 0.0),
+    "MΩ": ("ohm", 1e6, 0.0),
+    "Mohm": ("ohm", 1e6, 0.0),
+    "MOhm": ("ohm", 1e6, 0.0),
+    # 온도 -> °C (단독 "C"는 율속(0.1C 등)과 겹치므로 온도로 보지 않음)
+    "°C": ("°C", 1.0, 0.0),
+    "℃": ("°C", 1.0, 0.0),
+    "K": ("°C", 1.0, -273.15),
+    # 압력 -> MPa
+    "MPa": ("MPa", 1.0, 0.0),
+    "GPa": ("MPa", 1e3, 0.0),
+    "kPa": ("MPa", 1e-3, 0.0),
+    "mPa": ("MPa", 1e-9, 0.0),
+    "Pa": ("MPa", 1e-6, 0.0),
+    # 시간 -> h
+    "h": ("h", 1.0, 0.0),
+    "s": ("h", 1.0 / 3600.0, 0.0),
+    # 전압 -> V
+    "V": ("V", 1.0, 0.0),
+    "mV": ("V", 1e-3, 0.0),
+    # 전류 밀도 / 율속
+    "mA/g": ("mA/g", 1.0, 0.0),
+    "A/g": ("mA/g", 1e3, 0.0),
+    "mA/cm2": ("mA/cm2", 1.0, 0.0),
+    # 비율 -> % (ppm은 별도 기준 단위로 유지)
+    "%": ("%", 1.0, 0.0),
+    "°C/min": ("°C/min", 1.0, 0.0),
+    "K/min": ("°C/min", 1.0, 0.0),
+    "°": ("deg", 1.0, 0.0),
+}
+# 대소문자를 구분하지 않는 단위 이름/표기 (소문자 키). 접두어 기호와 대소문자로 구분되는 SI 기호는 넣지 않습니다.
+CASE_FREE_UNIT_CONVERSIONS: Dict[str, Tuple[str, float, float]] = {
+    "micron": ("um", 1.0, 0.0),
+    "microns": ("um", 1.0, 0.0),
+    "micrometer": ("um", 1.0, 0.0),
+    "angstrom": ("um", 1e-4, 0.0),
+    "mah/g": ("mAh/g", 1.0, 0.0),
+    "mahg-1": ("mAh/g", 1.0, 0.0),
+    "wh/kg": ("Wh/kg", 1.0, 0.0),
+    "ohm-cm": ("ohm·cm", 1.0, 0.0),
+    "ohmcm": ("ohm·cm", 1.0, 0.0),
+    "ohm·cm": ("ohm·cm", 1.0, 0.0),
+    "ohm": ("ohm", 1.0, 0.0),
+    "ohms": ("ohm", 1.0, 0.0),
+    "degc": ("°C", 1.0, 0.0),
+    "°c": ("°C", 1.0, 0.0),
+    "°c/min": ("°C/min", 1.0, 0.0),
+    "bar": ("MPa", 0.1, 0.0),
+    "atm": ("MPa", 0.101325, 0.0),
+    "hr": ("h", 1.0, 0.0),
+    "hrs": ("h", 1.0, 0.0),
+    "hour": ("h", 1.0, 0.0),
+    "hours": ("h", 1.0, 0.0),
+    "min": ("h", 1.0 / 60.0, 0.0),
+    "mins": ("h", 1.0 / 60.0, 0.0),
+    "minutes": ("h", 1.0 / 60.0, 0.0),
+    "sec": ("h", 1.0 / 3600.0, 0.0),
+    "wt%": ("wt%", 1.0, 0.0),
+    "wt.%": ("wt%", 1.0, 0.0),
+    "at%": ("at%", 1.0, 0.0),
+    "mol%": ("mol%", 1.0, 0.0),
+    "ppm": ("ppm", 1.0, 0.0),
+    "rpm": ("rpm", 1.0, 0.0),
+    "deg": ("deg", 1.0, 0.0),
+    "cycles": ("cycles", 1.0, 0.0),
+}
+
+# 숫자 토큰: 1,234.5 / 1.2 x 10^-4 / 1.5e-3 / 1.2×10-4
+_NUMBER_PATTERN = (
+    r"(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?"
+    r"(?:\s*[x×*]\s*10\s*\^?\s*\(?[-−–]?\s*\d+\)?|[eE][-+]?\d+)?"
+)
+# 라벨 안의 숫자("D50", "Td2")는 값으로 보지 않도록 영문자/숫자 바로 뒤의 숫자는 제외
+_NUMBER_RE = re.compile(r"(?<![A-Za-z\d.])" + _NUMBER_PATTERN)
+_RANGE_TAIL_RE = re.compile(
+    r"^\s*(?:(?P<unit>[^\s\d~〜–—-][^\s\d~〜–—]*)\s*)?(?:to|~|〜|–|—|-|and)\s*(?P<sign>[-−]\s*)?(?P<number>" + _NUMBER_PATTERN + ")",
+    re.IGNORECASE,
+)
+_SPACED_UNIT_TOKEN_RE = re.compile(r"^\s*(?P<unit>[^\s,;()\[\]0-9][^\s,;()\[\]]*\s+[^\s,;()\[\]0-9][^\s,;()\[\]]*?(?:-1|−1|⁻¹))(?![^\s,;()\[\]])")
+_UNIT_TOKEN_RE = re.compile(r"^\s*(?P<unit>[^\s,;()\[\]0-9][^\s,;()\[\]]*(?:\s*/\s*[^\s,;()\[\]]+)?)")
+_COMPARATOR_RE = re.compile(
+    r"(?P<cmp><=|>=|≤|≥|=<|=>|<|>|less than|more than|greater than|lower than|higher than|below|above|"
+    r"at least|at most|up to|not more than|not less than|approx\.?|approximately|about|around|ca\.|~)\s*$",
+    re.IGNORECASE,
+)
+# 값/단위 뒤에 오는 한계 표현 ("10 nm or less", "80 % 이상")
+_POSTFIX_COMPARATOR_RE = re.compile(
+    r"^\s*(?P<cmp>or (?:less|lower|below|fewer|smaller)|or (?:more|higher|above|greater|larger)|이하|미만|이상|초과)(?![A-Za-z])",
+    re.IGNORECASE,
+)
+_POSTFIX_UPPER_BOUND_WORDS = {"or less", "or lower", "or below", "or fewer", "or smaller", "이하", "미만"}
+_UPPER_BOUND_WORDS = {"<", "<=", "≤", "=<", "less than", "lower than", "below", "at most", "up to", "not more than"}
+_LOWER_BOUND_WORDS = {">", ">=", "≥", "=>", "more than", "greater than", "higher than", "above", "at least", "not less than"}
+_CONDITION_STRIP = " \t\r\n,;:=()[]"
+
+
+class ParsedQuantity(NamedTuple):
+    """파싱된 값 한 건 (원래 단위 기준). low/high/typical이 없으면 NaN입니다."""
+    low: float
+    high: float
+    typical: float
+    unit: str          # 기준 단위 (UNIT_CONVERSIONS에 없는 단위는 원문 그대로)
+    factor: float      # 기준 단위로 환산하는 배율
+    offset: float      # 기준 단위로 환산하는 오프셋 (온도 K -> °C 등)
+    qualifier: str     # 'eq', 'range', 'lt', 'gt', 'approx', 'none'
+    condition: str     # 값/단위 외의 나머지 텍스트 (측정 조건, 라벨 등)
+
+_EMPTY_QUANTITY = ParsedQuantity(np.nan, np.nan, np.nan, "", 1.0, 0.0, "none", "")
+
+def _unit_key(unit_text: str) -> str:
+    """단위 문자열을 조회용 키로 정규화합니다 (대소문자는 유지)."""
+    key = unit_text.strip().rstrip(".")
+    key = key.replace("μ", "u").replace("µ", "u").replace("²", "2").replace("³", "3").replace("⁻¹", "-1").replace("−", "-")
+    key = key.replace("\u2126", "\u03a9") # 옴 기호(Ω) -> 그리스 문자 오메가(Ω)
+    return re.sub(r"\s+", "", key)
+
+def lookup_unit(unit_text: str) -> Optional[Tuple[str, float, float]]:
+    """
+    단위 문자열의 (기준 단위, 배율, 오프셋)을 반환합니다. 모르는 단위면 None.
+    기호는 대소문자를 구분하여 찾고, 없으면 대소문자 구분이 없는 단위 이름/표기에서 소문자로 찾습니다.
+    """
+    if not unit_text:
+        return None
+    key = _unit_key(unit_text)
+    return UNIT_CONVERSIONS.get(key) or CASE_FREE_UNIT_CONVERSIONS.get(key.lower())
+
+def _parse_number(number_text: str) -> float:
+    text = number_text.replace(",", "").replace("−", "-").replace("–", "-").replace(" ", "")
+    mantissa_exponent = re.match(r"^([\d.]+)[x×*]10\^?\(?(-?\d+)\)?$", text)
+    if mantissa_exponent:
+        return float(mantissa_exponent.group(1)) * 10.0 ** int(mantissa_exponent.group(2))
+    return float(text)
+
+def _join_condition(*parts: str) -> str:
+    cleaned = [re.sub(r"\s+", " ", part).strip(_CONDITION_STRIP) for part in parts]
+    return "; ".join(part for part in cleaned if part)
+
+@functools.lru_cache(maxsize=200_000)
+def parse_quantity(text: str, unit_hint: str = "") -> ParsedQuantity:
+    """
+    값 문자열 하나를 파싱합니다. 같은 (문자열, 단위 힌트)는 캐시된 결과를 재사용합니다.
+    unit_hint는 스키마의 별도 'unit' 필드 값으로, 문자열 안에 알려진 단위가 없을 때 사용됩니다.
+    예: parse_quantity("120–135 mAh/g at 0.1C") -> low=120, high=135, typical=127.5, unit='mAh/g', condition='at 0.1C'
+    """
+    if not text or not text.strip():
+        return _EMPTY_QUANTITY
+    match = _NUMBER_RE.search(text)
+    if not match:
+        return _EMPTY_QUANTITY._replace(condition=_join_condition(text))
+
+    prefix = text[:match.start()]
+    first_value = _parse_number(match.group(0))
+    # 숫자 앞의 음수 부호 ("-20 °C"). 범위 구분자와 구분하기 위해 앞 글자가 숫자가 아닐 때만 인정
+    if prefix.rstrip().endswith(("-", "−")) and not re.search(r"[\d.]\s*[-−]\s*$", prefix):
+        first_value = -first_value
+        prefix = prefix.rstrip()[:-1]
+
+    qualifier = "eq"
+    comparator = _COMPARATOR_RE.search(prefix)
+    if comparator:
+        word = comparator.group("cmp").lower()
+        prefix = prefix[:comparator.start()]
+        qualifier = "lt" if word in _UPPER_BOUND_WORDS else "gt" if word in _LOWER_BOUND_WORDS else "approx"
+
+    rest = text[match.end():]
+    unit_text = ""
+    first_unit_text = "" # "50 nm to 2 um"처럼 범위 양쪽 단위가 다른 경우의 앞쪽 단위
+    second_value = None
+    range_tail = _RANGE_TAIL_RE.match(rest)
+    if range_tail and qualifier in ("eq", "approx"):
+        second_value = _parse_number(range_tail.group("number"))
+        if range_tail.group("sign"):
+            second_value = -second_value
+        unit_text = first_unit_text = range_tail.group("unit") or ""
+        rest = rest[range_tail.end():]
+        qualifier = "range"
+
+    # 값 뒤의 단위 토큰 (범위 뒤의 단위가 앞의 단위보다 우선). 공백으로 나뉜 단위("S cm-1", "mAh g-1")를 먼저 확인
+    unit_token = _SPACED_UNIT_TOKEN_RE.match(rest)
+    if not (unit_token and lookup_unit(unit_token.group("unit"))):
+        unit_token = _UNIT_TOKEN_RE.match(rest)
+    if unit_token and lookup_unit(unit_token.group("unit")):
+        unit_text = unit_token.group("unit")
+        rest = rest[unit_token.end():]
+    postfix = _POSTFIX_COMPARATOR_RE.match(rest) if qualifier == "eq" else None
+    if postfix:
+        word = re.sub(r"\s+", " ", postfix.group("cmp").lower())
+        qualifier = "lt" if word in _POSTFIX_UPPER_BOUND_WORDS else "gt"
+        rest = rest[postfix.end():]
+
+    conversion = lookup_unit(unit_text) or lookup_unit(unit_hint)
+    if conversion:
+        unit, factor, offset = conversion
+    else:
+        unit, factor, offset = (unit_text or unit_hint).strip(), 1.0, 0.0
+    first_conversion = lookup_unit(first_unit_text)
+    if conversion and first_conversion and first_conversion != conversion and first_conversion[0] == unit:
+        # 앞쪽 값을 뒤쪽 단위로 맞춤 (기준 단위로 올렸다가 뒤쪽 단위로 내림)
+        first_value = (first_value * first_conversion[1] + first_conversion[2] - offset) / factor
+
+    if qualifier == "range":
+        low, high = sorted((first_value, second_value))
+        typical = (low + high) / 2.0
+    elif qualifier == "lt":
+        low, high, typical = np.nan, first_value, np.nan
+    elif qualifier == "gt":
+        low, high, typical = first_value, np.nan, np.nan
+    else:
+        low = high = typical = first_value
+    return ParsedQuantity(low, high, typical, unit, factor, offset, qualifier, _join_condition(prefix, rest))
+
+def normalize_quantities(texts: Sequence[str], unit_hints: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    값 문자열 목록을 기준 단위로 환산된 NumPy 열로 변환합니다.
+    반환: {'min', 'max', 'typical' (float64), 'unit', 'qualifier', 'condition' (str)} — 모두 입력과 같은 길이
+    고유한 (문자열, 단위 힌트) 조합만 파싱하고, 환산은 배열 연산으로 한 번에 처리합니다.
+    """
+    hints = unit_hints if unit_hints is not None else [""] * len(texts)
+    unique_index: Dict[Tuple[str, str], int] = {}
+    inverse = np.empty(len(texts), dtype=np.int64)
+    parsed: List[ParsedQuantity] = []
+    for row, key in enumerate(zip(texts, hints)):
+        idx = unique_index.get(key)
+        if idx is None:
+            idx = unique_index[key] = len(parsed)
+            parsed.append(parse_quantity(str(key[0] or ""), str(key[1] or "")))
+        inverse[row] = idx
+
+    if parsed:
+        raw = np.array([(q.low, q.high, q.typical, q.factor, q.offset) for q in parsed], dtype=np.float64)
+    else:
+        raw = np.empty((0, 5), dtype=np.float64)
+    # (고유 값 수 x 3) 배열을 한 번에 환산한 뒤 행 인덱스로 펼침 (NaN은 NaN으로 유지)
+    converted = raw[:, :3] * raw[:, 3:4] + raw[:, 4:5]
+    units = np.array([q.unit for q in parsed] or [""], dtype=str)
+    qualifiers = np.array([q.qualifier for q in parsed] or [""], dtype=str)
+    conditions = np.array([q.condition for q in parsed] or [""], dtype=str)
+    return {
+        "min": converted[inverse, 0],
+        "max": converted[inverse, 1],
+        "typical": converted[inverse, 2],
+        "unit": units[inverse],
+        "qualifier": qualifiers[inverse],
+        "condition": conditions[inverse],
+    }
+
+def iter_property_entries(structured_data: Dict[str, Any]) -> Iterable[Dict[str, str]]:
+    """
+    구조화 데이터에서 수치 비교 대상 필드를 (필드, 항목명, 값 문자열, 단위 힌트, 조건) 단위로 펼칩니다.
+    대상: size_metrics, specific_surface_area_BET_m2_g, density_g_cm3, physical_chemical_properties_specific,
+    representative_performance_data_from_examples_or_figures
+    """
+    morphology = structured_data.get("morphology_structure") or {}
+    if not isinstance(morphology, dict):
+        morphology = {}
+
+    for item in morphology.get("size_metrics") or []:
+        if isinstance(item, dict):
+            yield {"field": "morphology_structure.size_metrics", "name": str(item.get("metric_type") or ""),
+                   "value": str(item.get("value_range") or ""), "unit_hint": str(item.get("unit") or ""), "condition": ""}
+    bet = morphology.get("specific_surface_area_BET_m2_g")
+    if isinstance(bet, dict) and bet.get("value_range"):
+        yield {"field": "morphology_structure.specific_surface_area_BET_m2_g", "name": "BET specific surface area",
+               "value": str(bet["value_range"]), "unit_hint": "m2/g", "condition": ""}
+    for item in morphology.get("density_g_cm3") or []:
+        if isinstance(item, dict):
+            yield {"field": "morphology_structure.density_g_cm3", "name": str(item.get("type") or "density"),
+                   "value": str(item.get("value_range") or ""), "unit_hint": "g/cm3", "condition": str(item.get("conditions") or "")}
+    for item in structured_data.get("physical_chemical_properties_specific") or []:
+        if isinstance(item, dict):
+            yield {"field": "physical_chemical_properties_specific", "name": str(item.get("property_name") or ""),
+                   "value": str(item.get("value_or_range") or ""), "unit_hint": str(item.get("unit") or ""),
+                   "condition": str(item.get("conditions_of_measurement") or "")}
+    for item in structured_data.get("representative_performance_data_from_examples_or_figures") or []:
+        if isinstance(item, dict):
+            yield {"field": "representative_performance_data_from_examples_or_figures", "name": str(item.get("metric_name") or ""),
+                   "value": str(item.get("value") if item.get("value") is not None else ""), "unit_hint": str(item.get("unit") or ""),
+                   "condition": str(item.get("conditions_or_context") or "")}
+
+def build_normalized_table(records: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    저장소 레코드들의 수치 필드를 하나의 열 지향 표(NumPy 배열 딕셔너리)로 정규화합니다.
+    열: document_id, field, name, value_text, min, max, typical, unit, qualifier, condition
+    condition은 스키마의 조건 필드와 값 문자열에서 분리된 조건을 합친 것입니다.
+    """
+    document_ids: List[str] = []
+    entries: List[Dict[str, str]] = []
+    for record in records:
+        for entry in iter_property_entries(record.get("structured_data") or {}):
+            if entry["value"].strip():
+                document_ids.append(str(record.get("document_id", "")))
+                entries.append(entry)
+
+    columns = normalize_quantities([e["value"] for e in entries], [e["unit_hint"] for e in entries])
+    columns["condition"] = np.array(
+        [_join_condition(e["condition"], parsed) for e, parsed in zip(entries, columns["condition"])] or [], dtype=str
+    )
+    columns.update(
+        document_id=np.array(document_ids, dtype=str),
+        field=np.array([e["field"] for e in entries], dtype=str),
+        name=np.array([e["name"] for e in entries], dtype=str),
+        value_text=np.array([e["value"] for e in entries], dtype=str),
+    )
+    return columns
+
+# --- 성능 측정 ---
+_BENCHMARK_TEMPLATES = [
+    ("{a}–{b} mAh/g at {c}C", ""),
+    ("D50 {a}~{b} μm", ""),
+    ("{a} to {b}", "nm"),
+    ("<{a} ppm", ""),
+    ("approx. {a} g/cm3", ""),
+    ("{m} x 10^-{e}", "S/cm"),
+    ("{a}% after {n} cycles", ""),
+    ("> {a} °C", ""),
+    ("{a}-{b} m2/g", ""),
+    ("Td = {a}", "°C"),
+]
+
+def make_benchmark_inputs(n_records: int, distinct_ratio: float = 0.2, seed: int = 0) -> Tuple[List[str], List[str]]:
+    """실제 추출 결과와 비슷한 형태의 값 문자열을 n_records개 생성합니다. distinct_ratio로 고유 문자열 비율을 조절합니다."""
+    rng = random.Random(seed)
+    n_distinct = max(1, int(n_records * distinct_ratio))
+    distinct = []
+    for _ in range(n_distinct):
+        template, hint = rng.choice(_BENCHMARK_TEMPLATES)
+        a = round(rng.uniform(0.1, 500), 1)
+        distinct.append((template.format(a=a, b=round(a + rng.uniform(0.1, 100), 1), c=rng.choice([0.1, 0.5, 1, 2]),
+                                         m=round(rng.uniform(1, 9.9), 1), e=rng.randint(2, 6), n=rng.choice([50, 100, 500])), hint))
+    picks = [rng.choice(distinct) for _ in range(n_records)]
+    return [text for text, _ in picks], [hint for _, hint in picks]
+
+def benchmark_normalization(n_records: int = 100_000, distinct_ratio: float = 0.2, seed: int = 0) -> Dict[str, float]:
+    """파서 캐시를 비운 상태(cold)와 채운 상태(warm)에서 n_records건 정규화 시간을 측정합니다."""
+    texts, hints = make_benchmark_inputs(n_records, distinct_ratio, seed)
+    parse_quantity.cache_clear()
+    started = time.perf_counter()
+    columns = normalize_quantities(texts, hints)
+    cold_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    normalize_quantities(texts, hints)
+    warm_seconds = time.perf_counter() - started
+    return {
+        "records": float(n_records),
+        "distinct_strings": float(parse_quantity.cache_info().currsize),
+        "cold_seconds": cold_seconds,
+        "warm_seconds": warm_seconds,
+        "records_per_second_cold": n_records / cold_seconds if cold_seconds else float("inf"),
+        "parsed_ratio": float(np.mean(~np.isnan(columns["min"]) | ~np.isnan(columns["max"]))) if n_records else 0.0,
+    }
@@ -0,0 +1,185 @@
+# upload_pipeline.py
+# 여러 PDF를 파싱/LLM 호출 두 단계 파이프라인으로 분석합니다.
+# 호출한 스레드(Streamlit 스크립트 스레드)가 다음 문서를 파싱하는 동안 앞 문서의 LLM 호출이 작업 스레드에서 진행되며,
+# LLM 호출은 llm_concurrency개까지만 동시에 실행합니다. 작업 스레드는 Streamlit을 호출하지 않으므로,
+# 진행 상황 콜백(on_update)은 항상 호출한 스레드에서 실행되어 st 요소를 바로 갱신할 수 있습니다.
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from app_config import AppConfig
+from batch_runner import PreparedDocument, extract_prepared_document, prepare_document
+from result_store import ResultStore, compute_document_id
+
+# 파이프라인 단계별 상태 표시 문자열
+STATUS_WAITING = "대기"
+STATUS_PARSED = "LLM 대기"
+STATUS_LLM = "LLM 호출 중"
+STATUS_DONE = "완료"
+STATUS_FAILED = "실패"
+
+
+@dataclass
+class UploadItemStatus:
+    """파일별 진행 상황 (진행 표의 한 행)"""
+    file_name: str
+    status: str = STATUS_WAITING
+    document_id: Optional[str] = None
+    parse_seconds: Optional[float] = None
+    llm_seconds: Optional[float] = None
+    cost_usd: Optional[float] = None
+    error: Optional[str] = None
+
+@dataclass
+class PipelineReport:
+    """전체 실행 결과: 파일별 상태와, 실제 경과 시간 대 단계 시간 합(순차 처리 시 걸렸을 시간)"""
+    items: List[UploadItemStatus]
+    wall_seconds: float
+    sequential_seconds: float
+
+    @property
+    def speedup(self) -> float:
+        return self.sequential_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+def status_rows(items: List[UploadItemStatus]) -> List[Dict[str, Any]]:
+    """진행 표(st.dataframe)용 행 목록"""
+    return [
+        {
+            "파일": item.file_name,
+            "상태": item.status,
+            "파싱(s)": round(item.parse_seconds, 2) if item.parse_seconds is not None else None,
+            "LLM(s)": round(item.llm_seconds, 2) if item.llm_seconds is not None else None,
+            "비용($)": round(item.cost_usd, 4) if item.cost_usd is not None else None,
+            "오류": item.error or "",
+        }
+        for item in items
+    ]
+
+def parse_pdf_bytes(pdf_bytes: bytes, file_name: str) -> PreparedDocument:
+    """업로드된 PDF 바이트를 LLM 호출 전 단계까지 처리합니다."""
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        return prepare_document(doc, compute_document_id(pdf_bytes), file_name)
+    finally:
+        doc.close()
+
+def _timed_extract(extract: Callable[[PreparedDocument], Dict[str, Any]], prepared: PreparedDocument) -> Tuple[Dict[str, Any], float]:
+    started = time.perf_counter()
+    result = extract(prepared)
+    return result, time.perf_counter() - started
+
+def run_pipelined_analysis(
+    files: List[Tuple[str, bytes]],
+    model: Any,
+    model_name: str,
+    store: ResultStore,
+    llm_concurrency: int = AppConfig.MULTI_UPLOAD_LLM_CONCURRENCY,
+    on_update: Optional[Callable[[List[UploadItemStatus]], None]] = None,
+    parse: Callable[[bytes, str], PreparedDocument] = parse_pdf_bytes,
+    extract: Optional[Callable[[PreparedDocument], Dict[str, Any]]] = None
+) -> PipelineReport:
+    """
+    files((파일명, PDF 바이트) 목록)를 업로드 순서대로 파싱하고, 파싱이 끝난 문서는 바로 LLM 작업 풀에 넣습니다.
+    파싱은 LLM 대기 + 호출 중 문서가 llm_concurrency + MULTI_UPLOAD_PARSE_AHEAD개 미만일 때만 진행하여,
+    파싱 결과가 메모리에 무한정 쌓이지 않게 합니다. 실패한 파일은 상태에 오류를 남기고 나머지는 계속 처리합니다.
+    extract(준비된 문서)는 LLM 단계이며, 기본값은 batch_runner.extract_prepared_document(model, model_name, store)입니다.
+    """
+    extract = extract or (lambda prepared: extract_prepared_document(prepared, model, model_name, store))
+    items = [UploadItemStatus(file_name=name) for name, _ in files]
+    started = time.perf_counter()
+    in_flight: Dict[Future, int] = {}
+
+    def _notify():
+        if on_update:
+            on_update(items)
+
+    def _collect(done_futures):
+        for future in done_futures:
+            item = items[in_flight.pop(future)]
+            try:
+                result, llm_seconds = future.result()
+            except Exception as e:
+                item.status, item.error = STATUS_FAILED, f"{type(e).__name__}: {e}"
+                continue
+            item.status, item.llm_seconds, item.cost_usd = STATUS_DONE, llm_seconds, result.get("cost_usd")
+            item.document_id = result.get("document_id", item.document_id)
+
+    max_ahead = max(1, llm_concurrency) + AppConfig.MULTI_UPLOAD_PARSE_AHEAD
+    with ThreadPoolExecutor(max_workers=max(1, llm_concurrency), thread_name_prefix="upload-llm") as executor:
+        next_index = 0
+        while next_index < len(files) or in_flight:
+            if next_index < len(files) and len(in_flight) < max_ahead:
+                name, pdf_bytes = files[next_index]
+                item = items[next_index]
+                parse_started = time.perf_counter()
+                try:
+                    prepared = parse(pdf_bytes, name)
+                except Exception as e:
+                    item.status, item.error = STATUS_FAILED, f"{type(e).__name__}: {e}"
+                else:
+                    item.status, item.document_id = STATUS_PARSED, prepared.document_id
+                    in_flight[executor.submit(_timed_extract, extract, prepared)] = next_index
+                item.parse_seconds = time.perf_counter() - parse_started
+                next_index += 1
+                _collect([future for future in in_flight if future.done()])
+            else:
+                done, _ = wait(list(in_flight), timeout=AppConfig.MULTI_UPLOAD_UPDATE_SECONDS, return_when=FIRST_COMPLETED)
+                _collect(done)
+            for future, index in in_flight.items():
+                if future.running() and items[index].status == STATUS_PARSED:
+                    items[index].status = STATUS_LLM
+            _notify()
+
+    return PipelineReport(
+        items=items,
+        wall_seconds=time.perf_counter() - started,
+        sequential_seconds=sum((item.parse_seconds or 0.0) + (item.llm_seconds or 0.0) for item in items),
+    )
+
+def make_benchmark_pdf_bytes(n_pages: int = 8, seed: int = 0) -> bytes:
+    """측정용 합성 특허 PDF (text_compaction.make_benchmark_pages의 본문을 페이지마다 기록)"""
+    from text_compaction import make_benchmark_pages
+    doc = fitz.open()
+    for page_text in make_benchmark_pages(n_pages, seed=seed):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 545, 790), page_text, fontsize=8)
+    try:
+        return doc.tobytes()
+    finally:
+        doc.close()
+
+def benchmark_pipelined_analysis(
+    n_files: int = 10,
+    llm_latency_seconds: float = 2.0,
+    llm_concurrency: int = AppConfig.MULTI_UPLOAD_LLM_CONCURRENCY,
+    store_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    가짜 LLM(호출마다 llm_latency_seconds 지연)으로 합성 PDF n_files개를 순차 처리(파싱 -> LLM을 한 건씩)와 파이프라인으로 각각 실행하여
+    실제 경과 시간을 비교합니다.
+    """
+    import tempfile
+    from fake_llm import FakeChatModel, requested_sections_responder
+
+    files = [(f"bench_{index:03d}.pdf", make_benchmark_pdf_bytes(seed=index)) for index in range(n_files)]
+    model = FakeChatModel(requested_sections_responder(), latency_seconds=llm_latency_seconds)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = ResultStore(store_dir or tmp_dir)
+        started = time.perf_counter()
+        for name, pdf_bytes in files:
+            extract_prepared_document(parse_pdf_bytes(pdf_bytes, name), model, "fake-model", store)
+        sequential_seconds = time.perf_counter() - started
+        report = run_pipelined_analysis(files, model, "fake-model", store, llm_concurrency=llm_concurrency)
+    return {
+        "files": n_files,
+        "llm_latency_seconds": llm_latency_seconds,
+        "llm_concurrency": llm_concurrency,
+        "sequential_seconds": sequential_seconds,
+        "pipelined_seconds": report.wall_seconds,
+        "speedup": sequential_seconds / report.wall_seconds if report.wall_seconds else 0.0,
+        "failed": sum(1 for item in report.items if item.status == STATUS_FAILED),
+        "items": [asdict(item) for item in report.items],
+    }
@@ -0,0 +1,308 @@
+# conftest.py
+# 성능 회귀 테스트 공용 설정: 경로, 합성 PDF/가짜 LLM 응답, 두 앱(streamlit_app.py, final_streamlit/streamlit_test2.py) 모듈 로드,
+# 단계별 시간/최대 메모리 측정과 기준값(perf_baselines.json) 비교.
+#
+# 실행:   pytest tests
+# 기준값 갱신: pytest tests --update-perf-baselines   (갱신한 perf_baselines.json을 함께 커밋)
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FINAL_APP_DIR = os.path.join(REPO_ROOT, "final_streamlit")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_baselines.json")
+sys.path.insert(0, FINAL_APP_DIR)
+
+# 기본 허용 범위: 측정값이 기준값 * (1 + 비율) + 여유분을 넘으면 회귀로 판정 (단계별로 perf_baselines.json에서 덮어쓸 수 있음)
+DEFAULT_TIME_TOLERANCE = 0.5
+DEFAULT_TIME_SLACK_MS = 2.0
+DEFAULT_MEMORY_TOLERANCE = 0.25
+DEFAULT_MEMORY_SLACK_MB = 1.0
+# 단계별 반복 측정 횟수 (첫 실행은 준비 단계로 제외, 기본은 중앙값 사용)
+DEFAULT_REPEATS = 5
+# 반복 측정값의 대표값 계산 방법. 실행마다 시간이 두 갈래로 갈리는 단계(GC, 스레드 스케줄링)는 "min"으로 잡음을 걷어냄
+MEASURE_STATISTICS = {"median": statistics.median, "min": min}
+
+# 두 앱에 같은 이름으로 있는 모듈 (루트 앱을 불러오는 동안만 루트 디렉토리 버전으로 바꿔 끼움)
+_SHARED_MODULE_NAMES = ("prompts", "schema_descriptions")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--update-perf-baselines", action="store_true", default=False,
+                     help="측정값으로 tests/perf_baselines.json을 다시 씁니다 (비교하지 않음).")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: 기준값과 비교하는 성능 회귀 테스트")
+
+
+# --- 측정 ---
+def _calibration_workload() -> None:
+    """기계 속도 보정용 고정 작업 (순수 Python: 정렬, 딕셔너리, JSON 직렬화)"""
+    rows = [{"id": index, "value": (index * 7919) % 10007, "name": f"item-{index}"} for index in range(20000)]
+    rows.sort(key=lambda row: row["value"])
+    json.loads(json.dumps(rows))
+
+def measure_seconds(fn: Callable[[], Any], repeats: int = DEFAULT_REPEATS, statistic: str = "median", loops: int = 1) -> float:
+    """
+    준비 실행 1회 뒤 repeats회 측정한 시간의 대표값 (초). statistic: 'median'(기본) 또는 'min'
+    loops: 측정 1회에 fn을 연달아 실행하는 횟수 (측정값은 loops회 합계)
+    """
+    fn()
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append(time.perf_counter() - started)
+    return MEASURE_STATISTICS[statistic](samples)
+
+def measure_peak_mb(fn: Callable[[], Any]) -> float:
+    """fn 1회 실행 동안 tracemalloc으로 본 Python 힙 최대 증가량 (MB). MuPDF 등 C 라이브러리 내부 할당은 포함되지 않습니다."""
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline_bytes, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    return max(0.0, (peak_bytes - baseline_bytes) / (1024 * 1024))
+
+
+class PerfGate:
+    """단계별 측정값을 기준값과 비교합니다. 갱신 모드에서는 측정값을 모아 세션 종료 시 기준값 파일에 씁니다."""
+
+    def __init__(self, update: bool):
+        self.update = update
+        self.baselines: Dict[str, Any] = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+                self.baselines = json.load(f)
+        self.results: List[Dict[str, Any]] = []
+        self._speed_factor: Optional[float] = None
+        self._calibration_seconds: Optional[float] = None
+
+    @property
+    def calibration_seconds(self) -> float:
+        if self._calibration_seconds is None:
+            self._calibration_seconds = measure_seconds(_calibration_workload)
+        return self._calibration_seconds
+
+    @property
+    def speed_factor(self) -> float:
+        """이 기계가 기준값을 기록한 기계보다 느린 배율 (1 미만이면 1: 빠른 기계에서 허용 범위를 좁히지 않음)"""
+        if self._speed_factor is None:
+            recorded = self.baselines.get("_meta", {}).get("calibration_seconds")
+            self._speed_factor = max(1.0, self.calibration_seconds / recorded) if recorded else 1.0
+        return self._speed_factor
+
+    def check(self, stage: str, fn: Callable[[], Any], repeats: int = DEFAULT_REPEATS, statistic: str = "median", loops: int = 1) -> None:
+        """
+        stage를 측정하고, 기준값 대비 시간 또는 최대 메모리가 허용 범위를 넘으면 비교 표와 함께 실패시킵니다.
+        기준값도 같은 repeats/statistic/loops로 기록되므로, 단계의 측정 방법을 바꾸면 그 단계의 기준값을 다시 기록해야 합니다.
+        loops: 1회 실행이 몇 ms밖에 안 되는 단계는 여러 번 묶어 재서, 고정 여유분(DEFAULT_TIME_SLACK_MS)이 기준값의 일부만 차지하게 함
+        """
+        measured = {"time_ms": measure_seconds(fn, repeats, statistic, loops) * 1000, "peak_mb": measure_peak_mb(fn)}
+        if self.update:
+            self.results.append({"stage": stage, "measured": measured, "rows": [], "failed": False})
+            return
+        baseline = self.baselines.get("stages", {}).get(stage)
+        if baseline is None:
+            pytest.fail(f"'{stage}' 단계의 기준값이 없습니다. `pytest tests --update-perf-baselines`로 기록한 뒤 perf_baselines.json을 커밋하세요.")
+        rows = [
+            self._compare_row("time_ms", baseline["time_ms"], measured["time_ms"],
+                              baseline.get("time_tolerance", DEFAULT_TIME_TOLERANCE), DEFAULT_TIME_SLACK_MS, self.speed_factor),
+            self._compare_row("peak_mb", baseline["peak_mb"], measured["peak_mb"],
+                              baseline.get("memory_tolerance", DEFAULT_MEMORY_TOLERANCE), DEFAULT_MEMORY_SLACK_MB, 1.0),
+        ]
+        failed = any(row["regressed"] for row in rows)
+        self.results.append({"stage": stage, "measured": measured, "rows": rows, "failed": failed})
+        if failed:
+            pytest.fail(f"성능 회귀: {stage}\n{format_comparison(rows)}\n"
+                        f"(기계 속도 보정 x{self.speed_factor:.2f}. 의도한 변경이면 `pytest tests --update-perf-baselines`로 기준값을 갱신하세요.)",
+                        pytrace=False)
+
+    @staticmethod
+    def _compare_row(metric: str, baseline: float, measured: float, tolerance: float, slack: float, scale: float) -> Dict[str, Any]:
+        limit = baseline * scale * (1 + tolerance) + slack
+        return {
+            "metric": metric,
+            "baseline": baseline,
+            "measured": measured,
+            "limit": limit,
+            "change": (measured - baseline) / baseline if baseline else 0.0,
+            "regressed": measured > limit,
+        }
+
+    def write_baselines(self) -> None:
+        stages = dict(self.baselines.get("stages", {}))
+        for result in self.results:
+            previous = stages.get(result["stage"], {})
+            # 단계별로 직접 지정한 허용 범위는 유지하고 측정값만 바꿈
+            stages[result["stage"]] = {**previous, **{key: round(value, 3) for key, value in result["measured"].items()}}
+        # 일부 단계만 다시 측정했으면(-k 등) 나머지 단계가 기록된 때의 보정값을 유지
+        previous_meta = self.baselines.get("_meta", {})
+        remeasured_all = set(self.baselines.get("stages", {})) <= {result["stage"] for result in self.results}
+        calibration_seconds = round(self.calibration_seconds, 5) if remeasured_all or not previous_meta else previous_meta["calibration_seconds"]
+        baselines = {
+            "_meta": {
+                "calibration_seconds": calibration_seconds,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "recorded_at": time.strftime("%Y-%m-%d"),
+            },
+            "stages": dict(sorted(stages.items())),
+        }
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+def _rjust_display(text: str, width: int) -> str:
+    """한글 등 전각 문자를 2칸으로 계산하여 오른쪽 정렬 (터미널 표 정렬용)"""
+    display_width = sum(2 if unicodedata.east_asian_width(char) in ("W", "F") else 1 for char in text)
+    return " " * max(0, width - display_width) + text
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    """기준값/측정값/허용 상한/변화율 비교 표"""
+    lines = ["  " + "지표" + " " * 6 + "".join(_rjust_display(title, width) for title, width in
+                                           (("기준값", 12), ("측정값", 12), ("허용 상한", 12), ("변화", 10)))]
+    for row in rows:
+        mark = "회귀" if row["regressed"] else "ok"
+        lines.append(f"  {row['metric']:<10}{row['baseline']:>12.2f}{row['measured']:>12.2f}{row['limit']:>12.2f}{row['change']:>+10.1%}  {mark}")
+    return "\n".join(lines)
+
+_PERF_GATE: Optional[PerfGate] = None
+
+@pytest.fixture(scope="session")
+def perf_gate(request) -> PerfGate:
+    global _PERF_GATE
+    _PERF_GATE = PerfGate(update=request.config.getoption("--update-perf-baselines"))
+    return _PERF_GATE
+
+def pytest_sessionfinish(session, exitstatus):
+    if _PERF_GATE is not None and _PERF_GATE.update and _PERF_GATE.results:
+        _PERF_GATE.write_baselines()
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if _PERF_GATE is None or not _PERF_GATE.results:
+        return
+    terminalreporter.section("성능 측정 결과")
+    if _PERF_GATE.update:
+        terminalreporter.write_line(f"기준값 갱신: {BASELINE_PATH} (보정 작업 {_PERF_GATE.calibration_seconds * 1000:.1f} ms)")
+    else:
+        terminalreporter.write_line(f"기계 속도 보정 x{_PERF_GATE.speed_factor:.2f}")
+    for result in _PERF_GATE.results:
+        status = "회귀" if result["failed"] else "ok"
+        changes = "  ".join(f"{row['metric']} {row['change']:+.0%}" for row in result["rows"])
+        terminalreporter.write_line(
+            f"{result['stage']:<40}{result['measured']['time_ms']:>10.2f} ms{result['measured']['peak_mb']:>9.2f} MB  {changes}  {status}"
+        )
+
+
+# --- 입력 데이터 / 앱 모듈 ---
+@pytest.fixture(scope="session", autouse=True)
+def isolated_working_dir(tmp_path_factory):
+    """앱이 상대 경로로 만드는 디렉토리(render_cache, debug_output, analysis_store)가 저장소 안에 생기지 않도록 임시 디렉토리에서 실행합니다."""
+    previous = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("perf_cwd"))
+    yield
+    os.chdir(previous)
+
+def make_table_pdf_bytes(n_pages: int = 8) -> bytes:
+    """괘선 표(성능 데이터)와 본문, 반복 머리말이 있는 합성 특허 PDF"""
+    import fitz  # PyMuPDF
+    doc = fitz.open()
+    header = ["Sample", "Discharge capacity (mAh/g)", "Coulombic efficiency (%)", "Composition"]
+    x = [72, 150, 300, 430, 540]
+    top, row_height = 130, 18
+    for page_index in range(n_pages):
+        page = doc.new_page()
+        page.insert_text((72, 60), f"EP 3 968 410 A1        Page {page_index + 1}", fontsize=9)
+        page.insert_text((72, 100), "Example results are summarized in Table 1 below.", fontsize=10)
+        rows = [header] + [[f"Example {i}", f"{110 + i * 3}", f"{90 + i * 0.5}", f"NaNi0.{i}MnO2"] for i in range(1, 9)]
+        for r, row in enumerate(rows):
+            for c, cell in enumerate(row):
+                page.insert_text((x[c] + 3, top + r * row_height + 13), cell, fontsize=8)
+        for r in range(len(rows) + 1):
+            page.draw_line((x[0], top + r * row_height), (x[-1], top + r * row_height))
+        for column_x in x:
+            page.draw_line((column_x, top), (column_x, top + len(rows) * row_height))
+        page.insert_text((72, top + len(rows) * row_height + 30), "As shown, the capacity increases with Ni content.", fontsize=10)
+    try:
+        return doc.tobytes()
+    finally:
+        doc.close()
+
+def make_fake_structured_data(n_items: int = 1000) -> Dict[str, Any]:
+    """LLM 응답으로 쓸 합성 구조화 데이터 (리스트 필드가 긴 큰 응답)"""
+    return {
+        "patent_info": {
+            "publication_number": "EP 3 968 410 A1",
+            "title": "Positive electrode active material for sodium-ion battery",
+            "applicants": ["Example Corp."],
+            "inventors": [f"Inventor {index}" for index in range(6)],
+            "priority_data": [{"number": f"KR 10-2020-00{index:05d}", "date": "2020-01-01", "country": "KR"} for index in range(4)],
+        },
+        "formula_parameters": [
+            {"parameter": f"x{index}", "range": f"0.{index % 9} <= x <= 0.{index % 9 + 1}", "elements_involved": ["Na", "Ni", "Mn"]}
+            for index in range(n_items // 4)
+        ],
+        "synthesis_steps": [{"step": index, "description": f"Heat at {600 + index} °C for {index % 12 + 1} h in air."} for index in range(n_items // 4)],
+        "representative_performance_data_from_examples_or_figures": [
+            {"metric_name": "Discharge capacity", "value": f"{110 + index % 40}", "unit": "mAh/g", "conditions": f"0.{index % 9 + 1}C, 25 °C"}
+            for index in range(n_items)
+        ],
+        "document_summary_for_user": "합성 요약 " * 40,
+        "language_of_document": "English",
+    }
+
+@pytest.fixture(scope="session")
+def table_pdf_bytes() -> bytes:
+    return make_table_pdf_bytes()
+
+@pytest.fixture(scope="session")
+def text_pdf_bytes() -> bytes:
+    from upload_pipeline import make_benchmark_pdf_bytes
+    return make_benchmark_pdf_bytes(n_pages=20)
+
+@pytest.fixture(scope="session")
+def fake_structured_data() -> Dict[str, Any]:
+    return make_fake_structured_data()
+
+@pytest.fixture(scope="session")
+def final_app():
+    """final_streamlit/streamlit_test2.py 모듈 (streamlit run 없이 불러오면 st 호출은 화면 없이 실행됨)"""
+    import streamlit_test2
+    return streamlit_test2
+
+@pytest.fixture(scope="session")
+def root_app():
+    """
+    루트 streamlit_app.py 모듈. 불러오는 동안만 prompts/schema_descriptions를 루트 디렉토리 버전으로 바꿔 끼우고,
+    디버그 파일 저장(SAVE_DEBUG_PDF_IMAGES)은 끕니다.
+    """
+    saved = {name: sys.modules.pop(name) for name in _SHARED_MODULE_NAMES if name in sys.modules}
+    sys.path.insert(0, REPO_ROOT)
+    try:
+        spec = importlib.util.spec_from_file_location("root_streamlit_app", os.path.join(REPO_ROOT, "streamlit_app.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(REPO_ROOT)
+        for name in _SHARED_MODULE_NAMES:
+            sys.modules.pop(name, None)
+        sys.modules.update(saved)
+    module.SAVE_DEBUG_PDF_IMAGES = False
+    return module
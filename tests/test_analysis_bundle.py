@@ -0,0 +1,114 @@
+# test_analysis_bundle.py
+# 분석 번들(analysis_bundle.py): 기록/읽기 왕복, 원본 PDF 포함 상한, 목록/지문, 가져오기 검증, 렌더링 캐시 채우기
+import io
+import json
+import zipfile
+
+import pytest
+
+from analysis_bundle import (
+    BUNDLE_FORMAT_VERSION, MANIFEST_MEMBER, AnalysisBundleStore, build_path_index, seed_render_cache,
+)
+from app_config import AppConfig
+from render_cache import RenderCache
+
+DOCUMENT_ID = "a" * 64
+STRUCTURED_DATA = {
+    "patent_info": {"publication_number": "EP 3 968 410 A1", "title_english_translation": "Sodium cathode", "applicants": ["CATL"]},
+    "representative_performance_data_from_examples_or_figures": [{"metric_name": "Discharge capacity", "value": "150"}],
+    "document_summary_for_user": None,
+}
+IMAGES = {(0, AppConfig.PDF_VIEWER_PREVIEW_DPI): b"thumbnail-jpeg", (0, AppConfig.DEFAULT_DPI_PDF_PREVIEW): b"full-jpeg"}
+
+
+def _write(store, **kwargs):
+    path_index = build_path_index(STRUCTURED_DATA, ["patent_info.publication_number", "document_summary_for_user",
+                                                    "representative_performance_data_from_examples_or_figures.0.value"])
+    arguments = dict(page_texts=["page 1", "page 2"], structured_data=STRUCTURED_DATA, path_index=path_index,
+                     session_fields={"analysis_mode": "full"}, images=IMAGES, source_pdf=b"%PDF-1.4 source", timings={"pipeline_seconds": 1.5})
+    arguments.update(kwargs)
+    return store.write(DOCUMENT_ID, "doc.pdf", **arguments)
+
+def _bundle_bytes(manifest, extra_members=()):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as bundle:
+        if manifest is not None:
+            bundle.writestr(MANIFEST_MEMBER, json.dumps(manifest))
+        for name in extra_members:
+            bundle.writestr(name, "{}")
+    return buffer.getvalue()
+
+
+def test_path_index_skips_missing_values():
+    index = build_path_index(STRUCTURED_DATA, ["patent_info.publication_number", "document_summary_for_user", "patent_info.missing",
+                                               "representative_performance_data_from_examples_or_figures.0.value",
+                                               "representative_performance_data_from_examples_or_figures.5.value"])
+    assert index == {"patent_info.publication_number": "EP 3 968 410 A1",
+                     "representative_performance_data_from_examples_or_figures.0.value": "150"}
+
+def test_write_read_round_trip(tmp_path):
+    store = AnalysisBundleStore(str(tmp_path))
+    manifest = _write(store)
+    assert manifest["label"]["publication_number"] == "EP 3 968 410 A1" and manifest["filled_paths"] == 2
+    bundle = store.read(store.path(DOCUMENT_ID))
+    assert bundle["page_texts"] == ["page 1", "page 2"]
+    assert bundle["structured_data"] == STRUCTURED_DATA
+    assert bundle["session_fields"] == {"analysis_mode": "full"}
+    assert bundle["images"] == IMAGES
+    assert bundle["source_pdf"] == b"%PDF-1.4 source"
+    assert bundle["manifest"]["timings"]["pipeline_seconds"] == 1.5 and "bundle_write_seconds" in bundle["manifest"]["timings"]
+    assert store.read(store.path(DOCUMENT_ID), include_source=False)["source_pdf"] is None
+
+def test_large_source_is_not_embedded(tmp_path, monkeypatch):
+    monkeypatch.setattr(AppConfig, "BUNDLE_EMBED_SOURCE_MAX_MB", 0)
+    store = AnalysisBundleStore(str(tmp_path))
+    manifest = _write(store)
+    assert manifest["source"]["embedded"] is False and manifest["source"]["size_bytes"] == len(b"%PDF-1.4 source")
+    assert store.read(store.path(DOCUMENT_ID))["source_pdf"] is None
+
+def test_list_manifests_and_fingerprint(tmp_path):
+    store = AnalysisBundleStore(str(tmp_path))
+    empty_fingerprint = store.fingerprint()
+    _write(store)
+    (tmp_path / "broken.zip").write_bytes(b"not a zip")
+    manifests = store.list_manifests()
+    assert [manifest["document_id"] for manifest in manifests] == [DOCUMENT_ID]
+    assert manifests[0]["path"] == store.path(DOCUMENT_ID) and manifests[0]["file_size_bytes"] > 0
+    assert store.fingerprint() != empty_fingerprint
+
+def test_import_round_trip(tmp_path):
+    source = AnalysisBundleStore(str(tmp_path / "source"))
+    _write(source)
+    with open(source.path(DOCUMENT_ID), "rb") as f:
+        data = f.read()
+    target = AnalysisBundleStore(str(tmp_path / "target"))
+    path = target.import_bytes(data)
+    assert path == target.path(DOCUMENT_ID)
+    assert target.read(path)["structured_data"] == STRUCTURED_DATA
+
+@pytest.mark.parametrize("data", [
+    b"not a zip file",
+    _bundle_bytes(None, extra_members=["page_texts.json"]),
+    _bundle_bytes({"format_version": BUNDLE_FORMAT_VERSION + 1, "document_id": DOCUMENT_ID}),
+    _bundle_bytes({"format_version": BUNDLE_FORMAT_VERSION, "document_id": "../../etc/passwd"}),
+    _bundle_bytes({"format_version": BUNDLE_FORMAT_VERSION}),
+    _bundle_bytes(["not", "a", "manifest"]),
+])
+def test_import_rejects_invalid_bundles(tmp_path, data):
+    store = AnalysisBundleStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.import_bytes(data)
+    assert store.list_manifests() == []
+
+def test_read_rejects_other_format_version(tmp_path):
+    path = tmp_path / "old.zip"
+    path.write_bytes(_bundle_bytes({"format_version": BUNDLE_FORMAT_VERSION + 1, "document_id": DOCUMENT_ID}))
+    with pytest.raises(ValueError):
+        AnalysisBundleStore(str(tmp_path)).read(str(path))
+
+def test_seed_render_cache_skips_existing_entries(tmp_path):
+    cache = RenderCache(str(tmp_path / "cache"))
+    cache.put(DOCUMENT_ID, 0, AppConfig.PDF_VIEWER_PREVIEW_DPI, b"already cached")
+    assert seed_render_cache(cache, DOCUMENT_ID, IMAGES) == 1
+    assert cache.get(DOCUMENT_ID, 0, AppConfig.DEFAULT_DPI_PDF_PREVIEW) == b"full-jpeg"
+    assert cache.get(DOCUMENT_ID, 0, AppConfig.PDF_VIEWER_PREVIEW_DPI) == b"already cached"
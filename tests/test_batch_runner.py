@@ -0,0 +1,35 @@
+# test_batch_runner.py
+# 재개 가능한 배치 실행(batch_runner.py): 저널에 완료된 항목은 건너뛰고, 실패 항목은 최대 시도 횟수까지 재시도
+from app_config import AppConfig
+from batch_runner import RunJournal, run_batch, summarize_run
+
+
+def _analyze(calls, failing=()):
+    def analyze(item, model, model_name, store):
+        calls.append(item)
+        if item in failing:
+            raise RuntimeError(f"cannot parse {item}")
+        return {"document_id": f"id-{item}", "source_file_name": item, "usage": {}, "cost_usd": 0.01}
+    return analyze
+
+def test_resume_skips_done_items_and_stops_after_max_attempts(tmp_path):
+    journal = RunJournal(str(tmp_path / "run.ndjson"))
+    journal.append({"event": "done", "item": "a.pdf", "document_id": "id-a.pdf", "cost_usd": 0.01, "ts": 1.0})
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"event": "done", "item": "c.p')  # 비정상 종료로 잘린 마지막 줄
+    items = ["a.pdf", "b.pdf", "c.pdf"]
+
+    calls = []
+    progress = run_batch(items, journal, None, "fake-model", None, sleep=lambda seconds: None,
+                         analyze=_analyze(calls, failing={"b.pdf"}))
+    assert calls == ["b.pdf", "c.pdf"] + ["b.pdf"] * (AppConfig.BATCH_MAX_ATTEMPTS - 1)
+    assert (progress.done, progress.failed, progress.exhausted, progress.remaining) == (2, 1, 1, 1)
+    assert summarize_run(journal, items) == progress
+
+    # 다시 실행해도 완료/포기한 항목은 호출하지 않고, retry_exhausted면 포기한 항목만 다시 시도
+    calls.clear()
+    run_batch(items, journal, None, "fake-model", None, sleep=lambda seconds: None, analyze=_analyze(calls))
+    assert calls == []
+    progress = run_batch(items, journal, None, "fake-model", None, sleep=lambda seconds: None,
+                         analyze=_analyze(calls), retry_exhausted=True)
+    assert calls == ["b.pdf"] and progress.done == 3 and progress.remaining == 0
@@ -0,0 +1,91 @@
+# test_bibliographic_parser.py
+# 첫 페이지 INID 코드 파서(bibliographic_parser.py)의 EP/US/KR 레이아웃별 추출 결과와 LLM 값 병합 규칙
+from bibliographic_parser import merge_with_llm_patent_info, parse_front_page
+
+EP_FRONT_PAGE = """(19) Europäisches Patentamt
+(11) EP 3 968 410 A1
+(12) EUROPEAN PATENT APPLICATION
+(43) Date of publication:
+16.03.2022 Bulletin 2022/11
+(21) Application number: 21809231.4
+(22) Date of filing: 22.03.2021
+(30) Priority: 22.05.2020 CN 202010442337
+(71) Applicant: Contemporary Amperex Technology Co.,
+Limited
+Ningde City, Fujian 352100 (CN)
+(72) Inventors:
+• LIU, Qian
+Ningde City, Fujian 352100 (CN)
+• ZHAO, Yuzhen
+Ningde City, Fujian 352100 (CN)
+(54) POSITIVE ELECTRODE ACTIVE MATERIAL FOR SODIUM-ION
+BATTERY
+(57) A positive electrode active material ...
+"""
+
+US_FRONT_PAGE = """(12) United States Patent
+(10) Patent No.: US 11,296,321 B2
+(45) Date of Patent: Apr. 5, 2022
+(54) LAYERED OXIDE CATHODE FOR SODIUM ION BATTERIES
+(71) Applicant: Faradion Limited, Sheffield (GB)
+(72) Inventors: Jerry Barker, Oxfordshire (GB); Richard Heap, Sheffield (GB)
+(21) Appl. No.: 16/330,485
+(22) Filed: Sep. 1, 2017
+(57) ABSTRACT
+"""
+
+KR_FRONT_PAGE = """(19) 대한민국특허청(KR)
+(12) 공개특허공보(A)
+(11) 공개번호 10-2022-0012345
+(43) 공개일자 2022년01월25일
+(21) 출원번호 10-2021-0098765
+(22) 출원일자 2021년07월28일
+(71) 출원인
+주식회사 엘지에너지솔루션
+서울특별시 영등포구 여의대로 108
+(72) 발명자
+홍길동
+대전광역시 유성구 문지로 188
+(54) 발명의 명칭 나트륨 이차전지용 양극 활물질
+(57) 요 약
+"""
+
+
+def test_ep_front_page():
+    info = parse_front_page(EP_FRONT_PAGE)
+    assert info["publication_number"] == "EP 3 968 410 A1"
+    assert info["publication_date"] == "2022-03-16"
+    assert info["filing_date"] == "2021-03-22"
+    assert info["applicants"] == ["Contemporary Amperex Technology Co., Limited"]
+    assert info["inventors"] == ["LIU, Qian", "ZHAO, Yuzhen"]
+    assert info["priority_data"][0]["priority_date"] == "2020-05-22"
+    assert info["title_original_language"] == "POSITIVE ELECTRODE ACTIVE MATERIAL FOR SODIUM-ION BATTERY"
+
+def test_us_front_page():
+    info = parse_front_page(US_FRONT_PAGE)
+    assert info["publication_number"] == "US 11,296,321 B2"
+    assert info["publication_date"] == "2022-04-05"
+    assert info["filing_date"] == "2017-09-01"
+    assert info["application_number"] == "16/330,485"
+    assert info["applicants"] == ["Faradion Limited"]
+    assert info["inventors"] == ["Jerry Barker", "Richard Heap"]
+
+def test_kr_front_page():
+    info = parse_front_page(KR_FRONT_PAGE)
+    assert info["publication_number"] == "10-2022-0012345"
+    assert info["publication_date"] == "2022-01-25"
+    assert info["application_number"] == "10-2021-0098765"
+    assert info["filing_date"] == "2021-07-28"
+    assert info["applicants"] == ["주식회사 엘지에너지솔루션"]
+    assert info["inventors"] == ["홍길동"]
+
+def test_name_mismatch_keeps_llm_value():
+    """이름이 불일치하면 LLM 값을 유지하고 교차 검증에만 표시 (번호/날짜 불일치는 규칙 기반 값 채택)"""
+    rule_based = {"applicants": ["Contemporary Amperex Technology Co.", "Limited"], "publication_date": "2022-03-16"}
+    llm = {"applicants": ["Contemporary Amperex Technology Co., Limited"], "publication_date": "2022-03-17"}
+    merged, crosscheck = merge_with_llm_patent_info(rule_based, llm)
+    assert merged["applicants"] == llm["applicants"]
+    assert merged["publication_date"] == "2022-03-16"
+    by_field = {item["field"]: item for item in crosscheck}
+    assert by_field["applicants"]["status"] == "mismatch" and by_field["applicants"]["adopted"] == "llm"
+    assert by_field["publication_date"]["adopted"] == "rule_based"
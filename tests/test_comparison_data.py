@@ -0,0 +1,46 @@
+# test_comparison_data.py
+# 여러 특허 비교 표(comparison_data.py): 단위를 맞춘 지표 열 집계와 범위/텍스트 필터
+import math
+
+import numpy as np
+
+from comparison_data import build_comparison_frame, filter_comparison_frame
+
+
+def _record(document_id, title, performance, formula="NaFePO4"):
+    return {
+        "document_id": document_id,
+        "source_file_name": f"{document_id}.pdf",
+        "structured_data": {
+            "patent_info": {"title_english_translation": title, "applicants": ["Acme"]},
+            "material_description": {"chemical_formula_general": formula},
+            "representative_performance_data_from_examples_or_figures": performance,
+        },
+    }
+
+RECORDS = [
+    _record("doc_a", "Layered oxide cathode", [
+        {"metric_name": "Discharge capacity", "value": "150", "unit": "mAh/g"},
+        {"metric_name": "Discharge capacity", "value": "0.165 Ah/g"},  # 단위 환산 후 최대값
+        {"metric_name": "Capacity retention", "value": "92 %"},
+    ], formula="NaNi0.33Mn0.33Fe0.33O2"),
+    _record("doc_b", "Polyanion cathode", [{"metric_name": "Discharge capacity", "value": "120–130 mAh/g"}]),
+    _record("doc_c", "Binder", []),
+]
+
+
+def test_metrics_are_aggregated_per_document_in_base_units():
+    frame = build_comparison_frame(RECORDS)
+    assert list(frame["document_id"]) == ["doc_a", "doc_b", "doc_c"]
+    capacity = frame["capacity_mAh_g"].to_numpy()
+    assert math.isclose(capacity[0], 165.0) and math.isclose(capacity[1], 125.0) and math.isnan(capacity[2])
+    assert frame.loc[0, "capacity_retention_pct"] == 92.0
+    assert frame["capacity_mAh_g"].dtype == np.float64
+
+def test_filter_by_range_text_and_row_mask():
+    frame = build_comparison_frame(RECORDS)
+    # 값이 없는 문서는 require_values에 넣을 때만 제외
+    assert list(filter_comparison_frame(frame, {"capacity_mAh_g": (140, 200)})["document_id"]) == ["doc_a", "doc_c"]
+    assert list(filter_comparison_frame(frame, {"capacity_mAh_g": (100, 200)}, require_values=["capacity_mAh_g"])["document_id"]) == ["doc_a", "doc_b"]
+    assert list(filter_comparison_frame(frame, {}, text_query="polyanion")["document_id"]) == ["doc_b"]
+    assert list(filter_comparison_frame(frame, {}, row_mask=np.array([False, True, True]))["document_id"]) == ["doc_b", "doc_c"]
@@ -0,0 +1,65 @@
+# test_element_index.py
+# 화학식 파서(element_index.py)의 원소별 화학량론 범위: 선형 계수식, 분수, 괄호, 자리표시자와 화학량론 검색
+import pytest
+
+from element_index import ElementIndex, parse_composition
+
+
+def _params(**value_ranges):
+    return [{"parameter_name": name, "value_range": value_range} for name, value_range in value_ranges.items()]
+
+def _stoichiometry(formula, params=()):
+    return parse_composition({"chemical_formula_general": formula, "formula_parameters": list(params)})["stoichiometry"]
+
+
+def test_linear_expression_coefficients():
+    stoichiometry = _stoichiometry("LiNi1-x-yCoxMnyO2", _params(x="0 < x < 0.2", y="0 < y < 0.2"))
+    assert stoichiometry["Ni"] == pytest.approx((0.6, 1.0))
+    assert stoichiometry["Co"] == pytest.approx((0.0, 0.2))
+    assert stoichiometry["Mn"] == pytest.approx((0.0, 0.2))
+    assert stoichiometry["Li"] == (1.0, 1.0) and stoichiometry["O"] == (2.0, 2.0)
+
+def test_coefficient_lower_bound_is_clamped_at_zero():
+    # x, y가 모두 최대(0.6)면 1-x-y = -0.2가 되지만 함량은 음수가 될 수 없음
+    stoichiometry = _stoichiometry("LiNixCoyMn1-x-yO2", _params(x="0.3 <= x <= 0.6", y="0.3 <= y <= 0.6"))
+    assert stoichiometry["Mn"] == pytest.approx((0.0, 0.4))
+    assert stoichiometry["Ni"] == pytest.approx((0.3, 0.6))
+
+def test_fraction_coefficients():
+    stoichiometry = _stoichiometry("Na2/3Ni1/3Mn2/3O2")
+    assert stoichiometry["Na"] == pytest.approx((2 / 3, 2 / 3))
+    assert stoichiometry["Ni"] == pytest.approx((1 / 3, 1 / 3))
+    assert stoichiometry["Mn"] == pytest.approx((2 / 3, 2 / 3))
+
+def test_sum_coefficient_and_placeholder():
+    params = _params(a="0 <= a <= 0.1", b="0 < b <= 1") + [{"parameter_name": "M", "elements_involved": ["Co", "Ni"]}]
+    composition = parse_composition({"chemical_formula_general": "Li1+aMbO2", "formula_parameters": params})
+    assert composition["stoichiometry"]["Li"] == pytest.approx((1.0, 1.1))
+    assert composition["stoichiometry"]["Co"] == pytest.approx((0.0, 1.0))
+    assert composition["elements"] == ["Li", "O"]
+    assert composition["possible_elements"] == ["Li", "O", "Co", "Ni"]
+
+@pytest.mark.parametrize("formula, expected", [
+    ("Na3V2(PO4)3", {"Na": 3, "V": 2, "P": 3, "O": 12}),
+    ("Na(Ni1/3Fe1/3Mn1/3)O2", {"Na": 1, "Ni": 1 / 3, "Fe": 1 / 3, "Mn": 1 / 3, "O": 2}),
+    ("Li2O-Al2O3", {"Li": 2, "Al": 2, "O": 4}),
+])
+def test_fixed_formulas(formula, expected):
+    stoichiometry = _stoichiometry(formula)
+    assert set(stoichiometry) == set(expected)
+    for symbol, value in expected.items():
+        assert stoichiometry[symbol] == pytest.approx((value, value))
+
+def test_unknown_variable_gives_nan_range():
+    low, high = _stoichiometry("NaNi1-zO2")["Ni"]
+    assert low != low and high != high
+
+def test_stoichiometry_filter_uses_expression_ranges():
+    records = [
+        {"document_id": "nmc", "structured_data": {"material_description": {
+            "chemical_formula_general": "LiNi1-x-yCoxMnyO2", "formula_parameters": _params(x="0 < x < 0.2", y="0 < y < 0.2")}}},
+        {"document_id": "p2", "structured_data": {"material_description": {"chemical_formula_general": "Na2/3Ni1/3Mn2/3O2"}}},
+    ]
+    index = ElementIndex.from_records(records)
+    assert list(index.document_ids[index.match_mask(["Ni"], stoichiometry={"Ni": (0.5, None)})]) == ["nmc"]
+    assert list(index.document_ids[index.match_mask(["Na"], stoichiometry={"Na": (None, 0.7)})]) == ["p2"]
@@ -0,0 +1,45 @@
+# test_error_artifacts.py
+# 실패한 분석의 큰 문자열을 디스크로 옮기는 저장소(error_artifacts.py): 저장/읽기 왕복, 참조 치환, 저장 실패 시 미리보기로 자르기
+from app_config import AppConfig
+from error_artifacts import ARTIFACTS_KEY, ErrorArtifactStore, spill_error_payload
+
+RAW_RESPONSE = "```json\n{\"items\": [" + ", ".join(f"{{\"value\": \"{index}\"}}" for index in range(5000))
+
+
+def _payload():
+    return {"error": "Failed to parse extracted JSON from LLM response", "raw_response": RAW_RESPONSE,
+            "extracted_json_to_parse": RAW_RESPONSE[len("```json\n"):], "source_file_name": "doc.pdf"}
+
+
+def test_put_get_round_trip_and_content_addressing(tmp_path):
+    store = ErrorArtifactStore(str(tmp_path))
+    artifact_id = store.put("응답 원문 " * 1000)
+    assert store.get(artifact_id) == "응답 원문 " * 1000
+    assert store.put("응답 원문 " * 1000) == artifact_id
+    assert 0 < store.stored_bytes(artifact_id) < len(("응답 원문 " * 1000).encode("utf-8"))
+    assert store.get("0" * 64) is None and store.stored_bytes("0" * 64) == 0
+
+def test_spill_replaces_large_fields_with_references(tmp_path):
+    store = ErrorArtifactStore(str(tmp_path))
+    spilled = spill_error_payload(_payload(), store)
+    assert "raw_response" not in spilled and "extracted_json_to_parse" not in spilled
+    assert spilled["error"] == _payload()["error"] and spilled["source_file_name"] == "doc.pdf"
+    reference = spilled[ARTIFACTS_KEY]["raw_response"]
+    assert reference["chars"] == len(RAW_RESPONSE)
+    assert reference["preview"] == RAW_RESPONSE[:AppConfig.ERROR_ARTIFACT_PREVIEW_CHARS]
+    assert store.get(reference["artifact_id"]) == RAW_RESPONSE
+
+def test_payload_without_large_fields_is_unchanged(tmp_path):
+    payload = {"error": "Timeout", "source_file_name": "doc.pdf"}
+    assert spill_error_payload(payload, ErrorArtifactStore(str(tmp_path))) == payload
+
+def test_store_failure_truncates_to_preview(tmp_path, monkeypatch):
+    store = ErrorArtifactStore(str(tmp_path))
+
+    def _disk_full(text):
+        raise OSError(28, "No space left on device")
+    monkeypatch.setattr(store, "put", _disk_full)
+    spilled = spill_error_payload(_payload(), store)
+    assert spilled["raw_response"] == RAW_RESPONSE[:AppConfig.ERROR_ARTIFACT_PREVIEW_CHARS]
+    assert ARTIFACTS_KEY not in spilled
+    assert spilled["artifact_store_error"].startswith("OSError")
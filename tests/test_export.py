@@ -0,0 +1,25 @@
+# test_export.py
+# 표 형식 내보내기(export.py): 항목의 열에 없는 키를 extra_json에 보관하고, 하위 표로 펼친 리스트만 제외하는지
+import json
+
+from export import flatten_record
+
+
+def test_list_extras_are_kept_but_nested_tables_are_not_duplicated():
+    step = {
+        "step_id": "S1",
+        "process_name": "calcination",
+        "equipment": ["tube furnace", "alumina crucible"],
+        "key_parameters_and_values": [{"parameter_name": "temperature", "value_or_range": "900", "unit": "°C"}],
+    }
+    performance = {"metric_name": "capacity", "value": "120", "unit": "mAh/g", "figure_ids": ["Fig. 3", "Fig. 4"]}
+    record = {"document_id": "doc", "structured_data": {
+        "preparation_method_summary": {"key_steps_and_conditions": [step]},
+        "representative_performance_data_from_examples_or_figures": [performance],
+    }}
+    tables = flatten_record(record)
+
+    step_row = tables["synthesis_steps"][0]
+    assert json.loads(step_row["extra_json"]) == {"equipment": ["tube furnace", "alumina crucible"]}
+    assert tables["synthesis_step_parameters"][0]["parameter_name"] == "temperature"
+    assert json.loads(tables["performance_data"][0]["extra_json"]) == {"figure_ids": ["Fig. 3", "Fig. 4"]}
@@ -0,0 +1,64 @@
+# test_ingest_daemon.py
+# 감시 폴더 수집 서비스(ingest_daemon.py): 저널에서 다시 읽은 실패의 재시도 보류와, 같은 경로에 바뀐 내용의 파일 재처리
+import os
+import threading
+import time
+
+from batch_runner import RunJournal
+from ingest_daemon import IngestDaemon
+from result_store import ResultStore, compute_file_document_id
+
+
+def _write_settled(path, content):
+    with open(path, "wb") as f:
+        f.write(content)
+    settled = time.time() - 3600
+    os.utime(path, (settled, settled))
+
+def _failing_analyze(path, model, model_name, store):
+    raise RuntimeError("broken PDF")
+
+def _succeeding_analyze(path, model, model_name, store):
+    record = {"document_id": compute_file_document_id(path), "source_file_name": os.path.basename(path), "usage": {}, "cost_usd": 0.0}
+    store.save(dict(record, structured_data={}))
+    return record
+
+def _run_once(tmp_path, analyze):
+    daemon = IngestDaemon(str(tmp_path / "watch"), ResultStore(str(tmp_path / "store")), None, "fake-model",
+                          RunJournal(str(tmp_path / "journal.ndjson")), workers=1, analyze=analyze)
+    return daemon, daemon.run(threading.Event(), once=True)
+
+
+def test_failed_attempt_is_restored_from_journal(tmp_path):
+    os.makedirs(tmp_path / "watch")
+    pdf_path = str(tmp_path / "watch" / "a.pdf")
+    _write_settled(pdf_path, b"%PDF-1.4 first version")
+    _, metrics = _run_once(tmp_path, _failing_analyze)
+    assert metrics["failed"] == 1
+
+    entries = RunJournal(str(tmp_path / "journal.ndjson")).read_entries()
+    assert entries[-1]["document_id_attempted"] == compute_file_document_id(pdf_path)
+    daemon, metrics = _run_once(tmp_path, _succeeding_analyze)
+    assert daemon._failures[pdf_path]["document_id_attempted"] == compute_file_document_id(pdf_path)
+    assert metrics["processed"] == 0  # 같은 내용은 재시도 대기 시간 동안 보류
+
+def test_replaced_file_is_reprocessed_after_restart(tmp_path):
+    os.makedirs(tmp_path / "watch")
+    pdf_path = str(tmp_path / "watch" / "a.pdf")
+    _write_settled(pdf_path, b"%PDF-1.4 first version")
+    _run_once(tmp_path, _failing_analyze)
+
+    _write_settled(pdf_path, b"%PDF-1.4 corrected version")
+    daemon, metrics = _run_once(tmp_path, _succeeding_analyze)
+    assert metrics["processed"] == 1
+    assert pdf_path not in daemon._failures
+
+def test_replaced_file_starts_a_fresh_attempt_count(tmp_path):
+    os.makedirs(tmp_path / "watch")
+    pdf_path = str(tmp_path / "watch" / "a.pdf")
+    _write_settled(pdf_path, b"%PDF-1.4 first version")
+    _run_once(tmp_path, _failing_analyze)
+    _write_settled(pdf_path, b"%PDF-1.4 second version")
+    daemon, _ = _run_once(tmp_path, _failing_analyze)
+    assert daemon._failures[pdf_path]["attempts"] == 1
+    assert RunJournal(str(tmp_path / "journal.ndjson")).item_states()[pdf_path]["attempts"] == 1
@@ -0,0 +1,35 @@
+# test_large_pdf.py
+# 대용량 PDF 모드(large_pdf.py): 페이지 범위 파싱, 청크 단위 디스크 저장, 선택한 페이지만 추출
+import io
+
+import pytest
+
+from large_pdf import extract_large_pdf, parse_page_ranges, spool_upload_to_disk
+from result_store import compute_document_id
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1-3, 5", [1, 2, 3, 5]),
+    ("-2, 9-", [1, 2, 9, 10]),
+    ("4, 2-3, 3", [2, 3, 4]),
+    ("8-20", [8, 9, 10]),  # 전체 페이지 수를 넘는 부분은 잘라냄
+    ("", []),
+])
+def test_parse_page_ranges(text, expected):
+    assert parse_page_ranges(text, total_pages=10) == expected
+
+@pytest.mark.parametrize("text", ["abc", "5-3", "0-2", "-"])
+def test_parse_page_ranges_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        parse_page_ranges(text, total_pages=10)
+
+def test_spooled_upload_extracts_only_selected_pages(tmp_path, text_pdf_bytes):
+    spooled = spool_upload_to_disk(io.BytesIO(text_pdf_bytes), str(tmp_path), chunk_bytes=1024)
+    assert spooled.document_id == compute_document_id(text_pdf_bytes)
+    assert spooled.size_bytes == len(text_pdf_bytes) and spooled.page_count == 20
+    assert [entry.name for entry in tmp_path.iterdir()] == [f"{spooled.document_id}.pdf"]  # 임시 .part 파일이 남지 않음
+
+    page_texts, info = extract_large_pdf(spooled.path, [2, 3], detect_tables=False)
+    assert len(page_texts) == 20
+    assert [number for number, text in enumerate(page_texts, start=1) if text] == [2, 3]
+    assert info["metrics"]["selected_pages"] == [2, 3] and info["metrics"]["peak_rss_mb"] > 0
@@ -0,0 +1,66 @@
+# test_map_reduce.py
+# 큰 문서의 map-reduce 추출(map_reduce.py): 페이지 창 분할과 창별 결과 병합(목록 중복 제거, 스칼라 다수결)
+from map_reduce import PERFORMANCE_DATA_PATH, benchmark_map_reduce, merge_window_results, split_page_windows
+
+
+def _performance(conditions, value="150", source="p.12"):
+    return {"metric_name": "First Cycle Discharge Specific Capacity", "value": value, "unit": "mAh/g",
+            "conditions_or_context": conditions, "source_reference_in_document": source}
+
+
+def test_windows_split_on_page_boundaries_with_overlap():
+    page_texts = ["x" * 400] * 10  # 페이지당 약 100 토큰
+    windows = split_page_windows(page_texts, window_tokens=300, overlap_pages=1)
+    assert windows[0] == [1, 2, 3] and windows[1] == [3, 4, 5]
+    assert windows[-1][-1] == 10
+    assert all(later[0] == earlier[-1] for earlier, later in zip(windows, windows[1:]))
+
+def test_oversized_page_is_its_own_window():
+    windows = split_page_windows(["x" * 400, "x" * 4000, "x" * 400], window_tokens=300, overlap_pages=0)
+    assert windows == [[1], [2], [3]]
+
+def test_split_respects_selected_page_numbers():
+    windows = split_page_windows(["x" * 400] * 6, page_numbers=[2, 4, 6], window_tokens=200, overlap_pages=0)
+    assert windows == [[2, 4], [6]]
+
+def test_equal_values_from_different_examples_are_kept():
+    first = {PERFORMANCE_DATA_PATH: [_performance("Example 1"), _performance("Comparative Example 3")]}
+    second = {PERFORMANCE_DATA_PATH: [_performance("Comparative Example 3"), _performance("Example 7", source="p.30")]}
+    merged, report = merge_window_results([first, second])
+    assert [entry["conditions_or_context"] for entry in merged[PERFORMANCE_DATA_PATH]] == [
+        "Example 1", "Comparative Example 3", "Example 7"]
+    assert report["duplicates_removed"] == {PERFORMANCE_DATA_PATH: 1}
+
+def test_duplicate_list_items_keep_the_fuller_entry():
+    step = {"process_name": "Calcination", "key_parameters_and_values": [{"parameter_name": "Temperature", "value_or_range": "900"}]}
+    first = {"preparation_method_summary": {"key_steps_and_conditions": [step]}}
+    second = {"preparation_method_summary": {"key_steps_and_conditions": [dict(step, atmosphere="air")]}}
+    merged, report = merge_window_results([first, second])
+    assert merged["preparation_method_summary"]["key_steps_and_conditions"] == [dict(step, atmosphere="air")]
+    assert report["duplicates_removed"] == {"preparation_method_summary.key_steps_and_conditions": 1}
+
+def test_scalar_majority_vote_and_tie_goes_to_first_window():
+    windows = [{"patent_info": {"publication_number": number}} for number in ("EP 1 A1", "EP 2 A1", "EP 2 A1")]
+    merged, report = merge_window_results(windows)
+    assert merged["patent_info"]["publication_number"] == "EP 2 A1"
+    assert report["conflicts"][0]["chosen_windows"] == [2, 3]
+    merged, _ = merge_window_results(windows[:2])
+    assert merged["patent_info"]["publication_number"] == "EP 1 A1"
+
+def test_benchmark_finds_examples_with_repeated_values():
+    stats = benchmark_map_reduce(n_pages=60, context_tokens=8_000, window_tokens=4_000, latency_seconds=0.0, latency_per_1k_input_tokens=0.0)
+    assert stats["map_reduce"]["completeness"] == 1.0
+    assert stats["single_shot"]["completeness"] < 1.0
+
+def test_free_text_fields_are_joined_instead_of_voted():
+    windows = [
+        {"document_summary_for_user": "The invention is a sodium layered oxide cathode.",
+         "preparation_method_summary": {"overall_synthesis_route_description": "Solid-state reaction"}},
+        {"document_summary_for_user": "Examples show 150 mAh/g at 0.1C.",
+         "preparation_method_summary": {"overall_synthesis_route_description": "Solid-state reaction method"}},
+        {"document_summary_for_user": "Examples show 150 mAh/g at 0.1C."},
+    ]
+    merged, report = merge_window_results(windows)
+    assert merged["document_summary_for_user"] == "The invention is a sodium layered oxide cathode.\n\nExamples show 150 mAh/g at 0.1C."
+    assert merged["preparation_method_summary"]["overall_synthesis_route_description"] == "Solid-state reaction method"
+    assert report["conflict_count"] == 0 and report["conflicts"] == []
@@ -0,0 +1,40 @@
+# test_model_routing.py
+# 섹션별 모델 캐스케이드(model_routing.py)의 비교 기준 비용: 문서를 한 번만 보내는 고성능 단일 호출
+from app_config import AppConfig
+from fake_llm import FakeChatModel, requested_sections_responder
+from llm_utils import estimate_cost_usd, estimate_tokens
+from model_routing import run_cascade_extraction, validate_section_output
+
+DOCUMENT_TEXT = "A sodium layered oxide cathode NaNi0.33Mn0.33Fe0.33O2 was prepared. " * 2000
+
+
+def test_strong_only_baseline_counts_document_once():
+    model = FakeChatModel(requested_sections_responder())
+    models = {"cheap": model, "strong": model}
+    _, metrics = run_cascade_extraction(DOCUMENT_TEXT, "doc.pdf", models)
+    first_attempts = [call for call in metrics["calls"] if call["attempt"] == 0]
+    assert len(first_attempts) == len(AppConfig.SECTION_MODEL_ROUTES) > 1
+
+    strong_model_name = AppConfig.CASCADE_MODEL_NAMES["strong"]
+    per_group_sum = sum(
+        estimate_cost_usd(strong_model_name, {"input_tokens": call["input_tokens"], "output_tokens": call["output_tokens"]})
+        for call in first_attempts
+    )
+    document_only = estimate_cost_usd(strong_model_name, {"input_tokens": estimate_tokens(DOCUMENT_TEXT)})
+    # 문서 토큰 1회분 이상, 그룹 수만큼 중복한 합계보다는 문서 토큰 (그룹 수 - 1)회분 가까이 작아야 함
+    assert metrics["strong_only_cost_usd"] >= document_only
+    assert per_group_sum - metrics["strong_only_cost_usd"] > document_only * (len(first_attempts) - 1) * 0.9
+
+
+def test_empty_cheap_section_escalates_to_strong_tier():
+    strong_material = {"chemical_formula_general": "NaFePO4", "formula_parameters": [{"parameter": "x", "value": "1"}]}
+    cheap = FakeChatModel(requested_sections_responder())
+    strong = FakeChatModel(requested_sections_responder({"material_description": strong_material}))
+    structured_data, metrics = run_cascade_extraction(DOCUMENT_TEXT, "doc.pdf", {"cheap": cheap, "strong": strong})
+
+    assert validate_section_output("material_description", {}) == ["low confidence: section is empty"]
+    report = metrics["sections"]["material_description"]
+    assert report["tier"] == "strong" and report["escalated"]
+    assert structured_data["material_description"] == strong_material
+    # 상위 등급도 비운 섹션은 빈 값 그대로 사용
+    assert structured_data["morphology_structure"] == {}
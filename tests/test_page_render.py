@@ -0,0 +1,36 @@
+# test_page_render.py
+# 뷰어 페이지 렌더링(page_render.py): JPEG 직접 인코딩, 썸네일 창, 저/고해상도 캐시 미리 채우기
+import io
+
+import pytest
+from PIL import Image
+
+from app_config import AppConfig
+from page_render import render_pdf_page_jpeg, thumbnail_window, warm_render_cache
+
+
+@pytest.mark.parametrize("current_page, total_pages, count, expected", [
+    (5, 20, 5, [3, 4, 5, 6, 7]),
+    (0, 20, 5, [0, 1, 2, 3, 4]),
+    (19, 20, 5, [15, 16, 17, 18, 19]),
+    (1, 3, 5, [0, 1, 2]),
+])
+def test_thumbnail_window_stays_inside_document(current_page, total_pages, count, expected):
+    assert thumbnail_window(current_page, total_pages, count) == expected
+
+def test_preview_is_smaller_than_full_render(text_pdf_bytes):
+    preview = render_pdf_page_jpeg(text_pdf_bytes, 0, AppConfig.PDF_VIEWER_PREVIEW_DPI)
+    full = render_pdf_page_jpeg(text_pdf_bytes, 0, AppConfig.DEFAULT_DPI_PDF_PREVIEW)
+    preview_size, full_size = Image.open(io.BytesIO(preview)).size, Image.open(io.BytesIO(full)).size
+    assert preview[:2] == full[:2] == b"\xff\xd8"  # JPEG
+    assert preview_size[0] < full_size[0]
+    assert render_pdf_page_jpeg(text_pdf_bytes, 99, AppConfig.PDF_VIEWER_PREVIEW_DPI) is None
+
+def test_warm_render_cache_fills_both_resolutions_once(tmp_path, text_pdf_bytes):
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(text_pdf_bytes)
+    cache_dir = str(tmp_path / "cache")
+    first = warm_render_cache(str(pdf_path), cache_dir, max_pages=3)
+    assert (first["pages"], first["rendered"], first["cached"]) == (3, 6, 0)
+    second = warm_render_cache(str(pdf_path), cache_dir, max_pages=3)
+    assert (second["rendered"], second["cached"]) == (0, 6)
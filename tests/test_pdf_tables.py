@@ -0,0 +1,52 @@
+# test_pdf_tables.py
+# 성능 표 변환과 LLM 결과 병합(pdf_tables.py): 값이 같아도 시료/조건이 다르면 별도 항목으로 유지
+from pdf_tables import merge_table_performance_data, performance_entry_key, table_to_performance_data
+
+PERFORMANCE_TABLE = [
+    ["Sample", "Rate", "Discharge capacity (mAh/g)"],
+    ["Example 1", "0.1C", "150"],
+    ["Example 5", "0.1C", "150"],
+    ["Comparative Example 3", "0.1C", "120"],
+]
+
+
+def _entry(conditions, value="150", metric_name="Discharge capacity", unit="mAh/g", source="p.12"):
+    return {"metric_name": metric_name, "value": value, "unit": unit,
+            "conditions_or_context": conditions, "source_reference_in_document": source}
+
+
+def test_table_rows_become_performance_entries():
+    entries = table_to_performance_data(PERFORMANCE_TABLE, page_number=12, table_number=1)
+    assert [entry["conditions_or_context"] for entry in entries] == [
+        "Sample: Example 1; Rate: 0.1C", "Sample: Example 5; Rate: 0.1C", "Sample: Comparative Example 3; Rate: 0.1C"]
+    assert entries[0]["unit"] == "mAh/g" and entries[0]["source_reference_in_document"] == "Table p12.1 (page 12)"
+
+def test_same_value_from_different_example_is_kept():
+    llm_entries = [_entry("Example 1, 0.1C charge/discharge")]
+    table_entries = table_to_performance_data(PERFORMANCE_TABLE, page_number=12, table_number=1)
+    merged, added = merge_table_performance_data(llm_entries, table_entries)
+    assert added == 2
+    assert [entry["conditions_or_context"] for entry in merged[1:]] == [
+        "Sample: Example 5; Rate: 0.1C", "Sample: Comparative Example 3; Rate: 0.1C"]
+
+def test_same_measurement_in_different_wording_is_deduplicated():
+    assert performance_entry_key(_entry("Example 5, 0.1C")) == performance_entry_key(_entry("Sample: Ex. 5; Rate: 0.1 C"))
+    assert performance_entry_key(_entry("Comp. Ex. 3")) == performance_entry_key(_entry("Comparative Example 3"))
+    assert performance_entry_key(_entry("실시예 1")) == performance_entry_key(_entry("Example 1"))
+    assert performance_entry_key(_entry("Example 1")) != performance_entry_key(_entry("Comparative Example 1"))
+    assert performance_entry_key(_entry("Example 1, 0.1C")) != performance_entry_key(_entry("Example 1, 1C"))
+    assert performance_entry_key(_entry("Example 1, 100 cycles")) != performance_entry_key(_entry("Example 1, 200 cycles"))
+
+def test_source_is_compared_only_when_requested():
+    first, second = _entry("Example 1", source="p.12"), _entry("Example 1", source="Table 3 (page 20)")
+    assert performance_entry_key(first) == performance_entry_key(second)
+    assert performance_entry_key(first, include_source=True) != performance_entry_key(second, include_source=True)
+
+def test_one_sided_values_are_deduplicated():
+    # "<10"처럼 대표값이 없는 값도 키가 NaN이 아니어서, 같은 항목이 다시 들어와도 하나로 병합
+    bound = _entry("Example 1", value="<10", metric_name="Capacity fade", unit="%")
+    merged, added = merge_table_performance_data([bound], [dict(bound)])
+    assert added == 0 and len(merged) == 1
+    assert performance_entry_key(bound) != performance_entry_key(dict(bound, value=">10"))
+    assert performance_entry_key(bound) != performance_entry_key(dict(bound, value="10"))
+    assert performance_entry_key(dict(bound, value="N/A")) == performance_entry_key(dict(bound, value="n/a"))
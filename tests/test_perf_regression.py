@@ -0,0 +1,216 @@
+# test_perf_regression.py
+# 단계별 성능 회귀 테스트 (오프라인: 합성 PDF + 가짜 LLM)
+# 각 테스트는 한 단계의 시간(중앙값, 짧은 단계는 SMALL_STAGE_LOOPS회 합계)과 Python 힙 최대 증가량을 측정하여 tests/perf_baselines.json의 기준값과 비교합니다.
+import pytest
+
+from fake_llm import FakeChatModel, json_response
+
+pytestmark = pytest.mark.perf
+
+PDF_FILENAME = "perf_sample.pdf"
+# 경로 조회 단계에서 전체 스키마 경로를 반복 조회하는 횟수
+PATH_LOOKUP_ROUNDS = 2000
+# 1회 실행이 수 ms인 단계를 한 번의 측정에 묶어 실행하는 횟수 (측정값이 수십 ms가 되어 고정 여유분 2 ms가 허용 범위를 좌우하지 않게 함)
+SMALL_STAGE_LOOPS = 10
+# 렌더링 단계에서 그리는 페이지 수
+RENDER_PAGES = 3
+
+
+# --- 텍스트 추출 ---
+def test_final_text_extraction_with_tables(perf_gate, final_app, table_pdf_bytes):
+    perf_gate.check("final.text_extraction_tables", lambda: final_app.convert_pdf_to_text(table_pdf_bytes, detect_tables=True))
+
+def test_final_text_extraction_plain(perf_gate, final_app, text_pdf_bytes):
+    perf_gate.check("final.text_extraction_plain", lambda: final_app.convert_pdf_to_text(text_pdf_bytes, detect_tables=False))
+
+def test_root_text_extraction(perf_gate, root_app, text_pdf_bytes):
+    perf_gate.check("root.text_extraction", lambda: root_app.convert_pdf_to_text_st(text_pdf_bytes, PDF_FILENAME))
+
+
+# --- 프롬프트 구성 ---
+def test_final_prompt_building(perf_gate, final_app, text_pdf_bytes):
+    from bibliographic_parser import parse_front_page
+    from text_compaction import build_prompt_text
+    page_texts, _, _ = final_app.convert_pdf_to_text(text_pdf_bytes, detect_tables=False)
+
+    def _build():
+        full_text, _, _ = build_prompt_text(page_texts)
+        final_app._build_llm_extraction_prompt(full_text, PDF_FILENAME, parse_front_page(page_texts[0]))
+    perf_gate.check("final.prompt_building", _build, loops=SMALL_STAGE_LOOPS)
+
+
+# --- 응답 파싱 ---
+def test_final_response_parsing(perf_gate, final_app, fake_structured_data):
+    response = "Here is the extracted data.\n" + json_response(fake_structured_data)
+    perf_gate.check("final.response_parsing", lambda: final_app._parse_llm_text_response(response, PDF_FILENAME, "sample text"),
+                    loops=SMALL_STAGE_LOOPS)
+
+def test_final_llm_roundtrip(perf_gate, final_app, text_pdf_bytes, fake_structured_data):
+    """프롬프트 구성 -> 가짜 LLM 호출 -> 응답 파싱 전체"""
+    _, full_text, _ = final_app.convert_pdf_to_text(text_pdf_bytes, detect_tables=False)
+    model = FakeChatModel(json_response(fake_structured_data))
+    perf_gate.check("final.llm_roundtrip", lambda: final_app.extract_structured_data_with_llm(full_text, model, PDF_FILENAME), loops=SMALL_STAGE_LOOPS)
+
+def test_root_llm_roundtrip(perf_gate, root_app, text_pdf_bytes, fake_structured_data):
+    """루트 앱은 프롬프트 구성과 응답 파싱이 한 함수에 있으므로 가짜 LLM으로 함께 측정"""
+    _, full_text = root_app.convert_pdf_to_text_st(text_pdf_bytes, PDF_FILENAME)
+    model = FakeChatModel(json_response(fake_structured_data))
+    perf_gate.check("root.llm_roundtrip", lambda: root_app.extract_structured_data_from_full_text_st(full_text, model, PDF_FILENAME), loops=SMALL_STAGE_LOOPS)
+
+
+# --- 경로 조회 ---
+def test_final_path_lookup(perf_gate, final_app, fake_structured_data):
+    paths = list(final_app.SCHEMA_FIELD_DESCRIPTIONS.keys())
+
+    def _lookup():
+        for _ in range(PATH_LOOKUP_ROUNDS):
+            for path in paths:
+                final_app.get_value_by_path(fake_structured_data, path)
+    perf_gate.check("final.path_lookup", _lookup)
+
+def test_root_path_lookup(perf_gate, root_app, fake_structured_data):
+    paths = list(root_app.SCHEMA_FIELD_DESCRIPTIONS.keys())
+
+    def _lookup():
+        for _ in range(PATH_LOOKUP_ROUNDS):
+            for path in paths:
+                root_app.get_value_by_path(fake_structured_data, path)
+    perf_gate.check("root.path_lookup", _lookup)
+
+
+# --- 렌더링 ---
+def test_final_page_render(perf_gate, table_pdf_bytes):
+    """Tab 1 뷰어의 캐시 미스 경로 (페이지 -> JPEG)"""
+    from app_config import AppConfig
+    from page_render import render_pdf_page_jpeg
+
+    def _render():
+        for page_num in range(RENDER_PAGES):
+            render_pdf_page_jpeg(table_pdf_bytes, page_num, AppConfig.DEFAULT_DPI_PDF_PREVIEW)
+    perf_gate.check("final.page_render", _render)
+
+def test_root_page_render(perf_gate, root_app, table_pdf_bytes):
+    """루트 앱 뷰어의 캐시 미스 경로 (매번 st.cache_data를 비우고 렌더링)"""
+    def _render():
+        root_app.render_pdf_page_as_image.clear()
+        for page_num in range(RENDER_PAGES):
+            root_app.render_pdf_page_as_image(table_pdf_bytes, page_num)
+    perf_gate.check("root.page_render", _render)
+
+def test_final_results_tabs_rerun(perf_gate, final_app, table_pdf_bytes, fake_structured_data):
+    """분석 결과가 있는 세션에서 전체 스크립트 재실행 (결과 탭 3개 렌더링, 페이지 이미지는 캐시 적중)"""
+    from streamlit.testing.v1 import AppTest
+    keys = final_app.SessionStateKeys
+    at = AppTest.from_file(final_app.__file__, default_timeout=60)
+    at.run()
+    at.session_state[keys.ANALYSIS_COMPLETE] = True
+    at.session_state[keys.STRUCTURED_DATA] = {**fake_structured_data, "source_file_name": PDF_FILENAME}
+    at.session_state[keys.PDF_PAGE_TEXTS] = ["page"] * 8
+    at.session_state[keys.PDF_BYTES_FOR_VIEWER] = table_pdf_bytes
+    at.session_state[keys.DOCUMENT_ID] = "perf-results-tabs"
+    at.session_state[keys.ORIGINAL_FILENAME] = PDF_FILENAME
+
+    def _rerun():
+        at.run()
+        assert not at.exception
+    # 재실행 시간이 실행마다 두 갈래(약 1.5배 차이)로 갈려 중앙값이 흔들리므로, 반복을 늘리고 최솟값으로 비교
+    perf_gate.check("final.results_tabs_rerun", _rerun, repeats=11, statistic="min")
+
+
+# --- 실패 결과 ---
+def test_final_failed_session_memory(perf_gate, final_app, fake_structured_data, tmp_path):
+    """파싱에 실패한 큰 응답: 원본 응답을 디스크 저장소로 옮긴 뒤 세션에 남는 크기 (결과 + JSON 다운로드 문자열)"""
+    import json
+    from error_artifacts import ErrorArtifactStore, deep_sizeof, spill_error_payload
+    store = ErrorArtifactStore(str(tmp_path / "error_artifacts"))
+    truncated = json_response({"items": [fake_structured_data] * 8})[:-200]
+    model = FakeChatModel(truncated)
+    retained = {}
+
+    def _fail():
+        result = spill_error_payload(final_app.extract_structured_data_with_llm("sample patent text", model, PDF_FILENAME), store)
+        retained["bytes"] = deep_sizeof(result) + len(json.dumps(result, ensure_ascii=False, indent=4))
+    perf_gate.check("final.failed_session_memory", _fail, loops=SMALL_STAGE_LOOPS)
+    assert retained["bytes"] < 64 * 1024, f"실패 결과가 세션에 {retained['bytes']:,} 바이트를 남깁니다 (응답 {len(truncated):,}자)."
+
+
+# --- 빠른 분석 ---
+def test_final_quick_analysis(perf_gate, fake_structured_data):
+    """요약/청구항 구간 탐지 -> 축소 스키마 프롬프트 -> 가짜 LLM 호출 -> 파싱 (합성 특허 40페이지)"""
+    from quick_analysis import make_benchmark_patent_pages, run_quick_analysis
+    page_texts = make_benchmark_patent_pages(40)
+    model = FakeChatModel(json_response(fake_structured_data))
+
+    def _quick():
+        data, metrics = run_quick_analysis(page_texts, model, "fake-model", PDF_FILENAME)
+        assert metrics["located"] and "error" not in data
+    perf_gate.check("final.quick_analysis", _quick, loops=SMALL_STAGE_LOOPS)
+
+
+# --- Map-reduce 병합 ---
+def test_final_map_reduce_merge(perf_gate, fake_structured_data):
+    """창 8개의 추출 결과 병합 (이웃 창과 절반씩 겹치는 큰 목록의 중복 제거 + 스칼라 충돌 해소 + 요약 이어 붙이기)"""
+    from map_reduce import merge_window_results
+    performance_key = "representative_performance_data_from_examples_or_figures"
+    rows = fake_structured_data[performance_key]
+    half = len(rows) // 2
+    window_results = [
+        {**fake_structured_data, performance_key: rows[half:] if index % 2 else rows[:half] + rows[half:half + half // 2],
+         "document_summary_for_user": f"Summary of part {index}", "language_of_document": "Korean" if index % 3 == 2 else "English"}
+        for index in range(8)
+    ]
+
+    def _merge():
+        merged, report = merge_window_results(window_results)
+        assert report["conflict_count"] >= 1
+        assert merged["document_summary_for_user"].count("Summary of part") == 8
+    perf_gate.check("final.map_reduce_merge", _merge)
+
+
+# --- 프롬프트 접두부 캐시 ---
+def test_final_prompt_cache_roundtrip(perf_gate, final_app, text_pdf_bytes, fake_structured_data):
+    """캐시 래퍼를 거친 LLM 왕복 (정적 접두부 분리 + 핸들 조회 + 시뮬레이터 캐시 토큰 계산)"""
+    from prompt_cache import PromptCachedModel, PromptCacheManager, SimulatedPromptCacheBackend
+    _, full_text, _ = final_app.convert_pdf_to_text(text_pdf_bytes, detect_tables=False)
+    model = PromptCachedModel(FakeChatModel(json_response(fake_structured_data)),
+                              PromptCacheManager(SimulatedPromptCacheBackend()), "fake-model")
+
+    def _roundtrip():
+        data = final_app.extract_structured_data_with_llm(full_text, model, PDF_FILENAME)
+        assert "error" not in data and model.requests[-1]["cached_input_tokens"] > 0
+    perf_gate.check("final.prompt_cache_roundtrip", _roundtrip, loops=SMALL_STAGE_LOOPS)
+
+
+# --- 유사 특허 검색 ---
+def test_final_similar_patent_query(perf_gate):
+    """합성 문서 1만 건 TF-IDF 인덱스에서 상위 5개 검색 20회 (대기 행 포함)"""
+    from similar_patents import SimilarityIndex, make_benchmark_term_vectors
+    documents = make_benchmark_term_vectors(10_020)
+    index = SimilarityIndex()
+    index.add_many((f"doc{row:06d}", terms, None, None) for row, terms in enumerate(documents[:10_000]))
+    index.merge()
+    index.add_many((f"new{row:06d}", terms, None, None) for row, terms in enumerate(documents[10_000:]))
+
+    def _query():
+        for terms in documents[10_000:]:
+            assert index.query(terms, 5)
+    perf_gate.check("final.similar_patent_query", _query)
+
+
+# --- 분석 번들 ---
+def test_final_bundle_reopen(perf_gate, text_pdf_bytes, fake_structured_data, tmp_path):
+    """20페이지 문서의 분석 번들 다시 열기: 번들 읽기 + 빈 렌더링 캐시 채우기 (LLM 호출 없음)"""
+    from analysis_bundle import AnalysisBundleStore, build_path_index, render_bundle_images, seed_render_cache
+    from render_cache import RenderCache
+    from schema_descriptions import SCHEMA_FIELD_DESCRIPTIONS
+    store = AnalysisBundleStore(str(tmp_path / "bundles"))
+    images = render_bundle_images(text_pdf_bytes, "bench", 20, RenderCache(str(tmp_path / "cache_write")))
+    path_index = build_path_index(fake_structured_data, SCHEMA_FIELD_DESCRIPTIONS.keys())
+    store.write("bench", "bench.pdf", ["page text"] * 20, fake_structured_data, path_index, images=images, source_pdf=text_pdf_bytes)
+
+    def _reopen():
+        cache = RenderCache(str(tmp_path / "cache_reopen"))
+        cache.clear()
+        bundle = store.read(store.path("bench"))
+        assert seed_render_cache(cache, "bench", bundle["images"]) == len(images)
+    perf_gate.check("final.bundle_reopen", _reopen, loops=SMALL_STAGE_LOOPS)
@@ -0,0 +1,42 @@
+# test_profiling.py
+# 선택적 프로파일링(profiling.py): 겹쳐 실행되는 블록이 프로세스 전역 tracemalloc을 서로 끄거나 최대값을 지우지 않는지
+import os
+import threading
+import tracemalloc
+
+from profiling import profile_block
+
+
+def test_overlapping_blocks_share_tracemalloc_safely(tmp_path):
+    assert not tracemalloc.is_tracing()
+    inner_entered, outer_may_finish = threading.Event(), threading.Event()
+    summaries = {}
+    errors = []
+
+    def _inner():
+        try:
+            inner_entered.wait(5)
+            with profile_block("inner", str(tmp_path)) as summary:
+                outer_may_finish.set()
+                data = [bytes(1024) for _ in range(100)]  # 바깥 블록이 끝난 뒤에도 계속 실행
+                del data
+            summaries["inner"] = summary
+        except Exception as e:
+            errors.append(e)
+
+    worker = threading.Thread(target=_inner)
+    worker.start()
+    with profile_block("outer", str(tmp_path)) as outer:
+        inner_entered.set()
+        outer_may_finish.wait(5)
+    worker.join(5)
+
+    assert not errors
+    # 먼저 시작한 블록만 메모리를 기록하고, 겹친 블록은 시간만 기록
+    assert outer["peak_mb"] is not None
+    assert summaries["inner"]["peak_mb"] is None and summaries["inner"]["top_allocations"] == []
+    assert not tracemalloc.is_tracing()
+    with profile_block("after", str(tmp_path)) as after:
+        pass
+    assert after["peak_mb"] is not None
+    assert all(os.path.exists(path) for path in after["files"])
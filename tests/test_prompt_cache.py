@@ -0,0 +1,136 @@
+# test_prompt_cache.py
+# 프롬프트 캐시 수명 관리(prompt_cache.py): 만료/연장, 연장 실패 시 재생성, prompts.py 변경 시 폐기, 생성/호출 실패 시 캐시 없이 호출
+import pytest
+from langchain_core.messages import HumanMessage
+
+import prompt_cache
+from app_config import AppConfig
+from fake_llm import FakeChatModel, requested_sections_responder
+from prompt_cache import PromptCachedModel, PromptCacheManager, SimulatedPromptCacheBackend, split_static_prefix
+from prompts import PATENT_DATA_SCHEMA_SECTIONS
+from schema_versioning import build_section_extraction_prompt
+
+PROMPT = build_section_extraction_prompt("A sodium layered oxide cathode. " * 50, "doc.pdf", list(PATENT_DATA_SCHEMA_SECTIONS))
+PREFIX, SUFFIX = split_static_prefix(PROMPT)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def _manager(backend=None):
+    clock = _Clock()
+    return PromptCacheManager(backend or SimulatedPromptCacheBackend(), clock=clock), clock
+
+def _events(manager):
+    return [event["event"] for event in manager.events]
+
+
+def test_prompt_splits_at_static_prefix():
+    assert PREFIX and SUFFIX.startswith(prompt_cache.STATIC_PREFIX_END_MARKER)
+    assert "doc.pdf" not in PREFIX
+    assert split_static_prefix("no marker here") == (None, "no marker here")
+
+def test_short_prefix_is_not_cached():
+    manager, _ = _manager()
+    assert manager.acquire("model", "short prefix") is None
+
+def test_handle_is_reused_then_extended_then_recreated_after_expiry():
+    manager, clock = _manager()
+    first = manager.acquire("model", PREFIX)
+    clock.now = 60
+    assert manager.acquire("model", PREFIX) is first and manager.totals["extended"] == 0
+    clock.now = AppConfig.PROMPT_CACHE_TTL_SECONDS - AppConfig.PROMPT_CACHE_REFRESH_MARGIN_SECONDS + 1
+    assert manager.acquire("model", PREFIX) is first
+    assert manager.totals["extended"] == 1 and first.expires_at == clock.now + AppConfig.PROMPT_CACHE_TTL_SECONDS
+    clock.now = first.expires_at + 1
+    second = manager.acquire("model", PREFIX)
+    assert second.name != first.name
+    assert _events(manager) == ["created", "extended", "deleted", "created"]
+
+def test_extend_failure_recreates_handle():
+    backend = SimulatedPromptCacheBackend()
+    manager, clock = _manager(backend)
+    first = manager.acquire("model", PREFIX)
+    backend.delete(first.name)  # 제공자 측에서 캐시가 사라짐
+    clock.now = AppConfig.PROMPT_CACHE_TTL_SECONDS - AppConfig.PROMPT_CACHE_REFRESH_MARGIN_SECONDS + 1
+    second = manager.acquire("model", PREFIX)
+    assert second is not None and second.name != first.name
+    assert _events(manager) == ["created", "extend_failed", "deleted", "created"]
+
+def test_prompts_change_invalidates_handles(monkeypatch):
+    manager, _ = _manager()
+    first = manager.acquire("model", PREFIX)
+    monkeypatch.setattr(prompt_cache, "_prompts_fingerprint", lambda: (1, 1))
+    second = manager.acquire("model", PREFIX)
+    assert second.name != first.name
+    assert "prompts.py changed" in manager.events[1]["detail"]
+
+def test_create_failure_waits_before_retrying():
+    class _FailingBackend(SimulatedPromptCacheBackend):
+        fail = True
+
+        def create(self, model_name, prefix_text, ttl_seconds, display_name):
+            if self.fail:
+                raise RuntimeError("quota")
+            return super().create(model_name, prefix_text, ttl_seconds, display_name)
+    backend = _FailingBackend()
+    manager, clock = _manager(backend)
+    assert manager.acquire("model", PREFIX) is None
+    backend.fail = False
+    clock.now = AppConfig.PROMPT_CACHE_RETRY_SECONDS - 1
+    assert manager.acquire("model", PREFIX) is None
+    clock.now = AppConfig.PROMPT_CACHE_RETRY_SECONDS
+    assert manager.acquire("model", PREFIX) is not None
+    assert manager.totals["failures"] == 1
+
+def test_cached_invoke_records_cache_read_tokens():
+    manager, _ = _manager()
+    base_model = FakeChatModel(requested_sections_responder())
+    model = PromptCachedModel(base_model, manager, AppConfig.GEMINI_MODEL_NAME)
+    model.invoke([HumanMessage(content=PROMPT)])
+    assert base_model.prompts[-1] == PROMPT
+    assert model.requests[0]["cache_name"] is not None
+    assert model.requests[0]["cached_input_tokens"] == model.requests[0]["prefix_tokens"] > 0
+
+def test_invoke_error_falls_back_to_full_prompt():
+    backend = SimulatedPromptCacheBackend()
+    manager, _ = _manager(backend)
+    base_model = FakeChatModel(requested_sections_responder())
+    model = PromptCachedModel(base_model, manager, AppConfig.GEMINI_MODEL_NAME)
+    handle = manager.acquire(AppConfig.GEMINI_MODEL_NAME, PREFIX)
+    backend.delete(handle.name)  # 캐시 호출이 'not found'로 실패
+    response = model.invoke([HumanMessage(content=PROMPT)])
+    assert response.content and base_model.prompts == [PROMPT]
+    assert model.requests[0]["cache_name"] is None and model.requests[0]["cached_input_tokens"] == 0
+    assert manager.snapshot()["handles"] == []
+    assert model.invoke([HumanMessage(content=PROMPT)]) is not None
+    assert model.requests[1]["cached_input_tokens"] > 0
+
+class _FailingBackend(SimulatedPromptCacheBackend):
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+    def invoke(self, handle, base_model, prefix_text, suffix, config):
+        raise self.error
+
+@pytest.mark.parametrize("error", [TimeoutError("deadline exceeded"), RuntimeError("429 RESOURCE_EXHAUSTED"), ConnectionError("reset")])
+def test_transient_invoke_error_keeps_handle_and_is_raised(error):
+    manager, _ = _manager(_FailingBackend(error))
+    base_model = FakeChatModel(requested_sections_responder())
+    model = PromptCachedModel(base_model, manager, AppConfig.GEMINI_MODEL_NAME)
+    with pytest.raises(type(error)):
+        model.invoke([HumanMessage(content=PROMPT)])
+    # 캐시는 그대로 두고 전체 프롬프트로 다시 보내지 않음
+    assert base_model.prompts == []
+    assert len(manager.snapshot()["handles"]) == 1
+
+def test_cache_missing_errors_are_recognized():
+    assert prompt_cache.is_cache_missing_error(KeyError("cached content not found"))
+    assert prompt_cache.is_cache_missing_error(RuntimeError("404 NOT_FOUND: CachedContent not found"))
+    assert prompt_cache.is_cache_missing_error(RuntimeError("Cache content 12ab has expired"))
+    assert not prompt_cache.is_cache_missing_error(RuntimeError("429 Resource has been exhausted"))
@@ -0,0 +1,81 @@
+# test_quick_analysis.py
+# 빠른 분석(quick_analysis.py): KR/EP/US 공보 레이아웃의 요약/청구항 구간 탐지와, 전체 추출 업그레이드에서 다시 추출할 섹션
+from fake_llm import FakeChatModel, requested_sections_responder
+from prompts import PATENT_DATA_SCHEMA_SECTIONS
+from quick_analysis import QUICK_SECTIONS, locate_quick_sections, sections_to_upgrade, upgrade_to_full_analysis
+
+BODY = "The positive electrode active material was prepared by a solid-state reaction. " * 20
+
+KR_PAGES = [
+    "(19) 대한민국특허청(KR)\n(12) 공개특허공보(A)\n(54) 발명의 명칭 나트륨 이차전지용 양극 활물질\n(57) 요 약\n"
+    "본 발명은 층상 구조의 나트륨 전이금속 산화물을 포함하는 양극 활물질에 관한 것이다.",
+    "명세서\n청구범위는 아래와 같이 작성한다는 안내 문장\n" + BODY,
+    BODY,
+    "청구범위\n청구항 1\n하기 화학식 1로 표시되는 나트륨 전이금속 산화물을 포함하는 양극 활물질.\n청구항 2\n제1항에 있어서, 입경이 5 내지 15 um인 양극 활물질.",
+]
+EP_PAGES = [
+    "(19) Europäisches Patentamt\n(11) EP 3 968 410 A1\n(54) POSITIVE ELECTRODE ACTIVE MATERIAL\n"
+    "(57) A positive electrode active material for a sodium-ion battery comprising NaxMnyNizO2 is provided.",
+    "Description\nClaims made in earlier applications are discussed below.\n" + BODY,
+    "Claims\n\n1. A positive electrode active material comprising NaxMnyNizO2.\n\n2. The material of claim 1, wherein x is 0.67.",
+    "Drawings\nFIG. 1 shows an XRD pattern.",
+]
+US_PAGES = [
+    "(12) United States Patent\n(10) Patent No.: US 11,296,321 B2\n(54) LAYERED OXIDE CATHODE FOR SODIUM ION BATTERIES\n"
+    "(57) ABSTRACT\nA layered oxide cathode material for sodium ion batteries is disclosed.",
+    BODY,
+    BODY + "\nWhat is claimed is:\n1. A cathode material comprising a layered oxide.\n2. The cathode material of claim 1.",
+]
+
+
+def test_kr_layout():
+    sections = locate_quick_sections(KR_PAGES)
+    assert sections.located
+    assert sections.abstract_page == 1 and sections.abstract.startswith("요 약\n본 발명은 층상 구조")
+    assert sections.claims_pages == [4] and sections.claims.startswith("청구범위\n청구항 1")
+
+def test_ep_layout_skips_claims_mention_in_description():
+    sections = locate_quick_sections(EP_PAGES)
+    assert sections.located
+    assert sections.abstract.startswith("A positive electrode active material")
+    assert sections.claims_pages == [3, 4] and sections.claims.startswith("Claims\n\n1. A positive electrode")
+
+def test_us_layout_claims_in_middle_of_page():
+    sections = locate_quick_sections(US_PAGES)
+    assert sections.located
+    assert sections.abstract.startswith("ABSTRACT\nA layered oxide cathode")
+    assert sections.claims_pages == [3] and sections.claims.startswith("What is claimed is:\n1. A cathode material")
+
+def test_fallback_when_sections_are_missing():
+    pages = ["Cover page text", BODY, "Last page text"]
+    sections = locate_quick_sections(pages)
+    assert not sections.located
+    assert sections.abstract == "Cover page text" and sections.abstract_page == 1
+    assert sections.claims_pages == [2, 3] and sections.claims.endswith("Last page text")
+
+def _quick_data():
+    return {
+        "patent_info": {"publication_number": "EP 3 968 410 A1", "title_original_language": "POSITIVE ELECTRODE ACTIVE MATERIAL"},
+        # 화학식만 있고 매개변수가 없어 검증 실패 -> 전체 추출에서 다시 추출
+        "material_description": {"chemical_formula_general": "NaxMnyNizO2", "formula_parameters": []},
+        "document_summary_for_user": "A sodium layered oxide cathode.",
+        "language_of_document": "English",
+        "source_file_name": "doc.pdf",
+    }
+
+def test_sections_to_upgrade_reuses_valid_quick_sections():
+    section_names = sections_to_upgrade(_quick_data())
+    expected = [name for name in PATENT_DATA_SCHEMA_SECTIONS if name not in QUICK_SECTIONS or name == "material_description"]
+    assert section_names == expected
+    assert sections_to_upgrade({}) == list(PATENT_DATA_SCHEMA_SECTIONS)
+    # 빈 섹션은 검증을 통과하지 않으므로 다시 추출
+    assert "patent_info" in sections_to_upgrade(dict(_quick_data(), patent_info={}))
+
+def test_upgrade_requests_only_missing_sections_and_merges_in_schema_order():
+    model = FakeChatModel(requested_sections_responder({"morphology_structure": {"particle_form_summary": "Single crystal"}}))
+    structured_data, metrics = upgrade_to_full_analysis(_quick_data(), "full text " * 100, model, "fake-model", "doc.pdf")
+    assert "error" not in structured_data
+    assert metrics["reused_sections"] == ["patent_info", "document_summary_for_user", "language_of_document", "source_file_name"]
+    assert structured_data["patent_info"] == _quick_data()["patent_info"]
+    assert structured_data["morphology_structure"] == {"particle_form_summary": "Single crystal"}
+    assert list(structured_data) == [name for name in PATENT_DATA_SCHEMA_SECTIONS if name in structured_data]
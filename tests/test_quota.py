@@ -0,0 +1,76 @@
+# test_quota.py
+# 공유 API 키 쿼터(quota.py): 진행 중 호출 예약, 실제 사용량으로의 정산, 최근 60초 토큰 슬라이딩 윈도우
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+import quota
+from fake_llm import FakeChatModel
+from quota import QuotaExceededError, QuotaLimitedModel, QuotaManager
+
+
+def _manager(**limits):
+    settings = dict(max_inflight_calls_global=2, max_inflight_calls_per_session=1,
+                    max_tokens_per_minute_global=10_000, max_tokens_per_minute_per_session=1_000,
+                    queue_timeout_seconds=0.05)
+    settings.update(limits)
+    return QuotaManager(**settings)
+
+def test_reservation_limits_inflight_calls_per_session_and_globally():
+    manager = _manager()
+    with manager.reserve("a", 10):
+        snapshot = manager.snapshot()
+        assert snapshot["global"]["inflight_calls"] == 1 and snapshot["global"]["inflight_tokens"] == 10
+        with pytest.raises(QuotaExceededError):
+            with manager.reserve("a", 10):
+                pass
+        with manager.reserve("b", 10):
+            with pytest.raises(QuotaExceededError):
+                with manager.reserve("c", 10):  # 전체 동시 호출 한도(2)
+                    pass
+    snapshot = manager.snapshot()
+    assert snapshot["global"]["inflight_calls"] == 0 and snapshot["global"]["queued"] == 0
+    assert snapshot["totals"]["rejected"] == 2
+    assert [event["type"] for event in snapshot["recent_events"]] == ["quota_rejected"] * 2
+
+def test_completed_call_is_reconciled_to_actual_usage():
+    manager = _manager()
+    with manager.reserve("a", 500) as usage:
+        usage["actual_tokens"] = 120
+    assert manager.snapshot()["global"]["tokens_last_minute"] == 120
+    # 실제 사용량을 모르면 예약한 추정치로 기록
+    with manager.reserve("a", 300):
+        pass
+    assert manager.snapshot()["totals"]["tokens"] == 420
+
+    model = QuotaLimitedModel(FakeChatModel('{"ok": true}'), manager, "b")
+    response = model.invoke([HumanMessage(content="prompt " * 50)])
+    session = next(row for row in manager.snapshot()["sessions"] if row["session_id"] == "b")
+    assert session["tokens_last_minute"] == response.usage_metadata["total_tokens"]
+    assert session["inflight_tokens"] == 0
+
+def test_failed_call_records_rate_limit_event():
+    manager = _manager()
+    model = QuotaLimitedModel(FakeChatModel("", error=RuntimeError("429 Resource has been exhausted")), manager, "a")
+    with pytest.raises(RuntimeError):
+        model.invoke([HumanMessage(content="prompt")])
+    snapshot = manager.snapshot()
+    assert snapshot["recent_events"][0]["type"] == "429"
+    assert snapshot["global"]["inflight_calls"] == 0
+
+def test_token_window_slides_after_a_minute(monkeypatch):
+    now = {"value": time.time()}
+    monkeypatch.setattr(quota.time, "time", lambda: now["value"])
+    manager = _manager()
+    with manager.reserve("a", 0) as usage:
+        usage["actual_tokens"] = 900
+    with pytest.raises(QuotaExceededError):
+        with manager.reserve("a", 200):  # 900 + 200 > 세션 한도 1,000
+            pass
+    with manager.reserve("b", 200):  # 다른 세션은 전체 한도 안이면 통과
+        pass
+    now["value"] += quota.TOKEN_WINDOW_SECONDS + 1
+    with manager.reserve("a", 200):
+        pass
+    assert manager.snapshot()["global"]["tokens_last_minute"] == 200
@@ -0,0 +1,16 @@
+# test_render_cache.py
+# 페이지 이미지 디스크 캐시(render_cache.py): 같은 페이지를 다시 써도 추정 용량이 실제 파일 크기와 맞는지
+from render_cache import RenderCache
+
+DOCUMENT_ID = "ab" * 32
+
+
+def test_overwrite_replaces_estimated_size(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=10_000)
+    for _ in range(5):
+        cache.put(DOCUMENT_ID, 0, 100, b"x" * 1000)
+        assert cache._estimated_bytes == 1000
+    cache.put(DOCUMENT_ID, 0, 100, b"x" * 400)
+    cache.put(DOCUMENT_ID, 1, 100, b"y" * 600)
+    assert cache._estimated_bytes == 1000
+    assert cache.get(DOCUMENT_ID, 0, 100) == b"x" * 400
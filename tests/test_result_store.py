@@ -0,0 +1,37 @@
+# test_result_store.py
+# 문서별 결과 저장소(result_store.py): 레코드 왕복과, 같은 디렉토리의 다른 .json 파일(수집 지표 등)을 레코드로 보지 않는지
+import json
+
+import pytest
+
+from ingest_daemon import INGEST_METRICS_FILENAME, write_ingest_metrics
+from result_store import ResultStore, compute_document_id
+
+DOCUMENT_ID = compute_document_id(b"%PDF-1.4 sample")
+
+
+def test_save_load_round_trip(tmp_path):
+    store = ResultStore(str(tmp_path))
+    store.save({"document_id": DOCUMENT_ID, "structured_data": {"patent_info": {}}})
+    record = store.load(DOCUMENT_ID)
+    assert record["structured_data"] == {"patent_info": {}} and record["created_at"] == record["updated_at"]
+    assert store.exists(DOCUMENT_ID) and store.list_ids() == [DOCUMENT_ID]
+
+def test_non_record_files_are_ignored(tmp_path):
+    store = ResultStore(str(tmp_path))
+    store.save({"document_id": DOCUMENT_ID})
+    fingerprint = store.fingerprint()
+    (tmp_path / "ingest_metrics.json").write_text(json.dumps({"processed": 1}))  # 이전 이름의 지표 파일
+    (tmp_path / "notes.json").write_text("{}")
+    write_ingest_metrics(str(tmp_path / INGEST_METRICS_FILENAME), {"processed": 2})
+    assert store.list_ids() == [DOCUMENT_ID]
+    assert list(store.list_versions()) == [DOCUMENT_ID]
+    assert [record["document_id"] for record in store.iter_records()] == [DOCUMENT_ID]
+    assert store.fingerprint() == fingerprint
+
+@pytest.mark.parametrize("document_id", [None, "ingest_metrics", "../" + DOCUMENT_ID, DOCUMENT_ID.upper()])
+def test_invalid_document_ids_are_rejected(tmp_path, document_id):
+    store = ResultStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.save({"document_id": document_id})
+    assert store.load(document_id) is None and not store.exists(document_id)
@@ -0,0 +1,35 @@
+# test_results_tabs.py
+# 결과 탭 프래그먼트(streamlit_test2.py): 파생 값 메모가 재실행 사이에 재사용되고, 새 결과 버전에서만 다시 계산되는지
+import json
+
+from streamlit.testing.v1 import AppTest
+
+PDF_FILENAME = "results_tabs.pdf"
+
+
+def test_render_memo_is_reused_until_results_version_changes(final_app, table_pdf_bytes, fake_structured_data):
+    keys = final_app.SessionStateKeys
+    at = AppTest.from_file(final_app.__file__, default_timeout=60)
+    at.run()
+    at.session_state[keys.ANALYSIS_COMPLETE] = True
+    at.session_state[keys.STRUCTURED_DATA] = {**fake_structured_data, "source_file_name": PDF_FILENAME}
+    at.session_state[keys.PDF_PAGE_TEXTS] = ["page"] * 8
+    at.session_state[keys.PDF_BYTES_FOR_VIEWER] = table_pdf_bytes
+    at.session_state[keys.DOCUMENT_ID] = "results-tabs"
+    at.session_state[keys.ORIGINAL_FILENAME] = PDF_FILENAME
+    at.run()
+    assert not at.exception
+    memo = at.session_state[keys.RENDER_MEMO]
+    first_json = memo["json_download_string"]
+    assert memo["__version__"] == at.session_state[keys.RESULTS_VERSION]
+    assert json.loads(first_json)["source_file_name"] == PDF_FILENAME
+
+    # 같은 결과 버전에서는 재실행해도 메모를 그대로 사용 (결과 딕셔너리를 다시 직렬화하지 않음)
+    at.session_state[keys.STRUCTURED_DATA] = {**fake_structured_data, "source_file_name": "changed.pdf"}
+    at.run()
+    assert at.session_state[keys.RENDER_MEMO]["json_download_string"] is first_json
+
+    at.session_state[keys.RESULTS_VERSION] += 1
+    at.run()
+    assert not at.exception
+    assert json.loads(at.session_state[keys.RENDER_MEMO]["json_download_string"])["source_file_name"] == "changed.pdf"
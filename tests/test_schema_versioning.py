@@ -0,0 +1,52 @@
+# test_schema_versioning.py
+# 섹션별 스키마 버전(schema_versioning.py): 재추출 대상 섹션 판정과, 백필의 병합/버전 갱신
+from fake_llm import FakeChatModel, requested_sections_responder
+from result_store import ResultStore, compute_document_id
+from schema_versioning import SHARED_INSTRUCTIONS_KEY, compute_schema_versions, find_stale_sections, plan_backfill, run_backfill
+
+SECTIONS = {"material_description": "material schema", "morphology_structure": "morphology schema"}
+CURRENT = compute_schema_versions(SECTIONS, "instructions")
+
+
+def test_find_stale_sections():
+    assert find_stale_sections(CURRENT, CURRENT) == []
+    # 저장된 버전이 없거나 공통 지시문이 바뀌면 모든 섹션
+    assert find_stale_sections(None, CURRENT) == list(SECTIONS)
+    assert find_stale_sections({**CURRENT, SHARED_INSTRUCTIONS_KEY: "old"}, CURRENT) == list(SECTIONS)
+    assert find_stale_sections({**CURRENT, "morphology_structure": "old"}, CURRENT) == ["morphology_structure"]
+    # 새로 추가된 섹션(저장된 버전에 없음)도 재추출 대상
+    stored = {key: value for key, value in CURRENT.items() if key != "material_description"}
+    assert find_stale_sections(stored, CURRENT) == ["material_description"]
+
+def test_run_backfill_merges_stale_sections_and_bumps_versions(tmp_path):
+    store = ResultStore(str(tmp_path))
+    current = compute_schema_versions()
+    document_id = compute_document_id(b"%PDF-1.4 backfill")
+    kept = {"chemical_formula_general": "NaFePO4", "formula_parameters": [{"parameter": "x", "value": "1"}]}
+    store.save({
+        "document_id": document_id,
+        "source_file_name": "doc.pdf",
+        "page_texts": ["A sodium layered oxide cathode."],
+        "structured_data": {"material_description": kept, "morphology_structure": {"particle_shape": "old"}},
+        "schema_versions": {**current, "morphology_structure": "old"},
+    })
+    assert plan_backfill(store) == (1, [(document_id, ["morphology_structure"])])
+
+    model = FakeChatModel(requested_sections_responder({"morphology_structure": {"particle_shape": "spherical"}}))
+    report = run_backfill(store, model, "fake-model")
+    assert (report.succeeded, report.failed, report.sections_reextracted) == (1, 0, 1)
+    record = store.load(document_id)
+    assert record["structured_data"]["morphology_structure"] == {"particle_shape": "spherical"}
+    assert record["structured_data"]["material_description"] == kept
+    assert record["schema_versions"] == current
+    assert plan_backfill(store) == (1, [])
+
+def test_failed_backfill_keeps_versions(tmp_path):
+    store = ResultStore(str(tmp_path))
+    current = compute_schema_versions()
+    document_id = compute_document_id(b"%PDF-1.4 failing")
+    stale_versions = {**current, "morphology_structure": "old"}
+    store.save({"document_id": document_id, "page_texts": ["text"], "structured_data": {}, "schema_versions": stale_versions})
+    report = run_backfill(store, FakeChatModel("not json"), "fake-model")
+    assert (report.succeeded, report.failed) == (0, 1)
+    assert store.load(document_id)["schema_versions"] == stale_versions
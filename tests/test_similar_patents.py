@@ -0,0 +1,89 @@
+# test_similar_patents.py
+# 유사 특허 TF-IDF 인덱스(similar_patents.py): 코사인 점수 범위, 추가 순서와 무관한 순위, 병합 전후 일치, 저장/읽기 왕복
+import pytest
+
+from similar_patents import SimilarityIndex, document_terms, load_index
+
+DOCUMENTS = {
+    "nfm": {"sodium": 2.0, "layered": 1.5, "oxide": 1.5, "nickel": 1.0, "manganese": 1.0},
+    "nvp": {"sodium": 2.0, "vanadium": 2.0, "phosphate": 1.5, "nasicon": 1.0},
+    "lfp": {"lithium": 2.0, "iron": 1.5, "phosphate": 2.0, "olivine": 1.0},
+    "hard-carbon": {"sodium": 1.0, "hard": 2.0, "carbon": 2.0, "anode": 1.0},
+}
+QUERY = {"sodium": 1.0, "phosphate": 1.0, "vanadium": 0.5, "layered": 0.5}
+
+
+def _index(document_ids, merge=False):
+    index = SimilarityIndex()
+    for document_id in document_ids:
+        index.add(document_id, DOCUMENTS[document_id], {"title": document_id.upper()})
+    if merge:
+        index.merge()
+    return index
+
+def _scores(index, query=QUERY):
+    return {result["document_id"]: result["score"] for result in index.query(query, k=10)}
+
+
+def test_self_match_scores_one_and_never_above():
+    index = _index(["nfm", "nvp", "lfp"])
+    for document_id in ("nfm", "nvp", "lfp"):
+        scores = _scores(index, DOCUMENTS[document_id])
+        assert scores[document_id] == pytest.approx(1.0, abs=1e-5)
+        assert max(scores.values()) <= 1.0 + 1e-6
+
+def test_ranking_does_not_depend_on_insert_order():
+    forward = _scores(_index(["nfm", "nvp", "lfp", "hard-carbon"]))
+    backward = _scores(_index(["hard-carbon", "lfp", "nvp", "nfm"]))
+    assert forward.keys() == backward.keys()
+    for document_id, score in forward.items():
+        assert backward[document_id] == pytest.approx(score, rel=1e-5)
+    assert next(iter(forward)) == "nvp"
+
+def test_pending_rows_score_like_merged_rows():
+    pending = _scores(_index(["nfm", "nvp", "lfp", "hard-carbon"]))
+    merged = _scores(_index(["nfm", "nvp", "lfp", "hard-carbon"], merge=True))
+    assert list(pending) == list(merged)
+    for document_id, score in merged.items():
+        assert pending[document_id] == pytest.approx(score, rel=1e-5)
+
+def test_additions_after_merge_keep_scores_in_range():
+    index = _index(["nfm", "lfp"], merge=True)
+    index.add("nvp", DOCUMENTS["nvp"])
+    index.add("hard-carbon", DOCUMENTS["hard-carbon"])
+    for document_id in DOCUMENTS:
+        scores = _scores(index, DOCUMENTS[document_id])
+        assert scores[document_id] == pytest.approx(1.0, abs=1e-5)
+        assert max(scores.values()) <= 1.0 + 1e-6
+
+def test_replace_remove_and_exclude():
+    index = _index(["nfm", "nvp", "lfp"])
+    index.add("nvp", DOCUMENTS["hard-carbon"])
+    index.remove("lfp")
+    assert len(index) == 2
+    results = index.query(DOCUMENTS["hard-carbon"], k=10, exclude_ids=["nfm"])
+    assert [result["document_id"] for result in results] == ["nvp"]
+    assert "hard" in results[0]["shared_terms"]
+
+def test_save_load_round_trip(tmp_path):
+    index = _index(["nfm", "nvp", "lfp"], merge=True)
+    index.add("hard-carbon", DOCUMENTS["hard-carbon"], {"title": "HC"}, version=7)
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = load_index(path)
+    assert loaded.document_ids == index.document_ids and loaded.versions == {"hard-carbon": 7}
+    assert loaded.query(QUERY, k=10) == index.query(QUERY, k=10)
+    assert loaded.query(QUERY, k=1)[0]["title"] == "NVP"
+
+def test_unreadable_index_file_gives_empty_index(tmp_path, caplog):
+    path = tmp_path / "index.npz"
+    path.write_bytes(b"not an npz file")
+    with caplog.at_level("WARNING", logger="similar_patents"):
+        assert len(load_index(str(path))) == 0
+    assert "유사 특허 인덱스를 읽을 수 없어" in caplog.text
+
+def test_document_terms_weights_fields_and_elements():
+    terms = document_terms(["The sodium cathode sodium layered oxide."],
+                           {"material_description": {"chemical_formula_general": "NaFePO4", "material_system_type": "Polyanion"}})
+    assert terms["sodium"] > terms["cathode"]
+    assert "the" not in terms and "el:fe" in terms and "polyanion" in terms
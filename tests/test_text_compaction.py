@@ -0,0 +1,32 @@
+# test_text_compaction.py
+# 프롬프트 텍스트 압축(text_compaction.py): 반복 머리말/꼬리말과 페이지 번호 제거, 표 보존, page map으로 원래 페이지 찾기
+from text_compaction import compact_page_texts, find_snippet_pages
+
+
+def _page(number, body):
+    return f"EP 3 968 410 A1\n\n{body}\n\n\n\n- {number} -"
+
+PAGES = [
+    _page(1, "A positive   electrode active material."),
+    _page(2, "[TABLE 1]\n- 2 -\n[/TABLE]\nThe sodium layered oxide was calcined."),
+    _page(3, "Capacity of 150 mAh/g was obtained."),
+    _page(4, "Claims follow."),
+]
+
+
+def test_repeated_edges_are_removed_and_tables_kept():
+    text, _, stats = compact_page_texts(PAGES)
+    assert "EP 3 968 410 A1" not in text and "- 4 -" not in text
+    assert "A positive electrode active material." in text  # 레이아웃 공백 축소
+    assert "[TABLE 1]\n- 2 -\n[/TABLE]" in text  # 표 안의 줄은 페이지 번호 형태여도 유지
+    assert "\n\n\n" not in text
+    # 공보 번호와 "- n -" 페이지 번호 두 패턴, 페이지마다 2줄씩
+    assert stats["repeated_line_patterns"] == 2 and stats["removed_lines"] == 8
+    assert stats["compacted_chars"] < stats["original_chars"]
+
+def test_page_map_points_back_to_original_pages():
+    text, page_map, _ = compact_page_texts(PAGES, page_numbers=[2, 3])
+    assert [entry["page"] for entry in page_map] == [2, 3]
+    assert find_snippet_pages(text, page_map, "150  mAh/g") == [3]
+    assert find_snippet_pages(text, page_map, "sodium layered\noxide") == [2]
+    assert find_snippet_pages(text, page_map, "Claims follow") == []
@@ -0,0 +1,74 @@
+# test_unit_normalization.py
+# 값 문자열 파싱과 기준 단위 환산(unit_normalization.py): 대소문자로만 구분되는 SI 기호, 범위, 조건 분리
+import math
+
+import pytest
+
+from unit_normalization import lookup_unit, normalize_quantities, parse_quantity
+
+
+def _base_value(text: str, unit_hint: str = "") -> tuple:
+    quantity = parse_quantity(text, unit_hint)
+    return quantity.typical * quantity.factor + quantity.offset, quantity.unit
+
+
+@pytest.mark.parametrize("text, expected_value, expected_unit", [
+    ("0.5 S cm-1", 0.5, "S/cm"),
+    ("3 mS/cm", 3e-3, "S/cm"),
+    ("1.2 × 10-4 S cm⁻¹", 1.2e-4, "S/cm"),
+    ("1e-4 S", 1e-4, "S"),
+    ("30 s", 30 / 3600, "h"),
+    ("2 hours", 2.0, "h"),
+])
+def test_siemens_vs_seconds(text, expected_value, expected_unit):
+    value, unit = _base_value(text)
+    assert unit == expected_unit
+    assert math.isclose(value, expected_value, rel_tol=1e-9)
+
+@pytest.mark.parametrize("text, expected_ohm", [("5 MΩ", 5e6), ("5 mΩ", 5e-3), ("5 kΩ", 5e3), ("5 Mohm", 5e6), ("5 mohm", 5e-3)])
+def test_mega_vs_milli_ohm(text, expected_ohm):
+    value, unit = _base_value(text)
+    assert unit == "ohm"
+    assert math.isclose(value, expected_ohm, rel_tol=1e-9)
+
+@pytest.mark.parametrize("text, expected_mpa", [("5 MPa", 5.0), ("5 mPa", 5e-9), ("5 kPa", 5e-3), ("2 bar", 0.2)])
+def test_mpa_vs_millipascal(text, expected_mpa):
+    value, unit = _base_value(text)
+    assert unit == "MPa"
+    assert math.isclose(value, expected_mpa, rel_tol=1e-9)
+
+def test_case_free_names_still_match():
+    assert lookup_unit("Hours") == lookup_unit("hours")
+    assert lookup_unit("MAH/G") == ("mAh/g", 1.0, 0.0)
+    assert lookup_unit("Wt%") == ("wt%", 1.0, 0.0)
+
+def test_range_with_condition():
+    quantity = parse_quantity("120–135 mAh/g at 0.1C")
+    assert (quantity.low, quantity.high, quantity.typical) == (120, 135, 127.5)
+    assert quantity.unit == "mAh/g" and quantity.condition == "at 0.1C"
+
+@pytest.mark.parametrize("text", ["-10 ~ -5 °C", "-10 °C to -5 °C", "−10 – −5 °C"])
+def test_range_with_negative_bounds(text):
+    quantity = parse_quantity(text)
+    assert quantity.qualifier == "range" and quantity.unit == "°C"
+    assert (quantity.low, quantity.high, quantity.typical) == (-10, -5, -7.5)
+
+@pytest.mark.parametrize("text, qualifier, bound", [
+    ("10 nm or less", "lt", 0.01),
+    ("0.5 um or below", "lt", 0.5),
+    ("80 % or more", "gt", 80.0),
+    ("300 °C or higher", "gt", 300.0),
+    ("10 nm 이하", "lt", 0.01),
+])
+def test_postfix_bounds(text, qualifier, bound):
+    quantity = parse_quantity(text)
+    assert quantity.qualifier == qualifier and quantity.condition == ""
+    value = quantity.high if qualifier == "lt" else quantity.low
+    assert math.isclose(value * quantity.factor + quantity.offset, bound)
+    assert math.isnan(quantity.typical)
+
+def test_normalize_quantities_uses_unit_hint():
+    columns = normalize_quantities(["1.5 x 10^-3", "50 nm to 2 um"], ["S/cm", ""])
+    assert list(columns["unit"]) == ["S/cm", "um"]
+    assert math.isclose(columns["typical"][0], 1.5e-3)
+    assert math.isclose(columns["min"][1], 0.05) and math.isclose(columns["max"][1], 2.0)
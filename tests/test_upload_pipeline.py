@@ -0,0 +1,43 @@
+# test_upload_pipeline.py
+# 여러 파일 업로드 파이프라인(upload_pipeline.py): 파싱과 LLM 호출을 겹쳐 실행하고, 앞서 파싱하는 문서 수를 제한하며, 실패 파일만 따로 표시
+import threading
+import time
+from types import SimpleNamespace
+
+from app_config import AppConfig
+from upload_pipeline import STATUS_DONE, STATUS_FAILED, run_pipelined_analysis
+
+LLM_SECONDS = 0.1
+
+
+def test_parsing_overlaps_llm_calls_and_failures_are_isolated():
+    files = [(f"doc{index}.pdf", b"%PDF") for index in range(6)]
+    lock = threading.Lock()
+    pending = set()  # 파싱은 끝났지만 LLM 단계가 끝나지 않은 문서
+    max_pending = [0]
+
+    def parse(pdf_bytes, name):
+        if name == "doc1.pdf":
+            raise ValueError("broken PDF")
+        with lock:
+            pending.add(name)
+            max_pending[0] = max(max_pending[0], len(pending))
+        return SimpleNamespace(document_id=f"id-{name}", name=name)
+
+    def extract(prepared):
+        time.sleep(LLM_SECONDS)
+        with lock:
+            pending.discard(prepared.name)
+        if prepared.name == "doc4.pdf":
+            raise RuntimeError("LLM timeout")
+        return {"document_id": prepared.document_id, "cost_usd": 0.01}
+
+    report = run_pipelined_analysis(files, None, "fake-model", None, llm_concurrency=2, parse=parse, extract=extract)
+    statuses = [item.status for item in report.items]
+    assert statuses == [STATUS_DONE, STATUS_FAILED, STATUS_DONE, STATUS_DONE, STATUS_FAILED, STATUS_DONE]
+    assert "broken PDF" in report.items[1].error and "LLM timeout" in report.items[4].error
+    assert report.items[0].document_id == "id-doc0.pdf" and report.items[0].cost_usd == 0.01
+    # 파싱 결과는 LLM 동시 호출 수 + 미리 파싱할 수 있는 수까지만 쌓임
+    assert max_pending[0] <= 2 + AppConfig.MULTI_UPLOAD_PARSE_AHEAD
+    # LLM 호출 5건이 2개씩 동시에 실행되어 한 건씩 호출하는 시간보다 짧음
+    assert report.wall_seconds < 5 * LLM_SECONDS